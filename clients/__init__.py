@@ -7,6 +7,11 @@ from .slack import SlackMCPClient
 from .github import GitHubMCPClient
 from .filesystem import FilesystemMCPClient
 from .preview_mcp import PreviewMCPClient
+from .pool import MCPServerPool, get_server_pool, set_server_pool
+from .registry import MCPClientRegistry, get_client_registry, set_client_registry
+from .rate_limit import AsyncRateLimiter, get_rate_limiter, set_rate_limit
+from .stream_decoder import SpooledContent
+from .timeouts import deadline_scope, remaining_time
 from typing import List, Dict, Any
 import logging
 
@@ -26,8 +31,8 @@ class Context7MCPClient(BaseMCPClient):
         List available Context7 MCP tools.
         """
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool.get("name") for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.warning(f"Failed to list Context7 tools: {e}")
             return [
@@ -86,8 +91,8 @@ class BrowserMCPClient(BaseMCPClient):
         List available Browser MCP tools.
         """
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool.get("name") for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.warning(f"Failed to list Browser tools: {e}")
             return [
@@ -133,4 +138,16 @@ __all__ = [
     "PreviewMCPClient",
     "Context7MCPClient",
     "BrowserMCPClient",
+    "MCPServerPool",
+    "get_server_pool",
+    "set_server_pool",
+    "MCPClientRegistry",
+    "get_client_registry",
+    "set_client_registry",
+    "AsyncRateLimiter",
+    "get_rate_limiter",
+    "set_rate_limit",
+    "SpooledContent",
+    "deadline_scope",
+    "remaining_time",
 ] 
\ No newline at end of file
@@ -6,26 +6,60 @@ that communicate with real MCP servers via the Model Context Protocol.
 """
 
 import asyncio
+import itertools
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import subprocess
 import tempfile
 import os
-from dotenv import load_dotenv
+
+from utils import get_json_codec
+from utils.capabilities import ServerCapabilities, capability_cache, capability_key
+from utils.config_snapshot import get_config_snapshot_async
+from utils.exceptions import MCPConfigError, MCPRetryError
+from utils.profiling import profile_span
+from utils.retry import RetryEngine, RetryPolicy, get_retry_budget
+from .stream_decoder import StreamingJSONDecoder, materialize_spooled
+from .rate_limit import get_rate_limiter
+from .timeouts import latency_tracker, remaining_time
 
 logger = logging.getLogger(__name__)
 
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# StreamReader buffer limit for server stdout. The default 64KiB limit is far
+# too small for repository packs; frames are read in chunks regardless.
+STREAM_READER_LIMIT = 64 * 1024 * 1024
+
+# Most recent server stderr output kept for error messages
+STDERR_BUFFER_LIMIT = 8 * 1024
+# Amount of buffered stderr quoted in a single error message
+STDERR_EXCERPT_SIZE = 1024
+
 class MCPConnectionError(Exception):
     """Raised when MCP server connection fails."""
     pass
 
 class MCPToolError(Exception):
     """Raised when MCP tool execution fails."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        # JSON-RPC error code of the response, if any (see utils.retry)
+        self.code = code
+
+class MCPTimeoutError(MCPConnectionError):
+    """Raised when an MCP server does not answer a request in time."""
     pass
 
+class MCPDeadlineExceeded(MCPTimeoutError):
+    """Raised when the caller's propagated deadline (see clients.timeouts) runs out."""
+    retryable = False
+
 class BaseMCPClient(ABC):
     """
     Abstract base class for MCP clients that communicate with real MCP servers.
@@ -34,6 +68,19 @@ class BaseMCPClient(ABC):
     session management, and error handling.
     """
     SERVER_NAME: str = None # Subclasses must override this
+    # Response frames (and string values) larger than this are parsed
+    # incrementally and spooled to a temporary file instead of held as str
+    SPOOL_THRESHOLD: Optional[int] = 8 * 1024 * 1024
+    # Per-request timeout ceiling in seconds. Once enough latency samples
+    # exist, tool calls use a tighter timeout derived from the observed p99.
+    DEFAULT_TIMEOUT: float = 30.0
+    # Per-tool overrides of DEFAULT_TIMEOUT for known slow tools
+    TOOL_TIMEOUTS: Dict[str, float] = {}
+    # Upper bound for a single backoff sleep between tool call attempts
+    RETRY_MAX_DELAY: float = 30.0
+    # Token-bucket retry budget shared by all clients of the same server
+    RETRY_BUDGET_CAPACITY: float = 20.0
+    RETRY_BUDGET_REFILL_PER_SECOND: float = 1.0
 
     def __init__(self, config_path: str | Path):
         """
@@ -51,48 +98,36 @@ class BaseMCPClient(ABC):
         self.config_path = Path(config_path)
         self.server_name = self.SERVER_NAME # Get from class attribute
         self._config = None
+        self._env_overrides: Dict[str, str] = {}
         self._process = None
         self._session_id = None
+        self._start_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_buffer = bytearray()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._response_sizes: Dict[str, int] = {}
+        self._request_ids = itertools.count(1)
+        self._started_at: Optional[float] = None
+        self._requests_served = 0
+        self._server_info: Optional[Dict[str, Any]] = None
+        self._capability_key = capability_key(self.config_path, self.server_name)
         
         logger.info(f"Initialized {self.__class__.__name__} for server '{self.server_name}'")
 
     async def _load_config(self) -> Dict[str, Any]:
-        """Load MCP server configuration from config file and .env."""
+        """Load MCP server configuration from the shared config snapshot."""
         if self._config is None:
-            # Load environment variables from .env file first
-            load_dotenv()
-
-            # DEBUG: Print initial environment values for GitHub token
-            if self.server_name == "ovr_github":
-                initial_token = os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN", "NOT_SET")
-                logger.warning(f"🔍 Initial env GITHUB_PERSONAL_ACCESS_TOKEN: '{initial_token}' (length: {len(initial_token)})")
-
-            # Overwrite with secrets.json if it exists
-            secrets_path = Path("secrets.json")
-            if secrets_path.exists():
-                logger.info("Found secrets.json, loading secrets...")
-                with open(secrets_path, 'r') as f:
-                    secrets = json.load(f)
-                for key, value in secrets.items():
-                    os.environ[key] = str(value)
-                    logger.debug(f"Loaded secret: {key}")
-                
-                # DEBUG: Print environment value after loading secrets.json
-                if self.server_name == "ovr_github":
-                    after_secrets_token = os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN", "NOT_SET")
-                    logger.warning(f"🔍 After secrets.json GITHUB_PERSONAL_ACCESS_TOKEN: '{after_secrets_token}' (length: {len(after_secrets_token)})")
+            try:
+                snapshot = await get_config_snapshot_async(self.config_path)
+            except MCPConfigError as e:
+                raise MCPConnectionError(f"Failed to load MCP config: {e}")
 
-            if not self.config_path.exists():
-                raise MCPConnectionError(f"MCP config file not found: {self.config_path}")
-            
-            with open(self.config_path, 'r') as f:
-                full_config = json.load(f)
-            
-            servers = full_config.get('mcpServers', {})
-            if self.server_name not in servers:
+            if not snapshot.has_server(self.server_name):
                 raise MCPConnectionError(f"Server '{self.server_name}' not found in config")
-            
-            self._config = servers[self.server_name]
+
+            self._config = snapshot.server_config(self.server_name)
+            self._env_overrides = snapshot.server_env(self.server_name)
             logger.debug(f"Loaded config for server '{self.server_name}'")
         
         return self._config
@@ -103,30 +138,10 @@ class BaseMCPClient(ABC):
         command = config.get('command')
         args = config.get('args', [])
         
-        # Environment variables from config.json
-        config_env_vars = config.get('env', {})
-
-        # Merge environment variables with proper substitution: .env has highest precedence, then config.json, then system env
-        env = os.environ.copy() # Start with system environment variables
-        
-        # Perform variable substitution for config.json environment variables
-        for key, value in config_env_vars.items():
-            if isinstance(value, str) and value.startswith("$"):
-                # Substitute environment variable (remove the $ prefix)
-                env_var_name = value[1:]
-                substituted_value = os.getenv(env_var_name, "")
-                env[key] = substituted_value
-                logger.debug(f"Substituted env var {key}=${env_var_name} -> {key}={substituted_value[:4]}...{substituted_value[-4:] if len(substituted_value) > 8 else '***'}")
-                
-                # TEMPORARY DEBUG: Print GitHub token substitution details
-                if self.server_name == "ovr_github" and "GITHUB" in key.upper():
-                    logger.warning(f"🔍 SUBSTITUTION: {key}=${env_var_name} -> '{substituted_value}' (length: {len(substituted_value)})")
-                    logger.warning(f"🔍 os.getenv('{env_var_name}') = '{os.getenv(env_var_name, 'NOT_FOUND')}' (length: {len(os.getenv(env_var_name, ''))})")
-            else:
-                env[key] = str(value)
-        
-        # Note: load_dotenv() is called in _load_config and already modifies os.environ,
-        # so values from .env are implicitly included in os.environ.copy() here.
+        # Start with the system environment (which already includes .env and
+        # secrets.json values) and apply the server's pre-substituted env block
+        env = os.environ.copy()
+        env.update(self._env_overrides)
 
         # Log sensitive environment variables with truncation
         for key, value in env.items(): # Iterate over the final 'env' dictionary
@@ -150,7 +165,8 @@ class BaseMCPClient(ABC):
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env=env
+                env=env,
+                limit=STREAM_READER_LIMIT
             )
             
             # Wait a moment for server to initialize
@@ -170,161 +186,477 @@ class BaseMCPClient(ABC):
                 raise MCPConnectionError(f"MCP server failed to start: {stderr}")
             
             self._process = process
+            self._started_at = time.monotonic()
+            self._requests_served = 0
+            self._server_info = None
             logger.info(f"MCP server '{self.server_name}' started successfully")
             return process
             
         except Exception as e:
             raise MCPConnectionError(f"Failed to start MCP server '{self.server_name}': {e}")
 
-    async def _send_mcp_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Send JSON-RPC request to MCP server using async I/O."""
-        if not self._process:
-            await self._start_server_process()
-        
-        request_id = f"req_{asyncio.current_task().get_name()}_{id(params)}"
-        
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        """Start the server process and its response reader exactly once."""
+        if self._process is not None and self._process.returncode is None:
+            return self._process
+        async with self._start_lock:
+            if self._process is None or self._process.returncode is not None:
+                if self._process is not None:
+                    # Reconnecting: the new process may expose different tools
+                    capability_cache.invalidate(self._capability_key)
+                process = await self._start_server_process()
+                self._stderr_buffer = bytearray()
+                self._stderr_task = asyncio.create_task(
+                    self._drain_stderr(process),
+                    name=f"mcp-stderr-{self.server_name}"
+                )
+                self._reader_task = asyncio.create_task(
+                    self._read_responses(process),
+                    name=f"mcp-reader-{self.server_name}"
+                )
+        return self._process
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Background reader that keeps the most recent stderr output.
+
+        This task is the only reader of the server's stderr pipe, so error
+        paths never race each other for it, and the server never blocks on
+        a full stderr pipe. Output beyond STDERR_BUFFER_LIMIT is discarded
+        oldest first.
+        """
+        if not process.stderr:
+            return
+        try:
+            while True:
+                chunk = await process.stderr.read(4096)
+                if not chunk:
+                    return
+                self._stderr_buffer += chunk
+                if len(self._stderr_buffer) > STDERR_BUFFER_LIMIT:
+                    del self._stderr_buffer[:-STDERR_BUFFER_LIMIT]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Stopped reading stderr of MCP server '{self.server_name}': {e}")
+
+    def _recent_stderr(self) -> str:
+        """Return the tail of the server's stderr output seen so far."""
+        return bytes(self._stderr_buffer[-STDERR_EXCERPT_SIZE:]).decode(errors="replace")
+
+    async def _read_responses(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Background reader that demultiplexes JSON-RPC responses by id.
+
+        Every response frame is routed to the future registered by the
+        request that carries the same id, so many requests can be in flight
+        on a single stdio process. When the stream ends or breaks, every
+        pending request is failed with MCPConnectionError.
+        """
+        decoder = StreamingJSONDecoder(process.stdout, spool_threshold=self.SPOOL_THRESHOLD)
+        error: Optional[Exception] = None
+        try:
+            while True:
+                try:
+                    message = await decoder.decode_frame()
+                except EOFError:
+                    # The server exited; give the stderr reader a moment to
+                    # catch up with its final output.
+                    if self._stderr_task is not None:
+                        await asyncio.wait({self._stderr_task}, timeout=0.5)
+                    stderr_output = self._recent_stderr() or "No stderr output"
+                    error = MCPConnectionError(f"No response from MCP server. Stderr: {stderr_output}")
+                    break
+                except ValueError as e:
+                    logger.warning(f"Ignoring non-JSON output from MCP server '{self.server_name}': {e}")
+                    continue
+
+                request_id = message.get("id") if isinstance(message, dict) else None
+                future = self._pending.pop(request_id, None)
+                if future is None:
+                    logger.debug(f"Ignoring unsolicited MCP message from '{self.server_name}' (id={request_id})")
+                    continue
+                if not future.done():
+                    self._response_sizes[request_id] = decoder.last_frame_size
+                    future.set_result(message)
+        except asyncio.CancelledError:
+            error = MCPConnectionError(f"MCP server '{self.server_name}' connection closed")
+            raise
+        except Exception as e:
+            error = MCPConnectionError(f"MCP communication error: {e}")
+            logger.error(f"MCP reader for '{self.server_name}' failed: {e}")
+        finally:
+            self._fail_pending(error or MCPConnectionError(f"MCP server '{self.server_name}' connection closed"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every outstanding request with the given error."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _send_mcp_request(self, method: str, params: Dict[str, Any],
+                                spool_large_content: bool = False,
+                                timeout: Optional[float] = None,
+                                attempt: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Send JSON-RPC request to MCP server using async I/O.
+
+        Requests are pipelined: each one is tagged with a unique id and
+        awaits its own future, so concurrent callers sharing this client
+        never read each other's responses.
+
+        Args:
+            method: JSON-RPC method name
+            params: JSON-RPC params
+            spool_large_content: Return string values larger than
+                SPOOL_THRESHOLD as SpooledContent instead of str
+            timeout: Seconds to wait for the response (default
+                DEFAULT_TIMEOUT), further capped by the active deadline
+            attempt: Retry attempt number, recorded on the profiling span
+
+        Raises:
+            MCPDeadlineExceeded: The propagated deadline ran out
+            MCPTimeoutError: The server did not answer within timeout
+        """
+        tool = params.get("name") if method == "tools/call" else None
+        with profile_span(f"{self.server_name}.{tool or method}", "mcp", server=self.server_name,
+                          method=method, tool=tool, attempt=attempt) as span:
+            return await self._send_profiled_request(method, params, span, spool_large_content, timeout)
+
+    async def _send_profiled_request(self, method: str, params: Dict[str, Any], span,
+                                     spool_large_content: bool, timeout: Optional[float]) -> Dict[str, Any]:
+        """
+        Body of _send_mcp_request. When profiling, span records bytes sent
+        and received, time spent before the request reached the server
+        (rate limit, process start, stdin backpressure) and time waiting
+        for the response.
+        """
+        queued_at = time.perf_counter()
+        if method == "tools/call":
+            limiter = get_rate_limiter(self.server_name)
+            if limiter is not None and not await limiter.acquire(max_wait=remaining_time()):
+                raise MCPDeadlineExceeded(f"Deadline leaves no time for '{self.server_name}' rate limit")
+
+        timeout = self.DEFAULT_TIMEOUT if timeout is None else timeout
+        remaining = remaining_time()
+        deadline_bound = remaining is not None and remaining <= timeout
+        if deadline_bound:
+            if remaining <= 0:
+                raise MCPDeadlineExceeded(f"Deadline exceeded before sending '{method}' to '{self.server_name}'")
+            timeout = remaining
+
+        process = await self._ensure_started()
+
+        request_id = f"req_{next(self._request_ids)}"
+        self._requests_served += 1
         request = {
             "jsonrpc": "2.0",
             "id": request_id,
             "method": method,
             "params": params
         }
-        
+
         # Log outgoing request
-        logger.debug(f"Sending MCP request: method={method}, params={json.dumps(params)}")
-        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending MCP request: method={method}, params={json.dumps(params)}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         try:
-            # Send request using async write
-            request_json = json.dumps(request) + '\n'
-            self._process.stdin.write(request_json.encode())
-            await self._process.stdin.drain()
-            
-            # Read response using async readline with timeout
+            # write() buffers the whole frame synchronously, so concurrent
+            # requests never interleave on stdin.
+            frame = get_json_codec().dumps_line(request)
+            process.stdin.write(frame)
+            await process.stdin.drain()
+            sent_at = time.perf_counter()
+            if span is not None:
+                span.args["bytes_out"] = len(frame)
+                span.args["queue_wait_ms"] = round((sent_at - queued_at) * 1000, 3)
+
             try:
-                response_line = await asyncio.wait_for(
-                    self._process.stdout.readline(),
-                    timeout=30.0  # 30 second timeout
-                )
+                response = await asyncio.wait_for(future, timeout=timeout)
             except asyncio.TimeoutError:
-                logger.error(f"MCP server '{self.server_name}' response timeout")
-                raise MCPConnectionError(f"MCP server '{self.server_name}' response timeout")
-            
-            if not response_line:
-                # Use timeout for non-blocking stderr read
-                try:
-                    stderr_data = await asyncio.wait_for(
-                        self._process.stderr.read(1024),
-                        timeout=0.5
-                    )
-                    stderr_output = stderr_data.decode() if stderr_data else "No stderr output"
-                except asyncio.TimeoutError:
-                    stderr_output = "No stderr available (timeout)"
-                logger.error(f"No response from MCP server. Stderr: {stderr_output}")
-                raise MCPConnectionError(f"No response from MCP server. Stderr: {stderr_output}")
-            
-            response = json.loads(response_line.decode().strip())
-            
-            # Log incoming response, truncate if large
-            response_str = json.dumps(response)
+                if deadline_bound:
+                    logger.warning(f"MCP server '{self.server_name}' deadline exceeded for '{method}' after {timeout:.1f}s")
+                    raise MCPDeadlineExceeded(f"MCP server '{self.server_name}' deadline exceeded after {timeout:.1f}s")
+                logger.error(f"MCP server '{self.server_name}' response timeout after {timeout:.1f}s")
+                raise MCPTimeoutError(f"MCP server '{self.server_name}' response timeout after {timeout:.1f}s")
+            finally:
+                if span is not None:
+                    span.args["server_ms"] = round((time.perf_counter() - sent_at) * 1000, 3)
+        except (MCPConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            stderr_output = self._recent_stderr() or "No stderr output"
+            logger.error(f"MCP communication error: {e}. Stderr: {stderr_output}")
+            raise MCPConnectionError(f"MCP communication error: {e}. Stderr: {stderr_output}")
+        finally:
+            self._pending.pop(request_id, None)
+            response_size = self._response_sizes.pop(request_id, None)
+            if span is not None and response_size is not None:
+                span.args["bytes_in"] = response_size
+
+        # Log incoming response, truncate if large. Re-serializing a large
+        # response is expensive, so only do it when DEBUG is actually enabled.
+        if logger.isEnabledFor(logging.DEBUG):
+            response_str = json.dumps(response, default=repr)
             if len(response_str) > 500: # Adjust threshold as needed
                 response_str = response_str[:250] + "...[TRUNCATED]..." + response_str[-250:]
             logger.debug(f"Received MCP response: {response_str}")
-            
-            # Check for errors
-            if 'error' in response:
-                error = response['error']
-                # Read any remaining stderr output for more context on the error
-                stderr_output = ""
-                if self._process.stderr:
-                    try:
-                        stderr_data = await asyncio.wait_for(
-                            self._process.stderr.read(1024),
-                            timeout=0.5
-                        )
-                        stderr_output = stderr_data.decode() if stderr_data else ""
-                    except asyncio.TimeoutError:
-                        stderr_output = "stderr unavailable (timeout)"
-
-                error_message = error.get('message', 'Unknown error')
-                if stderr_output:
-                    error_message += f"\nServer Stderr: {stderr_output}"
-
-                logger.error(f"MCP tool error: {error_message}")
-                raise MCPToolError(f"MCP tool error: {error_message}")
-            
-            return response.get('result', {})
-            
-        except json.JSONDecodeError as e:
-            # Read any remaining stderr output for more context on the error
-            try:
-                stderr_data = await asyncio.wait_for(
-                    self._process.stderr.read(1024),
-                    timeout=0.5
-                )
-                stderr_output = stderr_data.decode() if stderr_data else "No stderr output"
-            except asyncio.TimeoutError:
-                stderr_output = "stderr unavailable (timeout)"
-            logger.error(f"Invalid JSON response from MCP server: {e}. Stderr: {stderr_output}")
-            raise MCPConnectionError(f"Invalid JSON response from MCP server: {e}. Stderr: {stderr_output}")
+
+        # Check for errors
+        if 'error' in response:
+            error = response['error']
+            error_message = error.get('message', 'Unknown error')
+            stderr_output = self._recent_stderr()
+            if stderr_output:
+                error_message += f"\nServer Stderr: {stderr_output}"
+
+            logger.error(f"MCP tool error: {error_message}")
+            raise MCPToolError(f"MCP tool error: {error_message}", code=error.get('code'))
+
+        result = response.get('result', {})
+        if not spool_large_content:
+            result = materialize_spooled(result)
+        return result
+
+    async def _send_mcp_notification(self, method: str, params: Dict[str, Any]) -> None:
+        """Send a JSON-RPC notification (no id, no response expected)."""
+        process = await self._ensure_started()
+        notification = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params
+        }
+        try:
+            process.stdin.write(get_json_codec().dumps_line(notification))
+            await process.stdin.drain()
         except Exception as e:
-            # Read any remaining stderr output for more context on the error
-            try:
-                stderr_data = await asyncio.wait_for(
-                    self._process.stderr.read(1024),
-                    timeout=0.5
-                )
-                stderr_output = stderr_data.decode() if stderr_data else "No stderr output"
-            except asyncio.TimeoutError:
-                stderr_output = "stderr unavailable (timeout)"
-            logger.error(f"MCP communication error: {e}. Stderr: {stderr_output}")
-            raise MCPConnectionError(f"MCP communication error: {e}. Stderr: {stderr_output}")
+            raise MCPConnectionError(f"MCP communication error: {e}")
+
+    async def initialize(self) -> Dict[str, Any]:
+        """
+        Start the server (if needed) and perform the MCP initialize handshake.
+
+        Returns:
+            The server's initialize result (capabilities, serverInfo, ...)
+        """
+        if self._server_info is not None and self.is_alive:
+            return self._server_info
+
+        result = await self._send_mcp_request("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "graphmcp", "version": "0.0.1"}
+        })
+        await self._send_mcp_notification("notifications/initialized", {})
+        self._server_info = result
+        capability_cache.put_server_info(self._capability_key, result)
+        logger.debug(f"Initialized MCP session with '{self.server_name}'")
+        return result
+
+    @property
+    def is_alive(self) -> bool:
+        """True while the server process is running."""
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def requests_served(self) -> int:
+        """Number of requests sent to the current server process."""
+        return self._requests_served
+
+    @property
+    def process_age(self) -> float:
+        """Seconds since the current server process was started (0 if not running)."""
+        if self._started_at is None or not self.is_alive:
+            return 0.0
+        return time.monotonic() - self._started_at
+
+    async def list_tools(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the server's tool descriptors.
+
+        Served from the process-wide capability cache while fresh; a
+        tools/list round trip is only made on a miss, after the TTL expires,
+        after a reconnect, or when force_refresh is set.
+        """
+        capabilities = await self._get_capabilities(force_refresh)
+        return list(capabilities.tools)
+
+    async def _get_capabilities(self, force_refresh: bool = False) -> ServerCapabilities:
+        if self._process is not None and not self.is_alive:
+            # The process died; what it advertised no longer proves anything
+            capability_cache.invalidate(self._capability_key)
+
+        async def fetch() -> List[Dict[str, Any]]:
+            result = await self._send_mcp_request("tools/list", {})
+            return result.get("tools", [])
+
+        return await capability_cache.get_tools(self._capability_key, fetch, force_refresh=force_refresh)
+
+    async def _validate_tool_name(self, tool_name: str) -> None:
+        """
+        Reject unknown tool names without a round trip when tools are cached.
+
+        Nothing is fetched if the tool list is not cached yet. A cached list
+        that lacks the tool is refreshed once before giving up, so tools
+        added by a server upgrade are still found.
+        """
+        cached = capability_cache.get(self._capability_key)
+        if cached is None or cached.has_tool(tool_name):
+            return
+        refreshed = await self._get_capabilities(force_refresh=True)
+        if not refreshed.has_tool(tool_name):
+            raise MCPToolError(
+                f"Tool '{tool_name}' not found on server '{self.server_name}'. "
+                f"Available tools: {refreshed.tool_names}"
+            )
+
+    def tool_timeout(self, tool_name: str) -> float:
+        """
+        Return the per-request timeout for a tool call.
+
+        The configured ceiling (TOOL_TIMEOUTS, else DEFAULT_TIMEOUT) applies
+        until enough latency samples exist; afterwards the timeout tracks
+        the tool's observed p99 latency.
+        """
+        ceiling = self.TOOL_TIMEOUTS.get(tool_name, self.DEFAULT_TIMEOUT)
+        return latency_tracker.timeout_for(self.server_name, tool_name, ceiling)
 
-    async def call_tool_with_retry(self, tool_name: str, params: Dict[str, Any], retry_count: int = 3) -> Any:
+    async def call_tool_with_retry(self, tool_name: str, params: Dict[str, Any], retry_count: int = 3,
+                                   spool_large_content: bool = False) -> Any:
         """
         Call MCP tool with automatic retry on failure.
+
+        Retries use the shared RetryEngine: decorrelated-jitter backoff, a
+        per-server retry budget, server-requested Retry-After waits, and no
+        retries for terminal errors (bad credentials, not found, invalid
+        params). Attempts and backoff sleeps never outlive the deadline
+        propagated via clients.timeouts.deadline_scope.
         
         Args:
             tool_name: Name of the MCP tool to call
             params: Parameters to pass to the tool
             retry_count: Number of retry attempts
+            spool_large_content: Return very large string fields (e.g. packed
+                repository content) as SpooledContent instead of str
             
         Returns:
             Tool execution result
             
         Raises:
+            MCPDeadlineExceeded: If the propagated deadline runs out
             MCPToolError: If tool execution fails after all retries
         """
-        last_error = None
-        
-        for attempt in range(retry_count + 1):
+        await self._validate_tool_name(tool_name)
+
+        attempt_number = 0
+        mcp_params = {
+            "name": tool_name,
+            "arguments": params
+        }
+
+        async def attempt() -> Any:
+            nonlocal attempt_number
+            attempt_number += 1
+            timeout = self.tool_timeout(tool_name)
+            started = time.monotonic()
+            logger.debug(f"Calling tool '{tool_name}' (attempt {attempt_number}/{retry_count + 1}, timeout {timeout:.1f}s)")
             try:
-                logger.debug(f"Calling tool '{tool_name}' (attempt {attempt + 1}/{retry_count + 1})")
-                
-                # Prepare MCP tool call request
-                mcp_params = {
-                    "name": tool_name,
-                    "arguments": params
-                }
-                
-                # Send tool call request
-                result = await self._send_mcp_request("tools/call", mcp_params)
-                
-                logger.debug(f"Tool '{tool_name}' completed successfully")
-                return result
-                
-            except Exception as e:
-                last_error = e
-                if attempt < retry_count:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.warning(f"Tool '{tool_name}' failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Tool '{tool_name}' failed after {retry_count + 1} attempts: {e}")
-        
-        raise MCPToolError(f"Tool '{tool_name}' failed after {retry_count + 1} attempts: {last_error}")
+                result = await self._send_mcp_request(
+                    "tools/call", mcp_params, spool_large_content=spool_large_content, timeout=timeout,
+                    attempt=attempt_number,
+                )
+            except MCPTimeoutError:
+                # Censored sample: lets the p99 estimate grow if the tool slows down
+                latency_tracker.record(self.server_name, tool_name, timeout)
+                raise
+            latency_tracker.record(self.server_name, tool_name, time.monotonic() - started)
+            logger.debug(f"Tool '{tool_name}' completed successfully")
+            return result
+
+        def on_retry(attempt: int, delay: float, error: Exception) -> None:
+            logger.warning(f"Tool '{tool_name}' failed (attempt {attempt}), retrying in {delay:.1f}s: {error}")
+
+        engine = RetryEngine(
+            RetryPolicy(max_attempts=retry_count + 1, max_delay=self.RETRY_MAX_DELAY),
+            budget=get_retry_budget(
+                self.server_name, self.RETRY_BUDGET_CAPACITY, self.RETRY_BUDGET_REFILL_PER_SECOND
+            ),
+        )
+        try:
+            return await engine.run(attempt, remaining_time=remaining_time, on_retry=on_retry)
+        except MCPDeadlineExceeded:
+            logger.error(f"Tool '{tool_name}' exceeded its deadline on attempt {attempt_number}")
+            raise
+        except MCPRetryError as e:
+            if e.reason == "deadline":
+                logger.error(f"Tool '{tool_name}' failed (attempt {e.attempts}) with no deadline budget left to retry: {e.last_error}")
+                raise MCPDeadlineExceeded(
+                    f"Tool '{tool_name}' failed after {e.attempts} attempts, deadline leaves no time to retry: {e.last_error}"
+                ) from e.last_error
+            logger.error(f"Tool '{tool_name}' failed after {e.attempts} attempts ({e.reason}): {e.last_error}")
+            raise MCPToolError(f"Tool '{tool_name}' failed after {e.attempts} attempts: {e.last_error}") from e.last_error
+        except Exception as e:
+            logger.error(f"Tool '{tool_name}' failed with non-retryable error: {e}")
+            raise
+
+    async def call_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]],
+                               max_concurrency: int = 8, retry_count: int = 3) -> List[Any]:
+        """
+        Call many MCP tools concurrently over this client's server process.
+
+        Each call goes through call_tool_with_retry, so retry semantics are
+        identical to single calls. A failing call does not fail the batch.
+
+        Args:
+            calls: (tool_name, params) pairs
+            max_concurrency: Maximum number of calls in flight at once
+            retry_count: Number of retry attempts per call
+
+        Returns:
+            Results in input order; a call that failed after all retries is
+            represented by its exception (usually MCPToolError) instead.
+        """
+        if not calls:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_call(tool_name: str, params: Dict[str, Any]) -> Any:
+            async with semaphore:
+                return await self.call_tool_with_retry(tool_name, params, retry_count=retry_count)
+
+        logger.debug(f"Calling {len(calls)} tools on '{self.server_name}' (max_concurrency={max_concurrency})")
+        results = await asyncio.gather(
+            *(run_call(tool_name, params) for tool_name, params in calls),
+            return_exceptions=True
+        )
+
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        if failed:
+            logger.warning(f"{failed}/{len(calls)} batched tool calls failed on '{self.server_name}'")
+        return results
 
     async def close(self):
         """Close MCP server connection and cleanup resources."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+        if self._stderr_task:
+            self._stderr_task.cancel()
+            try:
+                await self._stderr_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._stderr_task = None
+        self._fail_pending(MCPConnectionError(f"MCP server '{self.server_name}' connection closed"))
+
         if self._process:
             try:
                 self._process.terminate()
@@ -338,6 +670,7 @@ class BaseMCPClient(ABC):
                 logger.warning(f"Error closing MCP server: {e}")
             finally:
                 self._process = None
+                self._server_info = None
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -34,8 +34,8 @@ class GitHubMCPClient(BaseMCPClient):
     async def list_available_tools(self) -> List[str]:
         """List available GitHub MCP tools."""
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool.get("name") for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.warning(f"Failed to list GitHub tools: {e}")
             return [
@@ -210,18 +210,7 @@ class GitHubMCPClient(BaseMCPClient):
         
         try:
             result = await self.call_tool_with_retry("get_file_contents", params)
-            
-            # Handle different response formats
-            if isinstance(result, str):
-                content = result
-            elif isinstance(result, dict):
-                content = result.get("content", "")
-                # Handle base64 encoded content
-                if result.get("encoding") == "base64":
-                    import base64
-                    content = base64.b64decode(content).decode("utf-8")
-            else:
-                content = str(result)
+            content = self._decode_file_contents(result)
             
             logger.debug(f"Retrieved file contents for {owner}/{repo}/{path}")
             return content
@@ -230,6 +219,60 @@ class GitHubMCPClient(BaseMCPClient):
             logger.error(f"Failed to get file contents {owner}/{repo}/{path}: {e}")
             raise MCPToolError(f"Failed to get file contents: {e}")
 
+    async def get_file_contents_batch(self, owner: str, repo: str, paths: List[str],
+                                      ref: str = None, max_concurrency: int = 8) -> List[Any]:
+        """
+        Get the contents of many files from a repository concurrently.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            paths: File paths in repository
+            ref: Git reference (branch, tag, commit), defaults to default branch
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            List aligned with paths; each entry is the file content as string,
+            or an MCPToolError if that file could not be fetched
+        """
+        calls = []
+        for path in paths:
+            params = {"owner": owner, "repo": repo, "path": path}
+            if ref:
+                params["ref"] = ref
+            calls.append(("get_file_contents", params))
+
+        results = await self.call_tools_batch(calls, max_concurrency=max_concurrency)
+
+        contents = []
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get file contents {owner}/{repo}/{path}: {result}")
+                contents.append(MCPToolError(f"Failed to get file contents: {result}"))
+                continue
+            try:
+                contents.append(self._decode_file_contents(result))
+            except Exception as e:
+                logger.error(f"Failed to decode file contents {owner}/{repo}/{path}: {e}")
+                contents.append(MCPToolError(f"Failed to get file contents: {e}"))
+
+        logger.debug(f"Retrieved {len(paths)} file contents for {owner}/{repo}")
+        return contents
+
+    @staticmethod
+    def _decode_file_contents(result: Any) -> str:
+        """Normalize the different get_file_contents response formats to a string."""
+        if isinstance(result, str):
+            return result
+        if isinstance(result, dict):
+            content = result.get("content", "")
+            # Handle base64 encoded content
+            if result.get("encoding") == "base64":
+                import base64
+                content = base64.b64decode(content).decode("utf-8")
+            return content
+        return str(result)
+
     async def create_or_update_file(self, owner: str, repo: str, path: str, 
                                   content: str, message: str, branch: str = None,
                                   sha: str = None) -> Dict[str, Any]:
@@ -263,20 +306,7 @@ class GitHubMCPClient(BaseMCPClient):
         
         try:
             result = await self.call_tool_with_retry("create_or_update_file", params)
-            
-            update_result = {
-                "success": True,
-                "owner": owner,
-                "repo": repo,
-                "path": path,
-                "branch": branch or "main",
-                "commit_sha": result.get("commit", {}).get("sha"),
-                "commit_url": result.get("commit", {}).get("html_url")
-            }
-            
-            ensure_serializable(update_result)
-            logger.info(f"Updated file {path} in {owner}/{repo}")
-            return update_result
+            return self._format_update_result(owner, repo, path, branch, result)
             
         except Exception as e:
             logger.error(f"Failed to update file {owner}/{repo}/{path}: {e}")
@@ -288,6 +318,75 @@ class GitHubMCPClient(BaseMCPClient):
                 "error": str(e)
             }
 
+    async def create_or_update_files(self, owner: str, repo: str,
+                                     files: List[Dict[str, Any]], branch: str = None,
+                                     max_concurrency: int = 1) -> List[Dict[str, Any]]:
+        """
+        Create or update many files in the repository as one batch.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            files: Dicts with "path", "content", "message" and optional "sha"
+            branch: Target branch (optional)
+            max_concurrency: Maximum number of commits in flight at once.
+                Every file becomes its own commit on the branch, and parallel
+                commits race on the branch head (409 conflicts that drain the
+                retry budget), so the default commits serially.
+            
+        Returns:
+            One result per file, in input order, shaped like create_or_update_file()
+        """
+        calls = []
+        for file_spec in files:
+            params = {
+                "owner": owner,
+                "repo": repo,
+                "path": file_spec["path"],
+                "content": file_spec["content"],
+                "message": file_spec["message"]
+            }
+            if branch:
+                params["branch"] = branch
+            if file_spec.get("sha"):
+                params["sha"] = file_spec["sha"]
+            calls.append(("create_or_update_file", params))
+
+        results = await self.call_tools_batch(calls, max_concurrency=max_concurrency)
+
+        update_results = []
+        for file_spec, result in zip(files, results):
+            path = file_spec["path"]
+            if isinstance(result, Exception):
+                logger.error(f"Failed to update file {owner}/{repo}/{path}: {result}")
+                update_results.append({
+                    "success": False,
+                    "owner": owner,
+                    "repo": repo,
+                    "path": path,
+                    "error": str(result)
+                })
+            else:
+                update_results.append(self._format_update_result(owner, repo, path, branch, result))
+        return update_results
+
+    def _format_update_result(self, owner: str, repo: str, path: str,
+                              branch: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the create_or_update_file result dict from a raw tool result."""
+        update_result = {
+            "success": True,
+            "owner": owner,
+            "repo": repo,
+            "path": path,
+            "branch": branch or "main",
+            "commit_sha": result.get("commit", {}).get("sha"),
+            "commit_url": result.get("commit", {}).get("html_url")
+        }
+        
+        ensure_serializable(update_result)
+        logger.info(f"Updated file {path} in {owner}/{repo}")
+        return update_result
+
     async def create_pull_request(self, owner: str, repo: str, title: str, 
                                 head: str, base: str, body: str = "",
                                 draft: bool = False) -> Dict[str, Any]:
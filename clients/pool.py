@@ -0,0 +1,338 @@
+"""
+Warm MCP server process pool.
+
+Cold-starting npx-based MCP servers costs seconds per client. MCPServerPool
+keeps a set of pre-spawned, initialized client processes per server name
+(as configured in mcp_config.json) and hands them out with async
+checkout/checkin, recycling processes after a request or age budget and
+replacing ones that die or fail their health check.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Type
+
+from utils.config_snapshot import get_config_snapshot, get_config_snapshot_async
+from .base import BaseMCPClient, MCPConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+def find_client_class(server_name: str) -> Optional[Type[BaseMCPClient]]:
+    """Find the BaseMCPClient subclass whose SERVER_NAME matches server_name."""
+    import clients  # noqa: F401 - make sure all built-in clients are registered
+
+    pending = list(BaseMCPClient.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if getattr(cls, "SERVER_NAME", None) == server_name:
+            return cls
+        pending.extend(cls.__subclasses__())
+    return None
+
+
+class _ServerSlots:
+    """Idle clients and live-process accounting for one server name."""
+
+    def __init__(self):
+        self.idle: Deque[BaseMCPClient] = deque()
+        self.size = 0
+        self.changed = asyncio.Condition()
+
+
+class MCPServerPool:
+    """
+    Process-wide pool of warm MCP server processes keyed by server name.
+
+    Usage:
+        pool = MCPServerPool("mcp_config.json", min_size=2)
+        await pool.start(["ovr_github", "ovr_repomix"])
+
+        async with pool.client("ovr_github") as github:
+            await github.get_file_contents(owner, repo, "README.md")
+
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path,
+        min_size: int = 1,
+        max_size: int = 4,
+        max_requests: int = 1000,
+        max_age_seconds: float = 1800.0,
+        health_check_interval: float = 60.0,
+        client_classes: Optional[Dict[str, Type[BaseMCPClient]]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            config_path: Path to MCP configuration file
+            min_size: Processes kept warm per server after start(); retired
+                processes of started servers are replaced in the background
+            max_size: Maximum live processes per server
+            max_requests: Recycle a process after serving this many requests
+            max_age_seconds: Recycle a process after it has run this long
+            health_check_interval: Run health_check() on checkout when a
+                process has been idle for longer than this many seconds
+            client_classes: Optional explicit server name -> client class map
+        """
+        if min_size > max_size:
+            raise ValueError("min_size cannot exceed max_size")
+
+        self.config_path = Path(config_path)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_requests = max_requests
+        self.max_age_seconds = max_age_seconds
+        self.health_check_interval = health_check_interval
+        self._client_classes: Dict[str, Type[BaseMCPClient]] = dict(client_classes or {})
+        self._slots: Dict[str, _ServerSlots] = {}
+        self._idle_since: Dict[int, float] = {}
+        # Servers warmed by start(), kept at min_size processes
+        self._warm_servers: Set[str] = set()
+        self._refills: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def _get_slots(self, server_name: str) -> _ServerSlots:
+        if server_name not in self._slots:
+            self._slots[server_name] = _ServerSlots()
+        return self._slots[server_name]
+
+    def _client_class(self, server_name: str) -> Type[BaseMCPClient]:
+        if server_name not in self._client_classes:
+            cls = find_client_class(server_name)
+            if cls is None:
+                raise MCPConnectionError(f"No MCP client class registered for server '{server_name}'")
+            self._client_classes[server_name] = cls
+        return self._client_classes[server_name]
+
+    def configured_servers(self) -> List[str]:
+        """List server names from the shared config snapshot that have a known client class."""
+        return self._with_client_class(get_config_snapshot(self.config_path).server_names())
+
+    def _with_client_class(self, server_names: Iterable[str]) -> List[str]:
+        names = []
+        for name in server_names:
+            try:
+                self._client_class(name)
+                names.append(name)
+            except MCPConnectionError:
+                logger.debug(f"Skipping server '{name}': no client class")
+        return names
+
+    async def start(self, server_names: Optional[Iterable[str]] = None) -> None:
+        """
+        Pre-spawn and initialize min_size processes per server.
+
+        Args:
+            server_names: Servers to warm; defaults to every configured server
+                with a known client class.
+        """
+        if server_names is not None:
+            names = list(server_names)
+        else:
+            snapshot = await get_config_snapshot_async(self.config_path)
+            names = self._with_client_class(snapshot.server_names())
+        warmups = []
+        for name in names:
+            self._warm_servers.add(name)
+            slots = self._get_slots(name)
+            missing = max(0, self.min_size - slots.size)
+            slots.size += missing
+            warmups.extend(self._warm_one(name) for _ in range(missing))
+
+        results = await asyncio.gather(*warmups, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        for failure in failures:
+            logger.warning(f"MCP pool warm-up failed: {failure}")
+        logger.info(f"MCP server pool warmed {len(results) - len(failures)}/{len(results)} processes")
+
+    async def _warm_one(self, server_name: str) -> None:
+        """Spawn a process for an already-reserved slot and park it as idle."""
+        slots = self._get_slots(server_name)
+        try:
+            client = await self._spawn(server_name)
+        except Exception:
+            async with slots.changed:
+                slots.size -= 1
+                slots.changed.notify()
+            raise
+        if self._closed:
+            await self._retire(client)
+            return
+        async with slots.changed:
+            self._idle_since[id(client)] = time.monotonic()
+            slots.idle.append(client)
+            slots.changed.notify()
+
+    def _schedule_refill(self, server_name: str) -> None:
+        """Spawn processes in the background until a started server has min_size again."""
+        if self._closed or server_name not in self._warm_servers:
+            return
+        slots = self._get_slots(server_name)
+        missing = self.min_size - slots.size
+        if missing <= 0:
+            return
+        slots.size += missing
+        for _ in range(missing):
+            task = asyncio.create_task(self._refill_one(server_name), name=f"mcp-pool-refill-{server_name}")
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _refill_one(self, server_name: str) -> None:
+        try:
+            await self._warm_one(server_name)
+        except Exception as e:
+            logger.warning(f"MCP pool refill for '{server_name}' failed: {e}")
+
+    async def _spawn(self, server_name: str) -> BaseMCPClient:
+        client = self._client_class(server_name)(self.config_path)
+        try:
+            await client.initialize()
+        except Exception:
+            await client.close()
+            raise
+        logger.debug(f"Spawned pooled MCP server '{server_name}'")
+        return client
+
+    def _is_expired(self, client: BaseMCPClient) -> bool:
+        return (client.requests_served >= self.max_requests
+                or client.process_age >= self.max_age_seconds)
+
+    async def _is_usable(self, client: BaseMCPClient) -> bool:
+        if not client.is_alive or self._is_expired(client):
+            return False
+        idle_for = time.monotonic() - self._idle_since.get(id(client), time.monotonic())
+        if idle_for >= self.health_check_interval:
+            try:
+                return await client.health_check()
+            except Exception as e:
+                logger.warning(f"Pooled MCP server '{client.server_name}' health check raised: {e}")
+                return False
+        return True
+
+    async def _retire(self, client: BaseMCPClient) -> None:
+        slots = self._get_slots(client.server_name)
+        self._idle_since.pop(id(client), None)
+        try:
+            await client.close()
+        finally:
+            async with slots.changed:
+                slots.size -= 1
+                slots.changed.notify()
+            self._schedule_refill(client.server_name)
+
+    async def checkout(self, server_name: str) -> BaseMCPClient:
+        """
+        Take a warm, healthy client for server_name, spawning one if needed.
+
+        Waits when max_size processes for this server are already checked out.
+        """
+        if self._closed:
+            raise MCPConnectionError("MCP server pool is closed")
+
+        slots = self._get_slots(server_name)
+        while True:
+            client = None
+            async with slots.changed:
+                while not slots.idle and slots.size >= self.max_size:
+                    await slots.changed.wait()
+                if slots.idle:
+                    client = slots.idle.popleft()
+                else:
+                    slots.size += 1
+
+            if client is None:
+                try:
+                    return await self._spawn(server_name)
+                except Exception:
+                    async with slots.changed:
+                        slots.size -= 1
+                        slots.changed.notify()
+                    raise
+
+            if await self._is_usable(client):
+                self._idle_since.pop(id(client), None)
+                return client
+
+            logger.info(f"Replacing pooled MCP server '{server_name}' "
+                        f"(alive={client.is_alive}, requests={client.requests_served})")
+            await self._retire(client)
+
+    async def checkin(self, client: BaseMCPClient, discard: bool = False) -> None:
+        """
+        Return a client to the pool.
+
+        Args:
+            client: Client previously obtained from checkout()
+            discard: Close the process instead of reusing it
+        """
+        if discard or self._closed or not client.is_alive or self._is_expired(client):
+            await self._retire(client)
+            return
+
+        slots = self._get_slots(client.server_name)
+        async with slots.changed:
+            self._idle_since[id(client)] = time.monotonic()
+            slots.idle.append(client)
+            slots.changed.notify()
+
+    @asynccontextmanager
+    async def client(self, server_name: str):
+        """Context manager wrapper around checkout()/checkin()."""
+        client = await self.checkout(server_name)
+        failed = False
+        try:
+            yield client
+        except MCPConnectionError:
+            failed = True
+            raise
+        finally:
+            await self.checkin(client, discard=failed)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Live and idle process counts per server."""
+        return {
+            name: {"live": slots.size, "idle": len(slots.idle)}
+            for name, slots in self._slots.items()
+        }
+
+    async def close(self) -> None:
+        """Close every idle process; checked-out ones are closed on checkin."""
+        self._closed = True
+        # Refills in progress retire their process once it has started
+        if self._refills:
+            await asyncio.gather(*self._refills, return_exceptions=True)
+        for slots in self._slots.values():
+            while slots.idle:
+                await self._retire(slots.idle.popleft())
+        logger.info("MCP server pool closed")
+
+
+_server_pool: Optional[MCPServerPool] = None
+
+
+def set_server_pool(pool: Optional[MCPServerPool]) -> None:
+    """Install (or clear) the process-wide MCP server pool."""
+    global _server_pool
+    _server_pool = pool
+
+
+def get_server_pool(config_path: str | Path | None = None) -> Optional[MCPServerPool]:
+    """
+    Return the process-wide pool, if one is installed.
+
+    When config_path is given, the pool is only returned if it was built
+    from the same configuration file.
+    """
+    if _server_pool is None or _server_pool._closed:
+        return None
+    if config_path is not None and Path(config_path).resolve() != _server_pool.config_path.resolve():
+        return None
+    return _server_pool
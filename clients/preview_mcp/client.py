@@ -110,8 +110,8 @@ class PreviewMCPClient(BaseMCPClient):
             List of available tool names
         """
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool["name"] for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.error(f"Failed to list tools: {e}")
             return [
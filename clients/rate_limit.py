@@ -0,0 +1,82 @@
+"""
+Per-server call rate limits for MCP tool calls.
+
+Limits are process-wide and keyed by server name, so every client of a
+server (pooled or not, across concurrently running workflows) draws from the
+same token bucket. BaseMCPClient acquires a token before each tools/call.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing ``rate`` calls per second with bursts up to ``burst``.
+
+    Waiters sleep until a token is available; tokens are handed out in the
+    order acquire() calls reach the front of the bucket.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if necessary.
+
+        Args:
+            max_wait: Give up (without consuming a token) if the wait would be
+                longer than this many seconds; None waits indefinitely
+
+        Returns:
+            True once a token was taken, False if max_wait was too short
+        """
+        self._refill()
+        # Reserve a token now (tokens may go negative) so concurrent waiters queue fairly
+        wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        if max_wait is not None and wait > max_wait:
+            return False
+        self._tokens -= 1
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+_rate_limiters: Dict[str, AsyncRateLimiter] = {}
+
+
+def set_rate_limit(server_name: str, calls_per_second: Optional[float],
+                   burst: Optional[float] = None) -> Optional[AsyncRateLimiter]:
+    """
+    Limit tools/call requests to a server; None or 0 removes the limit.
+
+    Returns:
+        The installed limiter, or None when the limit was removed
+    """
+    if not calls_per_second:
+        _rate_limiters.pop(server_name, None)
+        return None
+    limiter = _rate_limiters[server_name] = AsyncRateLimiter(calls_per_second, burst)
+    return limiter
+
+
+def get_rate_limiter(server_name: str) -> Optional[AsyncRateLimiter]:
+    """Return the limiter installed for server_name, if any."""
+    return _rate_limiters.get(server_name)
@@ -0,0 +1,147 @@
+"""
+MCP Client Registry
+
+Holds connected MCP clients by (config file, server name) so every user of
+a server shares one client: MCP tool steps in Workflow.execute, custom
+steps going through WorkflowContext.get_client() (e.g. the
+initialize_*_client helpers of the db decommission workflow), and later
+workflows run with the same registry. The registry's lifetime is
+independent of any single workflow run: clients stay connected until
+close() is called.
+
+When a warm MCPServerPool for the same config file is installed, clients
+are checked out of it and returned on close(); otherwise they are created
+directly and closed on close(). A client whose server process died
+restarts it on its next request, so entries never need replacing.
+
+A registry is bound to the event loop its clients were created on.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+from .base import BaseMCPClient
+from .pool import find_client_class, get_server_pool
+
+logger = logging.getLogger(__name__)
+
+_RegistryKey = Tuple[str, str]
+
+
+def _registry_key(config_path: str | Path, server_name: str) -> _RegistryKey:
+    return (str(Path(config_path).resolve()), server_name)
+
+
+class MCPClientRegistry:
+    """
+    Shared MCP clients keyed by config file and server name.
+
+    Usage:
+        registry = MCPClientRegistry()
+        workflow_a.client_registry = registry
+        workflow_b.client_registry = registry
+        await workflow_a.execute()
+        await workflow_b.execute()  # reuses workflow_a's server processes
+        await registry.close()
+    """
+
+    def __init__(self):
+        self._clients: Dict[_RegistryKey, BaseMCPClient] = {}
+        self._pooled: Set[_RegistryKey] = set()
+        self._locks: Dict[_RegistryKey, asyncio.Lock] = {}
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, client: BaseMCPClient) -> bool:
+        return any(held is client for held in self._clients.values())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get(self, server_name: str, config_path: str | Path) -> Optional[BaseMCPClient]:
+        """Return the client for server_name if one has been acquired."""
+        return self._clients.get(_registry_key(config_path, server_name))
+
+    async def acquire(self, server_name: str, config_path: str | Path,
+                      client_class: Optional[Type[BaseMCPClient]] = None) -> BaseMCPClient:
+        """
+        Return the shared client for server_name, creating it on first use.
+
+        Args:
+            server_name: MCP server name from the config file
+            config_path: Path to the MCP configuration file
+            client_class: Client class to instantiate; looked up by
+                SERVER_NAME when omitted
+
+        Raises:
+            RuntimeError: The registry has been closed
+            ValueError: No client class is known for server_name
+        """
+        key = _registry_key(config_path, server_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        if self._closed:
+            raise RuntimeError("MCP client registry is closed")
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            client = self._clients.get(key)
+            if client is not None:
+                return client
+            pool = get_server_pool(config_path)
+            if pool is not None:
+                client = await pool.checkout(server_name)
+                self._pooled.add(key)
+            else:
+                client_class = client_class or find_client_class(server_name)
+                if client_class is None:
+                    raise ValueError(f"No MCP client class registered for server '{server_name}'")
+                client = client_class(config_path)
+            self._clients[key] = client
+            logger.debug(f"Registered MCP client for '{server_name}'")
+            return client
+
+    def clients(self) -> List[BaseMCPClient]:
+        return list(self._clients.values())
+
+    async def close(self) -> None:
+        """Return pooled clients to the pool and close the others."""
+        self._closed = True
+        clients, self._clients = self._clients, {}
+        pooled, self._pooled = self._pooled, set()
+        for key, client in clients.items():
+            server_name = key[1]
+            try:
+                pool = get_server_pool(key[0]) if key in pooled else None
+                if pool is not None:
+                    await pool.checkin(client)
+                    logger.debug(f"Returned MCP client to pool: {server_name}")
+                else:
+                    await client.close()
+                    logger.debug(f"Closed MCP client: {server_name}")
+            except Exception as e:
+                logger.warning(f"Error closing MCP client {server_name}: {e}")
+
+
+_client_registry: Optional[MCPClientRegistry] = None
+
+
+def set_client_registry(registry: Optional[MCPClientRegistry]) -> None:
+    """Install (or clear) the process-wide client registry used by workflows."""
+    global _client_registry
+    _client_registry = registry
+
+
+def get_client_registry() -> Optional[MCPClientRegistry]:
+    """Return the process-wide client registry, if one is installed and open."""
+    if _client_registry is None or _client_registry.closed:
+        return None
+    return _client_registry
@@ -6,14 +6,79 @@ Enables AI assistants to interact with code repositories efficiently
 through repository packaging and analysis tools.
 """
 
+import asyncio
 import logging
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from utils import ensure_serializable
 from .base import BaseMCPClient, MCPToolError
+from .stream_decoder import SpooledContent, materialize_spooled
 
 logger = logging.getLogger(__name__)
 
+
+def _spooled_fields(value: Any, found: List[tuple]) -> List[tuple]:
+    """Collect (container, key) of every SpooledContent inside a decoded result."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return found
+    for key, item in items:
+        if isinstance(item, SpooledContent):
+            found.append((value, key))
+        else:
+            _spooled_fields(item, found)
+    return found
+
+
+async def save_spooled_output(result: Any, output_file: Optional[str] = None) -> Optional[str]:
+    """
+    Stream the packed output held as SpooledContent in a pack tool result to
+    a file, without materializing it as str.
+
+    The largest spooled value is taken to be the packed output and is
+    replaced by the file path; any other spooled values are materialized in
+    place so the result can be serialized. The copy runs in a worker thread,
+    so a large pack does not stall other requests on the event loop.
+
+    Args:
+        result: Raw tool result, as returned with spool_large_content=True
+        output_file: Where to write the output (a temporary file by default)
+
+    Returns:
+        Path of the written file, or None if nothing was spooled
+    """
+    return await asyncio.to_thread(_save_spooled_output, result, output_file)
+
+
+def _save_spooled_output(result: Any, output_file: Optional[str]) -> Optional[str]:
+    fields = _spooled_fields(result, [])
+    if not fields:
+        return None
+
+    container, key = max(fields, key=lambda field: len(field[0][field[1]]))
+    spooled = container[key]
+    if output_file:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        target = open(output_file, "wb")
+    else:
+        fd, output_file = tempfile.mkstemp(prefix="repomix-", suffix=".xml")
+        target = os.fdopen(fd, "wb")
+    try:
+        with target:
+            shutil.copyfileobj(spooled.open(), target)
+    finally:
+        spooled.close()
+    container[key] = output_file
+    materialize_spooled(result)
+    logger.debug(f"Streamed {len(spooled)} bytes of packed output to {output_file}")
+    return output_file
+
 class RepomixMCPClient(BaseMCPClient):
     """
     Specialized MCP client for Repomix server operations.
@@ -22,6 +87,11 @@ class RepomixMCPClient(BaseMCPClient):
     for efficient AI analysis and processing.
     """
     SERVER_NAME = "ovr_repomix"
+    # Packing a large repository routinely takes minutes
+    TOOL_TIMEOUTS = {
+        "pack_codebase": 300.0,
+        "pack_remote_repository": 300.0,
+    }
     
     def __init__(self, config_path: str | Path):
         """
@@ -35,8 +105,8 @@ class RepomixMCPClient(BaseMCPClient):
     async def list_available_tools(self) -> List[str]:
         """List available Repomix MCP tools."""
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool.get("name") for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.warning(f"Failed to list Repomix tools: {e}")
             return [
@@ -72,12 +142,13 @@ class RepomixMCPClient(BaseMCPClient):
             params["exclude"] = exclude_patterns
         
         try:
-            result = await self.call_tool_with_retry("pack_codebase", params)
+            result = await self.call_tool_with_retry("pack_codebase", params, spool_large_content=True)
+            spooled_file = await save_spooled_output(result, output_file)
             
             pack_result = {
                 "success": True,
                 "directory_path": directory_path,
-                "output_file": result.get("output_file"),
+                "output_file": result.get("output_file") or spooled_file,
                 "files_packed": result.get("files_packed", 0),
                 "total_size": result.get("total_size", 0),
                 "excluded_files": result.get("excluded_files", []),
@@ -140,7 +211,10 @@ class RepomixMCPClient(BaseMCPClient):
         
         try:
             logger.info(f"🔍 DEBUG: Calling pack_remote_repository with params: {params}")
-            result = await self.call_tool_with_retry("pack_remote_repository", params)
+            # Packed repositories can be huge: spool them and stream them to a
+            # file instead of holding the whole pack as str
+            result = await self.call_tool_with_retry("pack_remote_repository", params, spool_large_content=True)
+            spooled_file = await save_spooled_output(result, output_file)
             
             # Debug: Log the raw MCP response
             logger.info(f"🔍 DEBUG: Raw MCP response: {result}")
@@ -151,7 +225,7 @@ class RepomixMCPClient(BaseMCPClient):
             pack_result = {
                 "success": mcp_success,
                 "repository_url": repo_url,
-                "output_file": result.get("output_file"),
+                "output_file": result.get("output_file") or spooled_file,
                 "files_packed": result.get("files_packed", 0),
                 "total_size": result.get("total_size", 0),
                 "branch": result.get("branch"),
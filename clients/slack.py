@@ -35,8 +35,8 @@ class SlackMCPClient(BaseMCPClient):
     async def list_available_tools(self) -> List[str]:
         """List available Slack MCP tools."""
         try:
-            result = await self._send_mcp_request("tools/list", {})
-            return [tool.get("name") for tool in result.get("tools", [])]
+            tools = await self.list_tools()
+            return [tool.get("name") for tool in tools]
         except Exception as e:
             logger.warning(f"Failed to list Slack tools: {e}")
             return [
@@ -0,0 +1,364 @@
+"""
+Streaming JSON-RPC frame decoder for MCP stdio transports.
+
+MCP servers speak line-delimited JSON-RPC. Most frames are small and are
+decoded in one go with the shared JSON codec. Frames larger than the spool threshold
+(e.g. pack_remote_repository on a big monorepo) are parsed incrementally
+straight off the stream, and any string value larger than the threshold is
+written to a SpooledTemporaryFile instead of being materialized as a str.
+"""
+
+import asyncio
+import re
+import tempfile
+from typing import Any, BinaryIO, Optional
+
+from utils.json_codec import JSONCodec, get_json_codec
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+_WHITESPACE = b" \t\r"
+_NUMBER_CHARS = frozenset(b"0123456789+-.eE")
+_STRING_RUN = re.compile(rb'[^"\\\n]+')
+_ESCAPES = {
+    ord('"'): b'"',
+    ord("\\"): b"\\",
+    ord("/"): b"/",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+}
+
+
+class SpooledContent:
+    """
+    A large JSON string value kept as UTF-8 bytes in a spooled temp file.
+
+    Small spools stay in memory; large ones roll over to disk. Use open()
+    for file access, getbuffer() for a zero-copy memoryview of in-memory
+    data, or text() to explicitly materialize a str.
+    """
+
+    def __init__(self, spool: tempfile.SpooledTemporaryFile, size: int):
+        self._spool = spool
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"SpooledContent(size={self.size})"
+
+    def open(self) -> BinaryIO:
+        """Return the underlying binary file, rewound to the start."""
+        self._spool.seek(0)
+        return self._spool
+
+    def getbuffer(self) -> memoryview:
+        """Return a memoryview over the UTF-8 bytes (reads into memory if spooled to disk)."""
+        if not getattr(self._spool, "_rolled", True):
+            return self._spool._file.getbuffer()
+        return memoryview(self.read_bytes())
+
+    def read_bytes(self) -> bytes:
+        """Return the UTF-8 bytes."""
+        return self.open().read()
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Materialize the value as a str."""
+        return self.read_bytes().decode(encoding, errors="surrogatepass")
+
+    def close(self) -> None:
+        self._spool.close()
+
+
+def materialize_spooled(value: Any) -> Any:
+    """Replace every SpooledContent inside a decoded JSON value with its str."""
+    if isinstance(value, SpooledContent):
+        text = value.text()
+        value.close()
+        return text
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = materialize_spooled(item)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            value[index] = materialize_spooled(item)
+    return value
+
+
+class StreamingJSONDecoder:
+    """
+    Decode newline-delimited JSON frames from an asyncio StreamReader.
+
+    Frames up to spool_threshold bytes are decoded with the JSON codec
+    straight from bytes, so no intermediate str is built. Longer frames are
+    parsed incrementally and string values longer than spool_threshold
+    are returned as SpooledContent.
+    """
+
+    def __init__(self, stream: asyncio.StreamReader,
+                 spool_threshold: Optional[int] = 8 * 1024 * 1024,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 codec: Optional[JSONCodec] = None):
+        self._stream = stream
+        self._codec = codec or get_json_codec()
+        self._buf = bytearray()
+        self._pos = 0
+        self._dropped = 0  # bytes compacted off the front of the buffer
+        self._pin: Optional[int] = None  # absolute offset compaction must keep
+        self._eof = False
+        self.spool_threshold = spool_threshold
+        self.chunk_size = chunk_size
+        self.last_frame_size = 0
+
+    # -- buffer management -------------------------------------------------
+
+    async def _fill(self) -> bool:
+        """Read another chunk into the buffer; False at EOF."""
+        if self._eof:
+            return False
+        chunk = await self._stream.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        cut = self._pos if self._pin is None else min(self._pos, self._pin - self._dropped)
+        if cut and cut > len(self._buf) // 2:
+            del self._buf[:cut]
+            self._dropped += cut
+            self._pos -= cut
+        self._buf += chunk
+        return True
+
+    async def _peek(self) -> Optional[int]:
+        while self._pos >= len(self._buf):
+            if not await self._fill():
+                return None
+        return self._buf[self._pos]
+
+    async def _next(self) -> int:
+        byte = await self._peek()
+        if byte is None:
+            raise ValueError("Unexpected end of stream inside JSON value")
+        self._pos += 1
+        return byte
+
+    async def _skip_whitespace(self) -> Optional[int]:
+        while True:
+            byte = await self._peek()
+            if byte is None or byte not in _WHITESPACE:
+                return byte
+            self._pos += 1
+
+    async def _skip_line(self) -> None:
+        """Discard input up to and including the next newline (resync after errors)."""
+        while True:
+            newline = self._buf.find(b"\n", self._pos)
+            if newline != -1:
+                self._pos = newline + 1
+                return
+            self._pos = len(self._buf)
+            if not await self._fill():
+                return
+
+    # -- frame decoding ------------------------------------------------------
+
+    async def decode_frame(self) -> Any:
+        """
+        Decode the next frame.
+
+        Raises:
+            EOFError: The stream ended before another frame started
+            ValueError: The frame was not valid JSON (the stream is resynced
+                to the following line, so decoding can continue)
+        """
+        # Skip blank lines between frames
+        while True:
+            byte = await self._skip_whitespace()
+            if byte is None:
+                raise EOFError("MCP stream closed")
+            if byte != ord("\n"):
+                break
+            self._pos += 1
+
+        start_abs = self._pos + self._dropped
+        scanned_abs = start_abs
+        while True:
+            start = start_abs - self._dropped
+            newline = self._buf.find(b"\n", scanned_abs - self._dropped)
+            if newline != -1:
+                frame = self._buf[start:newline]
+                self._pos = newline + 1
+                self.last_frame_size = len(frame)
+                return self._codec.loads(frame)
+            scanned_abs = len(self._buf) + self._dropped
+            if self.spool_threshold is not None and scanned_abs - start_abs > self.spool_threshold:
+                return await self._decode_incremental(start)
+            if not await self._fill():
+                # Final frame without trailing newline
+                frame = self._buf[start:]
+                self._pos = len(self._buf)
+                if not frame.strip():
+                    raise EOFError("MCP stream closed")
+                self.last_frame_size = len(frame)
+                return self._codec.loads(frame)
+
+    async def _decode_incremental(self, start: int) -> Any:
+        """Parse an oversized frame value by value, spooling large strings."""
+        self._pos = start
+        frame_start_abs = start + self._dropped
+        try:
+            value = await self._parse_value()
+            byte = await self._skip_whitespace()
+            if byte is not None and byte != ord("\n"):
+                raise ValueError(f"Extra data after JSON value: {bytes([byte])!r}")
+            if byte is not None:
+                self._pos += 1
+        except ValueError:
+            await self._skip_line()
+            raise
+        self.last_frame_size = self._pos + self._dropped - frame_start_abs
+        return value
+
+    async def _parse_value(self) -> Any:
+        byte = await self._skip_whitespace()
+        if byte is None:
+            raise ValueError("Unexpected end of stream inside JSON value")
+        if byte == ord("{"):
+            return await self._parse_object()
+        if byte == ord("["):
+            return await self._parse_array()
+        if byte == ord('"'):
+            return await self._parse_string(spool=True)
+        if byte in _NUMBER_CHARS:
+            return await self._parse_number()
+        for literal, value in ((b"true", True), (b"false", False), (b"null", None)):
+            if byte == literal[0]:
+                for expected in literal:
+                    if await self._next() != expected:
+                        raise ValueError(f"Invalid literal, expected {literal!r}")
+                return value
+        raise ValueError(f"Unexpected character in JSON: {bytes([byte])!r}")
+
+    async def _parse_object(self) -> dict:
+        self._pos += 1  # '{'
+        result = {}
+        byte = await self._skip_whitespace()
+        if byte == ord("}"):
+            self._pos += 1
+            return result
+        while True:
+            if await self._skip_whitespace() != ord('"'):
+                raise ValueError("Expected string key in JSON object")
+            key = await self._parse_string(spool=False)
+            if await self._skip_whitespace() != ord(":"):
+                raise ValueError("Expected ':' in JSON object")
+            self._pos += 1
+            result[key] = await self._parse_value()
+            byte = await self._skip_whitespace()
+            self._pos += 1
+            if byte == ord("}"):
+                return result
+            if byte != ord(","):
+                raise ValueError("Expected ',' or '}' in JSON object")
+
+    async def _parse_array(self) -> list:
+        self._pos += 1  # '['
+        result = []
+        if await self._skip_whitespace() == ord("]"):
+            self._pos += 1
+            return result
+        while True:
+            result.append(await self._parse_value())
+            byte = await self._skip_whitespace()
+            self._pos += 1
+            if byte == ord("]"):
+                return result
+            if byte != ord(","):
+                raise ValueError("Expected ',' or ']' in JSON array")
+
+    async def _parse_number(self) -> Any:
+        self._pin = start_abs = self._pos + self._dropped
+        try:
+            while True:
+                byte = await self._peek()
+                if byte is None or byte not in _NUMBER_CHARS:
+                    break
+                self._pos += 1
+            return self._codec.loads(self._buf[start_abs - self._dropped:self._pos])
+        finally:
+            self._pin = None
+
+    async def _parse_string(self, spool: bool) -> Any:
+        self._pos += 1  # opening quote
+        out = bytearray()
+        spooled: Optional[tempfile.SpooledTemporaryFile] = None
+        size = 0
+        threshold = self.spool_threshold if spool else None
+
+        def emit(data) -> None:
+            nonlocal spooled, size
+            size += len(data)
+            if spooled is not None:
+                spooled.write(data)
+                return
+            out.extend(data)
+            if threshold is not None and len(out) > threshold:
+                spooled = tempfile.SpooledTemporaryFile(max_size=threshold)
+                spooled.write(out)
+                out.clear()
+
+        while True:
+            if self._pos >= len(self._buf) and not await self._fill():
+                raise ValueError("Unterminated string in JSON")
+            run = _STRING_RUN.match(self._buf, self._pos)
+            if run:
+                emit(memoryview(self._buf)[run.start():run.end()])
+                self._pos = run.end()
+                continue
+            byte = self._buf[self._pos]
+            if byte == ord('"'):
+                self._pos += 1
+                break
+            if byte == ord("\n"):
+                raise ValueError("Unterminated string in JSON")
+            # Backslash escape
+            self._pos += 1
+            escape = await self._next()
+            if escape == ord("u"):
+                emit(await self._parse_unicode_escape())
+            elif escape in _ESCAPES:
+                emit(_ESCAPES[escape])
+            else:
+                raise ValueError(f"Invalid escape in JSON string: \\{chr(escape)}")
+
+        if spooled is not None:
+            return SpooledContent(spooled, size)
+        return out.decode("utf-8", errors="surrogatepass")
+
+    async def _read_hex4(self) -> int:
+        digits = bytes([await self._next() for _ in range(4)])
+        try:
+            return int(digits, 16)
+        except ValueError:
+            raise ValueError(f"Invalid \\u escape: {digits!r}")
+
+    async def _parse_unicode_escape(self) -> bytes:
+        code = await self._read_hex4()
+        if 0xD800 <= code <= 0xDBFF and await self._peek() == ord("\\"):
+            # Possible surrogate pair
+            self._pin = mark_abs = self._pos + self._dropped
+            try:
+                self._pos += 1
+                if await self._peek() == ord("u"):
+                    self._pos += 1
+                    low = await self._read_hex4()
+                    if 0xDC00 <= low <= 0xDFFF:
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        return chr(code).encode("utf-8")
+                self._pos = mark_abs - self._dropped
+            finally:
+                self._pin = None
+        return chr(code).encode("utf-8", errors="surrogatepass")
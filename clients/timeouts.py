@@ -0,0 +1,127 @@
+"""
+Deadline propagation and adaptive per-tool timeouts for MCP calls.
+
+A deadline is an absolute time.monotonic() value kept in a ContextVar, so a
+workflow step can bound every MCP request issued underneath it (including
+ones made from tasks it spawns) without threading a parameter through every
+client method. Nested scopes can only shorten the active deadline.
+
+LatencyTracker keeps a sliding window of observed latencies per
+(server, tool) and derives request timeouts from the p99, so fast tools
+fail fast while slow ones (e.g. repository packing) get the room they need.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+_deadline: ContextVar[Optional[float]] = ContextVar("graphmcp_mcp_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout_seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound all MCP calls made inside the block to timeout_seconds from now.
+
+    Args:
+        timeout_seconds: Budget for the block; None keeps the current deadline
+
+    Yields:
+        The effective absolute deadline (time.monotonic() based), or None
+    """
+    current = _deadline.get()
+    if timeout_seconds is None:
+        yield current
+        return
+
+    deadline = time.monotonic() + timeout_seconds
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Return the active absolute deadline, if any."""
+    return _deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Return seconds left until the active deadline (may be <= 0), or None."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Sliding-window latency statistics used to size request timeouts.
+
+    Until min_samples observations exist for a key the caller's default
+    timeout is used. Afterwards the timeout is p99 * multiplier, clamped to
+    [floor, default]: adaptive timeouts only ever tighten the configured
+    ceiling. Timed-out requests should be recorded with their timeout as a
+    (censored) sample so the estimate can grow when a tool slows down.
+    """
+
+    def __init__(self, window: int = 256, min_samples: int = 20,
+                 multiplier: float = 3.0, floor: float = 2.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.floor = floor
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, server_name: str, tool_name: str, seconds: float) -> None:
+        """Record one observed latency."""
+        key = (server_name, tool_name)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, server_name: str, tool_name: str, q: float = 0.99) -> Optional[float]:
+        """Return the q-th latency percentile (nearest rank), or None with no samples."""
+        with self._lock:
+            samples = self._samples.get((server_name, tool_name))
+            if not samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def sample_count(self, server_name: str, tool_name: str) -> int:
+        with self._lock:
+            return len(self._samples.get((server_name, tool_name), ()))
+
+    def timeout_for(self, server_name: str, tool_name: str, default: float) -> float:
+        """
+        Return the request timeout for a tool.
+
+        Args:
+            server_name: MCP server name
+            tool_name: MCP tool name
+            default: Configured timeout, used while warming up and as the ceiling
+        """
+        if self.sample_count(server_name, tool_name) < self.min_samples:
+            return default
+        p99 = self.percentile(server_name, tool_name)
+        return max(self.floor, min(default, p99 * self.multiplier))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+# Shared by every client instance so pooled processes pool their statistics
+latency_tracker = LatencyTracker()
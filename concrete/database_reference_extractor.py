@@ -5,14 +5,21 @@ Extracts database references from packed repositories using normal grep,
 preserving directory structure during file extraction.
 """
 
+import asyncio
 import re
 import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import os
 import logging
 
+from concrete.pack_index import current_pack_index, find_candidates
+from concrete.parallel_scan import count_matches_parallel, should_scan_in_parallel
+from concrete.token_index import TokenIndex, get_token_index, get_token_index_async
+from utils.profiling import profile_span
+from utils.repomix_pack import PackEntry, RepomixPack
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -62,28 +69,40 @@ class DatabaseReferenceExtractor:
             if not output_dir:
                 output_dir = f"tests/tmp/pattern_match/{database_name}"
             
-            # Read and parse packed repository
-            files = self._parse_repomix_file(target_repo_pack_path)
-            
-            # Find matches using normal grep
+            # Stream candidate files out of the packed repository, or scan
+            # large packs across the process pool; only matched files are
+            # kept in memory
             matched_files = []
             total_references = 0
+            files_scanned = 0
             
-            for file_info in files:
-                matches = self._grep_file_content(file_info['content'], database_name)
-                if matches:
-                    extracted_path = self._extract_file(
-                        file_info, output_dir, database_name
-                    )
-                    
-                    matched_file = MatchedFile(
-                        original_path=file_info['path'],
-                        extracted_path=extracted_path,
-                        content=file_info['content'],
-                        match_count=len(matches)
-                    )
-                    matched_files.append(matched_file)
-                    total_references += len(matches)
+            # Load (or build, off the event loop) the pack's token index first
+            tokens = None
+            if Path(target_repo_pack_path).exists():
+                tokens = await get_token_index_async(target_repo_pack_path)
+            
+            with profile_span("pattern.scan", "cpu", database=database_name, source=target_repo_pack_path) as span:
+                scanned = await self._count_references_in_parallel(target_repo_pack_path, database_name, tokens)
+                if scanned is None:
+                    scanned = self._count_references(target_repo_pack_path, database_name, tokens)
+                for file_info, match_count in scanned:
+                    files_scanned += 1
+                    if match_count:
+                        extracted_path = self._extract_file(
+                            file_info, output_dir, database_name
+                        )
+                        
+                        matched_file = MatchedFile(
+                            original_path=file_info['path'],
+                            extracted_path=extracted_path,
+                            content=file_info['content'],
+                            match_count=match_count
+                        )
+                        matched_files.append(matched_file)
+                        total_references += match_count
+                if span is not None:
+                    span.args["files"] = files_scanned
+                    span.args["matched_files"] = len(matched_files)
             
             return {
                 "database_name": database_name,
@@ -114,37 +133,118 @@ class DatabaseReferenceExtractor:
     
     def _parse_repomix_file(self, file_path: str) -> List[Dict[str, str]]:
         """Parse repomix XML file to extract individual files."""
-        files = []
+        return list(self._iter_repomix_files(file_path))
+    
+    def _iter_repomix_files(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """
+        Yield the files of a repomix XML file one at a time.
+        
+        The pack is memory-mapped and each file's content decoded only when
+        it is reached, so memory stays flat however large the pack is.
+        """
+        if not Path(file_path).exists():
+            self.logger.warning(f"Repomix file does not exist: {file_path}")
+            return
         
+        parsed = 0
         try:
-            # Check if file exists first
-            from pathlib import Path
-            if not Path(file_path).exists():
-                self.logger.warning(f"Repomix file does not exist: {file_path}")
-                return []
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse files using regex pattern: <file path="...">content</file>
-            file_pattern = r'<file path="([^"]+)">\s*\n(.*?)\n</file>'
-            matches = re.findall(file_pattern, content, re.DOTALL)
-            
-            self.logger.info(f"🔍 DEBUG: Found {len(matches)} file matches in XML")
-            
-            for file_path, file_content in matches:
-                files.append({
-                    "path": file_path,
-                    "content": file_content.strip()
-                })
-                self.logger.info(f"🔍 DEBUG: Parsed file {file_path} with {len(file_content)} chars")
-                
-            self.logger.info(f"Parsed {len(files)} files from repomix file")
-            return files
-            
+            with RepomixPack(file_path) as pack:
+                with profile_span("repomix.parse", "cpu", source=file_path, bytes=pack.size):
+                    entries = list(pack)
+                for entry in entries:
+                    parsed += 1
+                    yield {
+                        "path": entry.path,
+                        "content": pack.text(entry).strip()
+                    }
         except Exception as e:
             self.logger.error(f"Error parsing repomix file {file_path}: {e}")
-            return []
+            return
+        
+        self.logger.info(f"Parsed {parsed} files from repomix file")
+
+    def _candidate_entries(self, pack: RepomixPack, file_path: str, database_name: str,
+                           tokens: Optional[TokenIndex] = None) -> List[PackEntry]:
+        """
+        Entries of a pack that mention database_name.
+
+        File offsets come from the pack's sidecar index when it is current,
+        so the pack is not reparsed. Candidates come from the pack's token
+        index when there is one (tokens, or a current token sidecar; none is
+        built here), otherwise from one search of the raw pack, so files
+        without the name are never decoded.
+        """
+        with profile_span("repomix.parse", "cpu", source=file_path, bytes=pack.size) as span:
+            index = current_pack_index(file_path)
+            entries = [indexed.entry for indexed in index] if index else list(pack)
+            if tokens is None:
+                tokens = get_token_index(file_path, build=False)
+            lines = tokens.lookup(database_name) if tokens is not None and len(tokens) == len(entries) else None
+            if lines is not None:
+                candidates = [entries[position] for position in lines]
+            else:
+                candidates = find_candidates(pack, entries, database_name)
+            if span is not None:
+                span.args["indexed"] = index is not None
+                span.args["token_index"] = lines is not None
+                span.args["files"] = len(entries)
+                span.args["candidates"] = len(candidates)
+        
+        self.logger.info(f"Found {len(candidates)} of {len(entries)} files mentioning {database_name}")
+        return candidates
+
+    def _iter_candidate_files(self, file_path: str, database_name: str,
+                              tokens: Optional[TokenIndex] = None) -> Iterator[Dict[str, str]]:
+        """Yield only the files of a repomix XML file that mention database_name."""
+        if not Path(file_path).exists():
+            self.logger.warning(f"Repomix file does not exist: {file_path}")
+            return
+        
+        try:
+            with RepomixPack(file_path) as pack:
+                for entry in self._candidate_entries(pack, file_path, database_name, tokens):
+                    yield {
+                        "path": entry.path,
+                        "content": pack.text(entry).strip()
+                    }
+        except Exception as e:
+            self.logger.error(f"Error parsing repomix file {file_path}: {e}")
+            return
+
+    def _count_references(self, file_path: str, database_name: str,
+                          tokens: Optional[TokenIndex] = None) -> Iterator[Tuple[Dict[str, str], int]]:
+        """Yield (file, reference count) for each candidate file, scanning serially."""
+        for file_info in self._iter_candidate_files(file_path, database_name, tokens):
+            yield file_info, len(self._grep_file_content(file_info['content'], database_name))
+
+    async def _count_references_in_parallel(
+        self,
+        file_path: str,
+        database_name: str,
+        tokens: Optional[TokenIndex] = None
+    ) -> Optional[List[Tuple[Dict[str, str], int]]]:
+        """
+        Like _count_references, sharded across the shared process pool.
+
+        Only files with references are decoded here, and the candidate
+        search runs in a worker thread. Returns None when the pack is too
+        small to be worth it (see concrete.parallel_scan), or when the pool
+        fails, so that the caller scans serially instead.
+        """
+        if not Path(file_path).exists() or not should_scan_in_parallel(Path(file_path).stat().st_size):
+            return None
+        
+        with RepomixPack(file_path) as pack:
+            candidates = await asyncio.to_thread(self._candidate_entries, pack, file_path, database_name, tokens)
+            try:
+                counts = await count_matches_parallel(pack, candidates, rf'\b{re.escape(database_name)}\b')
+            except Exception as e:
+                self.logger.warning(f"Parallel scan of {file_path} failed, scanning serially: {e}")
+                return None
+            return [
+                ({"path": entry.path, "content": pack.text(entry).strip() if count else ""}, count)
+                for entry, count in zip(candidates, counts)
+            ]
         
     def _grep_file_content(self, content: str, database_name: str) -> List[str]:
         """Simple grep for database name in content using normal regex."""
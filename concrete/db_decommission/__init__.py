@@ -38,6 +38,7 @@ from .data_models import (
 
 from .utils import (
     create_db_decommission_workflow,
+    compile_db_decommission_plan,
     run_decommission,
     initialize_environment_with_centralized_secrets,
     create_mcp_config,
@@ -49,6 +50,15 @@ from .utils import (
     format_workflow_summary
 )
 
+from .batch_runner import (
+    DecommissionJob,
+    BatchLimits,
+    BatchReport,
+    JobOutcome,
+    load_manifest,
+    run_batch
+)
+
 from .validation_checks import (
     perform_database_reference_check,
     perform_rule_compliance_check,
@@ -84,8 +94,17 @@ __author__ = "GraphMCP Database Decommissioning Team"
 __all__ = [
     # Main workflow functions
     "create_db_decommission_workflow",
+    "compile_db_decommission_plan",
     "run_decommission",
     
+    # Batch runner
+    "DecommissionJob",
+    "BatchLimits",
+    "BatchReport",
+    "JobOutcome",
+    "load_manifest",
+    "run_batch",
+    
     # Workflow steps
     "validate_environment_step",
     "process_repositories_step",
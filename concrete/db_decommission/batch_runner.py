@@ -0,0 +1,337 @@
+"""
+Batch Runner for Fleet-Wide Database Decommissioning.
+
+Runs many database decommissioning workflows in one process from a manifest
+of (database, repositories) jobs. All workflows share one warm MCP server
+pool, the process-wide config snapshot and capability caches, and are held
+to global limits on MCP processes, GitHub tool calls per second and
+concurrent reference scans. A combined report is produced at the end.
+
+Manifest format (JSON):
+
+    {
+        "defaults": {"slack_channel": "C01234567"},
+        "limits": {"max_concurrent_workflows": 4, "github_calls_per_second": 5},
+        "jobs": [
+            {"database": "postgres_air", "repos": ["https://github.com/org/repo"]},
+            {"database": "periodic_table", "repos": ["..."], "slack_channel": "C999"}
+        ]
+    }
+
+Usage:
+    python -m concrete.db_decommission.batch_runner --manifest fleet.json --report report.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from clients.pool import MCPServerPool, get_server_pool, set_server_pool
+from clients.rate_limit import get_rate_limiter, set_rate_limit
+from clients.registry import MCPClientRegistry
+from concrete.token_index import set_token_indexing, token_indexing_enabled
+from workflows.plan import ExecutionPlan
+
+from .repository_processors import set_scan_concurrency
+from .utils import compile_db_decommission_plan, create_db_decommission_workflow, create_mcp_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLACK_CHANNEL = "C01234567"
+
+
+@dataclass
+class DecommissionJob:
+    """One database to decommission across a set of repositories."""
+    database_name: str
+    target_repos: List[str]
+    slack_channel: str = DEFAULT_SLACK_CHANNEL
+    workflow_id: Optional[str] = None
+
+
+@dataclass
+class BatchLimits:
+    """Global limits shared by every workflow in a batch."""
+    max_concurrent_workflows: int = 4
+    # Total live MCP server processes, split evenly across configured servers
+    max_mcp_processes: int = 9
+    # GitHub MCP tool calls per second across all workflows (None = unlimited)
+    github_calls_per_second: Optional[float] = 5.0
+    # Concurrent repository reference scans (None = one per workflow)
+    scan_workers: Optional[int] = 2
+    # Build an inverted token index per repository pack, so every further
+    # database scanned against the pack is a lookup instead of a full scan
+    token_index: bool = True
+
+
+@dataclass
+class JobOutcome:
+    """Result of one job in a batch."""
+    database_name: str
+    status: str
+    duration_seconds: float
+    repositories: int
+    files_discovered: int = 0
+    files_modified: int = 0
+    steps_completed: int = 0
+    steps_failed: int = 0
+    resumed_steps: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchReport:
+    """Combined report over all jobs in a batch."""
+    outcomes: List[JobOutcome]
+    duration_seconds: float
+    limits: BatchLimits
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.status == "completed")
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.succeeded
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": {
+                "jobs": len(self.outcomes),
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "repositories": sum(o.repositories for o in self.outcomes),
+                "files_discovered": sum(o.files_discovered for o in self.outcomes),
+                "files_modified": sum(o.files_modified for o in self.outcomes),
+                "duration_seconds": round(self.duration_seconds, 3),
+            },
+            "limits": asdict(self.limits),
+            "jobs": [asdict(outcome) for outcome in self.outcomes],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        """Write the report as JSON and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+
+def load_manifest(path: str | Path) -> tuple[List[DecommissionJob], BatchLimits]:
+    """
+    Load jobs and limits from a JSON manifest.
+
+    Args:
+        path: Manifest file (see module docstring for the format)
+
+    Returns:
+        Tuple of (jobs, limits)
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ValueError(f"Manifest {path} must be an object with a 'jobs' list")
+
+    known_limits = {f.name for f in fields(BatchLimits)}
+    unknown = set(manifest.get("limits", {})) - known_limits
+    if unknown:
+        raise ValueError(f"Unknown batch limits in {path}: {', '.join(sorted(unknown))}")
+    limits = BatchLimits(**manifest.get("limits", {}))
+
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for index, entry in enumerate(manifest["jobs"]):
+        database = entry.get("database")
+        repos = entry.get("repos", defaults.get("repos"))
+        if not database or not repos:
+            raise ValueError(f"Manifest job #{index} needs 'database' and a non-empty 'repos' list")
+        jobs.append(DecommissionJob(
+            database_name=database,
+            target_repos=list(repos),
+            slack_channel=entry.get("slack_channel", defaults.get("slack_channel", DEFAULT_SLACK_CHANNEL)),
+            workflow_id=entry.get("workflow_id"),
+        ))
+
+    databases = [job.database_name for job in jobs]
+    duplicates = sorted({name for name in databases if databases.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate databases in manifest {path}: {', '.join(duplicates)}")
+    return jobs, limits
+
+
+async def _run_job(job: DecommissionJob, config_path: str, resume: bool,
+                   checkpoint_dir: Optional[str],
+                   client_registry: Optional[MCPClientRegistry] = None,
+                   plan: Optional[ExecutionPlan] = None) -> JobOutcome:
+    started = time.time()
+    try:
+        workflow = create_db_decommission_workflow(
+            database_name=job.database_name,
+            target_repos=job.target_repos,
+            slack_channel=job.slack_channel,
+            config_path=config_path,
+            workflow_id=job.workflow_id,
+            plan=plan,
+        )
+        if checkpoint_dir:
+            workflow.config.checkpoint_dir = checkpoint_dir
+        workflow.client_registry = client_registry
+        result = await workflow.execute(resume=resume)
+    except Exception as e:
+        logger.error(f"Decommission of '{job.database_name}' failed: {e}")
+        return JobOutcome(
+            database_name=job.database_name,
+            status="failed",
+            duration_seconds=time.time() - started,
+            repositories=len(job.target_repos),
+            error=str(e),
+        )
+
+    repo_result = result.get_step_result("process_repositories", {}) or {}
+    return JobOutcome(
+        database_name=job.database_name,
+        status=result.status,
+        duration_seconds=time.time() - started,
+        repositories=len(job.target_repos),
+        files_discovered=repo_result.get("total_files_processed", 0),
+        files_modified=repo_result.get("total_files_modified", 0),
+        steps_completed=result.steps_completed,
+        steps_failed=result.steps_failed,
+        resumed_steps=list(result.resumed_steps),
+    )
+
+
+async def run_batch(
+    jobs: List[DecommissionJob],
+    limits: Optional[BatchLimits] = None,
+    config_path: str = "mcp_config.json",
+    resume: bool = False,
+    checkpoint_dir: Optional[str] = None,
+) -> BatchReport:
+    """
+    Run decommissioning workflows for many databases concurrently.
+
+    Each concurrent workflow slot keeps an MCPClientRegistry for the whole
+    batch, so the clients one database's workflow connects are reused by the
+    next workflow run in that slot. Registries check their clients out of
+    one shared MCPServerPool, and each holds one client per server, so
+    workflow concurrency is capped at the per-server process budget to avoid
+    slots blocking each other on checkout.
+
+    Args:
+        jobs: Databases and repositories to process
+        limits: Global limits (defaults to BatchLimits())
+        config_path: MCP config file written for, and shared by, all workflows
+        resume: Reuse checkpointed step results from previous runs
+        checkpoint_dir: Directory to checkpoint step results in, instead of
+            the workflow's default; see run_decommission()
+
+    Returns:
+        BatchReport with one outcome per job, in job order
+    """
+    limits = limits or BatchLimits()
+    started = time.time()
+
+    config = create_mcp_config()
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+
+    # Every job runs the same workflow; validate and resolve it once
+    plan = compile_db_decommission_plan(config_path)
+
+    servers = list(config["mcpServers"])
+    per_server = max(1, limits.max_mcp_processes // len(servers))
+    concurrency = max(1, min(limits.max_concurrent_workflows, per_server))
+    if concurrency < limits.max_concurrent_workflows:
+        logger.info(f"Running {concurrency} workflows at a time to fit "
+                    f"{limits.max_mcp_processes} MCP processes across {len(servers)} servers")
+
+    owned_pool = None
+    if get_server_pool(config_path) is None:
+        owned_pool = MCPServerPool(config_path, min_size=0, max_size=per_server)
+        set_server_pool(owned_pool)
+    previous_limiter = get_rate_limiter("ovr_github")
+    set_rate_limit("ovr_github", limits.github_calls_per_second)
+    set_scan_concurrency(limits.scan_workers)
+    previous_token_indexing = token_indexing_enabled()
+    set_token_indexing(limits.token_index and len(jobs) > 1)
+
+    registries = [MCPClientRegistry() for _ in range(concurrency)]
+    idle_registries: asyncio.Queue = asyncio.Queue()
+    for registry in registries:
+        idle_registries.put_nowait(registry)
+
+    async def run_one(job: DecommissionJob) -> JobOutcome:
+        registry = await idle_registries.get()
+        try:
+            logger.info(f"Starting decommission of '{job.database_name}' ({len(job.target_repos)} repositories)")
+            return await _run_job(job, config_path, resume, checkpoint_dir, registry, plan)
+        finally:
+            idle_registries.put_nowait(registry)
+
+    try:
+        outcomes = await asyncio.gather(*(run_one(job) for job in jobs))
+    finally:
+        for registry in registries:
+            await registry.close()
+        set_scan_concurrency(None)
+        set_token_indexing(previous_token_indexing)
+        if previous_limiter is not None:
+            set_rate_limit("ovr_github", previous_limiter.rate, previous_limiter.burst)
+        else:
+            set_rate_limit("ovr_github", None)
+        if owned_pool is not None:
+            set_server_pool(None)
+            await owned_pool.close()
+
+    report = BatchReport(outcomes=list(outcomes), duration_seconds=time.time() - started, limits=limits)
+    logger.info(f"Batch finished: {report.succeeded}/{len(outcomes)} workflows completed "
+                f"in {report.duration_seconds:.1f}s")
+    return report
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run database decommissioning for many databases")
+    parser.add_argument("--manifest", required=True, help="JSON manifest of databases and repositories")
+    parser.add_argument("--report", default="logs/decommission_batch_report.json", help="Where to write the combined report")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse checkpointed step results of a failed run (using the same --checkpoint-dir)")
+    parser.add_argument("--checkpoint-dir", help="Checkpoint step results here instead of the default directory")
+    parser.add_argument("--max-workflows", type=int, help="Override max_concurrent_workflows")
+    parser.add_argument("--max-mcp-processes", type=int, help="Override max_mcp_processes")
+    parser.add_argument("--github-rps", type=float, help="Override github_calls_per_second")
+    parser.add_argument("--scan-workers", type=int, help="Override scan_workers")
+    return parser
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    jobs, limits = load_manifest(args.manifest)
+    overrides = {
+        "max_concurrent_workflows": args.max_workflows,
+        "max_mcp_processes": args.max_mcp_processes,
+        "github_calls_per_second": args.github_rps,
+        "scan_workers": args.scan_workers,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            setattr(limits, name, value)
+
+    report = await run_batch(jobs, limits, resume=args.resume, checkpoint_dir=args.checkpoint_dir)
+    path = report.write(args.report)
+    print(f"✅ {report.succeeded}/{len(report.outcomes)} workflows completed; report written to {path}")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(asyncio.run(main()))
@@ -14,6 +14,25 @@ from clients import GitHubMCPClient, SlackMCPClient, RepomixMCPClient
 # Import new structured logging
 
 
+async def acquire_workflow_client(context: Any, server_name: str, client_class: Any) -> Any:
+    """
+    Return the workflow's client for a server, creating it on first use.
+
+    Clients come from the workflow's MCPClientRegistry, so a custom step
+    gets the same client as MCP tool steps for that server and, when the
+    registry is shared (e.g. by the batch runner), as later workflows.
+
+    Args:
+        context: WorkflowContext of the running workflow
+        server_name: MCP server name from mcp_config.json
+        client_class: BaseMCPClient subclass to create on first use
+
+    Returns:
+        Client instance shared through the context's registry
+    """
+    return await context.get_client(server_name, client_class)
+
+
 async def initialize_github_client(context: Any, logger: Any) -> Optional[Any]:
     """
     Initialize GitHub MCP client with proper error handling.
@@ -27,7 +46,7 @@ async def initialize_github_client(context: Any, logger: Any) -> Optional[Any]:
     """
     try:
         logger.log_info("Initializing GitHub MCP client...")
-        github_client = GitHubMCPClient(config_path="mcp_config.json")
+        github_client = await acquire_workflow_client(context, "ovr_github", GitHubMCPClient)
         
         # Test connection
         connection_test = await github_client.test_connection()
@@ -56,7 +75,7 @@ async def initialize_slack_client(context: Any, logger: Any) -> Optional[Any]:
     """
     try:
         logger.log_info("Initializing Slack MCP client...")
-        slack_client = SlackMCPClient()
+        slack_client = await acquire_workflow_client(context, "ovr_slack", SlackMCPClient)
         
         # Test connection
         connection_test = await slack_client.test_connection()
@@ -85,7 +104,7 @@ async def initialize_repomix_client(context: Any, logger: Any) -> Optional[Any]:
     """
     try:
         logger.log_info("Initializing Repomix MCP client...")
-        repomix_client = RepomixMCPClient()
+        repomix_client = await acquire_workflow_client(context, "ovr_repomix", RepomixMCPClient)
         
         # Test connection
         connection_test = await repomix_client.test_connection()
@@ -136,29 +136,33 @@ async def commit_file_changes(
     Returns:
         Dict containing commit results
     """
-    files_committed = 0
-    commit_messages = []
-    
+    files_to_commit = []
     for file_result in modified_files:
         file_path = file_result["path"]
-        modified_content = file_result["modified_content"]
         changes_count = file_result["changes_made"]
         source_type = file_result.get("source_type", "unknown")
         
-        commit_message = f"refactor({source_type}): remove {database_name} references from {file_path} ({changes_count} changes)"
-        
-        # Commit the file changes
-        update_result = await github_client.create_or_update_file(
-            fork_owner, repo_name, file_path, modified_content,
-            commit_message, branch=branch_name
-        )
-        
+        files_to_commit.append({
+            "path": file_path,
+            "content": file_result["modified_content"],
+            "message": f"refactor({source_type}): remove {database_name} references from {file_path} ({changes_count} changes)"
+        })
+    
+    # Commit the file changes as one batch over the shared GitHub MCP connection;
+    # commits to one branch must land one after another
+    update_results = await github_client.create_or_update_files(
+        fork_owner, repo_name, files_to_commit, branch=branch_name, max_concurrency=1
+    )
+    
+    files_committed = 0
+    commit_messages = []
+    for file_spec, update_result in zip(files_to_commit, update_results):
         if update_result.get("success", False):
             files_committed += 1
-            commit_messages.append(commit_message)
-            logger.log_info(f"   ✅ Committed: {file_path}")
+            commit_messages.append(file_spec["message"])
+            logger.log_info(f"   ✅ Committed: {file_spec['path']}")
         else:
-            logger.log_warning(f"Failed to commit: {file_path} - {update_result.get('error', 'Unknown error')}")
+            logger.log_warning(f"Failed to commit: {file_spec['path']} - {update_result.get('error', 'Unknown error')}")
     
     return {
         "files_committed": files_committed,
@@ -5,7 +5,13 @@ This module contains repository processing functions for the database decommissi
 following async-first patterns and structured logging.
 """
 
+import asyncio
+import os
+import shutil
+import tempfile
 import time
+import weakref
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
@@ -14,17 +20,21 @@ from clients import SlackMCPClient, RepomixMCPClient
 
 # Import PRP-compliant components
 from concrete.database_reference_extractor import DatabaseReferenceExtractor
+from concrete.pack_index import PackIndex
+from concrete.token_index import TokenIndex, build_pack_sidecars, token_indexing_enabled
 from concrete.source_type_classifier import SourceTypeClassifier
 from concrete.performance_optimization import get_performance_manager
 
 # Import new structured logging
 from graphmcp.logging import get_logger
 from graphmcp.logging.config import LoggingConfig
+from utils.process_pool import run_in_process
 
 # Import data models
 
 # Import extracted client helpers
 from .client_helpers import (
+    acquire_workflow_client,
     initialize_github_client,
     initialize_slack_client,
     initialize_repomix_client,
@@ -33,6 +43,31 @@ from .client_helpers import (
     extract_repo_details
 )
 
+# Bounds concurrent reference scans when several workflows share one process
+# (see batch_runner); None means unbounded.
+_scan_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def set_scan_concurrency(limit: Optional[int]) -> None:
+    """
+    Limit how many repository reference scans run at once.
+
+    Args:
+        limit: Maximum concurrent scans, or None/0 to remove the limit
+    """
+    global _scan_semaphore
+    _scan_semaphore = asyncio.Semaphore(limit) if limit else None
+
+
+@asynccontextmanager
+async def _scan_slot():
+    semaphore = _scan_semaphore
+    if semaphore is None:
+        yield
+        return
+    async with semaphore:
+        yield
+
 
 async def process_repositories_step(
     context: Any,
@@ -180,139 +215,23 @@ async def process_single_repository(
     )
     
     try:
-        # Check if we should use existing mock data
-        existing_repo_pack = load_existing_repo_pack(database_name, logger)
-        
-        if existing_repo_pack:
-            # Use existing cached repo pack
-            logger.log_info(f"📁 Using existing cached repo pack for {database_name}")
-            
-            # Find the cached file path
-            from pathlib import Path
-            cache_dir = Path(f"tmp/{database_name}")
-            tests_data_dir = Path("tests/data")
-            
-            # Check for existing cached file
-            possible_files = [
-                cache_dir / f"{database_name}_repo_pack.xml",
-                tests_data_dir / f"{database_name}_mock_repo_pack.xml"
-            ]
-            
-            repo_pack_path = None
-            for cache_file in possible_files:
-                if cache_file.exists():
-                    repo_pack_path = str(cache_file)
-                    break
-            
-            if not repo_pack_path:
-                # Create a cached file from the loaded content
-                cache_dir.mkdir(parents=True, exist_ok=True)
-                repo_pack_path = cache_dir / f"{database_name}_repo_pack.xml"
-                with open(repo_pack_path, 'w', encoding='utf-8') as f:
-                    f.write(existing_repo_pack)
-                repo_pack_path = str(repo_pack_path)
-            
-            logger.log_info(f"📁 Using cached repo pack: {repo_pack_path}")
-            
-        else:
-            # Run Repomix to get fresh repository data
-            logger.log_info(f"🔄 Running Repomix for {database_name} in {repo_owner}/{repo_name}")
-            logger.log_info(f"🔄 Repository URL: https://github.com/{repo_owner}/{repo_name}")
-            
-            repomix_result = await repomix_client.pack_remote_repository(
-                repo_url=f"https://github.com/{repo_owner}/{repo_name}"
+        # Packs are cached per repository and shared by the workflows of every
+        # database; while one of them packs, the others wait for its cache
+        async with _repo_pack_lock(_repo_pack_cache_file(repo_owner, repo_name)):
+            repo_pack_path = await _obtain_repo_pack(
+                repo_url, repo_owner, repo_name, database_name, repomix_client, logger
             )
-            
-            # Debug: Log the full repomix result
-            logger.log_info(f"🔍 DEBUG: Repomix result keys: {list(repomix_result.keys()) if isinstance(repomix_result, dict) else 'Not a dict'}")
-            logger.log_info(f"🔍 DEBUG: Full repomix result: {repomix_result}")
-            
-            # Check if repomix packing was successful
-            if not repomix_result.get("success"):
-                error_msg = f"Failed to pack repository {repo_url}: {repomix_result.get('error', 'Unknown error')}"
-                logger.log_error(error_msg)
-                raise Exception(error_msg)
-            
-            # Get the output file path from repomix result
-            repo_pack_path = repomix_result.get("output_file")
-            if not repo_pack_path:
-                # Try alternative keys that might contain the file path
-                repo_pack_path = (repomix_result.get("output_path") or 
-                                repomix_result.get("file_path") or
-                                repomix_result.get("packed_file"))
-                
-                if not repo_pack_path:
-                    # Fallback: Create a mock packed file for demo purposes
-                    logger.log_warning("Repomix did not return output_file path. Creating fallback mock file for demo.")
-                    
-                    # Create a mock packed file
-                    from pathlib import Path
-                    
-                    # Create mock content for demo in the format expected by the reference extractor
-                    mock_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<repository>
-  <metadata>
-    <name>{repo_name}</name>
-    <url>{repo_url}</url>
-    <generated_for_demo>true</generated_for_demo>
-  </metadata>
-  <files>
-<file path="README.md">
-# {repo_name}
-
-This is a demo repository for database decommissioning.
-Sample database references:
-- postgres_air connection string
-- postgres_air schema
-</file>
-<file path="config/database.yml">
-production:
-  database: postgres_air
-  host: localhost
-  port: 5432
-</file>
-<file path="src/models/user.py">
-import psycopg2
-
-# Connect to postgres_air database
-conn = psycopg2.connect(
-    database="postgres_air",
-    user="admin",
-    password="secret"
-)
-</file>
-  </files>
-</repository>"""
-                    
-                    # Create the fallback file
-                    cache_dir = Path(f"tmp/{database_name}")
-                    cache_dir.mkdir(parents=True, exist_ok=True)
-                    repo_pack_path = cache_dir / f"{database_name}_repo_pack.xml"
-                    
-                    with open(repo_pack_path, 'w') as f:
-                        f.write(mock_content)
-                    
-                    logger.log_info(f"📁 Created fallback mock file: {repo_pack_path}")
-                    repo_pack_path = str(repo_pack_path)
-                    
-                    # Save the mock content
-                    save_repo_pack_to_tmp(mock_content, database_name, logger)
-            else:
-                # If we got a real repo pack path, save its content
-                if Path(repo_pack_path).exists():
-                    with open(repo_pack_path, 'r', encoding='utf-8') as f:
-                        repo_pack_content = f.read()
-                    save_repo_pack_to_tmp(repo_pack_content, database_name, logger)
         
         logger.log_info(f"📁 Repository packed to: {repo_pack_path}")
         
         # Extract references using PRP-compliant component
         extractor = DatabaseReferenceExtractor()
-        discovery_result = await extractor.extract_references(
-            database_name=database_name,
-            target_repo_pack_path=repo_pack_path,
-            output_dir=f"tests/tmp/pattern_match/{database_name}"
-        )
+        async with _scan_slot():
+            discovery_result = await extractor.extract_references(
+                database_name=database_name,
+                target_repo_pack_path=repo_pack_path,
+                output_dir=f"tests/tmp/pattern_match/{database_name}"
+            )
         
         files_found = discovery_result.get("total_files", 0)
         high_confidence_matches = discovery_result.get("files", [])
@@ -382,8 +301,7 @@ async def initialize_slack_client(context: Any, logger: Any) -> Optional[Any]:
             logger.log_info("Slack client already initialized")
             return slack_client
         
-        slack_client = SlackMCPClient(context.config.config_path)
-        context._clients['ovr_slack'] = slack_client
+        slack_client = await acquire_workflow_client(context, 'ovr_slack', SlackMCPClient)
         logger.log_info("Slack client initialized successfully")
         return slack_client
         
@@ -409,8 +327,7 @@ async def initialize_repomix_client(context: Any, logger: Any) -> Optional[Any]:
             logger.log_info("Repomix client already initialized")
             return repomix_client
         
-        repomix_client = RepomixMCPClient(context.config.config_path)
-        context._clients['ovr_repomix'] = repomix_client
+        repomix_client = await acquire_workflow_client(context, 'ovr_repomix', RepomixMCPClient)
         logger.log_info("Repomix client initialized successfully")
         return repomix_client
         
@@ -630,92 +547,250 @@ async def safe_slack_notification(
     await send_slack_notification_with_retry(slack_client, channel, message, logger)
 
 
-def save_repo_pack_to_tmp(
-    repo_pack_content: str,
+async def _obtain_repo_pack(
+    repo_url: str,
+    repo_owner: str,
+    repo_name: str,
     database_name: str,
+    repomix_client: Any,
+    logger: Any
+) -> str:
+    """
+    Return the path of a Repomix pack of a repository: a cached one if
+    available, otherwise a freshly packed (and cached) one.
+    """
+    cached_pack = find_existing_repo_pack(database_name, repo_owner, repo_name, logger)
+    
+    if cached_pack:
+        repo_pack_path = str(cached_pack)
+        logger.log_info(f"📁 Using cached repo pack: {repo_pack_path}")
+        # Packs cached by earlier versions or whose indexing failed have no
+        # (current) sidecars; build them in the process pool now rather
+        # than on the event loop when the pack is scanned
+        sidecars = [PackIndex, TokenIndex] if token_indexing_enabled() else [PackIndex]
+        if not all(sidecar.sidecar_is_newer(cached_pack) for sidecar in sidecars):
+            await index_repo_pack(cached_pack, logger)
+        
+    else:
+        # Run Repomix to get fresh repository data
+        logger.log_info(f"🔄 Running Repomix for {database_name} in {repo_owner}/{repo_name}")
+        logger.log_info(f"🔄 Repository URL: https://github.com/{repo_owner}/{repo_name}")
+        
+        repomix_result = await repomix_client.pack_remote_repository(
+            repo_url=f"https://github.com/{repo_owner}/{repo_name}"
+        )
+        
+        # Debug: Log the full repomix result
+        logger.log_info(f"🔍 DEBUG: Repomix result keys: {list(repomix_result.keys()) if isinstance(repomix_result, dict) else 'Not a dict'}")
+        logger.log_info(f"🔍 DEBUG: Full repomix result: {repomix_result}")
+        
+        # Check if repomix packing was successful
+        if not repomix_result.get("success"):
+            error_msg = f"Failed to pack repository {repo_url}: {repomix_result.get('error', 'Unknown error')}"
+            logger.log_error(error_msg)
+            raise Exception(error_msg)
+        
+        # Get the output file path from repomix result
+        repo_pack_path = repomix_result.get("output_file")
+        if not repo_pack_path:
+            # Try alternative keys that might contain the file path
+            repo_pack_path = (repomix_result.get("output_path") or 
+                            repomix_result.get("file_path") or
+                            repomix_result.get("packed_file"))
+            
+            if not repo_pack_path:
+                # Fallback: Create a mock packed file for demo purposes
+                logger.log_warning("Repomix did not return output_file path. Creating fallback mock file for demo.")
+                
+                # Create mock content for demo in the format expected by the reference extractor
+                mock_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<repository>
+  <metadata>
+    <name>{repo_name}</name>
+    <url>{repo_url}</url>
+    <generated_for_demo>true</generated_for_demo>
+  </metadata>
+  <files>
+<file path="README.md">
+# {repo_name}
+
+This is a demo repository for database decommissioning.
+Sample database references:
+- postgres_air connection string
+- postgres_air schema
+</file>
+<file path="config/database.yml">
+production:
+  database: postgres_air
+  host: localhost
+  port: 5432
+</file>
+<file path="src/models/user.py">
+import psycopg2
+
+# Connect to postgres_air database
+conn = psycopg2.connect(
+    database="postgres_air",
+    user="admin",
+    password="secret"
+)
+</file>
+  </files>
+</repository>"""
+                
+                # Create the fallback file; it is demo data, so it is kept
+                # apart from the repository's shared cache
+                cache_dir = Path(f"tmp/{database_name}")
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                repo_pack_path = cache_dir / f"{database_name}_repo_pack.xml"
+                
+                with open(repo_pack_path, 'w') as f:
+                    f.write(mock_content)
+                
+                logger.log_info(f"📁 Created fallback mock file: {repo_pack_path}")
+                await index_repo_pack(repo_pack_path, logger)
+                repo_pack_path = str(repo_pack_path)
+        else:
+            # If we got a real repo pack path, cache and index it, and scan
+            # the indexed copy so the extractor can use its sidecars
+            if Path(repo_pack_path).exists():
+                cached_pack = await copy_repo_pack_to_tmp(repo_pack_path, repo_owner, repo_name, logger)
+                if cached_pack is not None:
+                    repo_pack_path = str(cached_pack)
+    
+    return repo_pack_path
+
+
+# Repository packs (and their sidecar indexes) are cached per repository,
+# so the workflows of all databases scanning one repository share them
+REPO_PACK_CACHE_DIR = Path("tmp/repo_packs")
+
+# One lock per cached pack, held while it is looked up or created
+_repo_pack_locks: "weakref.WeakValueDictionary[Path, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _repo_pack_cache_file(repo_owner: str, repo_name: str) -> Path:
+    """Where the pack of a repository is cached."""
+    return REPO_PACK_CACHE_DIR / repo_owner / f"{repo_name}_repo_pack.xml"
+
+
+def _repo_pack_lock(cache_file: Path) -> asyncio.Lock:
+    lock = _repo_pack_locks.get(cache_file)
+    if lock is None:
+        lock = _repo_pack_locks[cache_file] = asyncio.Lock()
+    return lock
+
+
+async def index_repo_pack(pack_path: Path, logger: Any) -> None:
+    """
+    Write the sidecar index of a cached pack (see concrete.pack_index) and,
+    with token indexing enabled, its token index (see concrete.token_index).
+    
+    Indexing parses and classifies every file of the pack, so it runs in the
+    shared process pool instead of on the event loop.
+    
+    Args:
+        pack_path: Cached repository pack
+        logger: Structured logger instance
+    """
+    try:
+        files = await run_in_process(build_pack_sidecars, str(Path(pack_path).resolve()), token_indexing_enabled())
+        logger.log_info(f"Repository pack index covers {files} files")
+    except Exception as e:
+        # The pack is still usable without its index
+        logger.log_warning(f"Failed to index repository pack {pack_path}: {e}")
+
+
+def _replace_file(source: Path, target: Path) -> None:
+    """Atomically replace target with a copy of source."""
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp_name)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+async def copy_repo_pack_to_tmp(
+    repo_pack_file: str,
+    repo_owner: str,
+    repo_name: str,
     logger: Any
-) -> bool:
+) -> Optional[Path]:
     """
-    Save repository pack data to tmp/<database-name>/ directory for reuse.
+    Cache a freshly packed repository file in tmp/repo_packs/<owner>/ and
+    index it (see index_repo_pack).
+    
+    The file is copied, never read into memory, and replaces any older
+    cached pack.
     
     Args:
-        repo_pack_content: Repository pack XML content
-        database_name: Database name for directory naming
+        repo_pack_file: Pack written by Repomix
+        repo_owner: Repository owner
+        repo_name: Repository name
         logger: Structured logger instance
         
     Returns:
-        True if saved successfully
+        Path of the cached pack, or None if it could not be cached
     """
     try:
-        # Create tmp/<database-name> directory
-        cache_dir = Path(f"tmp/{database_name}")
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate cache file name based on database name
-        cache_file = cache_dir / f"{database_name}_repo_pack.xml"
-        
-        # Write content to cache file (don't overwrite if exists)
-        if not cache_file.exists():
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.write(repo_pack_content)
-            logger.log_info(f"Repository pack saved to: {cache_file}")
-        else:
-            logger.log_info(f"Repository pack already exists: {cache_file}")
-        
-        return True
-        
+        cache_file = _repo_pack_cache_file(repo_owner, repo_name)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(_replace_file, Path(repo_pack_file), cache_file)
+        logger.log_info(f"Repository pack saved to: {cache_file}")
     except Exception as e:
         logger.log_error(f"Failed to save repository pack: {e}")
-        return False
+        return None
+    
+    await index_repo_pack(cache_file, logger)
+    return cache_file
 
 
-def load_existing_repo_pack(
+def find_existing_repo_pack(
     database_name: str,
+    repo_owner: str,
+    repo_name: str,
     logger: Any
-) -> Optional[str]:
+) -> Optional[Path]:
     """
-    Load existing repository pack data from tmp/<database-name>/ directory.
+    Find a cached, non-empty pack of a repository.
+    
+    The repository's shared cache in tmp/repo_packs/ is preferred; packs
+    cached per database by earlier versions (tmp/<database-name>/) and the
+    mock packs in tests/data/ are used otherwise.
     
     Args:
-        database_name: Database name for directory naming
+        database_name: Database name the legacy and mock packs are named after
+        repo_owner: Repository owner
+        repo_name: Repository name
         logger: Structured logger instance
         
     Returns:
-        Cached repository pack content or None if not found
+        Path of the cached pack, or None if not found
     """
-    try:
-        # Try different cache file patterns in tmp/<database-name>/
-        cache_dir = Path(f"tmp/{database_name}")
-        possible_files = [
-            cache_dir / f"{database_name}_repo_pack.xml",
-            cache_dir / f"{database_name}_real_repo_pack.xml",
-            cache_dir / f"{database_name}_mock_repo_pack.xml"
-        ]
-        
-        # Also check tests/data/ for backward compatibility
-        tests_data_dir = Path("tests/data")
-        possible_files.extend([
-            tests_data_dir / f"{database_name}_real_repo_pack.xml",
-            tests_data_dir / f"{database_name}_mock_repo_pack.xml",
-            tests_data_dir / f"{database_name}_repo_pack.xml"
-        ])
-        
-        for cache_file in possible_files:
-            if cache_file.exists():
-                logger.log_info(f"Found existing repository pack: {cache_file}")
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check if content is valid (not empty)
-                if content.strip():
-                    logger.log_info(f"Loaded existing repo pack ({len(content)} characters)")
-                    return content
-                else:
-                    logger.log_warning(f"Cache file is empty: {cache_file}")
-        
-        logger.log_info("No existing repository pack found")
-        return None
-        
-    except Exception as e:
-        logger.log_error(f"Failed to load existing repository pack: {e}")
-        return None
\ No newline at end of file
+    cache_dir = Path(f"tmp/{database_name}")
+    tests_data_dir = Path("tests/data")
+    possible_files = [
+        _repo_pack_cache_file(repo_owner, repo_name),
+        cache_dir / f"{database_name}_repo_pack.xml",
+        cache_dir / f"{database_name}_real_repo_pack.xml",
+        cache_dir / f"{database_name}_mock_repo_pack.xml",
+        tests_data_dir / f"{database_name}_real_repo_pack.xml",
+        tests_data_dir / f"{database_name}_mock_repo_pack.xml",
+        tests_data_dir / f"{database_name}_repo_pack.xml"
+    ]
+    
+    for cache_file in possible_files:
+        try:
+            size = cache_file.stat().st_size
+        except OSError:
+            continue
+        if size:
+            logger.log_info(f"Found existing repository pack: {cache_file} ({size} bytes)")
+            return cache_file
+        logger.log_warning(f"Cache file is empty: {cache_file}")
+    
+    logger.log_info("No existing repository pack found")
+    return None
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 
 # Import workflow components
 from workflows.builder import WorkflowBuilder
+from workflows.checkpoint import DEFAULT_CHECKPOINT_DIR, DEFAULT_CHECKPOINT_MAX_AGE_SECONDS
+from workflows.plan import ExecutionPlan, plan_parameter
 
 # Import parameter service
 from concrete.parameter_service import get_parameter_service
@@ -49,7 +51,8 @@ def create_db_decommission_workflow(
     target_repos: Optional[List[str]] = None,
     slack_channel: str = "C01234567",
     config_path: str = "mcp_config.json",
-    workflow_id: Optional[str] = None
+    workflow_id: Optional[str] = None,
+    plan: Optional[ExecutionPlan] = None
 ) -> "Workflow":
     """
     Create database decommissioning workflow with pattern discovery and contextual rules.
@@ -66,6 +69,9 @@ def create_db_decommission_workflow(
         slack_channel: Slack channel ID for notifications
         config_path: Path to MCP configuration file
         workflow_id: Unique workflow identifier
+        plan: Plan from compile_db_decommission_plan() to bind instead of
+            building and validating the workflow again (config_path is
+            then taken from the plan)
         
     Returns:
         Configured workflow ready for execution
@@ -82,12 +88,58 @@ def create_db_decommission_workflow(
     first_repo_url = target_repos[0] if target_repos else "https://github.com/bprzybys-nc/postgres-sample-dbs"
     repo_owner, repo_name = extract_repo_details(first_repo_url)
     
-    workflow = (WorkflowBuilder(
+    values = {
+        "database_name": database_name,
+        "target_repos": target_repos,
+        "slack_channel": slack_channel,
+        "workflow_id": workflow_id,
+        "repo_owner": repo_owner,
+        "repo_name": repo_name,
+    }
+    if plan is not None:
+        return plan.bind(values)
+    return _db_decommission_builder(config_path, **values).build()
+
+
+def compile_db_decommission_plan(config_path: str = "mcp_config.json") -> ExecutionPlan:
+    """
+    Compile the database decommissioning workflow once for many databases.
+    
+    Pass the plan to create_db_decommission_workflow(plan=...) to get each
+    database's workflow by parameter substitution alone.
+    
+    Args:
+        config_path: Path to MCP configuration file
+        
+    Returns:
+        ExecutionPlan with the workflow's parameters as plan variables
+    """
+    variables = ["database_name", "target_repos", "slack_channel", "workflow_id", "repo_owner", "repo_name"]
+    return _db_decommission_builder(
+        config_path, **{name: plan_parameter(name) for name in variables}).compile()
+
+
+def _db_decommission_builder(config_path: str, database_name: str, target_repos: Any,
+                             slack_channel: str, workflow_id: str, repo_owner: str,
+                             repo_name: str) -> WorkflowBuilder:
+    """Define the decommissioning workflow's steps for the given parameter values."""
+    return (WorkflowBuilder(
         "db-decommission", 
         config_path,
         description=f"Decommissioning of {database_name} database with pattern discovery, contextual rules, and comprehensive logging"
     )
-    
+    .with_config(
+        max_parallel_steps=4,
+        default_timeout=120,
+        stop_on_error=False,
+        default_retry_count=3
+    )
+    # Checkpoint every run so a rerun after a late failure (e.g. PR creation)
+    # skips repository processing; checkpoints go once the run succeeds
+    .with_checkpoints(DEFAULT_CHECKPOINT_DIR, max_age_seconds=DEFAULT_CHECKPOINT_MAX_AGE_SECONDS,
+                      clear_on_success=True)
+    # workflow_id is new for every run; it must not invalidate checkpoints
+    .with_run_identity_parameters("workflow_id")
     .custom_step(
         "validate_environment", "Environment Validation & Setup",
         validate_environment_step,
@@ -104,7 +156,9 @@ def create_db_decommission_workflow(
             "workflow_id": workflow_id
         },
         depends_on=["validate_environment"],
-        timeout_seconds=600
+        timeout_seconds=600,
+        # Posts Slack notifications; a retry would post them again
+        retry_count=0
     )
     .custom_step(
         "apply_refactoring", "Apply Contextual Refactoring Rules",
@@ -128,7 +182,9 @@ def create_db_decommission_workflow(
             "workflow_id": workflow_id
         },
         depends_on=["apply_refactoring"],
-        timeout_seconds=180
+        timeout_seconds=180,
+        # Forks, commits and opens a pull request; not safe to repeat
+        retry_count=0
     )
     .custom_step(
         "quality_assurance", "Quality Assurance & Validation",
@@ -148,16 +204,7 @@ def create_db_decommission_workflow(
         parameters={"database_name": database_name, "workflow_id": workflow_id},
         depends_on=["quality_assurance"],
         timeout_seconds=30
-    )
-    .with_config(
-        max_parallel_steps=4,
-        default_timeout=120,
-        stop_on_error=False,
-        default_retry_count=3
-    )
-    .build())
-    
-    return workflow
+    ))
 
 
 async def run_decommission(
@@ -165,7 +212,9 @@ async def run_decommission(
     target_repos: Optional[List[str]] = None,
     slack_channel: str = "C01234567",
     workflow_id: Optional[str] = None,
-    mock_mode: bool = False
+    mock_mode: bool = False,
+    resume: bool = False,
+    checkpoint_dir: Optional[str] = None
 ) -> Any:
     """
     Execute the database decommissioning workflow.
@@ -176,6 +225,13 @@ async def run_decommission(
         slack_channel: Slack channel ID for notifications
         workflow_id: Unique workflow identifier
         mock_mode: Whether to use mock data from tests/data/ directory
+        resume: Reuse checkpointed results of steps whose inputs did not change
+            since the previous run (e.g. skip repository processing when only
+            PR creation failed)
+        checkpoint_dir: Directory to checkpoint step results in (default
+            DEFAULT_CHECKPOINT_DIR). Every run is checkpointed; a successful
+            run deletes its checkpoints and checkpoints older than
+            DEFAULT_CHECKPOINT_MAX_AGE_SECONDS are pruned
         
     Returns:
         Workflow execution result
@@ -199,6 +255,8 @@ async def run_decommission(
         config_path="mcp_config.json",
         workflow_id=workflow_id
     )
+    if checkpoint_dir:
+        workflow.config.checkpoint_dir = checkpoint_dir
     
     # Initialize structured logger
     workflow_id = f"db-decommission-{database_name}-{int(time.time())}"
@@ -213,7 +271,7 @@ async def run_decommission(
     
     try:
         # Execute workflow
-        result = await workflow.execute()
+        result = await workflow.execute(resume=resume)
         
         # Log final results
         logger.log_info("Workflow Execution Complete!")
@@ -5,7 +5,6 @@ This module provides comprehensive error handling, recovery mechanisms,
 and error reporting for production deployment.
 """
 
-import asyncio
 import traceback
 import time
 import logging
@@ -17,6 +16,9 @@ from enum import Enum
 import json
 import uuid # Add this import
 
+from utils.retry import RetryEngine, RetryPolicy, get_retry_budget
+from utils.exceptions import MCPRetryError
+
 logger = logging.getLogger(__name__)
 
 class ErrorSeverity(Enum):
@@ -63,33 +65,47 @@ class ErrorContext:
         return result
 
 class ErrorRecoveryStrategy:
-    """Base class for error recovery strategies."""
+    """Base class for error recovery strategies (backed by the shared RetryEngine)."""
     
-    def __init__(self, max_retries: int = 3, backoff_factor: float = 2.0):
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 2.0, jitter: bool = True,
+                 budget_key: str = "error_recovery"):
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        # Retry budget (see utils.retry.get_retry_budget) used unless the
+        # caller names the server the operation talks to
+        self.budget_key = budget_key
+        self.policy = RetryPolicy(
+            max_attempts=max_retries + 1,
+            base_delay=1.0,
+            multiplier=backoff_factor,
+            max_delay=60.0,
+            jitter=jitter
+        )
     
     async def execute_with_recovery(self,
                                   operation: Callable,
                                   *args,
                                   **kwargs) -> Any:
         """Execute operation with recovery strategy."""
-        last_error = None
+        return await self.recover(lambda: operation(*args, **kwargs))
+
+    async def recover(self, call: Callable, server_name: Optional[str] = None) -> Any:
+        """
+        Run call (a zero-argument coroutine function) with retries, drawing
+        on the retry budget of server_name, or of this strategy's budget key.
+        """
+        def on_retry(attempt: int, delay: float, error: Exception) -> None:
+            logger.warning(f"Attempt {attempt} failed, retrying in {delay:.1f}s: {error}")
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                return await operation(*args, **kwargs)
-            except Exception as e:
-                last_error = e
-                
-                if attempt < self.max_retries:
-                    delay = self.backoff_factor ** attempt
-                    logger.warning(f"Attempt {attempt + 1} failed, retrying in {delay}s: {e}")
-                    await asyncio.sleep(delay)
-                else:
-                    logger.error(f"All {self.max_retries + 1} attempts failed")
-                    
-        raise last_error
+        budget = get_retry_budget(server_name or self.budget_key)
+        try:
+            return await RetryEngine(self.policy, budget=budget).run(call, on_retry=on_retry)
+        except MCPRetryError as e:
+            if e.reason == "exhausted":
+                logger.error(f"All {e.attempts} attempts failed")
+            else:
+                logger.error(f"Giving up after {e.attempts} attempts ({e.reason})")
+            raise e.last_error
 
 class CircuitBreaker:
     """Circuit breaker pattern for external service calls."""
@@ -153,10 +169,14 @@ class ErrorHandler:
     def _setup_default_strategies(self):
         """Setup default recovery strategies for different error types."""
         self.recovery_strategies = {
-            ErrorCategory.NETWORK: ErrorRecoveryStrategy(max_retries=3, backoff_factor=2.0),
-            ErrorCategory.EXTERNAL_SERVICE: ErrorRecoveryStrategy(max_retries=2, backoff_factor=3.0),
-            ErrorCategory.RESOURCE: ErrorRecoveryStrategy(max_retries=1, backoff_factor=1.0),
-            ErrorCategory.AUTHENTICATION: ErrorRecoveryStrategy(max_retries=1, backoff_factor=1.0)
+            ErrorCategory.NETWORK: ErrorRecoveryStrategy(
+                max_retries=3, backoff_factor=2.0, budget_key="error_recovery:network"),
+            ErrorCategory.EXTERNAL_SERVICE: ErrorRecoveryStrategy(
+                max_retries=2, backoff_factor=3.0, budget_key="error_recovery:external_service"),
+            ErrorCategory.RESOURCE: ErrorRecoveryStrategy(
+                max_retries=1, backoff_factor=1.0, budget_key="error_recovery:resource"),
+            ErrorCategory.AUTHENTICATION: ErrorRecoveryStrategy(
+                max_retries=1, backoff_factor=1.0, budget_key="error_recovery:authentication")
         }
     
     def get_circuit_breaker(self, service_name: str) -> CircuitBreaker:
@@ -257,14 +277,20 @@ class ErrorHandler:
                                         workflow_id: str = None,
                                         database_name: str = None,
                                         repository_url: str = None,
+                                        server_name: str = None,
                                         **kwargs) -> Any:
-        """Execute operation with comprehensive error handling."""
+        """
+        Execute operation with comprehensive error handling.
+
+        Retries of an operation against an MCP server draw on that server's
+        retry budget when server_name is given.
+        """
         
         try:
             # Use recovery strategy if available
             if error_category in self.recovery_strategies:
                 strategy = self.recovery_strategies[error_category]
-                return await strategy.execute_with_recovery(operation, *args, **kwargs)
+                return await strategy.recover(lambda: operation(*args, **kwargs), server_name=server_name)
             else:
                 return await operation(*args, **kwargs)
                 
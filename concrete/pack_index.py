@@ -0,0 +1,299 @@
+"""
+Persistent Repomix Pack Index.
+
+Every discovery run used to reparse a Repomix pack and reclassify each of its
+files, although a saved pack never changes. PackIndex records once, per file
+of a pack:
+
+- its byte offset and length within the pack, so the content can be sliced
+  straight out of the memory-mapped file,
+- the SHA-256 of those bytes,
+- its SourceTypeClassifier classification,
+- its line-start table (character offsets of every line in the decoded
+  text), so line numbers of matches need no further newline scan.
+
+The index is pickled to a sidecar file next to the pack ("<pack>.index") and
+is only trusted while the pack's size and modification time are unchanged.
+Running discovery for a second database against the same pack then needs
+neither parsing nor classification, and find_candidates() narrows a search
+to the files containing a literal with one pass over the raw pack.
+
+Sidecars are written by the repository processors when they cache a pack
+(index_repo_pack); readers fall back to an in-memory index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Dict, Iterator, List, Optional, Sequence, Type, TypeVar, Union
+
+from concrete.source_type_classifier import ClassificationResult, SourceType, SourceTypeClassifier
+from utils.repomix_pack import PackEntry, RepomixPack
+
+logger = logging.getLogger(__name__)
+
+_NEWLINE = re.compile("\n")
+
+# PackEntry or IndexedFile
+Entry = TypeVar("Entry")
+Sidecar = TypeVar("Sidecar", bound="PackSidecar")
+
+
+def index_path_for(pack_path: Union[str, Path], suffix: str = ".index") -> Path:
+    """Path of a sidecar file belonging to a pack."""
+    pack_path = Path(pack_path)
+    return pack_path.with_name(pack_path.name + suffix)
+
+
+def line_starts_of(text: str) -> array:
+    """Character offset at which each line of text starts."""
+    starts = array("L", [0])
+    starts.extend(newline.end() for newline in _NEWLINE.finditer(text))
+    return starts
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """One file of an indexed pack."""
+    path: str
+    offset: int  # bytes, within the pack
+    length: int  # bytes
+    sha256: str
+    classification: ClassificationResult
+    line_starts: array
+
+    @property
+    def entry(self) -> PackEntry:
+        return PackEntry(path=self.path, offset=self.offset, length=self.length)
+
+    @property
+    def source_type(self) -> SourceType:
+        return self.classification.source_type
+
+    def line_number(self, position: int) -> int:
+        """1-based line containing a character position of the decoded text."""
+        return bisect_right(self.line_starts, position)
+
+
+@dataclass
+class PackSidecar:
+    """
+    Data derived from a pack, pickled next to it and trusted only while the
+    pack's size and modification time are unchanged.
+    """
+    # Sidecar file name suffix, and layout version: bump it when the pickled
+    # layout changes, older sidecars are then rebuilt
+    SUFFIX: ClassVar[str] = ".index"
+    VERSION: ClassVar[int] = 1
+
+    pack_path: Path
+    pack_size: int
+    pack_mtime_ns: int
+
+    def __post_init__(self):
+        self.version = self.VERSION
+
+    @staticmethod
+    def _stat(pack_path: Union[str, Path]) -> Dict[str, object]:
+        """Constructor arguments identifying the current state of a pack."""
+        pack_path = Path(pack_path).resolve()
+        stat = pack_path.stat()
+        return {"pack_path": pack_path, "pack_size": stat.st_size, "pack_mtime_ns": stat.st_mtime_ns}
+
+    @classmethod
+    def sidecar_path(cls, pack_path: Union[str, Path]) -> Path:
+        return index_path_for(pack_path, cls.SUFFIX)
+
+    @classmethod
+    def sidecar_is_newer(cls, pack_path: Union[str, Path]) -> bool:
+        """
+        Whether the pack's sidecar file exists and was written after the pack
+        last changed; a cheap check that does not load the sidecar.
+        """
+        try:
+            return cls.sidecar_path(pack_path).stat().st_mtime_ns >= Path(pack_path).stat().st_mtime_ns
+        except OSError:
+            return False
+
+    def is_current(self) -> bool:
+        """Whether the pack is unchanged since this was derived from it."""
+        try:
+            stat = self.pack_path.stat()
+        except OSError:
+            return False
+        return (self.version == self.VERSION
+                and stat.st_size == self.pack_size
+                and stat.st_mtime_ns == self.pack_mtime_ns)
+
+    def save(self, path: Union[str, Path, None] = None) -> Path:
+        """Atomically pickle to path, by default the pack's sidecar file."""
+        path = Path(path) if path is not None else self.sidecar_path(self.pack_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Saved {type(self).__name__} for {self.pack_path} to {path}")
+        return path
+
+    @classmethod
+    def load(cls: Type[Sidecar], path: Union[str, Path]) -> Sidecar:
+        """Load a sidecar written by save()."""
+        with open(path, "rb") as f:
+            sidecar = pickle.load(f)
+        if not isinstance(sidecar, cls):
+            raise ValueError(f"{path} does not contain a {cls.__name__}")
+        return sidecar
+
+    @classmethod
+    def current(cls: Type[Sidecar], pack_path: Union[str, Path]) -> Optional[Sidecar]:
+        """Return the pack's sidecar, or None if it is missing, unreadable or stale."""
+        path = cls.sidecar_path(pack_path)
+        if not path.exists():
+            return None
+        try:
+            sidecar = cls.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable pack sidecar {path}: {e}")
+            return None
+        if not sidecar.is_current() or sidecar.pack_path != Path(pack_path).resolve():
+            logger.debug(f"Pack sidecar {path} is stale")
+            return None
+        return sidecar
+
+
+@dataclass
+class PackIndex(PackSidecar):
+    """Per-file offsets, hashes, classifications and line tables of a pack."""
+    files: List[IndexedFile] = field(default_factory=list)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._by_path: Dict[str, IndexedFile] = {f.path: f for f in self.files}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_by_path"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._by_path = {f.path: f for f in self.files}
+
+    def __iter__(self) -> Iterator[IndexedFile]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def get(self, path: str) -> Optional[IndexedFile]:
+        return self._by_path.get(path)
+
+    @classmethod
+    def build(
+        cls,
+        pack_path: Union[str, Path],
+        classifier: Optional[SourceTypeClassifier] = None
+    ) -> PackIndex:
+        """Parse and classify every file of a pack."""
+        identity = cls._stat(pack_path)
+        classifier = classifier or SourceTypeClassifier()
+        files = []
+        with RepomixPack(pack_path) as pack:
+            for entry in pack:
+                with pack.content(entry) as view:
+                    digest = hashlib.sha256(view).hexdigest()
+                text = pack.text(entry)
+                files.append(IndexedFile(
+                    path=entry.path,
+                    offset=entry.offset,
+                    length=entry.length,
+                    sha256=digest,
+                    classification=classifier.classify_file(entry.path, text),
+                    line_starts=line_starts_of(text),
+                ))
+        logger.debug(f"Indexed {len(files)} files of {pack_path}")
+        return cls(**identity, files=files)
+
+    def find_candidates(self, pack: RepomixPack, literal: str) -> List[IndexedFile]:
+        """Indexed files whose raw content contains literal; see find_candidates()."""
+        return find_candidates(pack, self.files, literal)
+
+
+def find_candidates(pack: RepomixPack, entries: Sequence[Entry], literal: str) -> List[Entry]:
+    """
+    Entries (in pack order) whose raw content contains literal, ignoring
+    ASCII case.
+
+    One regex pass over the memory-mapped pack replaces decoding and
+    searching every file. Non-ASCII literals cannot be matched reliably on
+    raw bytes, so every entry is a candidate for them.
+    """
+    if not literal or not literal.isascii():
+        return list(entries)
+
+    pattern = re.compile(re.escape(literal.encode("ascii")), re.IGNORECASE)
+    offsets = [entry.offset for entry in entries]
+    candidates = []
+    position = 0
+    while offsets:
+        hit = pack.search(pattern, position)
+        if hit is None:
+            break
+        index = bisect_right(offsets, hit.start()) - 1
+        if index < 0:
+            position = offsets[0]
+            continue
+        entry = entries[index]
+        if hit.end() <= entry.offset + entry.length:
+            candidates.append(entry)
+            # One hit is enough; continue with the next file
+            position = entry.offset + entry.length
+        else:
+            # Hit in markup between files, or straddling the closing tag
+            position = hit.start() + 1
+    return candidates
+
+
+def current_pack_index(pack_path: Union[str, Path]) -> Optional[PackIndex]:
+    """Return the pack's sidecar index, or None if it is missing or stale."""
+    return PackIndex.current(pack_path)
+
+
+def load_pack_index(
+    pack_path: Union[str, Path],
+    classifier: Optional[SourceTypeClassifier] = None,
+    save: bool = False
+) -> PackIndex:
+    """
+    Return the sidecar index of a pack if it is current, otherwise build one.
+
+    Args:
+        pack_path: Repomix pack file
+        classifier: Classifier for files that need indexing
+        save: Write a newly built index to the pack's sidecar file
+    """
+    index = current_pack_index(pack_path)
+    if index is not None:
+        return index
+
+    index = PackIndex.build(pack_path, classifier)
+    if save:
+        try:
+            index.save()
+        except OSError as e:
+            logger.warning(f"Could not save pack index for {pack_path}: {e}")
+    return index
@@ -0,0 +1,194 @@
+"""
+Parallel Sharded Pack Scanning.
+
+Reference extraction and pattern discovery scan the files of a Repomix pack
+one after another on the event loop, keeping a single core busy. For packs
+large enough to repay the hand-off, the scan is sharded across the shared
+CPU process pool (utils.process_pool):
+
+- every file to scan becomes one or more segments: byte ranges of the pack,
+  cut at line boundaries once they exceed the chunk size, so one huge SQL
+  dump is split across workers instead of straggling,
+- consecutive segments are grouped into work units of about the chunk size
+  and submitted largest first,
+- workers memory-map the pack themselves, so only (offset, length, pattern)
+  descriptions travel to them, and return compact records: match counts,
+  or (pattern index, line, line text) for matching lines only,
+- results are merged in file order, then chunk order, so output is the same
+  as a serial scan regardless of which worker finished first.
+
+Line numbers stay exact because chunks end just after a newline: a chunk's
+first line number is one more than the newlines in the chunks before it.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from concrete.pattern_scanner import ScanMatch, get_scanner
+from utils.process_pool import process_pool_workers, run_in_process
+from utils.repomix_pack import PackEntry, RepomixPack
+
+logger = logging.getLogger(__name__)
+
+_NEWLINE_BYTES = re.compile(b"\n")
+
+# Packs smaller than this are scanned serially; below it worker hand-off
+# costs more than it saves
+_min_parallel_bytes = 8 << 20
+# Target size of a segment and of a work unit
+_chunk_bytes = 1 << 20
+
+
+def configure_parallel_scan(min_pack_bytes: Optional[int] = None, chunk_bytes: Optional[int] = None) -> None:
+    """
+    Tune parallel scanning.
+
+    Args:
+        min_pack_bytes: Smallest pack scanned in parallel
+        chunk_bytes: Target size of segments and work units
+    """
+    global _min_parallel_bytes, _chunk_bytes
+    if min_pack_bytes is not None:
+        _min_parallel_bytes = min_pack_bytes
+    if chunk_bytes is not None:
+        _chunk_bytes = max(1, chunk_bytes)
+
+
+def should_scan_in_parallel(pack_bytes: int) -> bool:
+    """Whether a pack of this size is worth scanning in the process pool."""
+    return pack_bytes >= _min_parallel_bytes and process_pool_workers() > 1
+
+
+@dataclass(frozen=True)
+class ScanSegment:
+    """A line-aligned byte range of one file of a pack, with what to scan it for."""
+    file: int  # position of the file in the caller's list
+    chunk: int
+    offset: int
+    length: int
+    patterns: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SegmentResult:
+    """What a worker found in one segment."""
+    file: int
+    chunk: int
+    newlines: int
+    # Count mode: occurrences of all patterns
+    count: int = 0
+    # Match mode: (pattern index, line number within the segment, line)
+    matches: Tuple[Tuple[int, int, str], ...] = ()
+
+
+def plan_segments(
+    pack: RepomixPack,
+    files: Sequence[Tuple[PackEntry, Tuple[str, ...]]],
+    chunk_bytes: Optional[int] = None
+) -> List[ScanSegment]:
+    """Cut each (entry, patterns) into segments ending just after a newline."""
+    chunk_bytes = chunk_bytes or _chunk_bytes
+    segments = []
+    for position, (entry, patterns) in enumerate(files):
+        start, chunk = entry.offset, 0
+        while True:
+            cut = entry.end
+            if entry.end - start > chunk_bytes:
+                newline = pack.search(_NEWLINE_BYTES, start + chunk_bytes - 1)
+                if newline is not None and newline.end() < entry.end:
+                    cut = newline.end()
+            segments.append(ScanSegment(position, chunk, start, cut - start, patterns))
+            if cut >= entry.end:
+                break
+            start, chunk = cut, chunk + 1
+    return segments
+
+
+def group_units(segments: Sequence[ScanSegment], unit_bytes: Optional[int] = None) -> List[List[ScanSegment]]:
+    """Group consecutive segments into work units, largest unit first."""
+    unit_bytes = unit_bytes or _chunk_bytes
+    units: List[List[ScanSegment]] = []
+    current: List[ScanSegment] = []
+    size = 0
+    for segment in segments:
+        if current and size + segment.length > unit_bytes:
+            units.append(current)
+            current, size = [], 0
+        current.append(segment)
+        size += segment.length
+    if current:
+        units.append(current)
+    units.sort(key=lambda unit: sum(segment.length for segment in unit), reverse=True)
+    return units
+
+
+def scan_segments(pack_path: str, segments: Sequence[ScanSegment], count_only: bool) -> List[SegmentResult]:
+    """
+    Worker entry point: scan segments of a pack.
+
+    In count mode every non-overlapping occurrence of every pattern is
+    counted (re.findall semantics); otherwise each segment is scanned with
+    a MultiPatternScanner for matching lines.
+    """
+    results = []
+    with RepomixPack(pack_path) as pack:
+        for segment in segments:
+            text = pack.text(PackEntry("", segment.offset, segment.length))
+            newlines = text.count("\n")
+            if count_only:
+                count = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in segment.patterns)
+                results.append(SegmentResult(segment.file, segment.chunk, newlines, count=count))
+            else:
+                index = {pattern: i for i, pattern in enumerate(segment.patterns)}
+                matches = tuple((index[pattern], line_number, line)
+                                for pattern, line_number, line in get_scanner(segment.patterns).scan(text))
+                results.append(SegmentResult(segment.file, segment.chunk, newlines, matches=matches))
+    return results
+
+
+async def _run_segments(pack: RepomixPack, segments: List[ScanSegment], count_only: bool) -> List[SegmentResult]:
+    units = group_units(segments)
+    logger.debug(f"Scanning {len(segments)} segments of {pack.path} in {len(units)} work units")
+    unit_results = await asyncio.gather(
+        *(run_in_process(scan_segments, str(pack.path), unit, count_only) for unit in units)
+    )
+    return sorted((result for results in unit_results for result in results),
+                  key=lambda result: (result.file, result.chunk))
+
+
+async def count_matches_parallel(
+    pack: RepomixPack,
+    entries: Sequence[PackEntry],
+    pattern: str
+) -> List[int]:
+    """Occurrences of pattern (case-insensitive) in each entry, in entry order."""
+    segments = plan_segments(pack, [(entry, (pattern,)) for entry in entries])
+    counts = [0] * len(entries)
+    for result in await _run_segments(pack, segments, count_only=True):
+        counts[result.file] += result.count
+    return counts
+
+
+async def scan_matches_parallel(
+    pack: RepomixPack,
+    files: Sequence[Tuple[PackEntry, Sequence[str]]]
+) -> List[List[ScanMatch]]:
+    """
+    MultiPatternScanner.scan() results for each (entry, patterns), in order,
+    as if each entry's decoded text had been scanned whole.
+    """
+    segments = plan_segments(pack, [(entry, tuple(patterns)) for entry, patterns in files])
+    scanned: List[List[ScanMatch]] = [[] for _ in files]
+    first_line = {}
+    for result in await _run_segments(pack, segments, count_only=False):
+        # Results arrive in (file, chunk) order, so earlier chunks are counted
+        base = first_line.get(result.file, 0)
+        patterns = files[result.file][1]
+        for pattern_index, line_number, line in result.matches:
+            scanned[result.file].append((patterns[pattern_index], base + line_number, line))
+        first_line[result.file] = base + result.newlines
+    return scanned
+
@@ -10,7 +10,6 @@ This service:
 """
 
 import os
-import json
 import re
 import logging
 from typing import Dict, Any, Optional, List, Set
@@ -18,6 +17,8 @@ from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
 
+from utils.config_snapshot import config_snapshots
+
 logger = logging.getLogger(__name__)
 
 class SecretLevel(Enum):
@@ -120,68 +121,38 @@ class ParameterService:
         ]
     
     def _load_environment(self):
-        """Load environment variables from .env file."""
+        """Load environment variables, then .env values from the shared snapshot."""
         # First, load all system environment variables
         for key, value in os.environ.items():
             self.parameters[key] = value
-            
-        env_path = Path(self.env_file)
-        
-        if env_path.exists():
+
+        snapshot = config_snapshots.get_secrets(self.env_file, self.secrets_file)
+        if Path(self.env_file).exists():
             logger.info(f"📁 Loading environment from {self.env_file}")
-            try:
-                with open(env_path, 'r') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        
-                        # Skip empty lines and comments
-                        if not line or line.startswith('#'):
-                            continue
-                        
-                        # Parse KEY=VALUE format
-                        if '=' in line:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            
-                            self.parameters[key] = value
-                            logger.debug(f"   - Loaded {key} from .env")
-                        else:
-                            self.validation_issues.append(f"Invalid .env format at line {line_num}: {line}")
-                            
-            except Exception as e:
-                self.validation_issues.append(f"Failed to load .env file: {e}")
-                logger.error(f"❌ Failed to load {self.env_file}: {e}")
+            for key, value in snapshot.dotenv.items():
+                self.parameters[key] = value
+                logger.debug(f"   - Loaded {key} from .env")
         else:
             logger.info(f"📁 No .env file found at {self.env_file}")
+        self.validation_issues.extend(snapshot.dotenv_issues)
     
     def _load_secrets(self):
-        """Load secrets from secrets.json, overwriting environment variables."""
-        secrets_path = Path(self.secrets_file)
-        
-        if secrets_path.exists():
+        """Load secrets from the shared snapshot, overwriting environment variables."""
+        snapshot = config_snapshots.get_secrets(self.env_file, self.secrets_file)
+        self.validation_issues.extend(snapshot.secrets_issues)
+
+        if Path(self.secrets_file).exists():
             logger.info(f"🔐 Loading secrets from {self.secrets_file}")
-            try:
-                with open(secrets_path, 'r') as f:
-                    secrets_data = json.load(f)
-                
-                # Flatten nested structures for easier access
-                flattened = self._flatten_json(secrets_data)
-                
-                for key, value in flattened.items():
-                    if key in self.parameters:
-                        logger.debug(f"   - Overwriting {key} from secrets.json")
-                    else:
-                        logger.debug(f"   - Adding {key} from secrets.json")
-                    
-                    self.parameters[key] = value
-                    
-            except json.JSONDecodeError as e:
-                self.validation_issues.append(f"Invalid JSON in secrets.json: {e}")
-                logger.error(f"❌ Invalid JSON in {self.secrets_file}: {e}")
-            except Exception as e:
-                self.validation_issues.append(f"Failed to load secrets.json: {e}")
-                logger.error(f"❌ Failed to load {self.secrets_file}: {e}")
+            # Flatten nested structures for easier access
+            flattened = self._flatten_json(snapshot.secrets_dict())
+
+            for key, value in flattened.items():
+                if key in self.parameters:
+                    logger.debug(f"   - Overwriting {key} from secrets.json")
+                else:
+                    logger.debug(f"   - Adding {key} from secrets.json")
+
+                self.parameters[key] = value
         else:
             logger.info(f"🔐 No secrets file found at {self.secrets_file}")
     
@@ -7,11 +7,17 @@ file discovery in the discover_helm_patterns_step function.
 
 import asyncio
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from pathlib import Path
 import logging
 
+from concrete.pack_index import load_pack_index
+from concrete.parallel_scan import scan_matches_parallel, should_scan_in_parallel
+from concrete.pattern_scanner import ScanMatch, get_scanner
+from concrete.token_index import get_token_index_async
 from concrete.source_type_classifier import SourceTypeClassifier, SourceType, get_database_search_patterns
+from utils.profiling import profile_span
+from utils.repomix_pack import RepomixPack, iter_pack_entries
 
 logger = logging.getLogger(__name__)
 
@@ -48,26 +54,56 @@ class PatternDiscoveryEngine:
         
         return patterns
 
-    def _search_content_for_patterns(self, content: str, patterns: List[str]) -> List[Dict[str, Any]]:
-        """Search content for database patterns."""
-        matches = []
-        lines = content.split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern in patterns:
-                try:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        matches.append({
-                            "pattern": pattern,
-                            "line_number": line_num,
-                            "line_content": line.strip(),
-                            "match_confidence": 0.8  # Base confidence
-                        })
-                except re.error:
-                    # Skip invalid regex patterns
-                    continue
-        
-        return matches
+    def _search_content_for_patterns(
+        self,
+        content: str,
+        patterns: List[str],
+        line_starts: Optional[Sequence[int]] = None,
+        line_numbers: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search content for database patterns.
+
+        Uses a cached MultiPatternScanner, so only lines containing a
+        literal of some pattern are matched against the patterns; invalid
+        regex patterns are skipped. line_starts, when known from a pack
+        index, saves finding the lines of content again; line_numbers from
+        a token index limit the search to those lines.
+        """
+        return self._format_matches(get_scanner(tuple(patterns)).scan(content, line_starts, line_numbers))
+
+    def _format_matches(self, scan_matches: List[ScanMatch]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "pattern": pattern,
+                "line_number": line_number,
+                "line_content": line.strip(),
+                "match_confidence": 0.8  # Base confidence
+            }
+            for pattern, line_number, line in scan_matches
+        ]
+
+    def _can_scan_in_parallel(self, repo_analysis: Dict[str, Any]) -> bool:
+        """Whether the analyzed files can be scanned from their pack in the process pool."""
+        return (bool(repo_analysis.get("pack_path"))
+                and should_scan_in_parallel(repo_analysis.get("total_size", 0))
+                and all("pack_entry" in file_info for file_info in repo_analysis["files"]))
+
+    async def _search_files_in_parallel(
+        self,
+        pack_path: str,
+        to_scan: List[Tuple[Dict[str, Any], Any, List[str], Optional[Sequence[int]]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Pattern matches of each (file, classification, patterns, _), sharded across the process pool."""
+        scannable = [i for i, (_, _, patterns, _) in enumerate(to_scan) if patterns]
+        with RepomixPack(pack_path) as pack:
+            scanned = await scan_matches_parallel(
+                pack, [(to_scan[i][0]["pack_entry"], to_scan[i][2]) for i in scannable]
+            )
+        all_matches: List[List[Dict[str, Any]]] = [[] for _ in to_scan]
+        for i, scan_matches in zip(scannable, scanned):
+            all_matches[i] = self._format_matches(scan_matches)
+        return all_matches
 
     async def analyze_repository_structure(
         self, 
@@ -87,31 +123,7 @@ class PatternDiscoveryEngine:
                 
                 if test_data_file.exists():
                     logger.info(f"📄 Reading from local test data: {test_data_file}")
-                    with open(test_data_file, 'r', encoding='utf-8') as f:
-                        full_content = f.read()
-                    
-                    logger.info(f"🔍 Read {len(full_content)} characters from local file")
-                    
-                    # Parse repository content using the same method as tests
-                    files = self._parse_repomix_content(full_content)
-                    
-                    logger.info(f"🔍 Parsed {len(files)} files from local packed repository")
-                    
-                    structure_analysis = {
-                        "total_files": len(files),
-                        "file_types": self._analyze_file_types(files),
-                        "directory_structure": self._analyze_directory_structure(files),
-                        "estimated_size": len(full_content)
-                    }
-                    
-                    logger.info(f"✅ Repository analysis complete: {len(files)} files found")
-                    
-                    return {
-                        "files": files,
-                        "structure": structure_analysis,
-                        "total_size": len(full_content),
-                        "source": "local_test_data"
-                    }
+                    return self._analyze_local_pack(test_data_file)
                 else:
                     logger.warning(f"Test data file not found: {test_data_file}")
             
@@ -173,6 +185,42 @@ class PatternDiscoveryEngine:
                 }
             return {"files": [], "structure": {}, "total_size": 0, "error": str(e)}
 
+    def _analyze_local_pack(self, pack_path: Path) -> Dict[str, Any]:
+        """Repository analysis of a Repomix pack on disk."""
+        # Slice files out of the pack at the offsets of its index, which
+        # also carries each file's classification
+        with RepomixPack(pack_path) as pack:
+            pack_size = pack.size
+            logger.info(f"🔍 Reading {pack_size} bytes from local file")
+            with profile_span("repomix.parse", "cpu", bytes=pack_size):
+                index = load_pack_index(pack_path, self.classifier)
+                files = []
+                for indexed in index:
+                    file_info = self._pack_file(indexed.path, pack.text(indexed.entry))
+                    file_info["classification"] = indexed.classification
+                    file_info["line_starts"] = indexed.line_starts
+                    file_info["pack_entry"] = indexed.entry
+                    files.append(file_info)
+        
+        logger.info(f"🔍 Parsed {len(files)} files from local packed repository")
+        
+        structure_analysis = {
+            "total_files": len(files),
+            "file_types": self._analyze_file_types(files),
+            "directory_structure": self._analyze_directory_structure(files),
+            "estimated_size": pack_size
+        }
+        
+        logger.info(f"✅ Repository analysis complete: {len(files)} files found")
+        
+        return {
+            "files": files,
+            "structure": structure_analysis,
+            "total_size": pack_size,
+            "pack_path": str(pack_path),
+            "source": "local_test_data"
+        }
+
     def _parse_repomix_content(self, content: str) -> List[Dict[str, Any]]:
         """Parse Repomix output to extract individual files."""
         files = []
@@ -180,18 +228,10 @@ class PatternDiscoveryEngine:
         logger.info(f"🔍 Parsing Repomix content: {len(content)} characters")
         
         # Repomix formats files with XML-like markers
-        file_pattern = r'<file path="([^"]+)">\s*\n(.*?)\n</file>'
-        matches = re.findall(file_pattern, content, re.DOTALL)
-        
-        logger.info(f"🔍 Found {len(matches)} file matches in Repomix content")
+        for entry in iter_pack_entries(content):
+            files.append(self._pack_file(entry.path, content[entry.offset:entry.end]))
         
-        for file_path, file_content in matches:
-            files.append({
-                "path": file_path,
-                "content": file_content,
-                "size": len(file_content),
-                "type": self._get_file_type(file_path)
-            })
+        logger.info(f"🔍 Found {len(files)} file matches in Repomix content")
         
         # Log first few file paths for debugging
         if files:
@@ -204,6 +244,15 @@ class PatternDiscoveryEngine:
         
         return files
 
+    def _pack_file(self, file_path: str, file_content: str) -> Dict[str, Any]:
+        """File record for one file of a Repomix pack."""
+        return {
+            "path": file_path,
+            "content": file_content,
+            "size": len(file_content),
+            "type": self._get_file_type(file_path)
+        }
+
     def _get_file_type(self, file_path: str) -> str:
         """Get file type from path."""
         path = Path(file_path)
@@ -453,6 +502,24 @@ if __name__ == '__main__':
             }
         ]
 
+    async def _indexed_candidate_lines(
+        self,
+        repo_analysis: Dict[str, Any],
+        database_name: str
+    ) -> Optional[Dict[int, List[int]]]:
+        """
+        Candidate lines per file position from the token index of the
+        analyzed pack, or None when every file has to be scanned. A missing
+        index is built in the process pool if token indexing is enabled.
+        """
+        pack_path = repo_analysis.get("pack_path")
+        if not pack_path:
+            return None
+        tokens = await get_token_index_async(pack_path)
+        if tokens is None or tokens.paths != [f["path"] for f in repo_analysis["files"]]:
+            return None
+        return tokens.lookup(database_name)
+
     async def discover_patterns_in_repository(
         self,
         repomix_client,
@@ -486,54 +553,81 @@ if __name__ == '__main__':
             # Step 2: Compile search patterns for this database
             database_patterns = self._compile_database_patterns(database_name)
             
-            # Step 3: Search each file for database patterns
+            # Step 3: Search each file for database patterns: only the
+            # candidate lines of a token index, across the process pool for
+            # large packs, or serially
             matched_files = []
             files_by_type = {}
             confidence_scores = []
+            candidate_lines = await self._indexed_candidate_lines(repo_analysis, database_name)
+            parallel = candidate_lines is None and self._can_scan_in_parallel(repo_analysis)
             
-            for file_info in repo_analysis["files"]:
-                file_path = file_info["path"]
-                file_content = file_info["content"]
+            with profile_span("pattern.scan", "cpu", database=database_name, files=len(repo_analysis["files"]),
+                              token_index=candidate_lines is not None, parallel=parallel):
+                to_scan = []
+                for position, file_info in enumerate(repo_analysis["files"]):
+                    line_numbers = None
+                    if candidate_lines is not None:
+                        line_numbers = candidate_lines.get(position)
+                        if line_numbers is None:
+                            # No line mentions the database
+                            continue
+                    file_path = file_info["path"]
+                    file_content = file_info["content"]
                 
-                # Classify file type using the source type classifier
-                classification = self.classifier.classify_file(file_path, file_content)
-                source_type = classification.source_type
+                    # Classify file type using the source type classifier,
+                    # unless the pack index already did
+                    classification = file_info.get("classification")
+                    if classification is None:
+                        classification = self.classifier.classify_file(file_path, file_content)
+                    source_type = classification.source_type
                 
-                # Get relevant patterns for this source type
-                relevant_patterns = database_patterns.get(source_type, [])
-                if not relevant_patterns and source_type != SourceType.UNKNOWN:
-                    # Fallback to general patterns
-                    relevant_patterns = database_patterns.get(SourceType.UNKNOWN, [])
+                    # Get relevant patterns for this source type
+                    relevant_patterns = database_patterns.get(source_type, [])
+                    if not relevant_patterns and source_type != SourceType.UNKNOWN:
+                        # Fallback to general patterns
+                        relevant_patterns = database_patterns.get(SourceType.UNKNOWN, [])
+                    to_scan.append((file_info, classification, relevant_patterns, line_numbers))
                 
                 # Search for patterns in file content
-                pattern_matches = self._search_content_for_patterns(file_content, relevant_patterns)
+                if parallel:
+                    all_matches = await self._search_files_in_parallel(repo_analysis["pack_path"], to_scan)
+                else:
+                    all_matches = [
+                        self._search_content_for_patterns(
+                            file_info["content"], patterns, file_info.get("line_starts"), line_numbers
+                        )
+                        for file_info, _, patterns, line_numbers in to_scan
+                    ]
                 
-                if pattern_matches:
-                    # Calculate overall confidence for this file
-                    file_confidence = min(
-                        classification.confidence + 
-                        (len(pattern_matches) * 0.1),  # Boost for multiple matches
-                        1.0
-                    )
+                for (file_info, classification, _, _), pattern_matches in zip(to_scan, all_matches):
+                    if pattern_matches:
+                        source_type = classification.source_type
+                        # Calculate overall confidence for this file
+                        file_confidence = min(
+                            classification.confidence + 
+                            (len(pattern_matches) * 0.1),  # Boost for multiple matches
+                            1.0
+                        )
                     
-                    file_result = {
-                        "path": file_path,
-                        "content": file_content,
-                        "source_type": source_type.value,
-                        "classification": classification,
-                        "pattern_matches": pattern_matches,
-                        "confidence": file_confidence,
-                        "match_count": len(pattern_matches)
-                    }
+                        file_result = {
+                            "path": file_info["path"],
+                            "content": file_info["content"],
+                            "source_type": source_type.value,
+                            "classification": classification,
+                            "pattern_matches": pattern_matches,
+                            "confidence": file_confidence,
+                            "match_count": len(pattern_matches)
+                        }
                     
-                    matched_files.append(file_result)
-                    confidence_scores.append(file_confidence)
+                        matched_files.append(file_result)
+                        confidence_scores.append(file_confidence)
                     
-                    # Group by source type
-                    type_key = source_type.value
-                    if type_key not in files_by_type:
-                        files_by_type[type_key] = []
-                    files_by_type[type_key].append(file_result)
+                        # Group by source type
+                        type_key = source_type.value
+                        if type_key not in files_by_type:
+                            files_by_type[type_key] = []
+                        files_by_type[type_key].append(file_result)
             
             # Step 4: Calculate overall discovery metrics
             discovery_result = {
@@ -0,0 +1,197 @@
+"""
+Single-Pass Multi-Pattern Scanner.
+
+PatternDiscoveryEngine searches every file for ~35 database-name regexes.
+Running each of them on each line costs O(lines x patterns) regex calls,
+which dominates discovery on large monorepos. MultiPatternScanner instead:
+
+1. extracts from every pattern a literal it cannot match without (e.g.
+   "postgres_air" from r'\\bpostgres_air\\b'),
+2. finds lines containing any of those literals with one combined,
+   case-insensitive alternation run over the whole file in C,
+3. confirms the individual precompiled patterns on those candidate lines
+   only.
+
+Line numbers of candidates come from bisecting the file's line-start
+offsets, so files without any candidate are never split into lines. Results are the
+same as searching every (line, pattern) pair: one match per pattern per
+line, in line order and then pattern order.
+"""
+
+import logging
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NEWLINE = re.compile("\n")
+
+# (pattern, line number, line) of one pattern match
+ScanMatch = Tuple[str, int, str]
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Index just past the character class starting at pattern[i] == '['."""
+    i += 1
+    if pattern[i:i + 1] == "^":
+        i += 1
+    if pattern[i:i + 1] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Return the longest literal that every match of pattern contains, or
+    None when there is no such literal (e.g. a top-level alternation).
+
+    Conservative: anything inside groups, character classes and optional
+    atoms is treated as unknown, which only shortens the literal.
+    """
+    runs: List[str] = []
+    current = ""
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        atom = None
+        if c == "\\":
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            # \b, \s, \d, \1 ... are not literal characters
+            if escaped and not (escaped.isalnum() or escaped == "_"):
+                atom = escaped
+        elif c == "[":
+            i = _skip_class(pattern, i)
+        elif c == "(":
+            depth += 1
+            i += 1
+        elif c == ")":
+            depth -= 1
+            i += 1
+        elif c == "|":
+            if depth == 0:
+                return None
+            i += 1
+        elif c == "{":
+            closing = pattern.find("}", i)
+            i = len(pattern) if closing < 0 else closing + 1
+        elif c in ".^$*+?}":
+            i += 1
+        else:
+            atom = c
+            i += 1
+
+        if atom is not None and depth == 0:
+            quantifier = pattern[i:i + 1]
+            if quantifier == "+":
+                current += atom
+            elif quantifier not in ("*", "?", "{"):
+                current += atom
+                continue
+        if current:
+            runs.append(current)
+            current = ""
+    if current:
+        runs.append(current)
+    return max(runs, key=len) if runs else None
+
+
+class MultiPatternScanner:
+    """Finds which of a fixed list of regexes match which lines of a text."""
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        self.patterns: List[Tuple[str, re.Pattern]] = []
+        literals = {}
+        prefilterable = True
+        for pattern in patterns:
+            try:
+                compiled = re.compile(pattern, flags)
+            except re.error as e:
+                logger.debug(f"Skipping invalid pattern {pattern!r}: {e}")
+                continue
+            self.patterns.append((pattern, compiled))
+            literal = None if compiled.flags & re.VERBOSE else required_literal(pattern)
+            if not literal or "\n" in literal:
+                prefilterable = False
+            else:
+                literals.setdefault(literal.lower(), literal)
+
+        # Without a literal for every pattern, every line is a candidate
+        self._prefilter: Optional[re.Pattern] = None
+        if prefilterable and literals:
+            # A line containing a longer literal also contains any literal inside it
+            needed: List[str] = []
+            for key in sorted(literals, key=len):
+                if not any(shorter in key for shorter in needed):
+                    needed.append(key)
+            ordered = sorted((literals[key] for key in needed), key=len, reverse=True)
+            self._prefilter = re.compile("|".join(re.escape(literal) for literal in ordered), flags)
+
+    def scan(
+        self,
+        content: str,
+        line_starts: Optional[Sequence[int]] = None,
+        line_numbers: Optional[Iterable[int]] = None
+    ) -> List[ScanMatch]:
+        """
+        Return (pattern, line number, line) for every pattern matching a line.
+
+        line_starts optionally supplies the offset at which each line of
+        content starts (see concrete.pack_index), saving the newline scan.
+        line_numbers, when already known to cover every line that can match
+        (see concrete.token_index), replaces the prefilter.
+        """
+        if not self.patterns:
+            return []
+        if line_numbers is not None:
+            lines = self._numbered_lines(content, line_starts, line_numbers)
+        else:
+            lines = self._candidate_lines(content, line_starts)
+        return self._confirm(lines)
+
+    def _confirm(self, lines: Iterable[Tuple[int, str]]) -> List[ScanMatch]:
+        matches = []
+        for line_number, line in lines:
+            for pattern, compiled in self.patterns:
+                if compiled.search(line):
+                    matches.append((pattern, line_number, line))
+        return matches
+
+    @staticmethod
+    def _numbered_lines(
+        content: str,
+        line_starts: Optional[Sequence[int]],
+        line_numbers: Iterable[int]
+    ) -> Iterator[Tuple[int, str]]:
+        if line_starts is None:
+            line_starts = [0] + [newline.end() for newline in _NEWLINE.finditer(content)]
+        for line_number in line_numbers:
+            start = line_starts[line_number - 1]
+            end = line_starts[line_number] - 1 if line_number < len(line_starts) else len(content)
+            yield line_number, content[start:end]
+
+    def _candidate_lines(self, content: str, line_starts: Optional[Sequence[int]]) -> Iterator[Tuple[int, str]]:
+        if self._prefilter is None:
+            yield from enumerate(content.split("\n"), 1)
+            return
+
+        hit = self._prefilter.search(content)
+        while hit is not None:
+            if line_starts is None:
+                line_starts = [0] + [newline.end() for newline in _NEWLINE.finditer(content)]
+            line_number = bisect_right(line_starts, hit.start())
+            start = line_starts[line_number - 1]
+            end = line_starts[line_number] - 1 if line_number < len(line_starts) else len(content)
+            yield line_number, content[start:end]
+            hit = self._prefilter.search(content, end)
+
+
+@lru_cache(maxsize=128)
+def get_scanner(patterns: Tuple[str, ...]) -> MultiPatternScanner:
+    """Return a scanner for patterns, reusing one built for the same tuple."""
+    return MultiPatternScanner(patterns)
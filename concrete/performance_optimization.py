@@ -15,13 +15,15 @@ from typing import Dict, List, Any, Optional, Callable, Union, TypeVar, Generic
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from functools import wraps, lru_cache
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial, wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import aiohttp
 import aiofiles
 import logging
 from enum import Enum
 
+from utils.process_pool import get_process_pool
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -408,7 +410,13 @@ class ConnectionPool:
         }
 
 class ParallelProcessor:
-    """High-performance parallel processing utility."""
+    """
+    High-performance parallel processing utility.
+
+    With use_process_pool the shared CPU pool from utils.process_pool is
+    used (also used by workflow CPU steps), so max_workers only sizes the
+    thread pool.
+    """
     
     def __init__(self, 
                  max_workers: int = None,
@@ -417,7 +425,7 @@ class ParallelProcessor:
         self.use_process_pool = use_process_pool
         
         if use_process_pool:
-            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.executor = get_process_pool()
         else:
             self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
     
@@ -439,8 +447,8 @@ class ParallelProcessor:
                 if asyncio.iscoroutinefunction(func):
                     task = func(item, **kwargs)
                 else:
-                    loop = asyncio.get_event_loop()
-                    task = loop.run_in_executor(self.executor, func, item, **kwargs)
+                    loop = asyncio.get_running_loop()
+                    task = loop.run_in_executor(self.executor, partial(func, item, **kwargs))
                 tasks.append(task)
             
             # Execute batch in parallel
@@ -454,8 +462,9 @@ class ParallelProcessor:
         return results
     
     def close(self):
-        """Close executor."""
-        self.executor.shutdown(wait=True)
+        """Close executor. The shared process pool outlives this processor."""
+        if not self.use_process_pool:
+            self.executor.shutdown(wait=True)
 
 # Performance optimization decorators
 def cached(ttl: int = 3600, 
@@ -0,0 +1,187 @@
+"""
+Inverted Token Index over Repomix Packs.
+
+Decommissioning several databases against the same repositories used to
+rescan every file of a pack once per database. TokenIndex tokenizes a pack
+once into identifier tokens ([A-Za-z0-9_-] runs) normalized the way
+get_database_search_patterns() varies a database name - case-folded, with
+"-" and "_" unified - and maps each token to postings of (file, line).
+
+Every discovery and extraction pattern requires its database name variant to
+appear in the line, and such an occurrence always lies inside one token. A
+lookup therefore collects the postings of every token containing the
+normalized name (so "DB_POSTGRES_AIR" is found for "postgres_air") and the
+real patterns only confirm those lines. Scanning N databases costs one index
+build plus N lookups instead of N full scans.
+
+Names that are not a single token (e.g. containing "."), or are not ASCII,
+cannot be answered by the index and lookup() returns None; callers then
+scan as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from concrete.pack_index import PackSidecar, load_pack_index
+from utils.process_pool import run_in_process
+from utils.repomix_pack import RepomixPack
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+# Postings pack (file number, line number) into one unsigned 64-bit integer
+_LINE_BITS = 32
+_LINE_MASK = (1 << _LINE_BITS) - 1
+
+
+def normalize_token(text: str) -> str:
+    """Case-fold text and unify "-" with "_", as the index stores tokens."""
+    return text.lower().replace("-", "_")
+
+
+@dataclass
+class TokenIndex(PackSidecar):
+    """Normalized identifier token -> (file, line) postings of a pack."""
+    SUFFIX = ".tokens"
+
+    # File paths in pack order; postings refer to files by position
+    paths: List[str] = field(default_factory=list)
+    postings: Dict[str, array] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def build(cls, pack_path: Union[str, Path]) -> TokenIndex:
+        """Tokenize every line of every file of a pack."""
+        identity = cls._stat(pack_path)
+        paths = []
+        postings = defaultdict(list)
+        with RepomixPack(pack_path) as pack:
+            for file_number, entry in enumerate(pack):
+                paths.append(entry.path)
+                text = normalize_token(pack.text(entry))
+                for line_number, line in enumerate(text.split("\n"), 1):
+                    posting = file_number << _LINE_BITS | line_number
+                    for token in set(_TOKEN.findall(line)):
+                        postings[token].append(posting)
+        logger.debug(f"Indexed {len(postings)} distinct tokens in {len(paths)} files of {pack_path}")
+        return cls(**identity, paths=paths,
+                   postings={token: array("Q", lines) for token, lines in postings.items()})
+
+    def lookup(self, name: str) -> Optional[Dict[int, List[int]]]:
+        """
+        Candidate lines for a database name: {file position: [line numbers]},
+        both ascending, covering every line any variant of name appears in.
+
+        Returns None when the index cannot answer for this name.
+        """
+        key = normalize_token(name)
+        if not key.isascii() or not _TOKEN.fullmatch(key):
+            return None
+
+        hits = set()
+        for token, token_postings in self.postings.items():
+            if key in token:
+                hits.update(token_postings)
+        candidates: Dict[int, List[int]] = {}
+        for posting in sorted(hits):
+            candidates.setdefault(posting >> _LINE_BITS, []).append(posting & _LINE_MASK)
+        return candidates
+
+
+# Token indexes used in this process, by resolved pack path
+_token_indexes: Dict[Path, TokenIndex] = {}
+
+# Whether packs without a token index get one built on first use
+_build_token_indexes = False
+
+
+def set_token_indexing(enabled: bool) -> None:
+    """
+    Build token indexes for packs that lack one when they are first scanned.
+
+    Worth enabling when several databases are scanned against the same
+    packs (see batch_runner); a single scan is cheaper without.
+    """
+    global _build_token_indexes
+    _build_token_indexes = enabled
+
+
+def token_indexing_enabled() -> bool:
+    return _build_token_indexes
+
+
+def get_token_index(pack_path: Union[str, Path], build: Optional[bool] = None) -> Optional[TokenIndex]:
+    """
+    Return the token index of a pack, reused within the process while the
+    pack is unchanged.
+
+    Args:
+        pack_path: Repomix pack file
+        build: Build the index in memory when the pack has no current
+            sidecar (defaults to the set_token_indexing() setting);
+            otherwise None is returned for such packs
+    """
+    if build is None:
+        build = _build_token_indexes
+    pack_path = Path(pack_path).resolve()
+    index = _token_indexes.get(pack_path)
+    if index is not None and index.is_current():
+        return index
+
+    index = TokenIndex.current(pack_path)
+    if index is None and build:
+        try:
+            index = TokenIndex.build(pack_path)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not build token index for {pack_path}: {e}")
+    if index is None:
+        _token_indexes.pop(pack_path, None)
+    else:
+        _token_indexes[pack_path] = index
+    return index
+
+
+async def get_token_index_async(pack_path: Union[str, Path], build: Optional[bool] = None) -> Optional[TokenIndex]:
+    """
+    Like get_token_index(), for async callers: the sidecar is loaded in a
+    worker thread, and a missing index is built - and saved as the pack's
+    sidecar - in the shared process pool, so tokenizing a whole pack never
+    stalls the event loop.
+    """
+    if build is None:
+        build = _build_token_indexes
+    index = await asyncio.to_thread(get_token_index, pack_path, False)
+    if index is not None or not build:
+        return index
+    try:
+        await run_in_process(build_pack_sidecars, str(Path(pack_path).resolve()), True)
+    except Exception as e:
+        logger.warning(f"Could not build token index for {pack_path}: {e}")
+        return None
+    return await asyncio.to_thread(get_token_index, pack_path, False)
+
+
+def build_pack_sidecars(pack_path: Union[str, Path], tokens: bool = False) -> int:
+    """
+    Write the sidecar index of a pack and, with tokens, its token index,
+    unless they are current. A module-level function so that it can run in
+    the shared process pool.
+
+    Returns:
+        Number of files in the pack's index
+    """
+    index = load_pack_index(pack_path, save=True)
+    if tokens and TokenIndex.current(pack_path) is None:
+        TokenIndex.build(pack_path).save()
+    return len(index)
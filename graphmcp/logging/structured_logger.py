@@ -13,10 +13,44 @@ import logging.handlers
 from datetime import datetime
 from typing import Dict, Any, Optional, TextIO
 
+from utils.json_codec import get_json_codec
 from .data_models import LogEntry, StructuredData, ProgressEntry
 from .config import LoggingConfig
 
 
+class JSONLineFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler for the JSON sink.
+
+    Records whose message is pre-encoded JSON bytes are written straight to
+    the file's binary buffer, skipping the Formatter and the str round-trip.
+    Any other record is handled like a plain RotatingFileHandler would.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        payload = record.msg
+        if not isinstance(payload, (bytes, bytearray)):
+            super().emit(record)
+            return
+
+        try:
+            with self.lock:
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0:
+                    self.stream.seek(0, 2)
+                    if self.stream.tell() + len(payload) >= self.maxBytes:
+                        self.doRollover()
+                        if self.stream is None:
+                            self.stream = self._open()
+                # Flush pending text writes so byte output stays ordered
+                self.stream.flush()
+                self.stream.buffer.write(payload)
+                self.stream.buffer.flush()
+        except Exception:
+            self.handleError(record)
+
+
 class StructuredLogger:
     """
     JSON-first logging system inspired by Claude Code.
@@ -51,7 +85,7 @@ class StructuredLogger:
     
     def _setup_file_handler(self) -> None:
         """Setup rotating file handler for structured logging."""
-        self.file_handler = logging.handlers.RotatingFileHandler(
+        self.file_handler = JSONLineFileHandler(
             filename=self.config.log_filepath,
             maxBytes=self.config.max_file_size_mb * 1024 * 1024,
             backupCount=self.config.backup_count,
@@ -168,29 +202,34 @@ class StructuredLogger:
             self.config.is_level_enabled(entry.level, "console")):
             self._write_console_output(entry)
     
-    def _write_json_output(self, entry: LogEntry) -> None:
-        """Write JSON output to file."""
-        json_data = entry.to_json()
-        
-        if self.config.json_pretty_print:
-            json_line = json.dumps(json_data, indent=2, separators=(',', ': '))
-        else:
-            json_line = json.dumps(json_data, separators=(',', ':'))
-        
-        # Create a log record for the file handler
+    def _encode_json(self, json_data: Dict[str, Any], pretty: bool) -> bytes:
+        """Encode one JSON sink entry as newline-terminated UTF-8 bytes."""
+        codec = get_json_codec()
+        if pretty:
+            return codec.dumps(json_data, indent=True, default=str) + b"\n"
+        return codec.dumps_line(json_data, default=str)
+    
+    def _emit_json(self, name: str, level: int, json_line: bytes, created: float) -> None:
+        """Hand pre-encoded JSON bytes to the file handler."""
         record = logging.LogRecord(
-            name=f"graphmcp.{entry.component}",
-            level=getattr(logging, entry.level),
+            name=name,
+            level=level,
             pathname="",
             lineno=0,
             msg=json_line,
             args=(),
             exc_info=None
         )
-        record.created = entry.timestamp
+        record.created = created
         
         self.file_handler.emit(record)
     
+    def _write_json_output(self, entry: LogEntry) -> None:
+        """Write JSON output to file."""
+        json_line = self._encode_json(entry.to_json(), self.config.json_pretty_print)
+        self._emit_json(f"graphmcp.{entry.component}", getattr(logging, entry.level),
+                        json_line, entry.timestamp)
+    
     def _write_console_output(self, entry: LogEntry) -> None:
         """Write human-readable output to console."""
         # Create a log record for the console handler
@@ -233,24 +272,9 @@ class StructuredLogger:
         
         # JSON output
         if self.config.output_format in ["json", "dual"]:
-            json_data = data.to_json()
-            
-            if self.config.json_pretty_print:
-                json_line = json.dumps(json_data, indent=2, separators=(',', ': '))
-            else:
-                json_line = json.dumps(json_data, separators=(',', ':'))
-            
-            record = logging.LogRecord(
-                name=f"graphmcp.{self.workflow_id}",
-                level=logging.INFO,
-                pathname="",
-                lineno=0,
-                msg=json_line,
-                args=(),
-                exc_info=None
-            )
-            record.created = data.timestamp
-            self.file_handler.emit(record)
+            json_line = self._encode_json(data.to_json(), self.config.json_pretty_print)
+            self._emit_json(f"graphmcp.{self.workflow_id}", logging.INFO,
+                            json_line, data.timestamp)
         
         # Console output (formatted)
         if self.config.output_format in ["console", "dual"]:
@@ -285,20 +309,9 @@ class StructuredLogger:
         
         # JSON output
         if self.config.output_format in ["json", "dual"]:
-            json_data = progress.to_json()
-            json_line = json.dumps(json_data, separators=(',', ':'))
-            
-            record = logging.LogRecord(
-                name=f"graphmcp.{self.workflow_id}",
-                level=logging.INFO,
-                pathname="",
-                lineno=0,
-                msg=json_line,
-                args=(),
-                exc_info=None
-            )
-            record.created = progress.timestamp
-            self.file_handler.emit(record)
+            json_line = self._encode_json(progress.to_json(), pretty=False)
+            self._emit_json(f"graphmcp.{self.workflow_id}", logging.INFO,
+                            json_line, progress.timestamp)
         
         # Console output (enhanced progress visualization)
         if self.config.output_format in ["console", "dual"]:
@@ -7,6 +7,7 @@ modular structure without the removed demo components.
 
 Usage:
     python run_db_workflow.py --database postgres_air --repo https://github.com/bprzybysz/postgres-sample-dbs
+    python run_db_workflow.py --manifest fleet.json [--report report.json] [--resume] [--checkpoint-dir DIR]
 """
 
 import asyncio
@@ -27,13 +28,30 @@ from concrete.db_decommission import run_decommission
 
 async def main():
     parser = argparse.ArgumentParser(description='Run database decommissioning workflow')
-    parser.add_argument('--database', required=True, help='Database name to decommission')
+    parser.add_argument('--database', help='Database name to decommission')
     parser.add_argument('--repo', default='https://github.com/bprzybysz/postgres-sample-dbs', help='Target repository')
     parser.add_argument('--slack-channel', default='demo-channel', help='Slack channel for notifications')
     parser.add_argument('--mock', action='store_true', help='Use mock data from tests/data/ directory')
+    parser.add_argument('--manifest', help='JSON manifest of databases and repositories to run as one batch')
+    parser.add_argument('--report', default='logs/decommission_batch_report.json', help='Combined report path for --manifest')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reuse checkpointed step results of a failed run (using the same --checkpoint-dir)')
+    parser.add_argument('--checkpoint-dir', help='Checkpoint step results here instead of the default directory')
     
     args = parser.parse_args()
     
+    if args.manifest:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        from concrete.db_decommission.batch_runner import main as batch_main
+        batch_args = ['--manifest', args.manifest, '--report', args.report]
+        if args.resume:
+            batch_args.append('--resume')
+        if args.checkpoint_dir:
+            batch_args.extend(['--checkpoint-dir', args.checkpoint_dir])
+        return await batch_main(batch_args)
+    if not args.database:
+        parser.error('--database is required unless --manifest is given')
+    
     # Check for cached mock data first
     if args.mock:
         # Check both tmp/<database-name>/ and tests/data/ for existing data
@@ -83,7 +101,9 @@ async def main():
             database_name=args.database,
             target_repos=[args.repo],
             slack_channel=args.slack_channel,
-            mock_mode=args.mock
+            mock_mode=args.mock,
+            resume=args.resume,
+            checkpoint_dir=args.checkpoint_dir
         )
         
         print("\n" + "=" * 80)
@@ -9,6 +9,7 @@ import logging
 from clients import GitHubMCPClient, RepomixMCPClient, SlackMCPClient, Context7MCPClient, BrowserMCPClient, FilesystemMCPClient
 from pathlib import Path
 import os
+import sys
 import time
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,84 @@ def mock_config_path(tmp_path_factory):
     config_file.write_text(json.dumps(config, indent=2))
     return str(config_file)
 
+FAKE_MCP_SERVER = r'''
+import json
+import sys
+import threading
+import time
+
+write_lock = threading.Lock()
+
+def send(message):
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+def respond(request):
+    method = request.get("method")
+    arguments = request.get("params", {}).get("arguments", {})
+    time.sleep(arguments.get("delay", 0))
+    if method == "initialize":
+        result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}}, "serverInfo": {"name": "fake"}}
+    elif method == "tools/list":
+        result = {"tools": [{"name": "echo"}, {"name": "get_file_contents"}]}
+    elif arguments.get("size"):
+        result = {"content": [{"type": "text", "text": "x" * arguments["size"]}]}
+    elif arguments.get("fail"):
+        sys.stderr.write("fake server failure details\n")
+        sys.stderr.flush()
+        send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": "boom"}})
+        return
+    else:
+        result = {"echo": arguments}
+    send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if "id" not in request:
+        continue  # notification
+    if request.get("params", {}).get("arguments", {}).get("exit"):
+        break
+    threading.Thread(target=respond, args=(request,), daemon=True).start()
+'''
+
+@pytest.fixture
+def fake_mcp_config_path(tmp_path):
+    """
+    MCP config pointing 'fake_server' at a tiny line-delimited JSON-RPC
+    server script, so transport code runs against a real subprocess.
+    """
+    script = tmp_path / "fake_mcp_server.py"
+    script.write_text(FAKE_MCP_SERVER)
+    config = {
+        "mcpServers": {
+            "fake_server": {
+                "command": sys.executable,
+                "args": ["-u", str(script)],
+                "env": {}
+            }
+        }
+    }
+    config_file = tmp_path / "fake_config.json"
+    config_file.write_text(json.dumps(config))
+    return str(config_file)
+
+@pytest.fixture(autouse=True)
+def clear_capability_cache():
+    """Keep cached server tool lists from leaking between tests."""
+    from utils.capabilities import capability_cache
+    capability_cache.invalidate()
+    yield
+    capability_cache.invalidate()
+
+@pytest.fixture(autouse=True)
+def clear_config_snapshots():
+    """Re-read config, .env and secrets files in every test."""
+    from utils.config_snapshot import config_snapshots
+    config_snapshots.invalidate()
+    yield
+    config_snapshots.invalidate()
+
 @pytest.fixture(scope="session")
 def real_config_path(tmp_path_factory):
     """
@@ -420,7 +420,7 @@ class TestAgenticRefactoring:
             "owner": {"login": "test-fork-owner"}
         }
         mock_github_client.create_branch.return_value = {"success": True}
-        mock_github_client.create_or_update_file.return_value = {"success": True}
+        mock_github_client.create_or_update_files.return_value = [{"success": True}, {"success": True}]
         mock_github_client.create_pull_request.return_value = {
             "success": True,
             "number": 123,
@@ -453,7 +453,8 @@ class TestAgenticRefactoring:
         # Verify GitHub operations were called
         mock_github_client.fork_repository.assert_called_once()
         mock_github_client.create_branch.assert_called_once()
-        assert mock_github_client.create_or_update_file.call_count == 2  # One for each file
+        mock_github_client.create_or_update_files.assert_called_once()
+        assert len(mock_github_client.create_or_update_files.call_args[0][2]) == 2  # One for each file
         mock_github_client.create_pull_request.assert_called_once()
         
         print("✅ GitHub PR creation step validated")
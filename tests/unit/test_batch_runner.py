@@ -0,0 +1,188 @@
+"""
+Unit tests for the fleet-wide decommissioning batch runner and the
+per-server rate limiter it installs.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from clients.pool import get_server_pool
+from clients.rate_limit import AsyncRateLimiter, get_rate_limiter, set_rate_limit
+from concrete.db_decommission import repository_processors
+from concrete.db_decommission.batch_runner import (
+    BatchLimits,
+    DecommissionJob,
+    load_manifest,
+    run_batch,
+)
+from workflows.builder import WorkflowResult
+
+
+class FakeWorkflow:
+    """Stands in for a built decommission workflow."""
+
+    running = 0
+    peak = 0
+
+    def __init__(self, database_name, fail=False):
+        self.database_name = database_name
+        self.fail = fail
+        self.config = SimpleNamespace(checkpoint_dir=None)
+        self.observed = {}
+
+    async def execute(self, resume=False):
+        FakeWorkflow.running += 1
+        FakeWorkflow.peak = max(FakeWorkflow.peak, FakeWorkflow.running)
+        self.observed = {
+            "pool": get_server_pool(),
+            "limiter": get_rate_limiter("ovr_github"),
+            "scan": repository_processors._scan_semaphore,
+            "registry": self.client_registry,
+            "resume": resume,
+        }
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise RuntimeError("boom")
+            return WorkflowResult(
+                status="completed",
+                duration_seconds=0.01,
+                success_rate=100.0,
+                step_results={"process_repositories": {"total_files_processed": 3, "total_files_modified": 1}},
+                steps_completed=5,
+                steps_failed=0,
+            )
+        finally:
+            FakeWorkflow.running -= 1
+
+
+@pytest.fixture
+def fake_workflows():
+    FakeWorkflow.running = FakeWorkflow.peak = 0
+    created = {}
+
+    def factory(database_name, target_repos, slack_channel, config_path, workflow_id, plan):
+        assert plan.variables and plan.config.config_path == config_path
+        workflow = FakeWorkflow(database_name, fail=database_name.startswith("bad"))
+        created[database_name] = (workflow, workflow_id)
+        return workflow
+
+    with patch("concrete.db_decommission.batch_runner.create_db_decommission_workflow", side_effect=factory):
+        yield created
+
+
+class TestManifest:
+
+    def test_load_manifest_applies_defaults_and_limits(self, tmp_path):
+        manifest = tmp_path / "fleet.json"
+        manifest.write_text(json.dumps({
+            "defaults": {"slack_channel": "C-default", "repos": ["https://github.com/org/shared"]},
+            "limits": {"max_concurrent_workflows": 2, "github_calls_per_second": 1.5},
+            "jobs": [
+                {"database": "alpha"},
+                {"database": "beta", "repos": ["https://github.com/org/b"], "slack_channel": "C-b"},
+            ],
+        }))
+
+        jobs, limits = load_manifest(manifest)
+
+        assert [job.database_name for job in jobs] == ["alpha", "beta"]
+        assert jobs[0].target_repos == ["https://github.com/org/shared"]
+        assert jobs[0].slack_channel == "C-default"
+        assert jobs[1].slack_channel == "C-b"
+        assert limits.max_concurrent_workflows == 2
+        assert limits.github_calls_per_second == 1.5
+
+    @pytest.mark.parametrize("content, message", [
+        ({"jobs": [{"database": "a"}]}, "needs 'database'"),
+        ({"jobs": [{"database": "a", "repos": ["r"]}, {"database": "a", "repos": ["r"]}]}, "Duplicate"),
+        ({"limits": {"bogus": 1}, "jobs": []}, "Unknown batch limits"),
+        ({"databases": []}, "'jobs' list"),
+    ])
+    def test_load_manifest_rejects_invalid(self, tmp_path, content, message):
+        manifest = tmp_path / "fleet.json"
+        manifest.write_text(json.dumps(content))
+        with pytest.raises(ValueError, match=message):
+            load_manifest(manifest)
+
+
+class TestRunBatch:
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_under_global_limits(self, tmp_path, fake_workflows):
+        jobs = [DecommissionJob(f"db{i}", [f"https://github.com/org/r{i}"]) for i in range(5)]
+        jobs.append(DecommissionJob("bad_db", ["https://github.com/org/x"]))
+        limits = BatchLimits(max_concurrent_workflows=4, max_mcp_processes=6,
+                             github_calls_per_second=2.0, scan_workers=1)
+
+        report = await run_batch(jobs, limits, config_path=str(tmp_path / "mcp_config.json"),
+                                 resume=True, checkpoint_dir=None)
+
+        # 6 processes over 3 servers leaves room for 2 workflows at a time
+        assert FakeWorkflow.peak == 2
+        assert [o.database_name for o in report.outcomes] == [job.database_name for job in jobs]
+        assert report.succeeded == 5 and report.failed == 1
+        assert report.outcomes[-1].error == "boom"
+        summary = report.to_dict()["summary"]
+        assert summary["files_discovered"] == 15
+        assert summary["repositories"] == 6
+
+        workflow, workflow_id = fake_workflows["db0"]
+        assert workflow_id is None
+        assert workflow.observed["resume"] is True
+        assert workflow.observed["pool"].max_size == 2
+        assert workflow.observed["limiter"].rate == 2.0
+        assert workflow.observed["scan"] is not None
+        # One client registry per concurrent slot, reused by later workflows
+        registries = {id(w.observed["registry"]) for w, _ in fake_workflows.values()}
+        assert len(registries) == 2
+        assert all(w.observed["registry"].closed for w, _ in fake_workflows.values())
+
+        # Global state is torn down after the batch
+        assert get_server_pool() is None
+        assert get_rate_limiter("ovr_github") is None
+        assert repository_processors._scan_semaphore is None
+
+    @pytest.mark.asyncio
+    async def test_report_written_as_json(self, tmp_path, fake_workflows):
+        report = await run_batch([DecommissionJob("db", ["https://github.com/org/r"])],
+                                 config_path=str(tmp_path / "mcp_config.json"), checkpoint_dir=None)
+        path = report.write(tmp_path / "out" / "report.json")
+        data = json.loads(path.read_text())
+        assert data["summary"]["succeeded"] == 1
+        assert data["jobs"][0]["status"] == "completed"
+
+
+class TestRateLimiter:
+
+    def teardown_method(self):
+        set_rate_limit("test_server", None)
+
+    @pytest.mark.asyncio
+    async def test_bucket_spaces_calls_after_burst(self):
+        limiter = AsyncRateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            assert await limiter.acquire()
+        # Two calls use the burst, the remaining two wait ~20ms each
+        assert time.monotonic() - start >= 0.035
+
+    @pytest.mark.asyncio
+    async def test_acquire_gives_up_when_wait_exceeds_budget(self):
+        limiter = AsyncRateLimiter(rate=1, burst=1)
+        assert await limiter.acquire(max_wait=0)
+        assert not await limiter.acquire(max_wait=0.1)
+        assert limiter.available < 1
+
+    def test_registry(self):
+        limiter = set_rate_limit("test_server", 3)
+        assert get_rate_limiter("test_server") is limiter
+        assert set_rate_limit("test_server", 0) is None
+        assert get_rate_limiter("test_server") is None
+        with pytest.raises(ValueError):
+            AsyncRateLimiter(rate=0)
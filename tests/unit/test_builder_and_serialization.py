@@ -2,7 +2,9 @@ import pytest
 import asyncio
 import json
 import pickle
+import os
 import re
+import time
 from unittest.mock import AsyncMock, patch, MagicMock, call
 from pathlib import Path
 
@@ -337,6 +339,21 @@ class TestWorkflowBuilderExtensions:
         assert workflow.config.default_timeout == 90
         assert workflow.config.stop_on_error == True
         assert workflow.config.default_retry_count == 2
+        assert workflow.steps[0].timeout_seconds == 90
+        assert workflow.steps[0].retry_count == 2
+
+    def test_step_defaults_are_resolved_at_build(self, mock_config_path):
+        """Test with_config() applies to steps added before it, but not to explicit values."""
+        workflow = (WorkflowBuilder("test-workflow", mock_config_path)
+            .custom_step("default", "Default", custom_function_helper)
+            .custom_step("once", "Once", custom_function_helper, retry_count=0, timeout_seconds=5)
+            .with_config(default_timeout=45, default_retry_count=4)
+            .build())
+
+        steps = {step.id: step for step in workflow.steps}
+        assert (steps["default"].retry_count, steps["default"].timeout_seconds) == (4, 45)
+        assert (steps["once"].retry_count, steps["once"].timeout_seconds) == (0, 5)
+        assert {step.id: step.retry_count for step in workflow.plan.steps} == {"default": 4, "once": 0}
 
     def test_prompt_template_rendering(self):
         """Test prompt template variable substitution."""
@@ -525,4 +542,324 @@ class TestWorkflowExecution:
         
         assert result.status in ["completed", "partial_success"]
         assert len(result.step_results) == 2
-        assert result.step_results["step2"]["processed"] == "data from step 1" 
\ No newline at end of file
+        assert result.step_results["step2"]["processed"] == "data from step 1" 
+
+class TestDagScheduling:
+    """Tests for dependency-ordered, bounded-parallel step execution."""
+
+    @staticmethod
+    def tracking_step(events, running, delay=0.05, fail=False):
+        async def step_func(context, step):
+            running.append(step.id)
+            events.append(("start", step.id, len(running)))
+            await asyncio.sleep(delay)
+            running.remove(step.id)
+            events.append(("end", step.id))
+            if fail:
+                raise RuntimeError(f"{step.id} failed")
+            return {"step": step.id}
+        return step_func
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently_within_limit(self, mock_config_path):
+        events, running = [], []
+        builder = WorkflowBuilder("dag", mock_config_path).with_config(max_parallel_steps=2)
+        for step_id in ["a", "b", "c", "d"]:
+            builder.custom_step(step_id, step_id, self.tracking_step(events, running, delay=0.1))
+        workflow = builder.build()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await workflow.execute()
+        elapsed = loop.time() - start
+
+        assert result.status == "completed"
+        assert result.steps_completed == 4
+        assert max(e[2] for e in events if e[0] == "start") == 2
+        assert elapsed < 0.35
+        assert [e[1] for e in events if e[0] == "start"][:2] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_dependencies_finish_before_dependents_start(self, mock_config_path):
+        events, running = [], []
+        workflow = (WorkflowBuilder("dag", mock_config_path)
+            .with_config(max_parallel_steps=4)
+            .custom_step("join", "join", self.tracking_step(events, running), depends_on=["left", "right"])
+            .custom_step("left", "left", self.tracking_step(events, running, delay=0.02))
+            .custom_step("right", "right", self.tracking_step(events, running, delay=0.08))
+            .build()
+        )
+
+        result = await workflow.execute()
+
+        order = [(e[0], e[1]) for e in events]
+        assert order.index(("start", "join")) > order.index(("end", "right"))
+        assert order.index(("start", "join")) > order.index(("end", "left"))
+        assert result.step_results["join"] == {"step": "join"}
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error_skips_downstream_steps(self, mock_config_path):
+        events, running = [], []
+        workflow = (WorkflowBuilder("dag", mock_config_path)
+            .with_config(max_parallel_steps=2, stop_on_error=True, default_retry_count=0)
+            .custom_step("slow", "slow", self.tracking_step(events, running, delay=0.1))
+            .custom_step("broken", "broken", self.tracking_step(events, running, delay=0.01, fail=True))
+            .custom_step("after_broken", "after", self.tracking_step(events, running), depends_on=["broken"])
+            .custom_step("after_slow", "after", self.tracking_step(events, running), depends_on=["slow"])
+            .build()
+        )
+
+        result = await workflow.execute()
+
+        assert result.step_results["slow"] == {"step": "slow"}
+        assert "broken failed" in result.step_results["broken"]["error"]
+        assert result.step_results["after_broken"] == {
+            "status": "skipped", "reason": "dependency 'broken' did not complete"}
+        assert result.step_results["after_slow"]["status"] == "skipped"
+        assert result.steps_completed == 1
+        assert result.steps_failed == 1
+
+    @pytest.mark.asyncio
+    async def test_dependents_still_run_without_stop_on_error(self, mock_config_path):
+        events, running = [], []
+        workflow = (WorkflowBuilder("dag", mock_config_path)
+            .with_config(default_retry_count=0)
+            .custom_step("broken", "broken", self.tracking_step(events, running, fail=True))
+            .custom_step("after", "after", self.tracking_step(events, running), depends_on=["broken"])
+            .build()
+        )
+
+        result = await workflow.execute()
+
+        assert result.status == "partial_success"
+        assert result.step_results["after"] == {"step": "after"}
+
+    def test_build_rejects_cycles(self, mock_config_path):
+        builder = (WorkflowBuilder("dag", mock_config_path)
+            .custom_step("a", "a", custom_function_helper, depends_on=["c"])
+            .custom_step("b", "b", custom_function_helper, depends_on=["a"])
+            .custom_step("c", "c", custom_function_helper, depends_on=["b"]))
+
+        with pytest.raises(ValueError, match="cycle.*a -> c -> b -> a"):
+            builder.build()
+
+    def test_build_rejects_unknown_and_duplicate_steps(self, mock_config_path):
+        with pytest.raises(ValueError, match="unknown step 'missing'"):
+            (WorkflowBuilder("dag", mock_config_path)
+                .custom_step("a", "a", custom_function_helper, depends_on=["missing"])
+                .build())
+
+        with pytest.raises(ValueError, match="Duplicate step id 'a'"):
+            (WorkflowBuilder("dag", mock_config_path)
+                .custom_step("a", "a", custom_function_helper)
+                .custom_step("a", "again", custom_function_helper)
+                .build())
+
+
+class TestStepTimeoutsAndRetries:
+    """Tests for enforced step timeouts, custom-step retries and attempt timings."""
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self, mock_config_path):
+        calls = []
+
+        async def flaky(context, step):
+            calls.append(step.id)
+            if len(calls) < 3:
+                raise ConnectionError("connection reset")
+            return {"ok": True}
+
+        workflow = (WorkflowBuilder("retry", mock_config_path)
+            .with_config(retry_backoff_seconds=0.01)
+            .custom_step("flaky", "Flaky", flaky, retry_count=2)
+            .build())
+
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        assert result.step_results["flaky"] == {"ok": True}
+        attempts = result.get_step_attempts("flaky")
+        assert [a.status for a in attempts] == ["failed", "failed", "succeeded"]
+        assert attempts[0].error == "connection reset"
+        assert all(a.duration_seconds >= 0 for a in attempts)
+
+    @pytest.mark.asyncio
+    async def test_terminal_errors_and_zero_retry_count_are_not_retried(self, mock_config_path):
+        calls = []
+
+        async def broken(context, step):
+            calls.append(step.id)
+            raise TypeError("bad argument")
+
+        async def flaky(context, step):
+            calls.append(step.id)
+            raise ConnectionError("reset")
+
+        workflow = (WorkflowBuilder("retry", mock_config_path)
+            .with_config(retry_backoff_seconds=0.01)
+            .custom_step("broken", "Broken", broken, retry_count=3)
+            .custom_step("once", "Once", flaky, retry_count=0)
+            .build())
+
+        result = await workflow.execute()
+
+        assert sorted(calls) == ["broken", "once"]
+        assert result.step_results["broken"] == {"error": "bad argument"}
+        assert result.steps_failed == 2
+
+    @pytest.mark.asyncio
+    async def test_hung_step_is_cancelled_at_its_timeout(self, mock_config_path):
+        cancelled = asyncio.Event()
+
+        async def hang(context, step):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def after(context, step):
+            return {"ran": True}
+
+        workflow = (WorkflowBuilder("timeout", mock_config_path)
+            .custom_step("hang", "Hang", hang, timeout_seconds=0.2)
+            .custom_step("after", "After", after, depends_on=["hang"])
+            .build())
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await workflow.execute()
+
+        assert loop.time() - start < 2
+        assert cancelled.is_set()
+        assert result.step_results["hang"] == {"error": "Step timed out after 0.2s"}
+        assert [a.status for a in result.get_step_attempts("hang")] == ["timed_out"]
+        assert result.step_results["after"] == {"ran": True}
+
+
+class TestCheckpointResume:
+    """Tests for content-addressed step checkpoints and resumed runs."""
+
+    @staticmethod
+    def build(mock_config_path, checkpoint_dir, calls, fail_publish=False, pack_param="repo", **checkpoint_options):
+        async def pack(context, step, repo):
+            calls.append("pack")
+            context.set_shared_value("pack_stats", {"files": 3})
+            return {"packed": repo}
+
+        async def analyze(context, step):
+            calls.append("analyze")
+            return {"files": context.get_shared_value("pack_stats")["files"]}
+
+        async def publish(context, step):
+            calls.append("publish")
+            if fail_publish:
+                raise TypeError("publish failed")
+            return {"published": context.get_step_result("analyze")}
+
+        return (WorkflowBuilder("resume-test", mock_config_path)
+            .with_checkpoints(checkpoint_dir, **checkpoint_options)
+            .custom_step("pack", "Pack", pack, parameters={"repo": pack_param})
+            .custom_step("analyze", "Analyze", analyze, depends_on=["pack"])
+            .custom_step("publish", "Publish", publish, depends_on=["analyze"])
+            .build())
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_unchanged_steps(self, mock_config_path, tmp_path):
+        calls = []
+        first = await self.build(mock_config_path, tmp_path, calls, fail_publish=True).execute()
+        assert first.steps_failed == 1
+        assert calls == ["pack", "analyze", "publish"]
+
+        calls.clear()
+        second = await self.build(mock_config_path, tmp_path, calls).execute(resume=True)
+
+        assert calls == ["publish"]
+        assert second.status == "completed"
+        assert second.resumed_steps == ["pack", "analyze"]
+        assert second.step_results["pack"] == {"packed": "repo"}
+        assert second.step_results["publish"] == {"published": {"files": 3}}
+
+    @pytest.mark.asyncio
+    async def test_changed_parameters_rerun_until_results_match(self, mock_config_path, tmp_path):
+        calls = []
+        await self.build(mock_config_path, tmp_path, calls).execute()
+
+        calls.clear()
+        result = await self.build(mock_config_path, tmp_path, calls, pack_param="other").execute(resume=True)
+
+        # analyze reran but produced the same result, so publish is still reusable
+        assert calls == ["pack", "analyze"]
+        assert result.resumed_steps == ["publish"]
+        assert result.step_results["pack"] == {"packed": "other"}
+
+    @pytest.mark.asyncio
+    async def test_run_identity_parameters_do_not_change_keys(self, mock_config_path, tmp_path):
+        calls = []
+
+        async def pack(context, step, repo, run_id):
+            calls.append(run_id)
+            return {"packed": repo}
+
+        def build(run_id):
+            return (WorkflowBuilder("resume-test", mock_config_path)
+                .with_checkpoints(tmp_path)
+                .with_run_identity_parameters("run_id")
+                .custom_step("pack", "Pack", pack, parameters={"repo": "repo", "run_id": run_id})
+                .build())
+
+        await build("run-1").execute()
+        result = await build("run-2").execute(resume=True)
+
+        assert calls == ["run-1"]
+        assert result.resumed_steps == ["pack"]
+
+    @pytest.mark.asyncio
+    async def test_without_resume_everything_runs(self, mock_config_path, tmp_path):
+        calls = []
+        await self.build(mock_config_path, tmp_path, calls).execute()
+        calls.clear()
+        await self.build(mock_config_path, tmp_path, calls).execute()
+
+        assert calls == ["pack", "analyze", "publish"]
+        assert len(list(tmp_path.rglob("*.pkl"))) == 3
+
+    @pytest.mark.asyncio
+    async def test_successful_run_clears_its_checkpoints(self, mock_config_path, tmp_path):
+        calls = []
+        failed = await self.build(mock_config_path, tmp_path, calls, fail_publish=True,
+                                  clear_on_success=True).execute()
+        assert failed.steps_failed == 1
+        assert len(list(tmp_path.rglob("*.pkl"))) == 2
+
+        calls.clear()
+        resumed = await self.build(mock_config_path, tmp_path, calls, clear_on_success=True).execute(resume=True)
+
+        assert calls == ["publish"]
+        assert resumed.status == "completed"
+        assert list(tmp_path.rglob("*.pkl")) == []
+
+    @pytest.mark.asyncio
+    async def test_expired_checkpoints_are_pruned(self, mock_config_path, tmp_path):
+        calls = []
+        await self.build(mock_config_path, tmp_path, calls, fail_publish=True).execute()
+        for path in tmp_path.rglob("*.pkl"):
+            os.utime(path, (time.time() - 3600, time.time() - 3600))
+
+        calls.clear()
+        result = await self.build(mock_config_path, tmp_path, calls, max_age_seconds=60).execute(resume=True)
+
+        assert calls == ["pack", "analyze", "publish"]
+        assert result.resumed_steps == []
+        assert len(list(tmp_path.rglob("*.pkl"))) == 3
+
+    def test_corrupt_checkpoint_is_ignored(self, tmp_path):
+        from workflows import CheckpointStore, StepCheckpoint
+
+        store = CheckpointStore(tmp_path)
+        path = store.save("wf", StepCheckpoint(step_id="s", key="abc", result={"x": 1}, result_hash="h"))
+        assert store.load("wf", "abc").result == {"x": 1}
+
+        path.write_bytes(b"not a pickle")
+        assert store.load("wf", "abc") is None
+        assert store.clear("wf") == 1
@@ -0,0 +1,180 @@
+"""
+Unit tests for the server capability cache and its use by BaseMCPClient
+and MCPSessionManager.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from clients.base import BaseMCPClient, MCPToolError
+from utils.capabilities import CapabilityCache, capability_cache, capability_key
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+
+    async def list_available_tools(self) -> list[str]:
+        tools = await self.list_tools()
+        return [tool.get("name") for tool in tools]
+
+    async def health_check(self) -> bool:
+        try:
+            await self.list_available_tools()
+            return True
+        except Exception:
+            return False
+
+
+def count_requests(client, method):
+    original = client._send_mcp_request
+    calls = []
+
+    async def counting(m, params, **kwargs):
+        if m == method:
+            calls.append(params)
+        return await original(m, params, **kwargs)
+
+    client._send_mcp_request = counting
+    return calls
+
+
+class TestCapabilityCache:
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_triggers_refetch(self):
+        cache = CapabilityCache(ttl_seconds=0.05)
+        fetch = AsyncMock(return_value=[{"name": "a"}])
+
+        await cache.get_tools(("cfg", "srv"), fetch)
+        await cache.get_tools(("cfg", "srv"), fetch)
+        assert fetch.await_count == 1
+
+        await asyncio.sleep(0.06)
+        entry = await cache.get_tools(("cfg", "srv"), fetch)
+        assert fetch.await_count == 2
+        assert entry.tool_names == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        cache = CapabilityCache()
+
+        async def slow_fetch():
+            await asyncio.sleep(0.05)
+            return [SimpleNamespace(name="tool")]
+
+        fetch = AsyncMock(side_effect=slow_fetch)
+        entries = await asyncio.gather(*[cache.get_tools(("cfg", "srv"), fetch) for _ in range(5)])
+
+        assert fetch.await_count == 1
+        assert all(entry.has_tool("tool") for entry in entries)
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self):
+        cache = CapabilityCache()
+        fetch = AsyncMock(side_effect=[ConnectionError("down"), [{"name": "a"}]])
+
+        with pytest.raises(ConnectionError):
+            await cache.get_tools(("cfg", "srv"), fetch)
+        assert (await cache.get_tools(("cfg", "srv"), fetch)).has_tool("a")
+
+    def test_new_server_version_drops_tools(self):
+        cache = CapabilityCache()
+        key = ("cfg", "srv")
+        cache.put_server_info(key, {"serverInfo": {"name": "s", "version": "1"}})
+        cache.put_tools(key, [{"name": "a"}])
+        cache.put_server_info(key, {"serverInfo": {"name": "s", "version": "1"}})
+        assert cache.get(key) is not None
+
+        cache.put_server_info(key, {"serverInfo": {"name": "s", "version": "2"}})
+        assert cache.get(key) is None
+
+
+class TestClientCapabilities:
+
+    @pytest.mark.asyncio
+    async def test_tools_list_is_fetched_once(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            calls = count_requests(client, "tools/list")
+            assert await client.health_check()
+            assert await client.list_available_tools() == ["echo", "get_file_contents"]
+            await client.call_tool_with_retry("echo", {}, retry_count=0)
+            assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_rejected_after_one_refresh(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            await client.list_tools()
+            calls = count_requests(client, "tools/list")
+
+            with pytest.raises(MCPToolError, match="not found"):
+                await client.call_tool_with_retry("no_such_tool", {}, retry_count=3)
+            assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_invalidates_cache(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            await client.list_tools()
+            client._process.kill()
+            await client._process.wait()
+
+            calls = count_requests(client, "tools/list")
+            await client.list_tools()
+            assert len(calls) == 1
+
+
+class TestSessionManagerCapabilities:
+
+    @pytest.fixture
+    def session_manager(self):
+        from utils.session import MCPSessionManager
+
+        config_manager = MagicMock()
+        config_manager.config_path = "mcp_config.json"
+        return MCPSessionManager(config_manager)
+
+    @pytest.fixture
+    def session(self):
+        session = MagicMock()
+        session.connector.list_tools = AsyncMock(return_value=[SimpleNamespace(name="search_code")])
+        session.connector.call_tool = AsyncMock(return_value={"ok": True})
+        return session
+
+    @pytest.mark.asyncio
+    async def test_call_tool_validates_against_cache(self, session_manager, session):
+        for _ in range(3):
+            assert await session_manager.call_tool(session, "search_code", {}, server_name="ovr_github") == {"ok": True}
+
+        assert session.connector.list_tools.await_count == 1
+        assert session.connector.call_tool.await_count == 3
+        assert capability_cache.get(capability_key("mcp_config.json", "ovr_github")).has_tool("search_code")
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_raises(self, session_manager, session):
+        from utils.exceptions import MCPToolError as UtilsToolError
+
+        with pytest.raises(UtilsToolError, match="not found"):
+            await session_manager.call_tool(session, "missing", {}, server_name="ovr_github")
+        session.connector.call_tool.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_without_server_name_lists_every_time(self, session_manager, session):
+        await session_manager.call_tool(session, "search_code", {})
+        await session_manager.call_tool(session, "search_code", {})
+        assert session.connector.list_tools.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_session_context_sessions_use_cache(self, session_manager, session):
+        registry = MagicMock()
+        registry.acquire = AsyncMock(return_value=session)
+        registry.release = AsyncMock()
+
+        with patch("utils.session.get_session_registry", return_value=registry):
+            async with session_manager.session_context("ovr_github") as borrowed:
+                for _ in range(3):
+                    await session_manager.call_tool(borrowed, "search_code", {})
+
+        assert session.connector.list_tools.await_count == 1
+        assert session_manager._session_servers == {}
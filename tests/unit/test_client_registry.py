@@ -0,0 +1,114 @@
+"""
+Unit tests for MCPClientRegistry: one client per server shared by tool
+steps, custom steps and successive workflows, using the fake stdio MCP
+server fixture.
+"""
+
+import pytest
+
+from clients.base import BaseMCPClient
+from clients.registry import MCPClientRegistry, get_client_registry, set_client_registry
+from workflows import WorkflowBuilder
+from workflows.builder import StepType, WorkflowStep
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+
+    async def list_available_tools(self) -> list[str]:
+        result = await self._send_mcp_request("tools/list", {})
+        return [tool.get("name") for tool in result.get("tools", [])]
+
+    async def health_check(self) -> bool:
+        return self.is_alive
+
+
+async def use_client(context, step):
+    client = await context.get_client("fake_server", FakeMCPClient)
+    return {"client": id(client), "pid": client._process.pid}
+
+
+def build_workflow(config_path, registry=None):
+    builder = WorkflowBuilder("registry", config_path)
+    if registry is not None:
+        builder.with_client_registry(registry)
+    builder._steps.append(WorkflowStep(
+        id="echo", name="Echo", step_type=StepType.CUSTOM,
+        server_name="fake_server", tool_name="echo", parameters={"value": 1}, retry_count=0,
+    ))
+    builder.custom_step("reuse", "Reuse", use_client, depends_on=["echo"], retry_count=0)
+    return builder.build()
+
+
+class TestMCPClientRegistry:
+
+    @pytest.mark.asyncio
+    async def test_acquire_returns_one_client_per_server(self, fake_mcp_config_path):
+        registry = MCPClientRegistry()
+        try:
+            first = await registry.acquire("fake_server", fake_mcp_config_path, FakeMCPClient)
+            second = await registry.acquire("fake_server", fake_mcp_config_path)
+            assert second is first
+            assert first in registry
+            assert len(registry) == 1
+        finally:
+            await registry.close()
+        assert registry.closed and len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_after_close_fails(self, fake_mcp_config_path):
+        registry = MCPClientRegistry()
+        await registry.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await registry.acquire("fake_server", fake_mcp_config_path, FakeMCPClient)
+
+    @pytest.mark.asyncio
+    async def test_unknown_server(self, fake_mcp_config_path):
+        with pytest.raises(ValueError, match="No MCP client class"):
+            await MCPClientRegistry().acquire("no_such_server", fake_mcp_config_path)
+
+    def test_closed_process_registry_is_ignored(self):
+        registry = MCPClientRegistry()
+        set_client_registry(registry)
+        try:
+            assert get_client_registry() is registry
+            registry._closed = True
+            assert get_client_registry() is None
+        finally:
+            set_client_registry(None)
+
+
+class TestWorkflowClientSharing:
+
+    @pytest.mark.asyncio
+    async def test_tool_and_custom_steps_share_client_across_workflows(self, fake_mcp_config_path):
+        registry = MCPClientRegistry()
+        try:
+            first = await build_workflow(fake_mcp_config_path, registry).execute()
+            second = await build_workflow(fake_mcp_config_path, registry).execute()
+
+            assert first.status == second.status == "completed"
+            client = registry.get("fake_server", fake_mcp_config_path)
+            assert client.is_alive
+            for result in (first, second):
+                assert result.get_step_result("reuse") == {"client": id(client), "pid": client._process.pid}
+        finally:
+            await registry.close()
+        assert not client.is_alive
+
+    @pytest.mark.asyncio
+    async def test_run_without_registry_closes_its_clients(self, fake_mcp_config_path):
+        clients = []
+
+        async def keep_client(context, step):
+            client = await context.get_client("fake_server", FakeMCPClient)
+            await client.list_available_tools()
+            clients.append(client)
+
+        workflow = (WorkflowBuilder("registry", fake_mcp_config_path)
+                    .custom_step("keep", "Keep", keep_client, retry_count=0)
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        assert len(clients) == 1 and not clients[0].is_alive
@@ -0,0 +1,155 @@
+"""
+Unit tests for the shared, mtime-reloaded configuration snapshot.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.config import MCPConfigManager
+from utils.config_snapshot import ConfigSnapshotStore, env_reference
+from utils.exceptions import MCPConfigError
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+    # Force a visibly different mtime even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def config_files(tmp_path):
+    config_path = tmp_path / "mcp_config.json"
+    write_json(config_path, {
+        "mcpServers": {
+            "srv": {
+                "command": "npx",
+                "args": ["some-server"],
+                "env": {"TOKEN": "$SNAPSHOT_TOKEN", "BRACED": "${SNAPSHOT_BRACED}",
+                        "MISSING": "$SNAPSHOT_MISSING", "LITERAL": 5},
+            }
+        }
+    })
+    (tmp_path / ".env").write_text("SNAPSHOT_BRACED=from-dotenv\nSNAPSHOT_TOKEN=dotenv-token\nnot a pair\n")
+    write_json(tmp_path / "secrets.json", {"SNAPSHOT_TOKEN": "secret-token"})
+    return tmp_path
+
+
+def load(store, files):
+    return store.get(files / "mcp_config.json", files / ".env", files / "secrets.json")
+
+
+class TestConfigSnapshotStore:
+
+    def test_env_reference_forms(self):
+        assert env_reference("$NAME") == "NAME"
+        assert env_reference("${NAME}") == "NAME"
+        assert env_reference("prefix-$NAME") is None
+        assert env_reference(42) is None
+
+    def test_snapshot_is_shared_until_files_change(self, config_files):
+        store = ConfigSnapshotStore(export_environ=False)
+        first = load(store, config_files)
+        assert load(store, config_files) is first
+
+        config = first.as_dict()
+        config["mcpServers"]["srv"]["args"].append("--mutated")
+        assert first.server_config("srv")["args"] == ["some-server"]
+        with pytest.raises(TypeError):
+            first.servers["srv"]["command"] = "other"
+
+        write_json(config_files / "mcp_config.json", {"mcpServers": {"other": {"command": "node"}}})
+        second = load(store, config_files)
+        assert second is not first
+        assert second.server_names() == ["other"]
+
+    def test_server_env_precomputed_with_precedence(self, config_files, monkeypatch):
+        monkeypatch.setenv("SNAPSHOT_BRACED", "from-environ")
+        monkeypatch.delenv("SNAPSHOT_MISSING", raising=False)
+        store = ConfigSnapshotStore(export_environ=False)
+        snapshot = load(store, config_files)
+
+        assert snapshot.server_env("srv") == {
+            "TOKEN": "secret-token",
+            "BRACED": "from-environ",
+            "MISSING": "",
+            "LITERAL": "5",
+        }
+        assert snapshot.server_env("srv", keep_unresolved=True)["MISSING"] == "$SNAPSHOT_MISSING"
+        assert snapshot.secrets.dotenv_issues == ("Invalid .env format at line 3: not a pair",)
+
+    def test_secrets_change_rebuilds_env(self, config_files):
+        store = ConfigSnapshotStore(export_environ=False)
+        first = load(store, config_files)
+
+        write_json(config_files / "secrets.json", {"SNAPSHOT_TOKEN": "rotated-token"})
+        second = load(store, config_files)
+        assert second is not first
+        assert second.server_env("srv")["TOKEN"] == "rotated-token"
+
+    def test_environ_change_rebuilds_env(self, config_files, monkeypatch):
+        monkeypatch.setenv("SNAPSHOT_BRACED", "from-environ")
+        monkeypatch.delenv("SNAPSHOT_MISSING", raising=False)
+        store = ConfigSnapshotStore(export_environ=False)
+        first = load(store, config_files)
+        assert load(store, config_files) is first
+
+        monkeypatch.setenv("SNAPSHOT_BRACED", "exported-later")
+        monkeypatch.setenv("SNAPSHOT_MISSING", "now-set")
+        second = load(store, config_files)
+        assert second is not first
+        assert second.server_env("srv")["BRACED"] == "exported-later"
+        assert second.server_env("srv")["MISSING"] == "now-set"
+        assert load(store, config_files) is second
+
+    def test_export_to_environ_once(self, config_files, monkeypatch):
+        monkeypatch.setenv("SNAPSHOT_BRACED", "already-set")
+        monkeypatch.delenv("SNAPSHOT_TOKEN", raising=False)
+        store = ConfigSnapshotStore()
+        try:
+            load(store, config_files)
+            assert os.environ["SNAPSHOT_TOKEN"] == "secret-token"
+            assert os.environ["SNAPSHOT_BRACED"] == "already-set"
+        finally:
+            os.environ.pop("SNAPSHOT_TOKEN", None)
+
+    def test_invalid_files(self, tmp_path):
+        store = ConfigSnapshotStore(export_environ=False)
+        with pytest.raises(MCPConfigError, match="not found"):
+            store.get(tmp_path / "missing.json", tmp_path / ".env", tmp_path / "secrets.json")
+
+        (tmp_path / "bad.json").write_text("{not json")
+        with pytest.raises(MCPConfigError, match="Invalid JSON"):
+            store.get(tmp_path / "bad.json", tmp_path / ".env", tmp_path / "secrets.json")
+
+        (tmp_path / "secrets.json").write_text("[broken")
+        secrets = store.get_secrets(tmp_path / ".env", tmp_path / "secrets.json")
+        assert secrets.secrets == {}
+        assert secrets.secrets_issues[0].startswith("Invalid JSON in secrets.json")
+
+    @pytest.mark.asyncio
+    async def test_get_async_returns_shared_snapshot(self, config_files):
+        store = ConfigSnapshotStore(export_environ=False)
+        snapshot = await store.get_async(config_files / "mcp_config.json",
+                                         config_files / ".env", config_files / "secrets.json")
+        assert load(store, config_files) is snapshot
+
+
+class TestConfigManagerUsesSnapshot:
+
+    def test_from_file_reloads_on_change(self, tmp_path):
+        config_path = tmp_path / "mcp_config.json"
+        write_json(config_path, {"mcpServers": {"a": {"command": "npx"}}})
+        manager = MCPConfigManager.from_file(config_path)
+
+        assert manager.list_servers() == ["a"]
+        assert manager.get_config() is manager.get_config()
+
+        write_json(config_path, {"mcpServers": {"a": {"command": "npx"}, "b": {"url": "http://x"}}})
+        assert manager.list_servers() == ["a", "b"]
+
+    def test_from_file_errors_are_config_errors(self, tmp_path):
+        with pytest.raises(MCPConfigError, match="not found"):
+            MCPConfigManager.from_file(tmp_path / "missing.json")
@@ -0,0 +1,96 @@
+"""
+Unit tests for CPU steps, which run their function in the shared process
+pool instead of on the event loop.
+"""
+
+import os
+
+import pytest
+
+from utils import process_pool
+from workflows import WorkflowBuilder
+
+
+def count_references(files, database_name):
+    """Module-level so spawned workers can import it."""
+    return {
+        "pid": os.getpid(),
+        "matches": {path: content.count(database_name) for path, content in files.items()},
+    }
+
+
+def fail_scan(**kwargs):
+    raise ValueError("malformed pack")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_pool():
+    process_pool.configure_process_pool(1)
+    yield
+    process_pool.shutdown_process_pool()
+
+
+class TestCPUStep:
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_with_inputs(self):
+        async def load(context, step):
+            return {"a.py": "postgres_air postgres_air", "b.sql": "other"}
+
+        workflow = (WorkflowBuilder("cpu", "mcp_config.json")
+                    .custom_step("load", "Load", load, retry_count=0)
+                    .cpu_step("scan", "Scan", count_references,
+                              parameters={"database_name": "postgres_air"},
+                              inputs={"files": "load"}, depends_on=["load"])
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        scan = result.get_step_result("scan")
+        assert scan["matches"] == {"a.py": 2, "b.sql": 0}
+        assert scan["pid"] != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_pool_is_shared_across_workflows(self):
+        def build():
+            return (WorkflowBuilder("cpu", "mcp_config.json")
+                    .cpu_step("scan", "Scan", count_references,
+                              parameters={"files": {"x": "db"}, "database_name": "db"})
+                    .build())
+
+        first = await build().execute()
+        pool = process_pool.get_process_pool()
+        second = await build().execute()
+
+        assert process_pool.get_process_pool() is pool
+        assert first.get_step_result("scan")["pid"] == second.get_step_result("scan")["pid"]
+
+    @pytest.mark.asyncio
+    async def test_worker_error_fails_step(self):
+        workflow = WorkflowBuilder("cpu", "mcp_config.json").cpu_step("scan", "Scan", fail_scan).build()
+        result = await workflow.execute()
+
+        assert result.status == "failed"
+        assert "malformed pack" in result.get_step_result("scan")["error"]
+
+
+class TestCPUStepValidation:
+
+    def test_rejects_local_function(self):
+        def local_scan():
+            return 1
+
+        with pytest.raises(ValueError, match="worker process"):
+            WorkflowBuilder("cpu", "mcp_config.json").cpu_step("scan", "Scan", local_scan)
+
+    def test_rejects_unpicklable_parameters(self):
+        with pytest.raises(ValueError, match="worker process"):
+            WorkflowBuilder("cpu", "mcp_config.json").cpu_step(
+                "scan", "Scan", count_references, parameters={"files": lambda: None})
+
+    def test_rejects_coroutine_function(self):
+        async def scan():
+            return 1
+
+        with pytest.raises(ValueError, match="plain function"):
+            WorkflowBuilder("cpu", "mcp_config.json").cpu_step("scan", "Scan", scan)
@@ -193,6 +193,8 @@ class TestBackwardCompatibility:
         mock_workflow_builder.return_value = mock_builder_instance
         mock_builder_instance.custom_step.return_value = mock_builder_instance
         mock_builder_instance.with_config.return_value = mock_builder_instance
+        mock_builder_instance.with_run_identity_parameters.return_value = mock_builder_instance
+        mock_builder_instance.with_checkpoints.return_value = mock_builder_instance
         mock_builder_instance.build.return_value = MagicMock()
         
         # Execute with legacy-style call
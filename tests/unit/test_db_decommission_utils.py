@@ -44,6 +44,8 @@ class TestCreateDbDecommissionWorkflow:
         mock_workflow_builder.return_value = mock_builder_instance
         mock_builder_instance.custom_step.return_value = mock_builder_instance
         mock_builder_instance.with_config.return_value = mock_builder_instance
+        mock_builder_instance.with_run_identity_parameters.return_value = mock_builder_instance
+        mock_builder_instance.with_checkpoints.return_value = mock_builder_instance
         mock_builder_instance.build.return_value = MagicMock()
         
         # Execute
@@ -69,6 +71,8 @@ class TestCreateDbDecommissionWorkflow:
         mock_workflow_builder.return_value = mock_builder_instance
         mock_builder_instance.custom_step.return_value = mock_builder_instance
         mock_builder_instance.with_config.return_value = mock_builder_instance
+        mock_builder_instance.with_run_identity_parameters.return_value = mock_builder_instance
+        mock_builder_instance.with_checkpoints.return_value = mock_builder_instance
         mock_builder_instance.build.return_value = MagicMock()
         
         # Execute
@@ -109,6 +113,8 @@ class TestCreateDbDecommissionWorkflow:
         mock_workflow_builder.return_value = mock_builder_instance
         mock_builder_instance.custom_step.return_value = mock_builder_instance
         mock_builder_instance.with_config.return_value = mock_builder_instance
+        mock_builder_instance.with_run_identity_parameters.return_value = mock_builder_instance
+        mock_builder_instance.with_checkpoints.return_value = mock_builder_instance
         mock_builder_instance.build.return_value = MagicMock()
         
         # Execute
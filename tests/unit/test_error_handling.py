@@ -14,6 +14,7 @@ Tests the error handling system functionality including:
 import pytest
 import asyncio
 import json
+import re
 from unittest.mock import patch, MagicMock, AsyncMock, call
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -32,6 +33,7 @@ from concrete.error_handling import (
     reset_error_handler,
     logger as error_handling_logger # Import the module's logger
 )
+from utils.retry import get_retry_budget, reset_retry_budgets
 
 # Use a custom logger name to avoid conflicts with other tests
 TEST_LOGGER_NAME = "test_error_handling_logger"
@@ -42,7 +44,7 @@ def mock_time():
     # Patch the datetime module used in concrete.error_handling
     with patch('concrete.error_handling.time.time') as mock_time_time, \
          patch('concrete.error_handling.datetime') as mock_datetime_module, \
-         patch('concrete.error_handling.asyncio.sleep', new_callable=AsyncMock) as mock_async_sleep:
+         patch('utils.retry.asyncio.sleep', new_callable=AsyncMock) as mock_async_sleep:
         
         mock_fixed_datetime = datetime(2023, 3, 15, 0, 0, 0)
 
@@ -238,6 +240,23 @@ class TestErrorRecoveryStrategy:
         mock_logger.warning.assert_has_calls(expected_warning_calls, any_order=True)
         mock_logger.error.assert_called_once_with("All 3 attempts failed") # Max retries + 1
 
+    @pytest.mark.asyncio
+    async def test_execute_with_recovery_respects_retry_budget(self, mock_time, mock_logger):
+        reset_retry_budgets()
+        try:
+            get_retry_budget("ovr_budget_test", capacity=1, refill_per_second=0)
+            strategy = ErrorRecoveryStrategy(max_retries=3, budget_key="ovr_budget_test")
+            mock_operation = AsyncMock(side_effect=ValueError("Fail"))
+
+            with pytest.raises(ValueError, match="Fail"):
+                await strategy.execute_with_recovery(mock_operation)
+
+            # One retry from the budget, then it gives up
+            assert mock_operation.call_count == 2
+            mock_logger.error.assert_called_once_with("Giving up after 2 attempts (budget)")
+        finally:
+            reset_retry_budgets()
+
 class TestCircuitBreaker:
     @pytest.mark.asyncio
     async def test_circuit_breaker_closed_state(self, mock_time, mock_logger):
@@ -463,11 +482,11 @@ class TestErrorHandler:
         assert mock_operation.call_count == 2
         assert len(error_handler.error_history) == 0 # Should be empty as error was recovered
         
-        # Expected warning calls from retries (adjusted to match actual backoff factor of 2.0)
-        expected_warning_calls = [
-            call(f"Attempt 1 failed, retrying in 1.0s: First try failed")
-        ]
-        mock_logger.warning.assert_has_calls(expected_warning_calls, any_order=True) # Check logging from the recovery strategy
+        # Default NETWORK strategy (backoff factor 2.0) uses decorrelated jitter: first delay in [1.0, 2.0]
+        mock_logger.warning.assert_called_once()
+        warning = mock_logger.warning.call_args[0][0]
+        match = re.fullmatch(r"Attempt 1 failed, retrying in (\d+\.\d)s: First try failed", warning)
+        assert match and 1.0 <= float(match.group(1)) <= 2.0
         mock_logger.error.assert_not_called()
 
     @pytest.mark.asyncio
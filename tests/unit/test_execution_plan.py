@@ -0,0 +1,150 @@
+"""
+Unit tests for compiled execution plans: validation and resolution at
+compile time, placeholder binding, duration estimates and persistence.
+"""
+
+import pytest
+
+from concrete.db_decommission.utils import compile_db_decommission_plan, create_db_decommission_workflow
+from utils.capabilities import capability_cache, capability_key
+from workflows import ExecutionPlan, StepTimings, WorkflowBuilder, plan_parameter, step_timings
+from workflows.builder import StepType, WorkflowStep
+
+
+async def echo_step(context, step, **parameters):
+    return parameters
+
+
+def build_templated(name="plan"):
+    return (WorkflowBuilder(name, "mcp_config.json", description=f"Decommission {plan_parameter('db')}")
+            .custom_step("scan", "Scan", echo_step, parameters={
+                "database_name": plan_parameter("db"),
+                "repos": plan_parameter("repos"),
+                "branch": f"decommission-{plan_parameter('db')}",
+                "options": {"labels": ["cleanup", plan_parameter("db")], "draft": True},
+            })
+            .custom_step("report", "Report", echo_step, parameters={"fixed": 1}, depends_on=["scan"]))
+
+
+class TestCompile:
+
+    def test_collects_variables_and_tables(self):
+        plan = build_templated().compile()
+
+        assert plan.variables == ["db", "repos"]
+        assert plan.dependents == {"scan": ["report"], "report": []}
+        assert plan.dependency_counts == {"scan": 0, "report": 1}
+        assert set(plan.parameter_slots) == {"scan"}
+
+    def test_rejects_cycles(self):
+        builder = (WorkflowBuilder("plan", "mcp_config.json")
+                   .custom_step("a", "A", echo_step, depends_on=["b"])
+                   .custom_step("b", "B", echo_step, depends_on=["a"]))
+        with pytest.raises(ValueError, match="cycle"):
+            builder.compile()
+
+    def test_resolves_client_class_and_checks_cached_tools(self):
+        from clients import GitHubMCPClient
+
+        builder = WorkflowBuilder("plan", "mcp_config.json").github_analyze_repo("analyze", "https://github.com/o/r")
+        assert builder.compile().client_classes == {"ovr_github": GitHubMCPClient}
+
+        key = capability_key("mcp_config.json", "ovr_github")
+        capability_cache.put_tools(key, [{"name": "get_file_contents"}])
+        try:
+            with pytest.raises(ValueError, match="analyze_repo_structure"):
+                builder.compile()
+        finally:
+            capability_cache.invalidate(key)
+
+    def test_rejects_unsupported_server(self):
+        builder = WorkflowBuilder("plan", "mcp_config.json")
+        builder._steps.append(WorkflowStep(id="call", name="Call", step_type=StepType.CUSTOM,
+                                           server_name="no_such_server", tool_name="x"))
+        with pytest.raises(ValueError, match="unsupported server"):
+            builder.compile()
+
+    def test_estimates_critical_path_from_history(self):
+        timings = StepTimings()
+        timings.record("plan", "scan", 4.0)
+        timings.record("plan", "scan", 6.0)
+
+        plan = build_templated().compile(timings)
+
+        assert plan.estimates == {"scan": 5.0, "report": None}
+        assert plan.unestimated_steps == ["report"]
+        assert plan.estimated_duration_seconds == 5.0
+
+
+class TestBind:
+
+    def test_substitutes_values_without_touching_plan(self):
+        plan = build_templated().compile()
+        workflow = plan.bind({"db": "postgres_air", "repos": ["r1", "r2"]})
+
+        scan = workflow.steps[0].parameters
+        assert scan == {
+            "database_name": "postgres_air",
+            "repos": ["r1", "r2"],
+            "branch": "decommission-postgres_air",
+            "options": {"labels": ["cleanup", "postgres_air"], "draft": True},
+        }
+        assert workflow.config.description == "Decommission postgres_air"
+        assert workflow.plan is plan
+        # Parameters without placeholders are shared, templated ones are copies
+        assert workflow.steps[1].parameters is plan.steps[1].parameters
+        assert plan.steps[0].parameters["database_name"] == "${db}"
+        assert plan.config.description == "Decommission ${db}"
+
+    @pytest.mark.parametrize("values, message", [
+        ({"db": "x"}, "No value for plan parameters: repos"),
+        ({"db": "x", "repos": [], "extra": 1}, "Unknown plan parameters: extra"),
+    ])
+    def test_rejects_missing_or_unknown_values(self, values, message):
+        with pytest.raises(ValueError, match=message):
+            build_templated().compile().bind(values)
+
+    @pytest.mark.asyncio
+    async def test_bound_workflows_run_independently(self):
+        plan = build_templated("plan-run").compile()
+
+        first = await plan.bind({"db": "a", "repos": ["r1"]}).execute()
+        second = await plan.bind({"db": "b", "repos": ["r2"]}).execute()
+
+        assert first.status == second.status == "completed"
+        assert first.get_step_result("scan")["database_name"] == "a"
+        assert second.get_step_result("scan")["repos"] == ["r2"]
+        assert step_timings.estimate("plan-run", "scan") is not None
+
+
+class TestPersistence:
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        plan = build_templated().compile()
+        loaded = ExecutionPlan.load(plan.save(tmp_path / "plan.pkl"))
+
+        assert loaded.variables == plan.variables
+        assert loaded.steps[0].custom_function is echo_step
+        assert loaded.bind({"db": "x", "repos": []}).steps[0].parameters["database_name"] == "x"
+
+    def test_save_rejects_local_functions(self, tmp_path):
+        async def local_step(context, step):
+            return None
+
+        plan = WorkflowBuilder("plan", "mcp_config.json").custom_step("s", "S", local_step).compile()
+        with pytest.raises(ValueError, match="cannot be saved"):
+            plan.save(tmp_path / "plan.pkl")
+        assert not list(tmp_path.iterdir())
+
+
+class TestDecommissionPlan:
+
+    def test_bound_plan_matches_built_workflow(self):
+        arguments = dict(database_name="postgres_air", target_repos=["https://github.com/org/repo"],
+                         slack_channel="C1", workflow_id="wf-1")
+        built = create_db_decommission_workflow(**arguments)
+        bound = create_db_decommission_workflow(**arguments, plan=compile_db_decommission_plan())
+
+        assert bound.config.description == built.config.description
+        assert [(s.id, s.parameters, s.depends_on) for s in bound.steps] == \
+            [(s.id, s.parameters, s.depends_on) for s in built.steps]
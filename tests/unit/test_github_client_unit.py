@@ -264,6 +264,71 @@ class TestGitHubMCPClientUnitTests:
             assert result["url"] == "https://github.com/testuser/postgres-sample-dbs/pull/42"
 
 
+    @pytest.mark.asyncio
+    async def test_get_file_contents_batch_keeps_order_and_errors(self, github_client):
+        """Test batched file fetches return contents in input order with per-file errors."""
+        with patch.object(github_client, 'call_tool_with_retry', new_callable=AsyncMock) as mock_call:
+            async def fake_call(tool_name, params, retry_count=3):
+                if params["path"] == "missing.py":
+                    raise MCPToolError("not found")
+                return {"content": f"content of {params['path']}"}
+            mock_call.side_effect = fake_call
+            
+            results = await github_client.get_file_contents_batch(
+                "testuser", "postgres-sample-dbs", ["a.py", "missing.py", "b.py"], ref="main"
+            )
+            
+            assert results[0] == "content of a.py"
+            assert isinstance(results[1], MCPToolError)
+            assert results[2] == "content of b.py"
+            assert mock_call.call_count == 3
+            assert all(call.args[1]["ref"] == "main" for call in mock_call.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_create_or_update_files_batch(self, github_client):
+        """Test batched commits produce one create_or_update_file-shaped result per file."""
+        with patch.object(github_client, 'call_tool_with_retry', new_callable=AsyncMock) as mock_call:
+            async def fake_call(tool_name, params, retry_count=3):
+                if params["path"] == "bad.sql":
+                    raise MCPToolError("conflict")
+                return {"commit": {"sha": f"sha-{params['path']}"}}
+            mock_call.side_effect = fake_call
+            
+            results = await github_client.create_or_update_files(
+                "testuser", "postgres-sample-dbs",
+                [
+                    {"path": "good.py", "content": "x", "message": "m1"},
+                    {"path": "bad.sql", "content": "y", "message": "m2"},
+                ],
+                branch="feature"
+            )
+            
+            assert results[0]["success"] is True
+            assert results[0]["commit_sha"] == "sha-good.py"
+            assert results[0]["branch"] == "feature"
+            assert results[1]["success"] is False
+            assert "conflict" in results[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_create_or_update_files_commits_serially(self, github_client):
+        """Test commits to one branch never overlap, so they cannot race on its head."""
+        in_flight = []
+        peak = []
+        with patch.object(github_client, 'call_tool_with_retry', new_callable=AsyncMock) as mock_call:
+            async def fake_call(tool_name, params, retry_count=3):
+                in_flight.append(params["path"])
+                peak.append(len(in_flight))
+                await asyncio.sleep(0)
+                in_flight.remove(params["path"])
+                return {"commit": {"sha": f"sha-{params['path']}"}}
+            mock_call.side_effect = fake_call
+
+            files = [{"path": f"f{i}.py", "content": "x", "message": "m"} for i in range(5)]
+            results = await github_client.create_or_update_files("testuser", "repo", files, branch="feature")
+
+            assert all(result["success"] for result in results)
+            assert max(peak) == 1
+
 class TestWorkflowCreation:
     """Unit tests for database decommissioning workflow creation."""
 
@@ -328,6 +393,15 @@ class TestWorkflowCreation:
         assert step_timeouts["quality_assurance"] == 60
         assert step_timeouts["workflow_summary"] == 30
 
+    def test_side_effecting_steps_are_not_retried(self):
+        """Test steps that notify Slack or open pull requests run at most once."""
+        workflow = create_db_decommission_workflow()
+
+        step_retries = {step.id: step.retry_count for step in workflow.steps}
+        assert step_retries["process_repositories"] == 0
+        assert step_retries["create_github_pr"] == 0
+        assert step_retries["validate_environment"] == workflow.config.default_retry_count == 3
+
 
 class TestGitHubClientIntegration:
     """Integration tests for GitHub client methods working together."""
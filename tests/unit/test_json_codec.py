@@ -0,0 +1,117 @@
+"""
+Unit tests for the pluggable JSON codec and its use by the JSON log sink.
+"""
+
+import json
+
+import pytest
+
+from utils import json_codec
+from utils.json_codec import JSONCodec, get_json_codec, set_json_codec
+
+
+def available_codecs():
+    names = ["json"]
+    if json_codec.orjson is not None:
+        names.append("orjson")
+    if json_codec.msgspec is not None:
+        names.append("msgspec")
+    return names
+
+
+@pytest.fixture
+def restore_codec():
+    previous = json_codec._active_codec
+    yield
+    json_codec._active_codec = previous
+
+
+class TestJSONCodec:
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_round_trip_bytes(self, name):
+        codec = json_codec._create_codec(name)
+        payload = {"jsonrpc": "2.0", "id": "req_1", "params": {"text": "zażółć ✓", "n": [1, 2.5, None, True]}}
+
+        encoded = codec.dumps(payload)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == payload
+        assert codec.loads(encoded) == payload
+        assert codec.loads(bytearray(encoded)) == payload
+        assert codec.loads(memoryview(encoded)) == payload
+        assert codec.loads(encoded.decode()) == payload
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_dumps_line_is_single_terminated_line(self, name):
+        codec = json_codec._create_codec(name)
+        line = codec.dumps_line({"a": "multi\nline"})
+
+        assert line.endswith(b"\n")
+        assert line.count(b"\n") == 1
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_indent_matches_stdlib_layout(self, name):
+        codec = json_codec._create_codec(name)
+        payload = {"a": 1, "b": [1, 2]}
+
+        assert codec.dumps(payload, indent=True).decode() == json.dumps(payload, indent=2)
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_falls_back_for_inputs_fast_codecs_reject(self, name):
+        codec = json_codec._create_codec(name)
+
+        big = {"value": 2 ** 70}
+        assert codec.loads(codec.dumps(big)) == big
+        assert codec.loads(b'{"value": NaN}')["value"] != 0
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_default_hook_is_used(self, name):
+        codec = json_codec._create_codec(name)
+
+        encoded = codec.dumps({"value": object()}, default=lambda o: "obj")
+        assert codec.loads(encoded) == {"value": "obj"}
+
+    def test_unknown_codec_name_raises(self, restore_codec):
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            set_json_codec("yaml")
+
+    def test_auto_selection_prefers_fast_codec(self, restore_codec):
+        codec = set_json_codec()
+        expected = available_codecs()[1] if len(available_codecs()) > 1 else "json"
+        assert codec.name == expected
+        assert get_json_codec() is codec
+
+    def test_env_override(self, restore_codec, monkeypatch):
+        monkeypatch.setenv("GRAPHMCP_JSON_CODEC", "json")
+        json_codec._active_codec = None
+
+        assert type(get_json_codec()) is JSONCodec
+
+
+class TestStructuredLoggerJSONSink:
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_sink_writes_codec_bytes(self, tmp_path, pretty):
+        from graphmcp.logging import StructuredLogger, LogEntry
+        from graphmcp.logging.config import LoggingConfig
+
+        log_file = tmp_path / "sink.json"
+        config = LoggingConfig(log_filepath=str(log_file), output_format="json", json_pretty_print=pretty)
+        logger = StructuredLogger("wf-codec", config)
+        try:
+            logger.log_structured(LogEntry.create("wf-codec", "INFO", "test", "first ✓", data={"k": 1}))
+            logger.log_structured(LogEntry.create("wf-codec", "INFO", "test", "second"))
+        finally:
+            logger.close()
+
+        decoder = json.JSONDecoder()
+        text = log_file.read_text(encoding="utf-8")
+        entries, index = [], 0
+        while index < len(text.rstrip()):
+            entry, index = decoder.raw_decode(text, index)
+            entries.append(entry)
+            while index < len(text) and text[index].isspace():
+                index += 1
+
+        assert [e["message"] for e in entries] == ["first ✓", "second"]
+        assert entries[0]["data"] == {"k": 1}
@@ -0,0 +1,141 @@
+"""
+Unit tests for MCPServerPool warm checkout/checkin, recycling and
+health-aware replacement, using the fake stdio MCP server fixture.
+"""
+
+import asyncio
+
+import pytest
+
+from clients.base import BaseMCPClient
+from clients.pool import MCPServerPool, get_server_pool, set_server_pool
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+
+    async def list_available_tools(self) -> list[str]:
+        result = await self._send_mcp_request("tools/list", {})
+        return [tool.get("name") for tool in result.get("tools", [])]
+
+    async def health_check(self) -> bool:
+        try:
+            await self.list_available_tools()
+            return True
+        except Exception:
+            return False
+
+
+def make_pool(config_path, **kwargs):
+    return MCPServerPool(config_path, client_classes={"fake_server": FakeMCPClient}, **kwargs)
+
+
+class TestMCPServerPool:
+
+    @pytest.mark.asyncio
+    async def test_start_prewarms_initialized_processes(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path, min_size=2)
+        try:
+            await pool.start(["fake_server"])
+            assert pool.stats()["fake_server"] == {"live": 2, "idle": 2}
+
+            client = await pool.checkout("fake_server")
+            assert client.is_alive
+            assert client._server_info["serverInfo"]["name"] == "fake"
+            await pool.checkin(client)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_checkin_reuses_same_process(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path)
+        try:
+            async with pool.client("fake_server") as first:
+                process = first._process
+            async with pool.client("fake_server") as second:
+                assert second is first
+                assert second._process is process
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_checkout_waits_when_max_size_reached(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path, max_size=1)
+        try:
+            client = await pool.checkout("fake_server")
+            waiter = asyncio.create_task(pool.checkout("fake_server"))
+            await asyncio.sleep(0.1)
+            assert not waiter.done()
+
+            await pool.checkin(client)
+            assert await asyncio.wait_for(waiter, timeout=5) is client
+            await pool.checkin(client)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_request_budget_recycles_process(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path, max_requests=3)
+        try:
+            client = await pool.checkout("fake_server")
+            await client.call_tool_with_retry("echo", {}, retry_count=0)
+            await client.call_tool_with_retry("echo", {}, retry_count=0)
+            await pool.checkin(client)
+
+            assert not client.is_alive
+            assert pool.stats()["fake_server"]["live"] == 0
+
+            replacement = await pool.checkout("fake_server")
+            assert replacement is not client
+            await pool.checkin(replacement)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_dead_process_is_replaced_on_checkout(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path)
+        try:
+            client = await pool.checkout("fake_server")
+            await pool.checkin(client)
+            client._process.kill()
+            await client._process.wait()
+
+            replacement = await pool.checkout("fake_server")
+            assert replacement is not client
+            assert replacement.is_alive
+            assert pool.stats()["fake_server"]["live"] == 1
+            await pool.checkin(replacement)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_retired_processes_are_refilled_to_min_size(self, fake_mcp_config_path):
+        pool = make_pool(fake_mcp_config_path, min_size=2)
+        try:
+            await pool.start()
+            client = await pool.checkout("fake_server")
+            client._process.kill()
+            await client._process.wait()
+            await pool.checkin(client)
+
+            for _ in range(50):
+                if pool.stats()["fake_server"]["idle"] == 2:
+                    break
+                await asyncio.sleep(0.1)
+            assert pool.stats()["fake_server"] == {"live": 2, "idle": 2}
+        finally:
+            await pool.close()
+        assert pool.stats()["fake_server"] == {"live": 0, "idle": 0}
+
+    @pytest.mark.asyncio
+    async def test_process_wide_pool_matches_config_path(self, fake_mcp_config_path, tmp_path):
+        pool = make_pool(fake_mcp_config_path)
+        set_server_pool(pool)
+        try:
+            assert get_server_pool() is pool
+            assert get_server_pool(fake_mcp_config_path) is pool
+            assert get_server_pool(tmp_path / "other.json") is None
+        finally:
+            set_server_pool(None)
+            await pool.close()
+        assert get_server_pool() is None
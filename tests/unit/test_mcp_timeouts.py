@@ -0,0 +1,144 @@
+"""
+Unit tests for deadline propagation and adaptive per-tool timeouts.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from clients.base import BaseMCPClient, MCPDeadlineExceeded, MCPTimeoutError
+from clients.timeouts import LatencyTracker, deadline_scope, get_deadline, latency_tracker, remaining_time
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+    DEFAULT_TIMEOUT = 5.0
+    TOOL_TIMEOUTS = {"slow_tool": 20.0}
+
+    async def list_available_tools(self) -> list[str]:
+        result = await self._send_mcp_request("tools/list", {})
+        return [tool.get("name") for tool in result.get("tools", [])]
+
+    async def health_check(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def fresh_latency_stats():
+    latency_tracker.reset()
+    yield
+    latency_tracker.reset()
+
+
+class TestDeadlineScope:
+
+    def test_no_deadline_by_default(self):
+        assert get_deadline() is None
+        assert remaining_time() is None
+
+    def test_nested_scope_only_shortens(self):
+        with deadline_scope(10) as outer:
+            with deadline_scope(100) as inner:
+                assert inner == outer
+            with deadline_scope(1) as tighter:
+                assert tighter < outer
+                assert 0 < remaining_time() <= 1
+            assert get_deadline() == outer
+        assert get_deadline() is None
+
+    def test_none_keeps_current_deadline(self):
+        with deadline_scope(5) as outer:
+            with deadline_scope(None) as inner:
+                assert inner == outer
+
+    @pytest.mark.asyncio
+    async def test_deadline_is_inherited_by_spawned_tasks(self):
+        async def read_deadline():
+            return get_deadline()
+
+        with deadline_scope(3) as deadline:
+            assert await asyncio.create_task(read_deadline()) == deadline
+
+
+class TestLatencyTracker:
+
+    def test_default_until_enough_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record("srv", "tool", 0.1)
+        assert tracker.timeout_for("srv", "tool", default=30) == 30
+
+    def test_timeout_tracks_p99_within_bounds(self):
+        tracker = LatencyTracker(min_samples=5, multiplier=3.0, floor=0.5)
+        for latency in [0.1] * 99 + [1.0]:
+            tracker.record("srv", "tool", latency)
+
+        assert tracker.percentile("srv", "tool") == pytest.approx(0.1)
+        assert tracker.timeout_for("srv", "tool", default=30) == pytest.approx(0.5)
+
+        tracker.record("srv", "tool", 1.0)
+        assert tracker.timeout_for("srv", "tool", default=30) == pytest.approx(3.0)
+        assert tracker.timeout_for("srv", "tool", default=2) == 2
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=10, min_samples=1)
+        for _ in range(10):
+            tracker.record("srv", "tool", 50.0)
+        for _ in range(10):
+            tracker.record("srv", "tool", 1.0)
+        assert tracker.percentile("srv", "tool") == 1.0
+
+
+class TestTransportTimeouts:
+
+    @pytest.mark.asyncio
+    async def test_deadline_caps_request_timeout(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            start = time.monotonic()
+            with deadline_scope(0.3):
+                with pytest.raises(MCPDeadlineExceeded):
+                    await client.call_tool_with_retry("echo", {"delay": 2}, retry_count=3)
+            assert time.monotonic() - start < 1.5
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_fails_before_sending(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            with deadline_scope(0):
+                with pytest.raises(MCPDeadlineExceeded, match="before sending"):
+                    await client._send_mcp_request("tools/call", {"name": "echo", "arguments": {}})
+            assert client._requests_served == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_when_backoff_exceeds_budget(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            start = time.monotonic()
+            with deadline_scope(1.5):
+                with pytest.raises(MCPDeadlineExceeded, match="no time to retry"):
+                    # Backoff is at least 1s, so at most one retry fits in the budget
+                    await client.call_tool_with_retry("echo", {"fail": True}, retry_count=3)
+            assert time.monotonic() - start < 2.0
+
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_fails_fast_after_warmup(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            assert client.tool_timeout("echo") == 5.0
+            assert client.tool_timeout("slow_tool") == 20.0
+
+            for _ in range(latency_tracker.min_samples):
+                latency_tracker.record("fake_server", "echo", 0.05)
+            assert client.tool_timeout("echo") == latency_tracker.floor
+
+            start = time.monotonic()
+            with pytest.raises(MCPTimeoutError):
+                await client._send_mcp_request(
+                    "tools/call", {"name": "echo", "arguments": {"delay": 1}},
+                    timeout=client.tool_timeout("echo") / 10,
+                )
+            assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_successful_calls_record_latency(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            await client.call_tool_with_retry("echo", {}, retry_count=0)
+        assert latency_tracker.sample_count("fake_server", "echo") == 1
@@ -0,0 +1,202 @@
+"""
+Unit tests for the BaseMCPClient stdio transport.
+
+The fake_mcp_config_path fixture (tests/conftest.py) spawns a tiny
+line-delimited JSON-RPC server as a real subprocess, so the
+request/response plumbing is exercised without any network or npx.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from clients.base import BaseMCPClient, MCPConnectionError, MCPToolError
+from clients.repomix import RepomixMCPClient
+from clients.stream_decoder import SpooledContent
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+
+    async def list_available_tools(self) -> list[str]:
+        result = await self._send_mcp_request("tools/list", {})
+        return [tool.get("name") for tool in result.get("tools", [])]
+
+    async def health_check(self) -> bool:
+        return True
+
+
+class TestMultiplexedTransport:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_routed_by_id(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            start = time.monotonic()
+            slow, fast = await asyncio.gather(
+                client.call_tool_with_retry("echo", {"delay": 0.5, "tag": "slow"}, retry_count=0),
+                client.call_tool_with_retry("echo", {"delay": 0.05, "tag": "fast"}, retry_count=0),
+            )
+            elapsed = time.monotonic() - start
+
+        assert slow["echo"]["tag"] == "slow"
+        assert fast["echo"]["tag"] == "fast"
+        # Both calls overlap on one process instead of running back to back
+        assert elapsed < 0.9
+
+    @pytest.mark.asyncio
+    async def test_many_in_flight_share_one_process(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            results = await asyncio.gather(*[
+                client.call_tool_with_retry("echo", {"index": i, "delay": 0.01 * (10 - i)}, retry_count=0)
+                for i in range(10)
+            ])
+            process = client._process
+
+            assert [r["echo"]["index"] for r in results] == list(range(10))
+            assert client._pending == {}
+            assert process is client._process
+
+    @pytest.mark.asyncio
+    async def test_error_response_raises_tool_error(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            with pytest.raises(MCPToolError, match="boom"):
+                await client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"fail": True}})
+
+            # The connection stays usable after a tool-level error
+            result = await client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"ok": 1}})
+            assert result["echo"]["ok"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_errors_all_raise_tool_error(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            results = await asyncio.gather(*[
+                client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"fail": True}})
+                for _ in range(3)
+            ], return_exceptions=True)
+
+            assert all(isinstance(result, MCPToolError) for result in results)
+            # Server stderr is collected in the background for error messages
+            await asyncio.sleep(0.1)
+            assert "fake server failure details" in client._recent_stderr()
+
+    @pytest.mark.asyncio
+    async def test_server_exit_fails_pending_requests(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            pending = asyncio.create_task(
+                client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"delay": 5}})
+            )
+            await asyncio.sleep(0.2)
+            with pytest.raises(MCPConnectionError):
+                await client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"exit": True}})
+            with pytest.raises(MCPConnectionError):
+                await asyncio.wait_for(pending, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_close_fails_outstanding_requests(self, fake_mcp_config_path):
+        client = FakeMCPClient(fake_mcp_config_path)
+        pending = asyncio.create_task(
+            client._send_mcp_request("tools/call", {"name": "echo", "arguments": {"delay": 5}})
+        )
+        await asyncio.sleep(0.3)
+        await client.close()
+
+        with pytest.raises(MCPConnectionError):
+            await asyncio.wait_for(pending, timeout=5)
+        assert client._process is None
+
+
+class TestBatchToolCalls:
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_results_in_input_order(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            calls = [("echo", {"index": i, "delay": 0.02 * (5 - i)}) for i in range(5)]
+            results = await client.call_tools_batch(calls, max_concurrency=5, retry_count=0)
+
+        assert [r["echo"]["index"] for r in results] == list(range(5))
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_per_item_errors(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            results = await client.call_tools_batch([
+                ("echo", {"index": 0}),
+                ("echo", {"fail": True}),
+                ("echo", {"index": 2}),
+            ], retry_count=0)
+
+        assert results[0]["echo"]["index"] == 0
+        assert isinstance(results[1], MCPToolError)
+        assert results[2]["echo"]["index"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_max_concurrency(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            start = time.monotonic()
+            await client.call_tools_batch([("echo", {"delay": 0.2})] * 4, max_concurrency=2, retry_count=0)
+            elapsed = time.monotonic() - start
+
+        # Two waves of two calls each
+        assert elapsed >= 0.4
+
+
+class SpoolingMCPClient(FakeMCPClient):
+    SPOOL_THRESHOLD = 16 * 1024
+
+
+class TestLargeResponses:
+
+    @pytest.mark.asyncio
+    async def test_frame_larger_than_default_stream_limit(self, fake_mcp_config_path):
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            result = await client.call_tool_with_retry("echo", {"size": 300_000}, retry_count=0)
+
+        assert result["content"][0]["text"] == "x" * 300_000
+
+    @pytest.mark.asyncio
+    async def test_large_content_can_be_spooled(self, fake_mcp_config_path):
+        async with SpoolingMCPClient(fake_mcp_config_path) as client:
+            spooled, small = await asyncio.gather(
+                client.call_tool_with_retry("echo", {"size": 200_000}, retry_count=0, spool_large_content=True),
+                client.call_tool_with_retry("echo", {"size": 10}, retry_count=0, spool_large_content=True),
+            )
+            materialized = await client.call_tool_with_retry("echo", {"size": 200_000}, retry_count=0)
+
+        content = spooled["content"][0]["text"]
+        assert isinstance(content, SpooledContent)
+        assert len(content) == 200_000
+        assert content.open().read(5) == b"xxxxx"
+        assert small["content"][0]["text"] == "x" * 10
+        assert materialized["content"][0]["text"] == "x" * 200_000
+
+    @pytest.mark.asyncio
+    async def test_repomix_pack_is_streamed_to_a_file(self, tmp_path):
+        spool = tempfile.SpooledTemporaryFile(max_size=16)
+        spool.write(b"<file path=\"a.py\">\n" + b"x" * 1000 + b"\n</file>\n")
+        raw = {"content": [{"type": "text", "text": "Packed 1 file"},
+                           {"type": "text", "text": SpooledContent(spool, spool.tell())}]}
+        output = tmp_path / "packs" / "repo.xml"
+
+        copy_threads = []
+        real_copyfileobj = shutil.copyfileobj
+
+        def copyfileobj(source, target):
+            copy_threads.append(threading.current_thread())
+            real_copyfileobj(source, target)
+
+        client = RepomixMCPClient.__new__(RepomixMCPClient)
+        with patch.object(client, "call_tool_with_retry", new=AsyncMock(return_value=raw)) as call, \
+                patch("clients.repomix.shutil.copyfileobj", side_effect=copyfileobj):
+            result = await client.pack_remote_repository("https://github.com/o/r", output_file=str(output))
+
+        assert call.call_args.kwargs["spool_large_content"] is True
+        # The copy runs off the event loop thread
+        assert copy_threads and copy_threads[0] is not threading.main_thread()
+        assert result["success"] is True
+        assert result["output_file"] == str(output)
+        assert output.read_bytes().startswith(b"<file path=\"a.py\">\nxxx")
+        assert raw["content"] == [{"type": "text", "text": "Packed 1 file"}, {"type": "text", "text": str(output)}]
@@ -0,0 +1,175 @@
+"""
+Unit tests for the persistent Repomix pack index and its use by the
+reference extractor and the repository processors.
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from concrete.database_reference_extractor import DatabaseReferenceExtractor
+from concrete.db_decommission import repository_processors
+from concrete.db_decommission.repository_processors import (
+    copy_repo_pack_to_tmp, find_existing_repo_pack
+)
+from concrete.pack_index import (
+    PackIndex, current_pack_index, find_candidates, index_path_for, line_starts_of, load_pack_index
+)
+from concrete.source_type_classifier import SourceType, SourceTypeClassifier
+from utils import process_pool
+from utils.repomix_pack import RepomixPack
+
+PACK = '''<file path="config/database.yml">
+production:
+  database: postgres_air
+</file>
+<file path="README.md">
+# Nothing to see
+</file>
+<file path="scripts/migrate.sql">
+-- POSTGRES_AIR schema
+CREATE TABLE flights (id INT);
+</file>
+<file path="docs/postgres_air.md">
+Only the path mentions the database
+</file>
+'''
+
+
+@pytest.fixture
+def shared_pool():
+    process_pool.configure_process_pool(1)
+    yield
+    process_pool.shutdown_process_pool()
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / "postgres_air_repo_pack.xml"
+    path.write_text(PACK)
+    return path
+
+
+class TestPackIndex:
+
+    def test_records_offsets_hashes_classification_and_lines(self, pack_path):
+        index = PackIndex.build(pack_path)
+        raw = pack_path.read_bytes()
+
+        with RepomixPack(pack_path) as pack:
+            assert [f.entry for f in index] == list(pack)
+        sql = index.get("scripts/migrate.sql")
+        content = raw[sql.offset:sql.offset + sql.length]
+        assert content == b"-- POSTGRES_AIR schema\nCREATE TABLE flights (id INT);"
+        assert sql.sha256 == hashlib.sha256(content).hexdigest()
+        assert sql.source_type == SourceType.SQL
+        assert sql.classification == SourceTypeClassifier().classify_file(sql.path, content.decode())
+        assert list(sql.line_starts) == [0, 23]
+        assert sql.line_number(30) == 2
+
+    def test_sidecar_round_trip_and_staleness(self, pack_path):
+        assert current_pack_index(pack_path) is None
+
+        built = load_pack_index(pack_path, save=True)
+        assert index_path_for(pack_path).name == "postgres_air_repo_pack.xml.index"
+        loaded = current_pack_index(pack_path)
+        assert [(f.path, f.sha256, f.source_type) for f in loaded] == \
+            [(f.path, f.sha256, f.source_type) for f in built]
+        assert loaded.get("README.md") is not None
+
+        pack_path.write_text(PACK + '<file path="new.txt">\nnew\n</file>\n')
+        assert current_pack_index(pack_path) is None
+        assert len(load_pack_index(pack_path)) == 5
+
+    def test_unreadable_sidecar_is_ignored(self, pack_path):
+        index_path_for(pack_path).write_bytes(b"not a pickle")
+        assert current_pack_index(pack_path) is None
+        assert len(load_pack_index(pack_path)) == 4
+
+    def test_line_starts_of(self):
+        assert list(line_starts_of("a\nbc\n")) == [0, 2, 5]
+        assert list(line_starts_of("")) == [0]
+
+
+class TestFindCandidates:
+
+    def test_only_files_containing_literal(self, pack_path):
+        index = PackIndex.build(pack_path)
+        with RepomixPack(pack_path) as pack:
+            paths = [f.path for f in index.find_candidates(pack, "postgres_air")]
+            assert paths == ["config/database.yml", "scripts/migrate.sql"]
+            assert find_candidates(pack, list(pack), "flights")[0].path == "scripts/migrate.sql"
+
+    def test_non_ascii_literal_keeps_every_file(self, pack_path):
+        with RepomixPack(pack_path) as pack:
+            assert len(find_candidates(pack, list(pack), "bázis")) == 4
+
+
+class TestIndexUsers:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("indexed", [False, True])
+    async def test_extractor_matches_full_scan(self, pack_path, tmp_path, indexed):
+        if indexed:
+            load_pack_index(pack_path, save=True)
+        extractor = DatabaseReferenceExtractor()
+
+        result = await extractor.extract_references("postgres_air", str(pack_path), str(tmp_path / "out"))
+
+        full_scan = [(f["path"], len(extractor._grep_file_content(f["content"], "postgres_air")))
+                     for f in extractor._parse_repomix_file(str(pack_path))]
+        assert [(f["path"], f["matches"]) for f in result["files"]] == [m for m in full_scan if m[1]]
+
+    @pytest.mark.asyncio
+    async def test_copied_repo_pack_is_indexed(self, pack_path, tmp_path, monkeypatch, shared_pool):
+        monkeypatch.chdir(tmp_path)
+
+        cached = await copy_repo_pack_to_tmp(str(pack_path), "org", "repo", MagicMock())
+
+        assert cached.resolve() == tmp_path / "tmp" / "repo_packs" / "org" / "repo_repo_pack.xml"
+        assert cached.read_text() == PACK
+        assert len(current_pack_index(cached)) == 4
+
+    @pytest.mark.asyncio
+    async def test_databases_share_one_cached_pack(self, pack_path, tmp_path, monkeypatch, shared_pool):
+        monkeypatch.chdir(tmp_path)
+
+        async def pack_remote_repository(repo_url):
+            await asyncio.sleep(0.01)
+            return {"success": True, "output_file": str(pack_path)}
+
+        repomix_client = MagicMock()
+        repomix_client.pack_remote_repository = AsyncMock(side_effect=pack_remote_repository)
+
+        async def obtain(database_name):
+            cache_file = repository_processors._repo_pack_cache_file("org", "repo")
+            async with repository_processors._repo_pack_lock(cache_file):
+                return await repository_processors._obtain_repo_pack(
+                    "https://github.com/org/repo", "org", "repo", database_name, repomix_client, MagicMock()
+                )
+
+        paths = await asyncio.gather(obtain("postgres_air"), obtain("flights"), obtain("periodic_table"))
+
+        assert repomix_client.pack_remote_repository.await_count == 1
+        assert len(set(paths)) == 1
+        assert find_existing_repo_pack("other_db", "org", "repo", MagicMock()) == Path(paths[0])
+        assert current_pack_index(paths[0]) is not None
+
+    @pytest.mark.asyncio
+    async def test_legacy_cached_pack_is_indexed(self, tmp_path, monkeypatch, shared_pool):
+        monkeypatch.chdir(tmp_path)
+        legacy = tmp_path / "tmp" / "postgres_air" / "postgres_air_repo_pack.xml"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(PACK)
+        assert not PackIndex.sidecar_is_newer(legacy)
+
+        path = await repository_processors._obtain_repo_pack(
+            "https://github.com/org/repo", "org", "repo", "postgres_air", MagicMock(), MagicMock()
+        )
+
+        assert Path(path) == Path("tmp/postgres_air/postgres_air_repo_pack.xml")
+        assert PackIndex.sidecar_is_newer(legacy)
+        assert len(current_pack_index(legacy)) == 4
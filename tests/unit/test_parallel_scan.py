@@ -0,0 +1,157 @@
+"""
+Unit tests for sharded pack scanning across the shared process pool.
+"""
+
+import re
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from concrete import parallel_scan
+from concrete.database_reference_extractor import DatabaseReferenceExtractor
+from concrete.parallel_scan import (
+    configure_parallel_scan, count_matches_parallel, group_units, plan_segments, scan_matches_parallel, scan_segments
+)
+from concrete.pattern_discovery import PatternDiscoveryEngine
+from concrete.pattern_scanner import MultiPatternScanner
+from utils import process_pool
+from utils.repomix_pack import RepomixPack
+
+PATTERNS = (r"\bpostgres_air\b", r"USE.*postgres_air", r"'postgres_air'")
+
+
+def build_pack():
+    dump = "".join(f"INSERT INTO flights VALUES ({i}, 'postgres_air');\n" if i % 7 == 0
+                   else f"INSERT INTO flights VALUES ({i}, 'other');\n" for i in range(400))
+    files = {
+        "config/database.yml": "production:\n  database: postgres_air\n",
+        "db/dump.sql": "USE postgres_air;\n" + dump + "-- end of postgres_air dump",
+        "scripts/windows.sql": "USE postgres_air;\r\nSELECT 1;\r\nSELECT postgres_air;\r\n",
+        "README.md": "Nothing here",
+        "src/app.py": "DATABASE = 'postgres_air'\nprint('postgres_air POSTGRES_AIR')\n",
+    }
+    return "".join(f'<file path="{path}">\n{content}\n</file>\n' for path, content in files.items())
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / "repo_pack.xml"
+    path.write_bytes(build_pack().encode())
+    return path
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_pool():
+    process_pool.configure_process_pool(2)
+    yield
+    process_pool.shutdown_process_pool()
+
+
+@pytest.fixture
+def parallel_everything(monkeypatch):
+    monkeypatch.setattr(parallel_scan, "_min_parallel_bytes", parallel_scan._min_parallel_bytes)
+    monkeypatch.setattr(parallel_scan, "_chunk_bytes", parallel_scan._chunk_bytes)
+    configure_parallel_scan(min_pack_bytes=0, chunk_bytes=512)
+
+
+class TestPlanning:
+
+    def test_segments_are_line_aligned_and_cover_each_file(self, pack_path):
+        with RepomixPack(pack_path) as pack:
+            entries = list(pack)
+            segments = plan_segments(pack, [(entry, PATTERNS) for entry in entries], chunk_bytes=512)
+            raw = pack_path.read_bytes()
+
+        dump = [s for s in segments if s.file == 1]
+        assert len(dump) > 5
+        assert [s.chunk for s in dump] == list(range(len(dump)))
+        for entry_position, entry in enumerate(entries):
+            parts = [s for s in segments if s.file == entry_position]
+            assert parts[0].offset == entry.offset
+            assert sum(s.length for s in parts) == entry.length
+            assert all(raw[s.offset + s.length - 1:s.offset + s.length] == b"\n" for s in parts[:-1])
+
+    def test_units_are_bounded_and_largest_first(self, pack_path):
+        with RepomixPack(pack_path) as pack:
+            segments = plan_segments(pack, [(entry, PATTERNS) for entry in pack], chunk_bytes=512)
+        units = group_units(segments, unit_bytes=1024)
+
+        sizes = [sum(s.length for s in unit) for unit in units]
+        assert sizes == sorted(sizes, reverse=True)
+        assert sorted((s.file, s.chunk) for unit in units for s in unit) == [(s.file, s.chunk) for s in segments]
+
+
+class TestParallelScan:
+
+    @pytest.mark.asyncio
+    async def test_matches_equal_whole_file_scan(self, pack_path, parallel_everything):
+        with RepomixPack(pack_path) as pack:
+            entries = list(pack)
+            expected = [MultiPatternScanner(PATTERNS).scan(pack.text(entry)) for entry in entries]
+            scanned = await scan_matches_parallel(pack, [(entry, PATTERNS) for entry in entries])
+
+        assert scanned == expected
+        assert any(line_number > 100 for _, line_number, _ in scanned[1])
+
+    @pytest.mark.asyncio
+    async def test_counts_equal_findall(self, pack_path, parallel_everything):
+        pattern = r"\bpostgres_air\b"
+        with RepomixPack(pack_path) as pack:
+            entries = list(pack)
+            expected = [len(re.findall(pattern, pack.text(entry), re.IGNORECASE)) for entry in entries]
+            assert await count_matches_parallel(pack, entries, pattern) == expected
+
+    def test_worker_reports_segment_lines(self, pack_path):
+        with RepomixPack(pack_path) as pack:
+            segments = plan_segments(pack, [(entry, PATTERNS) for entry in pack], chunk_bytes=512)
+        results = scan_segments(str(pack_path), segments, count_only=False)
+
+        windows = [r for r in results if r.file == 2]
+        assert windows[0].matches == ((0, 1, "USE postgres_air;"), (1, 1, "USE postgres_air;"),
+                                      (0, 3, "SELECT postgres_air;"))
+
+
+class TestScanUsers:
+
+    @pytest.mark.asyncio
+    async def test_extractor_matches_serial_scan(self, pack_path, tmp_path, parallel_everything):
+        extractor = DatabaseReferenceExtractor()
+        parallel = await extractor.extract_references("postgres_air", str(pack_path), str(tmp_path / "parallel"))
+        configure_parallel_scan(min_pack_bytes=1 << 40)
+        serial = await extractor.extract_references("postgres_air", str(pack_path), str(tmp_path / "serial"))
+
+        assert parallel["files"] == serial["files"]
+        assert parallel["total_references"] == serial["total_references"] > 60
+        assert [f["content"] for f in parallel["matched_files"]] == [f["content"] for f in serial["matched_files"]]
+
+    @pytest.mark.asyncio
+    async def test_extractor_falls_back_to_serial_scan(self, pack_path, tmp_path, parallel_everything):
+        extractor = DatabaseReferenceExtractor()
+        broken = AsyncMock(side_effect=BrokenProcessPool("worker died"))
+        with patch("concrete.database_reference_extractor.count_matches_parallel", broken):
+            result = await extractor.extract_references("postgres_air", str(pack_path), str(tmp_path / "out"))
+
+        broken.assert_awaited_once()
+        assert result["success"] is True
+        assert result["total_references"] > 60
+
+    @pytest.mark.asyncio
+    async def test_discovery_matches_serial_scan(self, pack_path, parallel_everything):
+        engine = PatternDiscoveryEngine()
+
+        async def analyze(*args):
+            return engine._analyze_local_pack(pack_path)
+
+        engine.analyze_repository_structure = analyze
+
+        async def discover():
+            result = await engine.discover_patterns_in_repository(None, None, "url", "postgres_air", "o", "r")
+            return [(f["path"], f["pattern_matches"], f["confidence"]) for f in result["files"]]
+
+        parallel = await discover()
+        configure_parallel_scan(min_pack_bytes=1 << 40)
+        serial = await discover()
+
+        assert parallel == serial
+        assert "db/dump.sql" in [path for path, _, _ in serial]
@@ -0,0 +1,79 @@
+"""
+Unit tests for the single-pass multi-pattern scanner used by
+PatternDiscoveryEngine.
+"""
+
+import random
+import re
+
+import pytest
+
+from concrete.pattern_discovery import PatternDiscoveryEngine
+from concrete.pattern_scanner import MultiPatternScanner, required_literal
+
+
+def search_every_line(content, patterns):
+    """Reference behaviour: every (line, pattern) pair, one re.search each."""
+    matches = []
+    for line_number, line in enumerate(content.split("\n"), 1):
+        for pattern in patterns:
+            try:
+                if re.search(pattern, line, re.IGNORECASE):
+                    matches.append((pattern, line_number, line))
+            except re.error:
+                continue
+    return matches
+
+
+class TestRequiredLiteral:
+
+    @pytest.mark.parametrize("pattern, literal", [
+        (r"\bpostgres_air\b", "postgres_air"),
+        (r"'postgres\-air'", "'postgres-air'"),
+        (r"=postgres_air(?:\s|$)", "=postgres_air"),
+        (r"DB_.*postgres_air", "postgres_air"),
+        (r"colou?r_table", "r_table"),
+        (r"ab+c", "ab"),
+        (r"[a-z]+_db\d{2}", "_db"),
+    ])
+    def test_extracts_longest_required_literal(self, pattern, literal):
+        assert required_literal(pattern) == literal
+
+    @pytest.mark.parametrize("pattern", [r"foo|bar", r"\d+", r"(?:abc)"])
+    def test_no_literal(self, pattern):
+        assert required_literal(pattern) is None
+
+
+class TestMultiPatternScanner:
+
+    def test_matches_per_line_search(self):
+        patterns = [p for group in PatternDiscoveryEngine()._compile_database_patterns("postgres_air").values()
+                    for p in group]
+        words = ["postgres_air", "POSTGRES-AIR", "database", "x=postgres_air", "'postgres_air'",
+                 '"Postgres_Air"', ":postgres_air ", "postgres_airline", "DB_POSTGRES_AIR", "psql", "\n", "\r\n"]
+        rng = random.Random(7)
+        for _ in range(50):
+            content = " ".join(rng.choice(words) for _ in range(80))
+            assert MultiPatternScanner(patterns).scan(content) == search_every_line(content, patterns)
+
+    def test_line_numbers_from_offsets(self):
+        content = "first\nuse postgres_air\n\nlast line postgres_air"
+        scanner = MultiPatternScanner([r"\bpostgres_air\b"])
+        assert scanner.scan(content) == [
+            (r"\bpostgres_air\b", 2, "use postgres_air"),
+            (r"\bpostgres_air\b", 4, "last line postgres_air"),
+        ]
+
+    def test_patterns_without_literal_scan_every_line(self):
+        scanner = MultiPatternScanner([r"\bdb\b", r"air|sea"])
+        assert scanner._prefilter is None
+        assert [line for _, line, _ in scanner.scan("by air\nthe db\nnone")] == [1, 2]
+
+    def test_invalid_patterns_are_skipped(self):
+        scanner = MultiPatternScanner(["[invalid", "valid"])
+        assert scanner.scan("a valid line") == [("valid", 1, "a valid line")]
+
+    def test_precomputed_line_starts(self):
+        content = "first\nuse postgres_air\n\nlast line postgres_air"
+        scanner = MultiPatternScanner([r"\bpostgres_air\b"])
+        assert scanner.scan(content, line_starts=[0, 6, 23, 24]) == scanner.scan(content)
@@ -0,0 +1,158 @@
+"""
+Unit tests for the workflow profiler: span nesting, trace exports, MCP call
+spans and workflow integration.
+"""
+
+import asyncio
+import json
+import pickle
+
+import pytest
+
+from clients.base import BaseMCPClient
+from utils.profiling import Profiler, current_span, profile_span, profiling
+from workflows import WorkflowBuilder
+
+
+class FakeMCPClient(BaseMCPClient):
+    SERVER_NAME = "fake_server"
+
+    async def list_available_tools(self) -> list[str]:
+        result = await self._send_mcp_request("tools/list", {})
+        return [tool.get("name") for tool in result.get("tools", [])]
+
+    async def health_check(self) -> bool:
+        return True
+
+
+def spans_named(profiler, name):
+    return [span for span in profiler.spans if span.name == name]
+
+
+class TestProfiler:
+
+    def test_profile_span_is_noop_without_profiler(self):
+        with profile_span("idle", "cpu") as span:
+            assert span is None
+            assert current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_spans_nest_across_tasks(self):
+        async def worker(name):
+            with profile_span(name, "step"):
+                await asyncio.sleep(0.01)
+                with profile_span("parse", "cpu"):
+                    pass
+
+        profiler = Profiler("run")
+        with profiling(profiler):
+            with profile_span("run", "workflow"):
+                await asyncio.gather(worker("a"), worker("b"))
+
+        (root,) = spans_named(profiler, "run")
+        a, b = spans_named(profiler, "a") + spans_named(profiler, "b")
+        assert a.parent is root and b.parent is root
+        assert a.track != b.track
+        assert sorted(span.stack() for span in spans_named(profiler, "parse")) == [
+            ["run", "a", "parse"], ["run", "b", "parse"]]
+
+    def test_span_records_error(self):
+        profiler = Profiler()
+        with profiling(profiler), pytest.raises(ValueError):
+            with profile_span("boom", "cpu"):
+                raise ValueError("bad input")
+        assert profiler.spans[0].args["error"] == "ValueError: bad input"
+        assert profiler.spans[0].end is not None
+
+    def test_chrome_trace_export(self):
+        profiler = Profiler("trace")
+        with profiling(profiler):
+            with profile_span("outer", "workflow"):
+                with profile_span("inner", "cpu", files=3, path=None):
+                    pass
+
+        trace = json.loads(json.dumps(profiler.to_chrome_trace()))
+        events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in events] == ["outer", "inner"]
+        assert events[1]["args"] == {"files": 3, "path": None}
+        assert events[0]["ts"] <= events[1]["ts"]
+        assert events[0]["dur"] >= events[1]["dur"]
+
+    def test_collapsed_stacks_attribute_self_time(self):
+        profiler = Profiler()
+        with profiling(profiler):
+            with profile_span("outer", "workflow"):
+                with profile_span("inner step", "cpu"):
+                    sum(range(200000))
+
+        lines = dict(line.rsplit(" ", 1) for line in profiler.to_collapsed_stacks().splitlines())
+        assert "outer;inner_step" in lines
+        total = sum(int(value) for value in lines.values())
+        assert total <= int(spans_named(profiler, "outer")[0].duration * 1e6) + len(lines)
+
+    def test_write_and_pickle(self, tmp_path):
+        profiler = Profiler("db decommission")
+        with profiling(profiler):
+            with profile_span("step", "step"):
+                pass
+
+        files = profiler.write(tmp_path)
+        assert files["chrome_trace"].name.startswith("db_decommission-")
+        assert json.loads(files["chrome_trace"].read_text())["traceEvents"]
+        assert files["collapsed_stacks"].exists()
+
+        restored = pickle.loads(pickle.dumps(profiler))
+        assert [span.name for span in restored.spans] == ["step"]
+
+
+class TestMCPCallSpans:
+
+    @pytest.mark.asyncio
+    async def test_tool_call_attempt_span(self, fake_mcp_config_path):
+        profiler = Profiler()
+        async with FakeMCPClient(fake_mcp_config_path) as client:
+            with profiling(profiler):
+                await client.call_tool_with_retry("echo", {"tag": "x"}, retry_count=0)
+
+        (span,) = spans_named(profiler, "fake_server.echo")
+        assert span.category == "mcp"
+        assert span.args["attempt"] == 1
+        assert span.args["bytes_out"] > 0
+        assert span.args["bytes_in"] > 0
+        assert span.args["queue_wait_ms"] >= 0
+        assert span.args["server_ms"] >= 0
+
+
+class TestWorkflowProfiling:
+
+    @pytest.mark.asyncio
+    async def test_workflow_records_step_spans_and_writes_files(self, tmp_path):
+        async def first(context, step):
+            with profile_span("scan", "cpu"):
+                return {"n": 1}
+
+        async def second(context, step):
+            return {"n": 2}
+
+        workflow = (WorkflowBuilder("profiled", "mcp_config.json")
+                    .with_profiling(tmp_path)
+                    .custom_step("first", "First", first, retry_count=0)
+                    .custom_step("second", "Second", second, depends_on=["first"], retry_count=0)
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        profiler = result.profile
+        assert [span.stack() for span in spans_named(profiler, "scan")] == [["profiled", "first", "scan"]]
+        assert spans_named(profiler, "second")[0].args["status"] == "succeeded"
+        assert set(result.profile_files) == {"chrome_trace", "collapsed_stacks"}
+
+    @pytest.mark.asyncio
+    async def test_workflow_is_not_profiled_by_default(self):
+        async def noop(context, step):
+            return {}
+
+        workflow = WorkflowBuilder("plain", "mcp_config.json").custom_step("noop", "Noop", noop).build()
+        result = await workflow.execute()
+        assert result.profile is None
+        assert result.profile_files == {}
@@ -0,0 +1,91 @@
+"""
+Unit tests for the incremental Repomix pack reader.
+"""
+
+import re
+
+import pytest
+
+from utils.repomix_pack import PackEntry, RepomixPack, iter_pack_entries
+
+# The whole-text regex the reader replaces
+FILE_PATTERN = r'<file path="([^"]+)">\s*\n(.*?)\n</file>'
+
+PACK = '''This file is a merged representation of the entire codebase.
+
+<file path="config/database.yml">
+production:
+  database: postgres_air
+</file>
+
+<file path="notes.txt">
+
+  indented first line
+last line
+</file>
+<file path="broken.txt">no newline after the tag</file>
+<file path="src/app.py">
+import os
+print("</fil")
+</file>
+'''
+
+
+def parse_with_regex(text):
+    return re.findall(FILE_PATTERN, text, re.DOTALL)
+
+
+class TestIterPackEntries:
+
+    def test_matches_regex_on_str(self):
+        entries = list(iter_pack_entries(PACK))
+        assert [(e.path, PACK[e.offset:e.end]) for e in entries] == parse_with_regex(PACK)
+
+    def test_matches_regex_on_bytes(self):
+        data = PACK.encode()
+        entries = list(iter_pack_entries(data))
+        assert [(e.path, data[e.offset:e.end].decode()) for e in entries] == parse_with_regex(PACK)
+
+    def test_empty_file_content(self):
+        text = '<file path="empty.txt">\n</file>\n<file path="b.txt">\nb\n</file>'
+        assert [(e.path, e.length) for e in iter_pack_entries(text)] == [("empty.txt", 0), ("b.txt", 1)]
+
+    def test_unterminated_entry_ends_iteration(self):
+        assert list(iter_pack_entries('<file path="a">\nnever closed')) == []
+
+
+class TestRepomixPack:
+
+    def test_reads_memory_mapped_pack(self, tmp_path):
+        path = tmp_path / "pack.xml"
+        path.write_text(PACK)
+
+        with RepomixPack(path) as pack:
+            entries = list(pack)
+            assert pack.size == len(PACK.encode())
+            assert [(e.path, pack.text(e)) for e in entries] == parse_with_regex(PACK)
+            with pack.content(entries[0]) as view:
+                assert bytes(view) == b"production:\n  database: postgres_air"
+
+    def test_text_translates_crlf_like_text_mode(self, tmp_path):
+        path = tmp_path / "pack.xml"
+        path.write_bytes(b'<file path="a.sql">\r\nUSE postgres_air;\r\nSELECT 1;\r\n</file>\r\n')
+
+        with RepomixPack(path) as pack:
+            (entry,) = list(pack)
+            assert pack.text(entry) == "USE postgres_air;\nSELECT 1;"
+
+    def test_empty_pack(self, tmp_path):
+        path = tmp_path / "pack.xml"
+        path.write_bytes(b"")
+
+        with RepomixPack(path) as pack:
+            assert pack.size == 0
+            assert list(pack) == []
+
+    def test_missing_pack(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            RepomixPack(tmp_path / "missing.xml")
+
+    def test_entry_end(self):
+        assert PackEntry("a", offset=10, length=5).end == 15
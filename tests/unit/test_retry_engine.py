@@ -0,0 +1,208 @@
+"""
+Unit tests for the shared retry engine (utils.retry) and its call sites.
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from utils.exceptions import MCPConfigError, MCPRetryError
+from utils.retry import (
+    MCPRetryHandler,
+    RetryBudget,
+    RetryEngine,
+    RetryPolicy,
+    get_retry_after,
+    get_retry_budget,
+    is_retryable_error,
+    reset_retry_budgets,
+)
+
+
+@pytest.fixture
+def no_sleep():
+    with patch("utils.retry.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        yield sleep
+
+
+class TestRetryPolicy:
+
+    def test_decorrelated_jitter_bounds(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=10.0, multiplier=3.0)
+        previous = None
+        for attempt in range(20):
+            delay = policy.next_delay(attempt, previous)
+            upper = max(1.0, (previous or 1.0) * 3.0)
+            assert 1.0 <= delay <= min(10.0, upper)
+            previous = delay
+
+    def test_jitter_spreads_parallel_retries(self):
+        policy = RetryPolicy()
+        delays = {round(policy.next_delay(0), 6) for _ in range(50)}
+        assert len(delays) > 1
+
+    def test_without_jitter_is_exponential(self):
+        policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=False)
+        assert [policy.next_delay(a) for a in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+class TestClassification:
+
+    @pytest.mark.parametrize("error", [
+        ConnectionError("reset by peer"),
+        TimeoutError(),
+        Exception("MCP tool error: API rate limit exceeded for user"),
+        Exception("403 You have exceeded a secondary rate limit"),
+        ValueError("transient glitch"),
+        Exception("connection to port 4040 reset after 404 bytes, request 401 of 422"),
+    ])
+    def test_retryable(self, error):
+        assert is_retryable_error(error)
+
+    @pytest.mark.parametrize("error", [
+        Exception("MCP tool error: Bad credentials"),
+        Exception("MCP tool error: Not Found"),
+        Exception("422 Validation Failed"),
+        Exception("JSON-RPC error -32602: invalid params"),
+        Exception("request failed with status code 404"),
+        Exception('upstream answered {"status": 403}'),
+        TypeError("missing argument"),
+        MCPConfigError("bad config"),
+    ])
+    def test_terminal(self, error):
+        assert not is_retryable_error(error)
+
+    def test_structured_status(self):
+        error = Exception("MCP tool error: no such method")
+        error.code = -32601
+        assert not is_retryable_error(error)
+        error = Exception("upstream failure")
+        error.status = 429
+        assert is_retryable_error(error)
+        assert get_retry_after(error) == 60.0
+
+    def test_explicit_retryable_attribute_wins(self):
+        error = Exception("Not Found")
+        error.retryable = True
+        assert is_retryable_error(error)
+
+    def test_retry_after_sources(self):
+        assert get_retry_after(Exception("429 Too Many Requests, Retry-After: 7")) == 7.0
+        reset = int(time.time()) + 30
+        assert 25 <= get_retry_after(Exception(f"rate limited, x-ratelimit-reset: {reset}")) <= 30
+        assert get_retry_after(Exception("API rate limit exceeded")) == 60.0
+        error = Exception("slow down")
+        error.retry_after = 3
+        assert get_retry_after(error) == 3.0
+        assert get_retry_after(Exception("connection reset")) is None
+
+
+class TestRetryBudget:
+
+    def test_budget_drains_and_refills(self):
+        budget = RetryBudget(capacity=2, refill_per_second=100)
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+        time.sleep(0.02)
+        assert budget.try_acquire()
+
+    def test_budgets_are_shared_per_key(self):
+        reset_retry_budgets()
+        try:
+            assert get_retry_budget("ovr_github") is get_retry_budget("ovr_github")
+            assert get_retry_budget("ovr_github") is not get_retry_budget("ovr_slack")
+        finally:
+            reset_retry_budgets()
+
+
+class TestRetryEngine:
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self, no_sleep):
+        operation = AsyncMock(side_effect=[ConnectionError("a"), ConnectionError("b"), "ok"])
+        retries = []
+
+        result = await RetryEngine(RetryPolicy(max_attempts=3)).run(
+            operation, on_retry=lambda attempt, delay, error: retries.append(attempt)
+        )
+
+        assert result == "ok"
+        assert retries == [1, 2]
+        assert no_sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_terminal_error_is_not_retried(self, no_sleep):
+        operation = AsyncMock(side_effect=Exception("Bad credentials"))
+
+        with pytest.raises(Exception, match="Bad credentials"):
+            await RetryEngine(RetryPolicy(max_attempts=5)).run(operation)
+        assert operation.await_count == 1
+        no_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exhaustion_reports_attempts(self, no_sleep):
+        operation = AsyncMock(side_effect=ConnectionError("down"))
+
+        with pytest.raises(MCPRetryError) as info:
+            await RetryEngine(RetryPolicy(max_attempts=3)).run(operation)
+        assert info.value.reason == "exhausted"
+        assert info.value.attempts == 3
+        assert isinstance(info.value.last_error, ConnectionError)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_raises_the_delay(self, no_sleep):
+        operation = AsyncMock(side_effect=[Exception("rate limit, Retry-After: 12"), "ok"])
+
+        assert await RetryEngine(RetryPolicy(max_attempts=2)).run(operation) == "ok"
+        no_sleep.assert_awaited_once_with(12.0)
+
+    @pytest.mark.asyncio
+    async def test_excessive_retry_after_gives_up(self, no_sleep):
+        operation = AsyncMock(side_effect=Exception("rate limit, Retry-After: 3600"))
+
+        with pytest.raises(MCPRetryError) as info:
+            await RetryEngine(RetryPolicy(max_attempts=3)).run(operation)
+        assert info.value.reason == "retry_after"
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_retries(self, no_sleep):
+        operation = AsyncMock(side_effect=ConnectionError("down"))
+
+        with pytest.raises(MCPRetryError) as info:
+            await RetryEngine(RetryPolicy(max_attempts=5)).run(operation, remaining_time=lambda: 0.5)
+        assert info.value.reason == "deadline"
+        assert operation.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_fails_fast(self, no_sleep):
+        budget = RetryBudget(capacity=1, refill_per_second=0)
+        engine = RetryEngine(RetryPolicy(max_attempts=5), budget=budget)
+
+        with pytest.raises(MCPRetryError) as info:
+            await engine.run(AsyncMock(side_effect=ConnectionError("down")))
+        assert info.value.reason == "budget"
+        assert info.value.attempts == 2
+
+
+class TestMCPRetryHandler:
+
+    @pytest.mark.asyncio
+    async def test_wraps_exhaustion_in_retry_error(self, no_sleep):
+        handler = MCPRetryHandler(max_retries=2)
+        operation = AsyncMock(side_effect=ConnectionError("down"))
+
+        with pytest.raises(MCPRetryError, match="after 2 retry attempts"):
+            await handler.with_retry(operation, "arg")
+        assert operation.await_count == 2
+        operation.assert_awaited_with("arg")
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_exception_type_is_raised(self, no_sleep):
+        handler = MCPRetryHandler(max_retries=3)
+        operation = AsyncMock(side_effect=KeyError("missing"))
+
+        with pytest.raises(KeyError):
+            await handler.with_retry(operation)
+        assert operation.await_count == 1
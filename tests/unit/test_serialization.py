@@ -0,0 +1,154 @@
+"""
+Unit tests for the structural serializability check and its use when
+workflow steps hand off results.
+"""
+
+import pickle
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from utils import ensure_serializable
+from utils import serialization
+from utils.serialization import check_serializable, set_serialization_check_mode
+from workflows import WorkflowBuilder
+
+
+@dataclass
+class FileMatch:
+    path: str
+    content: str
+    lines: list = field(default_factory=list)
+
+
+class Slotted:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+@pytest.fixture
+def restore_mode():
+    previous = serialization.get_serialization_check_mode()
+    yield
+    set_serialization_check_mode(previous)
+
+
+class TestCheckSerializable:
+
+    def test_accepts_nested_results(self):
+        shared = {"content": "x" * 1000}
+        data = {
+            "files": [FileMatch("a.py", "SELECT 1", [1, 2]), FileMatch("b.py", "", [])],
+            "by_path": {Path("a.py"): shared, "b.py": shared},
+            "slotted": Slotted("n", (1, 2.5, None)),
+            "tags": {"db", "sql"},
+        }
+        assert check_serializable(data) is None
+        pickle.dumps(data)
+
+    def test_handles_cycles(self):
+        data = {"name": "root"}
+        data["self"] = data
+        assert check_serializable(data) is None
+
+    def test_reports_path_to_offending_value(self):
+        data = {"files": [FileMatch("a.py", "x")], "lock": threading.Lock()}
+        problem = check_serializable(data)
+        assert problem is not None
+        assert problem.startswith("value['lock']")
+
+    def test_rejects_local_function_and_class(self):
+        def local():
+            pass
+
+        class Local:
+            pass
+
+        assert "local function" in check_serializable({"fn": local})
+        assert "local class" in check_serializable([Local()])
+
+    def test_does_not_pickle_walkable_values(self):
+        data = {"files": [FileMatch(f"{i}.py", "x" * 100) for i in range(50)]}
+        with patch.object(serialization.pickle, "dumps", side_effect=AssertionError("pickled")):
+            assert check_serializable(data) is None
+
+    def test_deep_nesting_does_not_recurse(self):
+        data = []
+        for _ in range(5000):
+            data = [data]
+        assert check_serializable(data) is None
+
+
+class TestEnsureSerializableModes:
+
+    def test_structural_mode_raises_runtime_error(self):
+        with pytest.raises(RuntimeError, match="Non-serializable data detected"):
+            ensure_serializable({"lock": threading.Lock()}, "structural")
+
+    def test_pickle_mode_raises_runtime_error(self):
+        with pytest.raises(RuntimeError, match="Non-serializable data detected"):
+            ensure_serializable({"lock": threading.Lock()}, "pickle")
+
+    def test_off_mode_returns_data(self):
+        lock = threading.Lock()
+        assert ensure_serializable(lock, "off") is lock
+
+    def test_default_mode_is_process_wide(self, restore_mode):
+        set_serialization_check_mode("off")
+        lock = threading.Lock()
+        assert ensure_serializable(lock) is lock
+
+    def test_rejects_unknown_mode(self, restore_mode):
+        with pytest.raises(ValueError):
+            set_serialization_check_mode("fast")
+
+
+class TestStepResultHandoff:
+
+    @pytest.mark.asyncio
+    async def test_result_is_validated_once_and_shared_by_reference(self):
+        produced = {"files": [FileMatch("a.py", "SELECT 1")]}
+        seen = {}
+
+        async def producer(context, step):
+            return produced
+
+        async def consumer(context, step):
+            seen["value"] = context.get_step_result("producer")
+            return {"ok": True}
+
+        workflow = (WorkflowBuilder("handoff", "mcp_config.json")
+                    .custom_step("producer", "Producer", producer, retry_count=0)
+                    .custom_step("consumer", "Consumer", consumer, depends_on=["producer"], retry_count=0)
+                    .build())
+
+        with patch("workflows.builder.ensure_serializable", wraps=ensure_serializable) as check:
+            result = await workflow.execute()
+
+        assert result.status == "completed"
+        assert result.get_step_result("producer") is produced
+        assert seen["value"] is produced
+        assert [c.args[0] for c in check.call_args_list].count(produced) == 1
+
+    @pytest.mark.asyncio
+    async def test_workflow_check_mode(self):
+        async def unpicklable(context, step):
+            return {"lock": threading.Lock()}
+
+        builder = WorkflowBuilder("locks", "mcp_config.json").custom_step(
+            "locked", "Locked", unpicklable, retry_count=0)
+        result = await builder.build().execute()
+        assert result.status == "failed"
+
+        result = await builder.with_serialization_check("off").build().execute()
+        assert result.status == "completed"
+
+    def test_builder_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            WorkflowBuilder("modes", "mcp_config.json").with_serialization_check("fast")
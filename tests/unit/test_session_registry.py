@@ -0,0 +1,166 @@
+"""
+Unit tests for MCPSessionRegistry session reuse through
+MCPSessionManager.session_context (mcp_use is mocked).
+"""
+
+import asyncio
+import pickle
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from utils.exceptions import MCPSessionError
+from utils.session import MCPSessionManager, MCPSessionRegistry
+
+
+class FakeConfigManager:
+    def __init__(self, config_path):
+        self.config_path = config_path
+
+
+def make_mcp_client_factory():
+    """Patchable stand-in for MCPClient that records every client/session created."""
+    created = []
+
+    def from_config_file(path):
+        session = MagicMock()
+        session.is_connected = True
+        session.connect = AsyncMock()
+        session.disconnect = AsyncMock()
+        client = MagicMock()
+        client.create_session = AsyncMock(return_value=session)
+        client.close_all_sessions = AsyncMock()
+        created.append(SimpleNamespace(client=client, session=session))
+        return client
+
+    return SimpleNamespace(from_config_file=from_config_file), created
+
+
+@pytest.fixture
+def registry():
+    registry = MCPSessionRegistry(idle_timeout=60)
+    with patch("utils.session._session_registry", registry):
+        yield registry
+
+
+@pytest.fixture
+def mcp_client():
+    factory, created = make_mcp_client_factory()
+    with patch("utils.session.MCPClient", factory):
+        yield created
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return MCPSessionManager(FakeConfigManager(str(tmp_path / "mcp_config.json")))
+
+
+class TestSessionReuse:
+
+    @pytest.mark.asyncio
+    async def test_repeated_contexts_reuse_one_connection(self, registry, mcp_client, manager):
+        for _ in range(3):
+            async with manager.session_context("ovr_github") as session:
+                assert session is mcp_client[0].session
+
+        assert len(mcp_client) == 1
+        mcp_client[0].session.disconnect.assert_not_awaited()
+        assert registry.stats()["ovr_github"]["refcount"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_contexts_share_session_and_refcount(self, registry, mcp_client, manager):
+        entered = asyncio.Event()
+
+        async def use():
+            async with manager.session_context("ovr_github") as session:
+                entered.set()
+                await asyncio.sleep(0.05)
+                return session
+
+        first = asyncio.create_task(use())
+        await entered.wait()
+        assert registry.stats()["ovr_github"]["refcount"] == 1
+        second = await use()
+
+        assert await first is second
+        assert len(mcp_client) == 1
+        assert registry.stats()["ovr_github"]["refcount"] == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_are_evicted(self, registry, mcp_client, manager):
+        async with manager.session_context("ovr_github"):
+            pass
+
+        assert await registry.evict_idle(max_idle=0) == 1
+        mcp_client[0].session.disconnect.assert_awaited_once()
+        mcp_client[0].client.close_all_sessions.assert_awaited_once()
+
+        async with manager.session_context("ovr_github") as session:
+            assert session is mcp_client[1].session
+
+    @pytest.mark.asyncio
+    async def test_connection_error_discards_session(self, registry, mcp_client, manager):
+        with pytest.raises(MCPSessionError):
+            async with manager.session_context("ovr_github"):
+                raise ConnectionError("pipe closed")
+
+        mcp_client[0].session.disconnect.assert_awaited_once()
+        async with manager.session_context("ovr_github") as session:
+            assert session is mcp_client[1].session
+
+    @pytest.mark.asyncio
+    async def test_tool_error_keeps_session(self, registry, mcp_client, manager):
+        with pytest.raises(MCPSessionError):
+            async with manager.session_context("ovr_github"):
+                raise ValueError("bad tool arguments")
+
+        async with manager.session_context("ovr_github") as session:
+            assert session is mcp_client[0].session
+
+    @pytest.mark.asyncio
+    async def test_disconnected_session_is_replaced(self, registry, mcp_client, manager):
+        async with manager.session_context("ovr_github"):
+            pass
+        mcp_client[0].session.is_connected = False
+
+        async with manager.session_context("ovr_github") as session:
+            assert session is mcp_client[1].session
+
+    @pytest.mark.asyncio
+    async def test_reuse_can_be_disabled(self, registry, mcp_client, tmp_path):
+        manager = MCPSessionManager(FakeConfigManager(str(tmp_path / "c.json")), reuse_sessions=False)
+        for _ in range(2):
+            async with manager.session_context("ovr_github"):
+                pass
+
+        assert len(mcp_client) == 2
+        assert all(c.session.disconnect.await_count == 1 for c in mcp_client)
+        assert registry.stats() == {}
+
+
+class TestGarbageCollectionOptIn:
+
+    @pytest.mark.asyncio
+    async def test_gc_is_not_forced_by_default(self, registry, mcp_client, manager):
+        with patch("utils.session.gc.collect") as collect:
+            async with manager.session_context("ovr_github"):
+                pass
+        collect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_gc_opt_in(self, registry, mcp_client, tmp_path):
+        manager = MCPSessionManager(FakeConfigManager(str(tmp_path / "c.json")), force_gc=True)
+        with patch("utils.session.gc.collect") as collect:
+            async with manager.session_context("ovr_github"):
+                pass
+        collect.assert_called_once()
+
+
+class TestPickleSafety:
+
+    @pytest.mark.asyncio
+    async def test_manager_stays_picklable_while_sessions_are_live(self, registry, mcp_client, manager):
+        async with manager.session_context("ovr_github"):
+            restored = pickle.loads(pickle.dumps(manager))
+        assert restored.reuse_sessions is True
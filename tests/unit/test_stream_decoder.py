@@ -0,0 +1,74 @@
+"""
+Unit tests for the streaming JSON-RPC frame decoder.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from clients.stream_decoder import SpooledContent, StreamingJSONDecoder, materialize_spooled
+
+
+def make_decoder(data: bytes, spool_threshold=None, chunk_size=7):
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return StreamingJSONDecoder(stream, spool_threshold=spool_threshold, chunk_size=chunk_size)
+
+
+async def decode_all(decoder):
+    frames = []
+    while True:
+        try:
+            frames.append(await decoder.decode_frame())
+        except EOFError:
+            return frames
+        except ValueError:
+            frames.append("<invalid>")
+
+
+MESSAGES = [
+    {"jsonrpc": "2.0", "id": "req_1", "result": {"n": 1.5e3, "ok": True, "none": None, "neg": -2}},
+    {"jsonrpc": "2.0", "id": "req_2", "result": {"content": [{"type": "text", "text": 'quote " slash \\ nl \n é € 😀' * 50}]}},
+    {"jsonrpc": "2.0", "id": "req_3", "result": {"nested": [[1, {}], [], {"a": [False]}]}},
+]
+
+
+class TestStreamingJSONDecoder:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("spool_threshold", [None, 16, 1024 * 1024])
+    @pytest.mark.parametrize("ensure_ascii", [True, False])
+    async def test_round_trips_frames(self, spool_threshold, ensure_ascii):
+        data = b"".join(json.dumps(m, ensure_ascii=ensure_ascii).encode() + b"\n" for m in MESSAGES)
+        frames = await decode_all(make_decoder(data, spool_threshold=spool_threshold))
+
+        assert [materialize_spooled(f) for f in frames] == MESSAGES
+
+    @pytest.mark.asyncio
+    async def test_large_strings_are_spooled(self):
+        text = "abc" * 10_000
+        data = json.dumps({"id": 1, "result": {"text": text, "small": "tiny"}}).encode() + b"\n"
+        frame = (await decode_all(make_decoder(data, spool_threshold=1024, chunk_size=4096)))[0]
+
+        spooled = frame["result"]["text"]
+        assert isinstance(spooled, SpooledContent)
+        assert len(spooled) == len(text)
+        assert bytes(spooled.getbuffer()[:6]) == b"abcabc"
+        assert spooled.text() == text
+        assert frame["result"]["small"] == "tiny"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("spool_threshold", [None, 4])
+    async def test_resyncs_after_invalid_frame(self, spool_threshold):
+        data = b'{"id": 1}\nnot json at all\n\n{"id": 2}\n'
+        frames = await decode_all(make_decoder(data, spool_threshold=spool_threshold))
+
+        assert frames == [{"id": 1}, "<invalid>", {"id": 2}]
+
+    @pytest.mark.asyncio
+    async def test_final_frame_without_newline(self):
+        frames = await decode_all(make_decoder(b'{"id": 1}\n{"id": 2}'))
+
+        assert frames == [{"id": 1}, {"id": 2}]
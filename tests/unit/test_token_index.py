@@ -0,0 +1,148 @@
+"""
+Unit tests for the inverted token index and its use by pattern discovery
+and the reference extractor.
+"""
+
+import pytest
+
+from concrete import token_index
+from concrete.database_reference_extractor import DatabaseReferenceExtractor
+from concrete.pattern_discovery import PatternDiscoveryEngine
+from concrete.token_index import (
+    TokenIndex, get_token_index, get_token_index_async, normalize_token, set_token_indexing
+)
+from utils import process_pool
+
+DATABASES = ["postgres_air", "periodic-table", "flights"]
+
+PACK = '''<file path="config/database.yml">
+production:
+  database: postgres_air
+  url: postgresql://localhost/POSTGRES-AIR
+</file>
+<file path="scripts/deploy.sh">
+export DB_POSTGRES_AIR=1
+psql -d periodic_table -f load.sql
+</file>
+<file path="src/models.py">
+class PeriodicTableModel:
+    __tablename__ = "periodic_table"
+
+# flights live in postgres_air
+</file>
+<file path="docs/postgres_air.md">
+Only the path mentions a database
+</file>
+<file path="README.md">
+Nothing here
+</file>
+'''
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / "repo_pack.xml"
+    path.write_text(PACK)
+    return path
+
+
+@pytest.fixture
+def shared_pool():
+    process_pool.configure_process_pool(1)
+    yield
+    process_pool.shutdown_process_pool()
+
+
+@pytest.fixture(autouse=True)
+def no_cached_indexes(monkeypatch):
+    monkeypatch.setattr(token_index, "_token_indexes", {})
+    set_token_indexing(False)
+    yield
+    set_token_indexing(False)
+
+
+class TestTokenIndex:
+
+    def test_lookup_covers_name_variants(self, pack_path):
+        index = TokenIndex.build(pack_path)
+
+        assert index.paths[0] == "config/database.yml"
+        assert index.lookup("postgres_air") == {0: [2, 3], 1: [1], 2: [4]}
+        assert index.lookup("POSTGRES-AIR") == index.lookup("postgres_air")
+        assert index.lookup("periodic_table") == {1: [2], 2: [2]}
+        assert index.lookup("no_such_db") == {}
+
+    def test_names_the_index_cannot_answer(self, pack_path):
+        index = TokenIndex.build(pack_path)
+        assert index.lookup("my.db") is None
+        assert index.lookup("bázis") is None
+
+    def test_normalize_token(self):
+        assert normalize_token("Postgres-Air_DB") == "postgres_air_db"
+
+    def test_get_token_index_builds_only_when_enabled(self, pack_path):
+        assert get_token_index(pack_path) is None
+
+        set_token_indexing(True)
+        built = get_token_index(pack_path)
+        assert built is not None
+        assert get_token_index(pack_path) is built
+
+        pack_path.write_text(PACK + '<file path="new.txt">\nnew\n</file>\n')
+        assert len(get_token_index(pack_path)) == 6
+
+    def test_sidecar_is_used_without_building(self, pack_path):
+        TokenIndex.build(pack_path).save()
+        assert TokenIndex.sidecar_path(pack_path).name == "repo_pack.xml.tokens"
+        assert get_token_index(pack_path, build=False).lookup("flights") == {2: [4]}
+
+    @pytest.mark.asyncio
+    async def test_async_index_is_built_in_the_pool(self, pack_path, shared_pool):
+        assert await get_token_index_async(pack_path) is None
+
+        set_token_indexing(True)
+        index = await get_token_index_async(pack_path)
+
+        assert index.lookup("flights") == {2: [4]}
+        # Built and saved by a worker; this process only loaded the sidecar
+        assert TokenIndex.sidecar_path(pack_path).exists()
+        assert await get_token_index_async(pack_path) is index
+
+
+class TestIndexedScans:
+
+    @pytest.mark.asyncio
+    async def test_discovery_matches_full_scan(self, pack_path, shared_pool):
+        engine = PatternDiscoveryEngine()
+        engine.analyze_repository_structure = lambda *args: _async(engine._analyze_local_pack(pack_path))
+
+        async def discover(database):
+            result = await engine.discover_patterns_in_repository(None, None, "url", database, "o", "r")
+            return [(f["path"], f["pattern_matches"]) for f in result["files"]]
+
+        full = [await discover(database) for database in DATABASES]
+        set_token_indexing(True)
+        indexed = [await discover(database) for database in DATABASES]
+
+        assert indexed == full
+        assert full[0] and full[1]
+        assert get_token_index(pack_path) is not None
+
+    @pytest.mark.asyncio
+    async def test_extractor_matches_full_scan(self, pack_path, tmp_path, shared_pool):
+        extractor = DatabaseReferenceExtractor()
+
+        async def extract(database):
+            result = await extractor.extract_references(database, str(pack_path), str(tmp_path / "out"))
+            return result["files"]
+
+        full = [await extract(database) for database in DATABASES]
+        set_token_indexing(True)
+        indexed = [await extract(database) for database in DATABASES]
+
+        assert indexed == full
+        assert [f["path"] for f in full[0]] == ["config/database.yml", "src/models.py"]
+
+
+async def _async(value):
+    return value
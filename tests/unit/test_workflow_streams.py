@@ -0,0 +1,148 @@
+"""
+Unit tests for streaming steps: items flow from an async generator step to
+its dependents through bounded buffers while the producer is still running.
+"""
+
+import asyncio
+
+import pytest
+
+from workflows import StepStream, StreamClosedError, WorkflowBuilder
+
+
+class TestStepStream:
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_to_every_consumer(self):
+        stream = StepStream("producer", ["a", "b"], buffer_size=4)
+        for item in range(3):
+            await stream.publish(item)
+        await stream.close()
+
+        assert [item async for item in stream.iterate("a")] == [0, 1, 2]
+        assert [item async for item in stream.iterate("b")] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_blocks_producer(self):
+        stream = StepStream("producer", ["consumer"], buffer_size=2)
+        await stream.publish(1)
+        await stream.publish(2)
+
+        blocked = asyncio.create_task(stream.publish(3))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        items = stream.iterate("consumer")
+        assert await items.__anext__() == 1
+        await asyncio.wait_for(blocked, 1)
+
+    @pytest.mark.asyncio
+    async def test_detached_consumer_releases_producer(self):
+        stream = StepStream("producer", ["consumer"], buffer_size=1)
+        await stream.publish(1)
+        blocked = asyncio.create_task(stream.publish(2))
+        await asyncio.sleep(0.01)
+
+        await stream.detach("consumer")
+        await asyncio.wait_for(blocked, 1)
+        with pytest.raises(ValueError):
+            stream.iterate("consumer")
+
+    @pytest.mark.asyncio
+    async def test_close_with_error_raises_after_buffered_items(self):
+        stream = StepStream("producer", ["consumer"])
+        await stream.publish("first")
+        await stream.close(RuntimeError("pack failed"))
+
+        items = stream.iterate("consumer")
+        assert await items.__anext__() == "first"
+        with pytest.raises(StreamClosedError, match="pack failed"):
+            await items.__anext__()
+
+    def test_unknown_consumer(self):
+        with pytest.raises(ValueError):
+            StepStream("producer", ["a"]).iterate("b")
+
+
+class TestStreamingWorkflow:
+
+    @pytest.mark.asyncio
+    async def test_consumer_overlaps_producer(self):
+        events = []
+
+        async def produce(context, step, repos):
+            for repo in repos:
+                events.append(f"packed {repo}")
+                yield repo
+                await asyncio.sleep(0.01)
+
+        async def consume(context, step):
+            handled = []
+            async for repo in context.stream("pack"):
+                events.append(f"refactored {repo}")
+                handled.append(repo)
+            return {"handled": handled}
+
+        workflow = (WorkflowBuilder("streaming", "mcp_config.json")
+                    .with_config(max_parallel_steps=1)
+                    .stream_step("pack", "Pack", produce, parameters={"repos": ["r1", "r2", "r3"]}, buffer_size=1)
+                    .custom_step("refactor", "Refactor", consume, depends_on=["pack"], retry_count=0)
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        assert result.get_step_result("pack") == {"status": "streamed", "items": 3}
+        assert result.get_step_result("refactor") == {"handled": ["r1", "r2", "r3"]}
+        # Refactoring of the first repo happens before the last one is packed
+        assert events.index("refactored r1") < events.index("packed r3")
+
+    @pytest.mark.asyncio
+    async def test_producer_failure_reaches_consumer(self):
+        async def produce(context, step):
+            yield 1
+            raise RuntimeError("repomix crashed")
+
+        async def consume(context, step):
+            return [item async for item in context.stream("pack")]
+
+        workflow = (WorkflowBuilder("streaming", "mcp_config.json")
+                    .stream_step("pack", "Pack", produce)
+                    .custom_step("refactor", "Refactor", consume, depends_on=["pack"], retry_count=0)
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "failed"
+        assert "repomix crashed" in result.get_step_result("pack")["error"]
+        assert "repomix crashed" in result.get_step_result("refactor")["error"]
+
+    @pytest.mark.asyncio
+    async def test_consumer_that_stops_early_does_not_stall_producer(self):
+        async def produce(context, step):
+            for item in range(20):
+                yield item
+
+        async def consume(context, step):
+            async for item in context.stream("pack"):
+                return {"first": item}
+
+        workflow = (WorkflowBuilder("streaming", "mcp_config.json")
+                    .stream_step("pack", "Pack", produce, buffer_size=2, timeout_seconds=5)
+                    .custom_step("peek", "Peek", consume, depends_on=["pack"], retry_count=0)
+                    .build())
+        result = await workflow.execute()
+
+        assert result.status == "completed"
+        assert result.get_step_result("peek") == {"first": 0}
+        assert result.get_step_result("pack")["items"] == 20
+
+    @pytest.mark.asyncio
+    async def test_non_generator_function_fails(self):
+        async def not_a_generator(context, step):
+            return [1, 2]
+
+        workflow = WorkflowBuilder("streaming", "mcp_config.json").stream_step(
+            "pack", "Pack", not_a_generator).build()
+        result = await workflow.execute()
+
+        assert result.status == "failed"
+        assert "async generator" in result.get_step_result("pack")["error"]
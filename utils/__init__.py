@@ -8,12 +8,59 @@ and reusability across different workflow contexts.
 
 # Core configuration management
 from .config import MCPConfigManager
+from .config_snapshot import (
+    ConfigSnapshot,
+    ConfigSnapshotStore,
+    SecretsSnapshot,
+    config_snapshots,
+    get_config_snapshot,
+    get_config_snapshot_async,
+)
 
 # Session and connection management
-from .session import MCPSessionManager, ensure_serializable, execute_context7_search, execute_github_analysis
+from .session import (
+    MCPSessionManager,
+    MCPSessionRegistry,
+    ensure_serializable,
+    execute_context7_search,
+    execute_github_analysis,
+    get_session_registry,
+)
+
+# Serializability checks
+from .serialization import check_serializable, get_serialization_check_mode, set_serialization_check_mode
 
 # Retry handling
-from .retry import MCPRetryHandler, TimedRetryHandler, retry_with_exponential_backoff
+from .retry import (
+    MCPRetryHandler,
+    RetryBudget,
+    RetryEngine,
+    RetryPolicy,
+    TimedRetryHandler,
+    get_retry_after,
+    get_retry_budget,
+    is_retryable_error,
+    retry_with_exponential_backoff,
+)
+
+# Server capability caching
+from .capabilities import CapabilityCache, ServerCapabilities, capability_cache, capability_key
+
+# Shared CPU process pool
+from .process_pool import (
+    configure_process_pool,
+    get_process_pool,
+    process_pool_workers,
+    run_in_process,
+    shutdown_process_pool,
+)
+from .repomix_pack import PackEntry, RepomixPack, iter_pack_entries
+
+# Profiling
+from .profiling import Profiler, Span, current_span, get_profiler, profile_span, profiling
+
+# JSON encoding
+from .json_codec import JSONCodec, get_json_codec, set_json_codec
 
 # Exception classes
 from .exceptions import (
@@ -38,17 +85,65 @@ from .data_models import (
 __all__ = [
     # Configuration
     "MCPConfigManager",
+    "ConfigSnapshot",
+    "ConfigSnapshotStore",
+    "SecretsSnapshot",
+    "config_snapshots",
+    "get_config_snapshot",
+    "get_config_snapshot_async",
     
     # Session management
     "MCPSessionManager",
+    "MCPSessionRegistry",
+    "get_session_registry",
     "ensure_serializable",
     "execute_github_analysis",
     "execute_context7_search",
     
+    # Serializability checks
+    "check_serializable",
+    "get_serialization_check_mode",
+    "set_serialization_check_mode",
+    
     # Retry handling
     "MCPRetryHandler",
     "TimedRetryHandler",
     "retry_with_exponential_backoff",
+    "RetryEngine",
+    "RetryPolicy",
+    "RetryBudget",
+    "get_retry_budget",
+    "get_retry_after",
+    "is_retryable_error",
+    
+    # Capability caching
+    "CapabilityCache",
+    "ServerCapabilities",
+    "capability_cache",
+    "capability_key",
+    
+    # Shared CPU process pool
+    "configure_process_pool",
+    "get_process_pool",
+    "process_pool_workers",
+    "run_in_process",
+    "shutdown_process_pool",
+    "PackEntry",
+    "RepomixPack",
+    "iter_pack_entries",
+    
+    # Profiling
+    "Profiler",
+    "Span",
+    "current_span",
+    "get_profiler",
+    "profile_span",
+    "profiling",
+    
+    # JSON encoding
+    "JSONCodec",
+    "get_json_codec",
+    "set_json_codec",
     
     # Exceptions
     "MCPUtilityError",
@@ -0,0 +1,142 @@
+"""
+MCP Server Capability Cache
+
+Caches each server's tool list (and initialize() server info) for a TTL so
+tool-name validation and health checks do not cost a tools/list round trip
+every time. Entries are keyed by (config path, server name) and are shared
+by every client and session manager in the process.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+
+def capability_key(config_path: str | Path, server_name: str) -> CacheKey:
+    """Build the cache key for a server defined in a config file."""
+    return (str(Path(config_path).resolve()), server_name)
+
+
+@dataclass
+class ServerCapabilities:
+    """Cached capabilities of one MCP server."""
+
+    server_name: str
+    tools: Optional[List[Any]] = None
+    server_info: Optional[Dict[str, Any]] = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def tool_names(self) -> List[str]:
+        """Names of the cached tools (dict descriptors or objects with .name)."""
+        names = []
+        for tool in self.tools or []:
+            name = tool.get("name") if isinstance(tool, dict) else getattr(tool, "name", None)
+            if name:
+                names.append(name)
+        return names
+
+    def has_tool(self, tool_name: str) -> bool:
+        return tool_name in self.tool_names
+
+
+class CapabilityCache:
+    """
+    TTL cache of server tool lists with single-flight refresh.
+
+    Concurrent get_tools() calls for the same key share one in-flight
+    fetch instead of each issuing tools/list.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[CacheKey, ServerCapabilities] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+
+    def _is_fresh(self, entry: ServerCapabilities) -> bool:
+        return time.monotonic() - entry.fetched_at < self.ttl_seconds
+
+    def get(self, key: CacheKey) -> Optional[ServerCapabilities]:
+        """Return the fresh entry with a tool list for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry.tools is None or not self._is_fresh(entry):
+            return None
+        return entry
+
+    def put_tools(self, key: CacheKey, tools: List[Any]) -> ServerCapabilities:
+        """Store a freshly fetched tool list."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = ServerCapabilities(server_name=key[1])
+        entry.tools = list(tools)
+        entry.fetched_at = time.monotonic()
+        return entry
+
+    def put_server_info(self, key: CacheKey, server_info: Dict[str, Any]) -> None:
+        """Record the initialize() result; drops cached tools if the server changed."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = ServerCapabilities(server_name=key[1], server_info=server_info)
+            return
+        if entry.server_info is not None and entry.server_info.get("serverInfo") != server_info.get("serverInfo"):
+            logger.info(f"Server '{key[1]}' reports a new version, dropping cached tools")
+            entry.tools = None
+        entry.server_info = server_info
+
+    def invalidate(self, key: Optional[CacheKey] = None) -> None:
+        """Drop one entry, or every entry when key is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_tools(self, key: CacheKey, fetch: Callable[[], Awaitable[List[Any]]],
+                        force_refresh: bool = False) -> ServerCapabilities:
+        """
+        Return cached capabilities for key, fetching the tool list on a miss.
+
+        Args:
+            key: Cache key (see capability_key)
+            fetch: Coroutine function returning the server's tool list
+            force_refresh: Ignore any cached tool list
+
+        Returns:
+            ServerCapabilities with a populated tool list
+        """
+        if not force_refresh:
+            entry = self.get(key)
+            if entry is not None:
+                return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and not inflight.done():
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = self.put_tools(key, await fetch())
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+# Process-wide cache shared by BaseMCPClient and MCPSessionManager
+capability_cache = CapabilityCache()
@@ -5,12 +5,12 @@ Handles MCP configuration loading and validation using proven patterns
 from the working DirectMCPClient implementation.
 """
 
-import json
 import logging
 import os
 from pathlib import Path
 from typing import Any
 
+from .config_snapshot import env_reference, get_config_snapshot
 from .data_models import MCPConfigStatus, MCPServerConfig
 from .exceptions import MCPConfigError
 
@@ -36,6 +36,9 @@ class MCPConfigManager:
         self.config_path = str(config_path)  # Store as string for serialization
         self._config_data = config_data
         self._validation_status: MCPConfigStatus | None = None
+        # Validated copy of the shared snapshot, reused until the file changes
+        self._validated_config: dict[str, Any] | None = None
+        self._snapshot_stamp: tuple[int, int] | None = None
 
     @classmethod
     def from_file(cls, config_path: str | Path) -> 'MCPConfigManager':
@@ -51,28 +54,9 @@ class MCPConfigManager:
         Raises:
             MCPConfigError: If file cannot be loaded or is invalid
         """
-        config_path = Path(config_path)
-        if not config_path.exists():
-            raise MCPConfigError(
-                f"MCP configuration file not found: {config_path}",
-                config_path=str(config_path)
-            )
-
-        try:
-            with open(config_path) as f:
-                config_data = json.load(f)
-        except json.JSONDecodeError as e:
-            raise MCPConfigError(
-                f"Invalid JSON in MCP config file: {e}",
-                config_path=str(config_path)
-            )
-        except Exception as e:
-            raise MCPConfigError(
-                f"Failed to read config file: {e}",
-                config_path=str(config_path)
-            )
-
-        return cls(config_path, config_data)
+        # Loads (or reuses) the shared snapshot; raises MCPConfigError if invalid
+        get_config_snapshot(config_path)
+        return cls(config_path)
 
     def _load_and_validate_config(self) -> dict[str, Any]:
         """
@@ -90,21 +74,10 @@ class MCPConfigManager:
         if self._config_data is not None:
             config = self._config_data
         else:
-            config_path = Path(self.config_path)
-            if not config_path.exists():
-                raise MCPConfigError(
-                    f"MCP configuration file not found: {config_path}",
-                    config_path=self.config_path
-                )
-
-            try:
-                with open(config_path) as f:
-                    config = json.load(f)
-            except json.JSONDecodeError as e:
-                raise MCPConfigError(
-                    f"Invalid JSON in MCP config file: {e}",
-                    config_path=self.config_path
-                )
+            snapshot = get_config_snapshot(self.config_path)
+            if self._snapshot_stamp == snapshot.stamp and self._validated_config is not None:
+                return self._validated_config
+            config = snapshot.as_dict()
 
         # Validation logic extracted exactly from working implementation
         if "mcpServers" not in config:
@@ -129,6 +102,9 @@ class MCPConfigManager:
                 )
 
         logger.info(f"Validated MCP configuration with {len(config['mcpServers'])} servers")
+        if self._config_data is None:
+            self._validated_config = config
+            self._snapshot_stamp = snapshot.stamp
         return config
 
     def get_config(self) -> dict[str, Any]:
@@ -196,8 +172,8 @@ class MCPConfigManager:
                 # Validate environment variable references
                 env_vars = server_config.get("env", {})
                 for var_name, var_value in env_vars.items():
-                    if isinstance(var_value, str) and var_value.startswith("${") and var_value.endswith("}"):
-                        env_name = var_value[2:-1]  # Remove ${ and }
+                    env_name = env_reference(var_value)
+                    if env_name:
                         if env_name not in os.environ:
                             errors.append(f"Server '{server_name}': Environment variable '{env_name}' not set")
 
@@ -267,14 +243,17 @@ class MCPConfigManager:
             Dictionary of resolved environment variables
         """
         server_config = self.get_server_config(server_name)
+        if self._config_data is None:
+            # Substitutions are precomputed when the shared snapshot is built
+            return get_config_snapshot(self.config_path).server_env(server_name, keep_unresolved=True)
+
         env_config = server_config.get("env", {})
         resolved_env = {}
 
         for var_name, var_value in env_config.items():
-            if isinstance(var_value, str) and var_value.startswith("${") and var_value.endswith("}"):
-                env_name = var_value[2:-1]  # Remove ${ and }
-                resolved_value = os.environ.get(env_name, var_value)  # Fallback to original if not found
-                resolved_env[var_name] = resolved_value
+            env_name = env_reference(var_value)
+            if env_name:
+                resolved_env[var_name] = os.environ.get(env_name, var_value)  # Fallback to original if not found
             else:
                 resolved_env[var_name] = str(var_value)
 
@@ -0,0 +1,370 @@
+"""
+Shared Configuration Snapshot
+
+Loads mcp_config.json, .env and secrets.json once per process into immutable
+snapshots shared by every BaseMCPClient, MCPConfigManager and
+ParameterService. Files are re-read only when their mtime or size changes,
+and each server's "$VAR" / "${VAR}" env substitutions are resolved when the
+snapshot is built rather than on every process start. A snapshot also records
+the process environment values of the variables it references, and is
+re-resolved when one of them changes (e.g. a token exported after startup).
+
+Precedence for substitution matches the original client behaviour: values
+from secrets.json override the process environment, which overrides .env.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from dotenv import dotenv_values
+
+from .exceptions import MCPConfigError
+from .json_codec import get_json_codec
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size) of a file, or None when it does not exist
+FileStamp = Optional[Tuple[int, int]]
+
+_ENV_REFERENCE = re.compile(r"^\$(?:\{([A-Za-z_][A-Za-z0-9_]*)\}|([A-Za-z_][A-Za-z0-9_]*))$")
+
+
+def _stamp(path: Path) -> FileStamp:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def env_reference(value: Any) -> Optional[str]:
+    """Return NAME for a "$NAME" or "${NAME}" config value, else None."""
+    if not isinstance(value, str):
+        return None
+    match = _ENV_REFERENCE.match(value)
+    if match is None:
+        return None
+    return match.group(1) or match.group(2)
+
+
+@dataclass(frozen=True)
+class SecretsSnapshot:
+    """Parsed contents of a .env file and a secrets.json file."""
+
+    env_file: str
+    secrets_file: str
+    dotenv: Mapping[str, str]
+    secrets: Mapping[str, Any]
+    stamp: Tuple[FileStamp, FileStamp]
+    dotenv_issues: Tuple[str, ...] = ()
+    secrets_issues: Tuple[str, ...] = ()
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def issues(self) -> Tuple[str, ...]:
+        """Problems found while parsing either file."""
+        return self.dotenv_issues + self.secrets_issues
+
+    def secrets_dict(self) -> Dict[str, Any]:
+        """Return a mutable deep copy of secrets.json."""
+        return _thaw(self.secrets)
+
+    @property
+    def secrets_env(self) -> Dict[str, str]:
+        """Top-level secrets as environment variable strings."""
+        return {key: str(value) for key, value in self.secrets.items()}
+
+    def environment(self) -> Dict[str, str]:
+        """Environment view used for substitution: .env < os.environ < secrets.json."""
+        env = dict(self.dotenv)
+        env.update(os.environ)
+        env.update(self.secrets_env)
+        return env
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of one MCP config file with per-server env resolved."""
+
+    config_path: str
+    config: Mapping[str, Any]
+    secrets: SecretsSnapshot
+    stamp: FileStamp
+    # server -> env key -> (resolved value or None if the variable is unset, raw value)
+    resolved_env: Mapping[str, Mapping[str, Tuple[Optional[str], str]]]
+    # os.environ value (or None) of every referenced variable when resolved
+    environ: Tuple[Tuple[str, Optional[str]], ...] = ()
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def servers(self) -> Mapping[str, Any]:
+        return self.config.get("mcpServers", MappingProxyType({}))
+
+    def server_names(self) -> List[str]:
+        return list(self.servers.keys())
+
+    def has_server(self, server_name: str) -> bool:
+        return server_name in self.servers
+
+    def server_config(self, server_name: str) -> Dict[str, Any]:
+        """
+        Return a mutable copy of one server's configuration.
+
+        Raises:
+            KeyError: If the server is not defined
+        """
+        return _thaw(self.servers[server_name])
+
+    def server_env(self, server_name: str, keep_unresolved: bool = False) -> Dict[str, str]:
+        """
+        Return the server's "env" block with variable references substituted.
+
+        Args:
+            server_name: Name of the server
+            keep_unresolved: Keep the raw "$VAR" text for unset variables
+                instead of substituting an empty string
+
+        Returns:
+            Dictionary of environment overrides for the server process
+        """
+        resolved = {}
+        for key, (value, raw) in self.resolved_env.get(server_name, {}).items():
+            if value is None:
+                value = raw if keep_unresolved else ""
+            resolved[key] = value
+        return resolved
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a mutable deep copy of the whole configuration."""
+        return _thaw(self.config)
+
+
+def _read_dotenv(path: Path) -> Tuple[Dict[str, str], List[str]]:
+    issues = []
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as e:
+        return {}, [f"Failed to load .env file: {e}"]
+
+    for line_num, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if line and not line.startswith("#") and "=" not in line:
+            issues.append(f"Invalid .env format at line {line_num}: {line}")
+
+    values = dotenv_values(stream=io.StringIO(text))
+    return {key: value for key, value in values.items() if value is not None}, issues
+
+
+def _read_secrets(path: Path) -> Tuple[Dict[str, Any], List[str]]:
+    try:
+        data = get_json_codec().loads(path.read_bytes())
+    except ValueError as e:
+        return {}, [f"Invalid JSON in secrets.json: {e}"]
+    except OSError as e:
+        return {}, [f"Failed to load secrets.json: {e}"]
+    if not isinstance(data, dict):
+        return {}, ["Invalid secrets.json: top level must be an object"]
+    return data, []
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        raise MCPConfigError(f"MCP configuration file not found: {path}", config_path=str(path))
+    except OSError as e:
+        raise MCPConfigError(f"Failed to read config file: {e}", config_path=str(path))
+
+    try:
+        config = get_json_codec().loads(data)
+    except ValueError as e:
+        raise MCPConfigError(f"Invalid JSON in MCP config file: {e}", config_path=str(path))
+    if not isinstance(config, dict):
+        raise MCPConfigError("MCP config file must contain a JSON object", config_path=str(path))
+    return config
+
+
+def _referenced_variables(config: Dict[str, Any]) -> List[str]:
+    """Names of the variables referenced by any server's "env" block, sorted."""
+    names = set()
+    servers = config.get("mcpServers", {})
+    for server_config in servers.values() if isinstance(servers, dict) else ():
+        env_config = server_config.get("env", {}) if isinstance(server_config, dict) else {}
+        names.update(filter(None, map(env_reference, (env_config or {}).values())))
+    return sorted(names)
+
+
+def _environ_values(names: Any) -> Tuple[Tuple[str, Optional[str]], ...]:
+    return tuple((name, os.environ.get(name)) for name in names)
+
+
+def _resolve_server_env(config: Dict[str, Any], environment: Dict[str, str]) -> Dict[str, Dict[str, Tuple[Optional[str], str]]]:
+    resolved = {}
+    servers = config.get("mcpServers", {})
+    if not isinstance(servers, dict):
+        return resolved
+    for server_name, server_config in servers.items():
+        env_config = server_config.get("env", {}) if isinstance(server_config, dict) else {}
+        server_env = {}
+        for key, value in (env_config or {}).items():
+            raw = str(value)
+            name = env_reference(value)
+            server_env[key] = (environment.get(name), raw) if name else (raw, raw)
+        resolved[server_name] = server_env
+    return resolved
+
+
+class ConfigSnapshotStore:
+    """
+    Process-wide cache of config and secrets snapshots.
+
+    get()/get_secrets() stat the underlying files and only re-parse them when
+    their (mtime, size) changed; a config snapshot's env substitutions are
+    also redone when a referenced process environment variable changed. Building a new secrets snapshot also exports
+    it to os.environ once (.env without overriding, secrets.json overriding),
+    preserving what load_dotenv() plus the secrets loader used to do on every
+    client start.
+    """
+
+    def __init__(self, export_environ: bool = True):
+        self.export_environ = export_environ
+        self._configs: Dict[Tuple[str, str, str], ConfigSnapshot] = {}
+        self._secrets: Dict[Tuple[str, str], SecretsSnapshot] = {}
+        self._lock = threading.RLock()
+
+    def get_secrets(self, env_file: str | Path = ".env",
+                    secrets_file: str | Path = "secrets.json") -> SecretsSnapshot:
+        """
+        Return the current snapshot of env_file and secrets_file.
+
+        Missing files are treated as empty; parse problems are reported in
+        SecretsSnapshot.issues rather than raised.
+        """
+        env_path, secrets_path = Path(env_file).resolve(), Path(secrets_file).resolve()
+        key = (str(env_path), str(secrets_path))
+        stamp = (_stamp(env_path), _stamp(secrets_path))
+
+        with self._lock:
+            snapshot = self._secrets.get(key)
+            if snapshot is not None and snapshot.stamp == stamp:
+                return snapshot
+
+            dotenv, issues = _read_dotenv(env_path) if stamp[0] is not None else ({}, [])
+            secrets, secret_issues = _read_secrets(secrets_path) if stamp[1] is not None else ({}, [])
+            snapshot = SecretsSnapshot(
+                env_file=key[0],
+                secrets_file=key[1],
+                dotenv=MappingProxyType(dotenv),
+                secrets=_freeze(secrets),
+                stamp=stamp,
+                dotenv_issues=tuple(issues),
+                secrets_issues=tuple(secret_issues),
+            )
+            self._secrets[key] = snapshot
+            logger.debug(f"Loaded secrets snapshot: {len(dotenv)} .env values, {len(secrets)} secrets")
+            for issue in snapshot.issues:
+                logger.warning(issue)
+
+            if self.export_environ:
+                for name, value in snapshot.dotenv.items():
+                    os.environ.setdefault(name, value)
+                os.environ.update(snapshot.secrets_env)
+            return snapshot
+
+    def get(self, config_path: str | Path, env_file: str | Path = ".env",
+            secrets_file: str | Path = "secrets.json") -> ConfigSnapshot:
+        """
+        Return the current snapshot of an MCP config file.
+
+        Args:
+            config_path: Path to the MCP configuration JSON file
+            env_file: .env file used for variable substitution
+            secrets_file: secrets.json file used for variable substitution
+
+        Returns:
+            ConfigSnapshot shared by all callers until one of the files changes
+
+        Raises:
+            MCPConfigError: If the config file is missing or not valid JSON
+        """
+        path = Path(config_path).resolve()
+        secrets = self.get_secrets(env_file, secrets_file)
+        key = (str(path), secrets.env_file, secrets.secrets_file)
+        stamp = _stamp(path)
+
+        with self._lock:
+            snapshot = self._configs.get(key)
+            if (snapshot is not None and snapshot.stamp == stamp and snapshot.secrets is secrets
+                    and snapshot.environ == _environ_values(name for name, _ in snapshot.environ)):
+                return snapshot
+
+            if stamp is None:
+                self._configs.pop(key, None)
+                raise MCPConfigError(f"MCP configuration file not found: {config_path}",
+                                     config_path=str(config_path))
+
+            if snapshot is not None and snapshot.stamp == stamp:
+                config = _thaw(snapshot.config)
+            else:
+                config = _read_config(path)
+            snapshot = ConfigSnapshot(
+                config_path=str(path),
+                config=_freeze(config),
+                secrets=secrets,
+                stamp=stamp,
+                resolved_env=_freeze(_resolve_server_env(config, secrets.environment())),
+                environ=_environ_values(_referenced_variables(config)),
+            )
+            self._configs[key] = snapshot
+            logger.debug(f"Loaded config snapshot for {path} ({len(snapshot.servers)} servers)")
+            return snapshot
+
+    async def get_async(self, config_path: str | Path, env_file: str | Path = ".env",
+                        secrets_file: str | Path = "secrets.json") -> ConfigSnapshot:
+        """Like get(), but parses changed files in a worker thread."""
+        return await asyncio.to_thread(self.get, config_path, env_file, secrets_file)
+
+    def invalidate(self) -> None:
+        """Forget every snapshot so the next access re-reads the files."""
+        with self._lock:
+            self._configs.clear()
+            self._secrets.clear()
+
+
+# Process-wide store shared by clients, config managers and ParameterService
+config_snapshots = ConfigSnapshotStore()
+
+
+def get_config_snapshot(config_path: str | Path) -> ConfigSnapshot:
+    """Return the shared snapshot of config_path (see ConfigSnapshotStore.get)."""
+    return config_snapshots.get(config_path)
+
+
+async def get_config_snapshot_async(config_path: str | Path) -> ConfigSnapshot:
+    """Return the shared snapshot of config_path without blocking the event loop."""
+    return await config_snapshots.get_async(config_path)
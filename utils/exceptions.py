@@ -55,9 +55,12 @@ class MCPConfigError(MCPUtilityError):
 class MCPRetryError(MCPUtilityError):
     """Raised when retry operations fail after all attempts."""
 
-    def __init__(self, message: str, attempts: int = None, last_error: Exception = None, details: str = None):
+    def __init__(self, message: str, attempts: int = None, last_error: Exception = None, details: str = None,
+                 reason: str = None):
         self.attempts = attempts
         self.last_error = last_error
+        # Why retrying stopped: "exhausted", "budget", "deadline" or "retry_after"
+        self.reason = reason
         super().__init__(message, details)
 
     def __str__(self) -> str:
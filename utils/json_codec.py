@@ -0,0 +1,159 @@
+"""
+Pluggable JSON Codec
+
+Bytes-in/bytes-out JSON encoding shared by the MCP stdio transport and the
+structured JSON log sink. Prefers orjson, then msgspec, when installed and
+falls back to the stdlib json module otherwise. Set GRAPHMCP_JSON_CODEC to
+"orjson", "msgspec" or "json" to force a specific implementation.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec:
+    """
+    Stdlib JSON codec, and the interface every codec implements.
+
+    dumps() always returns UTF-8 bytes and loads() accepts bytes, bytearray,
+    memoryview or str, so callers never need an intermediate str.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        """Encode obj as compact (or 2-space indented) UTF-8 JSON."""
+        if indent:
+            text = json.dumps(obj, indent=2, separators=(',', ': '), ensure_ascii=False, default=default)
+        else:
+            text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default)
+        return text.encode("utf-8", errors="surrogatepass")
+
+    def dumps_line(self, obj: Any, default: Optional[Callable] = None) -> bytes:
+        """Encode obj as one compact JSON line terminated by a newline."""
+        return self.dumps(obj, default=default) + b"\n"
+
+    def loads(self, data: Any) -> Any:
+        """Decode JSON from bytes-like or str input."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson-backed codec; falls back to stdlib for inputs orjson rejects."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._fallback = JSONCodec()
+
+    def dumps(self, obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits or lone surrogates
+            return self._fallback.dumps(obj, indent=indent, default=default)
+
+    def dumps_line(self, obj: Any, default: Optional[Callable] = None) -> bytes:
+        try:
+            return orjson.dumps(obj, default=default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return self._fallback.dumps_line(obj, default=default)
+
+    def loads(self, data: Any) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the stdlib decide (it accepts NaN/Infinity and lone surrogates)
+            return self._fallback.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """msgspec-backed codec; falls back to stdlib for inputs msgspec rejects."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self._fallback = JSONCodec()
+
+    def dumps(self, obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+        try:
+            data = msgspec.json.encode(obj, enc_hook=default)
+        except (TypeError, msgspec.EncodeError):
+            return self._fallback.dumps(obj, indent=indent, default=default)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(self, data: Any) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            return self._fallback.loads(data)
+
+
+_CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+_active_codec: Optional[JSONCodec] = None
+
+
+def _create_codec(name: Optional[str]) -> JSONCodec:
+    if name:
+        if name not in _CODECS:
+            raise ValueError(f"Unknown JSON codec '{name}'. Available: {list(_CODECS)}")
+        return _CODECS[name]()
+
+    for codec_class in _CODECS.values():
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JSONCodec()
+
+
+def set_json_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Select the process-wide JSON codec.
+
+    Args:
+        name: "orjson", "msgspec" or "json"; None picks the fastest installed
+
+    Returns:
+        The active codec
+    """
+    global _active_codec
+    _active_codec = _create_codec(name)
+    logger.debug(f"Using JSON codec: {_active_codec.name}")
+    return _active_codec
+
+
+def get_json_codec() -> JSONCodec:
+    """Return the process-wide JSON codec, selecting it on first use."""
+    if _active_codec is None:
+        return set_json_codec(os.getenv("GRAPHMCP_JSON_CODEC") or None)
+    return _active_codec
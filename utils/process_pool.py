@@ -0,0 +1,99 @@
+"""
+Shared CPU Process Pool
+
+Pattern scanning, Repomix pack parsing and rule application are pure-Python
+CPU work; run on the event loop they stall MCP I/O, log flushing and
+preview streaming. run_in_process() sends such work to one process-wide
+ProcessPoolExecutor shared by every workflow (and by
+concrete.performance_optimization.ParallelProcessor), so worker start-up
+is paid once per process rather than once per step.
+
+Workers are started with the "spawn" method: forking a process that runs an
+event loop and helper threads is unsafe. Functions therefore have to be
+importable module-level callables, and arguments and results travel by
+pickle.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def default_worker_count() -> int:
+    """One worker per CPU, keeping one core for the event loop when possible."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def configure_process_pool(max_workers: Optional[int]) -> None:
+    """
+    Set the worker count of the shared pool.
+
+    Takes effect when the pool is next created; an existing pool is shut
+    down (after its running work finishes) if the size changes.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and max_workers != _pool_workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        _pool_workers = max_workers
+
+
+def process_pool_workers() -> int:
+    """Worker count of the shared pool, whether or not it is running yet."""
+    return _pool_workers or default_worker_count()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = process_pool_workers()
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Started shared CPU process pool with {workers} workers")
+        return _pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Shut down the shared pool; the next run_in_process() starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run func(*args, **kwargs) in the shared pool and await its result.
+
+    Cancelling the await does not stop a call that a worker already started;
+    its result is discarded.
+
+    Raises:
+        BrokenProcessPool: A worker died; the pool is replaced on next use
+        Any exception raised by func, re-raised in this process
+    """
+    pool = get_process_pool()
+    future = pool.submit(func, *args, **kwargs)
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        global _pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        logger.error("Shared CPU process pool broke; it will be restarted on next use")
+        raise
@@ -0,0 +1,228 @@
+"""
+Workflow Execution Profiling
+
+A Profiler records spans: timed, named regions such as a workflow step, one
+MCP tool call attempt, or a CPU-heavy phase like parsing a Repomix pack.
+The active profiler and the innermost open span are kept in ContextVars,
+so spans opened anywhere underneath a profiled workflow (including tasks
+it spawns) nest under the right parent without threading a parameter
+through every call. When no profiler is active, profile_span() is a no-op.
+
+A recorded run can be exported as:
+
+- Chrome trace-event JSON, viewable in chrome://tracing or Perfetto
+- collapsed stacks ("workflow;step;mcp.call 1234" per line, self time in
+  microseconds), the input format of flamegraph.pl and speedscope
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_PROFILE_DIR = "logs/profiles"
+
+_active_profiler: ContextVar[Optional["Profiler"]] = ContextVar("graphmcp_profiler", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("graphmcp_profile_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed region of a profiled run. Times are time.perf_counter() seconds."""
+    name: str
+    category: str
+    start: float
+    track: int
+    parent: Optional["Span"] = field(default=None, repr=False)
+    end: Optional[float] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def stack(self) -> List[str]:
+        """Names of this span and its ancestors, outermost first."""
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return names[::-1]
+
+
+class Profiler:
+    """
+    Collects spans for one run and exports them.
+
+    Spans are assigned to tracks: every asyncio task (or thread, outside an
+    event loop) that opens a span gets its own track, so concurrent steps
+    and MCP calls do not overlap on one row of the trace.
+    """
+
+    def __init__(self, name: str = "workflow"):
+        self.name = name
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._wall_origin = time.time()
+        self._tracks: Dict[Any, int] = {}
+        self._track_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"], state["_tracks"], state["_track_ids"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tracks = {}
+        self._track_ids = itertools.count(max((span.track for span in self.spans), default=0) + 1)
+        self._lock = threading.Lock()
+
+    def _track(self) -> int:
+        try:
+            owner = asyncio.current_task()
+        except RuntimeError:
+            owner = None
+        key = id(owner) if owner is not None else ("thread", threading.get_ident())
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None:
+                track = self._tracks[key] = next(self._track_ids)
+        return track
+
+    def start_span(self, name: str, category: str, parent: Optional[Span] = None, **args: Any) -> Span:
+        span = Span(name=name, category=category, start=time.perf_counter(),
+                    track=self._track(), parent=parent, args=args)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    # -- export ----------------------------------------------------------------
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the run as a Chrome trace-event document of complete ("X") events."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": self.name},
+        }]
+        for span in sorted(self.spans, key=lambda s: s.start):
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": span.track,
+                "args": {key: _trace_arg(value) for key, value in span.args.items()},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"name": self.name, "started_at": self._wall_origin},
+        }
+
+    def to_collapsed_stacks(self) -> str:
+        """
+        Return self time per stack, one "outer;inner <microseconds>" line each.
+
+        Time a span spends in child spans is attributed to the children.
+        Children running concurrently can add up to more than their parent,
+        whose self time is then counted as zero.
+        """
+        child_time: Dict[int, float] = defaultdict(float)
+        for span in self.spans:
+            if span.parent is not None:
+                child_time[id(span.parent)] += span.duration
+        totals: Dict[str, int] = defaultdict(int)
+        for span in self.spans:
+            self_time = max(0.0, span.duration - child_time[id(span)])
+            stack = ";".join(name.replace(";", ":").replace(" ", "_") for name in span.stack())
+            totals[stack] += int(self_time * 1e6)
+        return "".join(f"{stack} {value}\n" for stack, value in sorted(totals.items()) if value > 0)
+
+    def write(self, directory: str | Path = DEFAULT_PROFILE_DIR) -> Dict[str, Path]:
+        """
+        Write <name>-<timestamp>.trace.json and .folded files to directory.
+
+        Returns:
+            {"chrome_trace": path, "collapsed_stacks": path}
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._wall_origin))
+        base = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.name)
+        trace_path = directory / f"{base}-{stamp}.trace.json"
+        folded_path = directory / f"{base}-{stamp}.folded"
+        trace_path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        folded_path.write_text(self.to_collapsed_stacks(), encoding="utf-8")
+        return {"chrome_trace": trace_path, "collapsed_stacks": folded_path}
+
+
+def _trace_arg(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    """Record spans opened inside the block (and tasks it spawns) on profiler."""
+    profiler_token = _active_profiler.set(profiler)
+    span_token = _current_span.set(None)
+    try:
+        yield profiler
+    finally:
+        _current_span.reset(span_token)
+        _active_profiler.reset(profiler_token)
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the active profiler, if any."""
+    return _active_profiler.get()
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span, so callees can annotate it."""
+    return _current_span.get() if _active_profiler.get() is not None else None
+
+
+@contextmanager
+def profile_span(name: str, category: str = "function", **args: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the block as a span nested under the current one.
+
+    Args:
+        name: Span name, shown in traces and as a flamegraph frame
+        category: Trace-event category, e.g. "step", "mcp" or "cpu"
+        **args: Attributes recorded with the span
+
+    Yields:
+        The span (whose args may be extended), or None when not profiling
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield None
+        return
+
+    span = profiler.start_span(name, category, parent=_current_span.get(), **args)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.args["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end = time.perf_counter()
+        _current_span.reset(token)
@@ -0,0 +1,142 @@
+"""
+Incremental Repomix Pack Reader
+
+A Repomix pack is one XML-like document holding every file of a repository:
+
+    <file path="config/database.yml">
+    production:
+      database: postgres_air
+    </file>
+
+Matching it with a DOTALL regex over the whole text materializes every file
+body as a new string at once. RepomixPack instead memory-maps the pack and
+yields PackEntry (path, offset, length) records lazily; a file's content is
+only sliced out (as a memoryview, or decoded with text()) when asked for,
+so callers can stream through multi-GB packs with flat memory.
+
+Entries follow the same rules as the regex this replaces,
+r'<file path="([^"]+)">\\s*\\n(.*?)\\n</file>': the content starts after the
+last newline of the whitespace following the opening tag and ends before
+the first "\\n</file>". A file whose closing tag directly follows that
+newline is empty.
+"""
+
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+PackBuffer = Union[str, bytes, bytearray, mmap.mmap]
+
+_OPEN_TAG = re.compile(r'<file path="([^"]+)">')
+_OPEN_TAG_BYTES = re.compile(rb'<file path="([^"]+)">')
+_WHITESPACE = re.compile(r"\s*")
+_WHITESPACE_BYTES = re.compile(rb"\s*")
+
+
+@dataclass(frozen=True)
+class PackEntry:
+    """Location of one file's content within a pack buffer."""
+    path: str
+    # In bytes for byte buffers and memory-mapped packs, characters for str
+    offset: int
+    length: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+def iter_pack_entries(buffer: PackBuffer, start: int = 0) -> Iterator[PackEntry]:
+    """Yield the entries of a pack held in a str, bytes or mmap, in order."""
+    if isinstance(buffer, str):
+        open_tag, whitespace, newline, close_tag = _OPEN_TAG, _WHITESPACE, "\n", "\n</file>"
+    else:
+        open_tag, whitespace, newline, close_tag = _OPEN_TAG_BYTES, _WHITESPACE_BYTES, b"\n", b"\n</file>"
+
+    position = start
+    while True:
+        tag = open_tag.search(buffer, position)
+        if tag is None:
+            return
+        blank_end = whitespace.match(buffer, tag.end()).end()
+        last_newline = buffer.rfind(newline, tag.end(), blank_end)
+        if last_newline < 0:
+            position = tag.end()
+            continue
+        close = buffer.find(close_tag, last_newline)
+        if close < 0:
+            return
+        path = tag.group(1)
+        if not isinstance(path, str):
+            path = path.decode("utf-8", errors="surrogateescape")
+        offset = last_newline + 1
+        yield PackEntry(path=path, offset=offset, length=max(0, close - offset))
+        position = close + len(close_tag)
+
+
+class RepomixPack:
+    """
+    Read-only, memory-mapped Repomix pack file.
+
+    Usage:
+        with RepomixPack(path) as pack:
+            for entry in pack:
+                if entry.path.endswith(".py"):
+                    scan(pack.text(entry))
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # Empty files cannot be mapped
+            self._buffer: PackBuffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except BaseException:
+            self._file.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        """Size of the pack in bytes."""
+        return len(self._buffer)
+
+    def __iter__(self) -> Iterator[PackEntry]:
+        return iter_pack_entries(self._buffer)
+
+    def __enter__(self) -> "RepomixPack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def content(self, entry: PackEntry) -> memoryview:
+        """
+        Zero-copy view of an entry's raw bytes.
+
+        Release the view (or drop every reference to it) before closing
+        the pack.
+        """
+        return memoryview(self._buffer)[entry.offset:entry.end]
+
+    def search(self, pattern: "re.Pattern[bytes]", position: int = 0) -> Optional["re.Match[bytes]"]:
+        """Search the raw pack bytes from position with a bytes pattern."""
+        return pattern.search(self._buffer, position)
+
+    def text(self, entry: PackEntry, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """Decode an entry's content, translating newlines as text-mode reads do."""
+        with self.content(entry) as view:
+            text = str(view, encoding, errors)
+        if "\r" in text:
+            # The "\r" of a "\r\n</file>" line ending belongs to the closing tag
+            text = text[:-1] if text.endswith("\r") else text
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
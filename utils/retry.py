@@ -1,27 +1,319 @@
 """
 MCP Retry Handler
 
-Handles retry logic with exponential backoff using proven patterns
-from the working DirectMCPClient implementation.
+Retry engine shared by BaseMCPClient, MCPRetryHandler and
+ErrorRecoveryStrategy: decorrelated-jitter backoff, per-server token-bucket
+retry budgets, retryable vs terminal error classification, and
+Retry-After / rate-limit awareness (GitHub reports these in tool errors).
 """
 
 import asyncio
 import logging
+import random
+import re
+import threading
 import time
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Optional
 
-from .exceptions import MCPRetryError
+from .exceptions import MCPConfigError, MCPRetryError
 
 logger = logging.getLogger(__name__)
 
+# Errors that indicate a bug or bad input; retrying cannot help
+_TERMINAL_EXCEPTIONS = (
+    TypeError,
+    AttributeError,
+    NameError,
+    NotImplementedError,
+    AssertionError,
+    MCPConfigError,
+)
+
+# HTTP statuses count only in a status context ("status: 404", "HTTP 403",
+# "code=422"), never as bare numbers, which may be ports, sizes, line numbers
+# or ids quoted in a message
+_STATUS_CONTEXT = r"(?:status(?:[ _]?code)?|http(?:/[\d.]+)?|code)[\"']?\s*[:=]?\s*"
+_RATE_LIMIT_PATTERN = re.compile(
+    r"rate limit|too many requests|abuse detection|" + _STATUS_CONTEXT + r"429\b", re.IGNORECASE
+)
+_TERMINAL_PATTERN = re.compile(
+    r"bad credentials|unauthori[sz]ed|forbidden|not found|unprocessable"
+    r"|validation failed|invalid param|invalid argument|unknown tool|method not found"
+    r"|" + _STATUS_CONTEXT + r"(?:40[134]|422|-3260[12])\b",
+    re.IGNORECASE,
+)
+# Structured status codes (an HTTP status, or a JSON-RPC error code such as
+# "method not found" / "invalid params") that retrying cannot fix
+_TERMINAL_STATUSES = frozenset({401, 403, 404, 422, -32601, -32602})
+_RATE_LIMIT_STATUS = 429
+_RETRY_AFTER_PATTERN = re.compile(r"retry[- ]after[\"']?\s*[:=]?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+_RATELIMIT_RESET_PATTERN = re.compile(r"x-ratelimit-reset[\"']?\s*[:=]?\s*(\d{9,})", re.IGNORECASE)
+
+# Wait used for rate-limit errors that carry no Retry-After / reset hint
+DEFAULT_RATE_LIMIT_DELAY = 60.0
+
+
+def get_error_status(error: BaseException) -> Optional[int]:
+    """
+    Return the structured status of an error: its ``status`` or
+    ``status_code`` (HTTP), or ``code`` (e.g. a JSON-RPC error code), if set.
+    """
+    for attribute in ("status", "status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Extract a server-requested wait from an error, in seconds.
+
+    Honours a ``retry_after`` attribute, then ``Retry-After`` and
+    ``X-RateLimit-Reset`` values embedded in the message. Rate-limit errors
+    without a hint get DEFAULT_RATE_LIMIT_DELAY.
+
+    Returns:
+        Seconds to wait, or None when the error carries no rate-limit signal
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return max(0.0, float(retry_after))
+
+    message = str(error)
+    match = _RETRY_AFTER_PATTERN.search(message)
+    if match:
+        return float(match.group(1))
+    match = _RATELIMIT_RESET_PATTERN.search(message)
+    if match:
+        return max(0.0, float(match.group(1)) - time.time())
+    if get_error_status(error) == _RATE_LIMIT_STATUS or _RATE_LIMIT_PATTERN.search(message):
+        return DEFAULT_RATE_LIMIT_DELAY
+    return None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Classify an error as retryable (transient) or terminal.
+
+    An explicit boolean ``retryable`` attribute on the exception wins, then
+    a structured status (see get_error_status), then the message. Rate
+    limits are retryable; authentication, not-found and validation
+    failures, and programming errors are terminal. Anything else is
+    assumed transient.
+    """
+    retryable = getattr(error, "retryable", None)
+    if isinstance(retryable, bool):
+        return retryable
+    if isinstance(error, _TERMINAL_EXCEPTIONS):
+        return False
+    status = get_error_status(error)
+    if status == _RATE_LIMIT_STATUS:
+        return True
+    if status in _TERMINAL_STATUSES:
+        return False
+    message = str(error)
+    if _RATE_LIMIT_PATTERN.search(message):
+        return True
+    return not _TERMINAL_PATTERN.search(message)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Backoff schedule for one retried operation.
+
+    With jitter the delays follow "decorrelated jitter":
+    ``delay = min(max_delay, uniform(base_delay, previous * multiplier))``,
+    so parallel workers failing together spread their retries out. Without
+    jitter the delays are ``base_delay * multiplier ** attempt``.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 3.0
+    jitter: bool = True
+    # Server-requested waits longer than this are not worth sleeping through
+    max_retry_after: float = 300.0
+
+    def next_delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        """
+        Return the delay before the retry following attempt (0-based).
+
+        Args:
+            attempt: Index of the attempt that just failed
+            previous: Delay used before that attempt, if any
+        """
+        if not self.jitter:
+            return min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        upper = max(self.base_delay, (previous or self.base_delay) * self.multiplier)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+class RetryBudget:
+    """
+    Token bucket limiting how many retries a server receives.
+
+    Every retry spends one token; tokens refill continuously. When many
+    workers fail against the same server at once the bucket drains and
+    further failures are returned immediately instead of piling retries
+    onto an already struggling server.
+    """
+
+    def __init__(self, capacity: float = 20.0, refill_per_second: float = 1.0):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Spend tokens for a retry; False if the budget is exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+
+_retry_budgets: dict[str, RetryBudget] = {}
+_retry_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(key: str, capacity: float = 20.0, refill_per_second: float = 1.0) -> RetryBudget:
+    """
+    Return the process-wide retry budget for a server, creating it on first use.
+
+    Args:
+        key: Budget key, normally the MCP server name
+        capacity: Bucket size used when the budget is created
+        refill_per_second: Refill rate used when the budget is created
+    """
+    with _retry_budgets_lock:
+        budget = _retry_budgets.get(key)
+        if budget is None:
+            budget = _retry_budgets[key] = RetryBudget(capacity, refill_per_second)
+        return budget
+
+
+def reset_retry_budgets() -> None:
+    """Forget all retry budgets (mainly for tests)."""
+    with _retry_budgets_lock:
+        _retry_budgets.clear()
+
+
+class RetryEngine:
+    """
+    Runs an async operation under a RetryPolicy.
+
+    Terminal errors are re-raised unchanged. When retrying stops for any
+    other reason an MCPRetryError is raised with ``attempts``,
+    ``last_error`` and ``reason`` ("exhausted", "budget", "deadline" or
+    "retry_after") so each call site can translate it into its own error.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        budget: Optional[RetryBudget] = None,
+        retryable: Callable[[Exception], bool] = is_retryable_error,
+    ):
+        self.policy = policy or RetryPolicy()
+        self.budget = budget
+        self.retryable = retryable
+
+    def compute_delay(self, attempt: int, previous: Optional[float], error: Exception) -> float:
+        """Backoff delay for the next retry, raised to any server-requested wait."""
+        delay = self.policy.next_delay(attempt, previous)
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[Any]],
+        remaining_time: Optional[Callable[[], Optional[float]]] = None,
+        on_retry: Optional[Callable[[int, float, Exception], None]] = None,
+    ) -> Any:
+        """
+        Execute operation until it succeeds or retrying stops.
+
+        Args:
+            operation: Zero-argument callable returning an awaitable (one attempt)
+            remaining_time: Returns seconds left until the caller's deadline
+                (None for no deadline); retries that would outlive it stop early
+            on_retry: Called as on_retry(attempt_number, delay, error) before
+                each backoff sleep, for call-site logging
+
+        Returns:
+            Result of the first successful attempt
+        """
+        delay: Optional[float] = None
+        attempts = self.policy.max_attempts
+
+        for attempt in range(attempts):
+            try:
+                return await operation()
+            except Exception as e:
+                if not self.retryable(e):
+                    raise
+
+                if attempt >= attempts - 1:
+                    raise MCPRetryError(
+                        f"Operation failed after {attempt + 1} attempts",
+                        attempts=attempt + 1, last_error=e, reason="exhausted",
+                    ) from e
+
+                delay = self.compute_delay(attempt, delay, e)
+                if delay > self.policy.max_retry_after:
+                    raise MCPRetryError(
+                        f"Server asked to wait {delay:.0f}s, longer than allowed",
+                        attempts=attempt + 1, last_error=e, reason="retry_after",
+                    ) from e
+
+                remaining = remaining_time() if remaining_time else None
+                if remaining is not None and remaining <= delay:
+                    raise MCPRetryError(
+                        "Deadline leaves no time to retry",
+                        attempts=attempt + 1, last_error=e, reason="deadline",
+                    ) from e
+
+                if self.budget is not None and not self.budget.try_acquire():
+                    raise MCPRetryError(
+                        "Retry budget exhausted",
+                        attempts=attempt + 1, last_error=e, reason="budget",
+                    ) from e
+
+                if on_retry:
+                    on_retry(attempt + 1, delay, e)
+                await asyncio.sleep(delay)
+
+        raise MCPRetryError("Operation was not attempted", attempts=0, reason="exhausted")
+
 
 class MCPRetryHandler:
     """
     Handles retry logic with exponential backoff.
     
     Extracted from proven retry patterns in DirectMCPClient.call_github_tools()
-    to ensure compatibility with working retry strategies.
+    to ensure compatibility with working retry strategies. Backoff, budgets
+    and rate-limit handling are delegated to RetryEngine.
     """
 
     def __init__(
@@ -29,20 +321,32 @@ class MCPRetryHandler:
         max_retries: int = 3,
         base_delay: float = 2.0,
         max_delay: float = 30.0,
-        retryable_exceptions: tuple[type[Exception], ...] = None
+        retryable_exceptions: tuple[type[Exception], ...] = None,
+        budget: Optional[RetryBudget] = None,
+        jitter: bool = True
     ):
         """
         Initialize retry handler.
         
         Args:
             max_retries: Maximum number of retry attempts
-            base_delay: Base delay in seconds (used for exponential backoff)
+            base_delay: Backoff growth factor between attempts
             max_delay: Maximum delay between retries
             retryable_exceptions: Tuple of exception types that should trigger retries
+            budget: Optional shared retry budget (see get_retry_budget)
+            jitter: Use decorrelated jitter instead of fixed exponential delays
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
+        self.budget = budget
+        self.policy = RetryPolicy(
+            max_attempts=max_retries,
+            base_delay=1.0,
+            max_delay=max_delay,
+            multiplier=base_delay,
+            jitter=jitter,
+        )
 
         # Default retryable exceptions based on working patterns
         if retryable_exceptions is None:
@@ -64,9 +368,6 @@ class MCPRetryHandler:
         """
         Execute operation with exponential backoff retry.
         
-        This implementation follows the exact pattern from 
-        DirectMCPClient.call_github_tools() retry logic.
-        
         Args:
             operation: Async callable to execute
             *args: Arguments to pass to operation
@@ -79,42 +380,27 @@ class MCPRetryHandler:
             MCPRetryError: If all retry attempts are exhausted
             Exception: If operation fails with non-retryable exception
         """
-        last_error = None
-
-        for attempt in range(self.max_retries):
-            try:
-                logger.debug(f"Executing operation (attempt {attempt + 1}/{self.max_retries})")
+        engine = RetryEngine(self.policy, budget=self.budget, retryable=self.should_retry)
 
-                result = await operation(*args, **kwargs)
-
-                if attempt > 0:
-                    logger.info(f"Operation succeeded on attempt {attempt + 1}")
-
-                return result
+        def on_retry(attempt: int, delay: float, error: Exception) -> None:
+            logger.warning(
+                f"Network error on attempt {attempt}, "
+                f"retrying in {delay:.1f}s: {error}"
+            )
 
-            except Exception as e:
-                last_error = e
-
-                if not self.should_retry(e):
-                    logger.error(f"Non-retryable error: {e}")
-                    raise e
-
-                if attempt < self.max_retries - 1:
-                    delay = self.calculate_delay(attempt)
-                    logger.warning(
-                        f"Network error on attempt {attempt + 1}, "
-                        f"retrying in {delay}s: {e}"
-                    )
-                    await asyncio.sleep(delay)
-                else:
-                    logger.error(f"Failed after {self.max_retries} attempts: {e}")
-
-        # If we get here, all retries were exhausted
-        raise MCPRetryError(
-            f"Operation failed after {self.max_retries} retry attempts",
-            attempts=self.max_retries,
-            last_error=last_error
-        )
+        try:
+            return await engine.run(lambda: operation(*args, **kwargs), on_retry=on_retry)
+        except MCPRetryError as e:
+            logger.error(f"Failed after {e.attempts} attempts ({e.reason}): {e.last_error}")
+            raise MCPRetryError(
+                f"Operation failed after {e.attempts} retry attempts",
+                attempts=e.attempts,
+                last_error=e.last_error,
+                reason=e.reason
+            ) from e.last_error
+        except Exception as e:
+            logger.error(f"Non-retryable error: {e}")
+            raise
 
     def should_retry(self, exception: Exception) -> bool:
         """
@@ -126,28 +412,20 @@ class MCPRetryHandler:
         Returns:
             True if exception should trigger a retry
         """
-        return isinstance(exception, self.retryable_exceptions)
+        return isinstance(exception, self.retryable_exceptions) and is_retryable_error(exception)
 
-    def calculate_delay(self, attempt: int) -> float:
+    def calculate_delay(self, attempt: int, previous: Optional[float] = None) -> float:
         """
-        Calculate delay with exponential backoff.
-        
-        This uses the exact pattern from DirectMCPClient:
-        wait_time = 2 ** attempt  # Exponential backoff
+        Calculate the backoff delay before the next retry.
         
         Args:
             attempt: Current attempt number (0-based)
+            previous: Delay used before the current attempt, if any
             
         Returns:
             Delay in seconds
         """
-        # Exponential backoff: 2^attempt
-        delay = self.base_delay ** attempt
-
-        # Cap at maximum delay
-        delay = min(delay, self.max_delay)
-
-        return delay
+        return self.policy.next_delay(attempt, previous)
 
     async def with_retry_and_cleanup(
         self,
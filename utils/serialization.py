@@ -0,0 +1,227 @@
+"""
+Serializability Checks
+
+ensure_serializable() used to run a full pickle.dumps() of every value just
+to prove it could be pickled, then discard the bytes. For large step
+results (discovery results carry the content of every matched file) that
+cost dominates step hand-off. check_serializable() instead walks the object
+graph once, verifying that every node is of a type pickle can handle:
+
+- builtin scalars and containers are accepted or walked directly
+- instances of importable Python classes with default pickling are walked
+  through their __dict__ / __slots__ state
+- classes and functions must be importable by qualified name
+- anything else (C types, custom __reduce__/__getstate__) is checked by
+  pickling that one leaf object
+
+Shared containers and cycles are visited once (memoized by id), and
+per-type decisions are cached.
+"""
+
+import copyreg
+import datetime
+import decimal
+import enum
+import fractions
+import functools
+import logging
+import pickle
+import sys
+import types
+import uuid
+from collections import deque
+from pathlib import PurePath
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Check modes for ensure_serializable()
+STRUCTURAL = "structural"  # type walk (default)
+PICKLE = "pickle"          # full pickle.dumps(), the original behaviour
+OFF = "off"                # no check; errors surface when data is persisted
+CHECK_MODES = (STRUCTURAL, PICKLE, OFF)
+
+_default_mode = STRUCTURAL
+
+# Values pickle handles without inspecting further
+_ATOMIC_TYPES = (
+    type(None), bool, int, float, complex, str, bytes, bytearray, range, slice,
+    type(Ellipsis), type(NotImplemented), decimal.Decimal, fractions.Fraction, uuid.UUID,
+    datetime.date, datetime.time, datetime.timedelta, datetime.tzinfo, PurePath, enum.Enum,
+)
+_SEQUENCE_TYPES = (list, tuple, set, frozenset, deque)
+
+_OBJECT_GETSTATE = getattr(object, "__getstate__", None)
+
+
+class _NotSerializable(Exception):
+    """Internal signal carrying the path to the offending value."""
+
+
+def set_serialization_check_mode(mode: str) -> None:
+    """Set the process-wide default mode used by ensure_serializable()."""
+    global _default_mode
+    if mode not in CHECK_MODES:
+        raise ValueError(f"Unknown serialization check mode '{mode}'; expected one of {CHECK_MODES}")
+    _default_mode = mode
+
+
+def get_serialization_check_mode() -> str:
+    return _default_mode
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_importable(obj: Any) -> bool:
+    """True if pickle can find obj (a class or function) by module and qualname."""
+    qualname = getattr(obj, "__qualname__", None)
+    module = sys.modules.get(getattr(obj, "__module__", None) or "")
+    if not qualname or module is None or "<" in qualname:
+        return False
+    target = module
+    for part in qualname.split("."):
+        target = getattr(target, part, None)
+        if target is None:
+            return False
+    return target is obj
+
+
+def _is_python_class(cls: type) -> bool:
+    """True if cls and all its bases but object are Python classes keeping state in __dict__/__slots__."""
+    return all(
+        c.__flags__ & (1 << 9)  # Py_TPFLAGS_HEAPTYPE; C extension types may set it too,
+        and (c.__dictoffset__ or "__slots__" in c.__dict__)  # but do not keep state this way
+        for c in cls.__mro__[:-1]
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _walks_state(cls: type) -> bool:
+    """True if instances of cls pickle as (class, __dict__/__slots__) with no custom hooks."""
+    if not _is_python_class(cls):
+        return False
+    if cls in copyreg.dispatch_table:
+        return False
+    return (
+        cls.__reduce_ex__ is object.__reduce_ex__
+        and cls.__reduce__ is object.__reduce__
+        and getattr(cls, "__getstate__", _OBJECT_GETSTATE) is _OBJECT_GETSTATE
+        and not hasattr(cls, "__getnewargs_ex__")
+        and not hasattr(cls, "__getnewargs__")
+    )
+
+
+def _slot_values(obj: Any):
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                yield name, getattr(obj, name)
+
+
+def _format_path(path: Any) -> str:
+    # Paths are built lazily as (parent, label) links; only rendered on failure
+    labels = []
+    while path is not None:
+        path, label = path
+        if isinstance(label, tuple):
+            key, suffix = label
+            label = f"[{key!r}]{suffix}"
+        labels.append(label)
+    return "".join(reversed(labels))
+
+
+def _pickle_leaf(value: Any, path: Any) -> None:
+    try:
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        raise _NotSerializable(f"{_format_path(path)}: {e}")
+
+
+def _check(value: Any) -> None:
+    seen = set()
+    # Iterative so deeply nested results do not hit the recursion limit
+    stack = [(value, (None, "value"))]
+    while stack:
+        value, path = stack.pop()
+        cls = type(value)
+        if isinstance(value, _ATOMIC_TYPES) and (cls.__module__ == "builtins" or _is_importable(cls)):
+            continue
+
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+
+        # Walked values are never pickled whole, so their class is checked here
+        walked = isinstance(value, (dict,) + _SEQUENCE_TYPES) or _walks_state(cls)
+        if walked and not _is_importable(cls):
+            raise _NotSerializable(f"{_format_path(path)}: cannot pickle instance of local class {cls.__qualname__}")
+
+        if isinstance(value, dict):
+            if getattr(value, "default_factory", None) is not None:
+                stack.append((value.default_factory, (path, ".default_factory")))
+            if cls.__module__ != "builtins" and hasattr(value, "__dict__") and vars(value):
+                stack.append((vars(value), (path, ".__dict__")))
+            for key, item in value.items():
+                stack.append((key, (path, (key, " (key)"))))
+                stack.append((item, (path, (key, ""))))
+        elif isinstance(value, _SEQUENCE_TYPES):
+            for index, item in enumerate(value):
+                stack.append((item, (path, (index, ""))))
+        elif isinstance(value, type):
+            if value.__module__ != "builtins" and not _is_importable(value):
+                raise _NotSerializable(f"{_format_path(path)}: cannot pickle local class {value.__qualname__}")
+        elif isinstance(value, (types.FunctionType, types.BuiltinFunctionType)):
+            if not _is_importable(value):
+                raise _NotSerializable(f"{_format_path(path)}: cannot pickle local function {value.__qualname__}")
+        elif _walks_state(cls):
+            if hasattr(value, "__dict__"):
+                stack.append((vars(value), (path, ".__dict__")))
+            for name, item in _slot_values(value):
+                stack.append((item, (path, f".{name}")))
+        else:
+            _pickle_leaf(value, path)
+
+
+def check_serializable(data: Any) -> Optional[str]:
+    """
+    Structurally check that data can be pickled.
+
+    Args:
+        data: Value to check
+
+    Returns:
+        None if data is serializable, otherwise a description of the
+        first offending value and where it was found
+    """
+    try:
+        _check(data)
+    except _NotSerializable as e:
+        return str(e)
+    return None
+
+
+def validate_serializable(data: Any, mode: Optional[str] = None) -> Any:
+    """
+    Return data unchanged if it passes the serializability check for mode.
+
+    Args:
+        data: Value to check
+        mode: STRUCTURAL, PICKLE or OFF; defaults to the process-wide mode
+
+    Raises:
+        RuntimeError: If data cannot be serialized
+    """
+    mode = mode or _default_mode
+    if mode == OFF:
+        return data
+    if mode == PICKLE:
+        try:
+            pickle.dumps(data)
+            return data
+        except (TypeError, AttributeError, pickle.PicklingError) as e:
+            problem = str(e)
+    else:
+        problem = check_serializable(data)
+        if problem is None:
+            return data
+    logger.error(f"Data serialization failed: {problem}")
+    raise RuntimeError(f"Non-serializable data detected: {problem}")
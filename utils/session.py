@@ -5,16 +5,19 @@ Manages MCP server sessions with proven lifecycle patterns extracted
 from the working DirectMCPClient implementation.
 
 CRITICAL: This implementation avoids storing actual mcp_use client/session 
-objects to prevent pickle serialization issues with LangGraph.
+objects to prevent pickle serialization issues with LangGraph. Connected
+sessions are reused through a process-wide MCPSessionRegistry that lives
+outside any pickled state.
 """
 
 import asyncio
 import gc
 import logging
-import pickle
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 try:
     from mcp_use import MCPClient
@@ -22,23 +25,28 @@ except ImportError:
     # For testing without mcp_use dependency
     MCPClient = None
 
+from .capabilities import capability_cache, capability_key
 from .config import MCPConfigManager
 from .data_models import MCPSession
 from .exceptions import MCPSessionError, MCPToolError
 from .retry import MCPRetryHandler
+from .serialization import validate_serializable
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_serializable(data: Any) -> Any:
+def ensure_serializable(data: Any, mode: Optional[str] = None) -> Any:
     """
-    Ensure data is serializable by testing pickle serialization.
+    Ensure data is serializable for LangGraph state management.
     
-    This is extracted EXACTLY from the working DirectMCPClient.ensure_serializable()
-    to maintain compatibility with LangGraph state management.
+    By default this is a structural type walk (see utils.serialization)
+    rather than a full pickle.dumps(), so large results are not encoded
+    just to be discarded.
     
     Args:
         data: Data to test for serializability
+        mode: "structural", "pickle" (full pickle round, the original
+            behaviour) or "off"; defaults to the process-wide mode
         
     Returns:
         The same data if serializable
@@ -46,12 +54,203 @@ def ensure_serializable(data: Any) -> Any:
     Raises:
         RuntimeError: If data cannot be serialized
     """
-    try:
-        pickle.dumps(data)
-        return data
-    except (TypeError, AttributeError) as e:
-        logger.error(f"Data serialization failed: {e}")
-        raise RuntimeError(f"Non-serializable data detected: {e}")
+    return validate_serializable(data, mode)
+
+
+@dataclass
+class _RegistryEntry:
+    """A connected mcp_use client/session pair held by the registry."""
+    server_name: str
+    client: Any
+    session: Any
+    loop: asyncio.AbstractEventLoop
+    refcount: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class MCPSessionRegistry:
+    """
+    Process-wide registry of connected mcp_use sessions.
+
+    Sessions are keyed by (config path, server name) and reference counted:
+    acquire() reuses a connected session when one exists, release() returns
+    it, and sessions idle for longer than idle_timeout are disconnected on
+    the next acquire/release. The registry is deliberately module-level so
+    MCPSessionManager instances (and anything that pickles them) never hold
+    live session objects.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0):
+        self.idle_timeout = idle_timeout
+        self._entries: dict[tuple[str, str], _RegistryEntry] = {}
+        self._connecting: dict[tuple[str, str], asyncio.Future] = {}
+        # Discarded sessions still held by someone; closed on last release
+        self._retired: list[_RegistryEntry] = []
+
+    @staticmethod
+    def _key(config_path: str | Path, server_name: str) -> tuple[str, str]:
+        return (str(Path(config_path).resolve()), server_name)
+
+    def _is_usable(self, entry: _RegistryEntry) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if entry.loop is not loop or loop.is_closed():
+            return False
+        return bool(getattr(entry.session, "is_connected", True))
+
+    async def _connect(self, config_path: str | Path, server_name: str) -> _RegistryEntry:
+        # Exact lifecycle from DirectMCPClient: fresh client, create, connect
+        client = MCPClient.from_config_file(str(config_path))
+        try:
+            session = await client.create_session(server_name)
+            await session.connect()
+        except BaseException:
+            try:
+                await client.close_all_sessions()
+            except Exception as cleanup_error:
+                logger.warning(f"Client cleanup warning for {server_name}: {cleanup_error}")
+            raise
+        logger.debug(f"Connected to MCP server: {server_name}")
+        return _RegistryEntry(
+            server_name=server_name, client=client, session=session, loop=asyncio.get_running_loop()
+        )
+
+    async def acquire(self, config_path: str | Path, server_name: str) -> Any:
+        """
+        Return a connected mcp_use session, reusing an idle one when possible.
+
+        Every acquire() must be paired with a release().
+        """
+        await self.evict_idle()
+        key = self._key(config_path, server_name)
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_usable(entry):
+                    entry.refcount += 1
+                    entry.last_used = time.monotonic()
+                    return entry.session
+                # Disconnected or created on another (possibly closed) loop
+                await self._drop(key, entry)
+
+            pending = self._connecting.get(key)
+            if pending is not None:
+                try:
+                    await asyncio.shield(pending)
+                except Exception:
+                    pass
+                continue
+
+            pending = asyncio.get_running_loop().create_future()
+            self._connecting[key] = pending
+            try:
+                entry = await self._connect(config_path, server_name)
+                entry.refcount = 1
+                self._entries[key] = entry
+                pending.set_result(None)
+                return entry.session
+            except BaseException as e:
+                if isinstance(e, asyncio.CancelledError):
+                    pending.cancel()
+                else:
+                    pending.set_exception(e)
+                    pending.exception()
+                raise
+            finally:
+                self._connecting.pop(key, None)
+
+    async def release(self, config_path: str | Path, server_name: str, session: Any,
+                      discard: bool = False) -> None:
+        """
+        Return a session obtained from acquire().
+
+        Args:
+            discard: Stop reusing the session and disconnect it once no other
+                user holds it (use after connection errors)
+        """
+        key = self._key(config_path, server_name)
+        entry = self._entries.get(key)
+        if entry is None or entry.session is not session:
+            entry = next((e for e in self._retired if e.session is session), None)
+            if entry is None:
+                return
+        elif discard:
+            del self._entries[key]
+            self._retired.append(entry)
+
+        entry.refcount = max(0, entry.refcount - 1)
+        entry.last_used = time.monotonic()
+        await self.evict_idle()
+
+    async def evict_idle(self, max_idle: Optional[float] = None) -> int:
+        """
+        Disconnect unused sessions idle for longer than max_idle (default
+        idle_timeout), plus discarded sessions nobody holds any more.
+        """
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        now = time.monotonic()
+        evicted = 0
+        for key, entry in list(self._entries.items()):
+            if entry.refcount == 0 and now - entry.last_used >= max_idle:
+                await self._drop(key, entry)
+                evicted += 1
+        for entry in [e for e in self._retired if e.refcount == 0]:
+            self._retired.remove(entry)
+            await self._close_entry(entry)
+            evicted += 1
+        return evicted
+
+    async def _drop(self, key: tuple[str, str], entry: _RegistryEntry) -> None:
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        await self._close_entry(entry)
+
+    async def _close_entry(self, entry: _RegistryEntry) -> None:
+        server_name = entry.server_name
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if entry.loop is not running or entry.loop.is_closed():
+            # Its transports belong to another loop; just drop the references
+            return
+        try:
+            await entry.session.disconnect()
+            logger.debug(f"Disconnected session for {server_name}")
+        except Exception as cleanup_error:
+            logger.warning(f"Session disconnect warning for {server_name}: {cleanup_error}")
+        try:
+            await entry.client.close_all_sessions()
+            logger.debug(f"Closed client for {server_name}")
+        except Exception as cleanup_error:
+            logger.warning(f"Client cleanup warning for {server_name}: {cleanup_error}")
+
+    async def close_all(self) -> None:
+        """Disconnect every registered session regardless of reference count."""
+        entries, self._entries = self._entries, {}
+        retired, self._retired = self._retired, []
+        for entry in list(entries.values()) + retired:
+            await self._close_entry(entry)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Reference count and idle time per registered server."""
+        now = time.monotonic()
+        return {
+            key[1]: {"refcount": entry.refcount, "idle_seconds": now - entry.last_used}
+            for key, entry in self._entries.items()
+        }
+
+
+_session_registry = MCPSessionRegistry()
+
+
+def get_session_registry() -> MCPSessionRegistry:
+    """Return the process-wide MCP session registry."""
+    return _session_registry
 
 
 class MCPSessionManager:
@@ -60,24 +259,36 @@ class MCPSessionManager:
     
     CRITICAL DESIGN PRINCIPLES (extracted from working implementation):
     1. Never store actual mcp_use client/session objects in instance state
-    2. Always create fresh client instances for each operation
+    2. Reuse connected sessions via the process-wide MCPSessionRegistry
+       (or create fresh client instances per operation with reuse_sessions=False)
     3. Ensure proper cleanup in all code paths (especially finally blocks)
     4. Test serialization of all returned data
     5. Use exact session lifecycle: create → connect → use → disconnect → cleanup
     """
 
-    def __init__(self, config_manager: MCPConfigManager):
+    def __init__(self, config_manager: MCPConfigManager, reuse_sessions: bool = True,
+                 force_gc: bool = False):
         """
         Initialize session manager.
         
         Args:
             config_manager: Configuration manager for MCP servers
+            reuse_sessions: Share connected sessions through the session registry
+                instead of connecting and disconnecting on every use
+            force_gc: Run a full gc.collect() after each session_context
+                (the old DirectMCPClient behaviour; expensive, off by default)
         """
         self.config_manager = config_manager
         self.retry_handler = MCPRetryHandler()
+        self.reuse_sessions = reuse_sessions
+        self.force_gc = force_gc
 
         # CRITICAL: Only store serializable metadata, never actual sessions
         self._active_session_metadata: dict[str, MCPSession] = {}
+        # Server name and open context count of each session yielded by
+        # session_context(), by id(session); lets call_tool() use the
+        # capability cache without being told the server
+        self._session_servers: dict[int, tuple[str, int]] = {}
 
         # Validate mcp_use is available
         if MCPClient is None:
@@ -130,16 +341,53 @@ class MCPSessionManager:
         """
         Context manager for automatic session lifecycle management.
         
-        This implements the exact pattern from DirectMCPClient:
-        - Create fresh client instance
-        - Create and connect session
-        - Yield session for use
-        - Ensure cleanup in finally block
+        With reuse_sessions (the default) a connected session is borrowed
+        from the process-wide MCPSessionRegistry and returned afterwards, so
+        repeated calls do not reconnect. Sessions that hit connection errors
+        are discarded rather than reused. With reuse_sessions=False this is
+        the exact DirectMCPClient pattern: fresh client, connect, yield,
+        disconnect.
         
         Usage:
             async with session_manager.session_context('ovr_github') as session:
                 result = await session.connector.call_tool('tool_name', params)
         """
+        if not self.reuse_sessions:
+            async with self._fresh_session_context(server_name) as session:
+                with self._track_session(session, server_name):
+                    yield session
+            return
+
+        registry = get_session_registry()
+        config_path = self.config_manager.config_path
+        session = None
+        discard = False
+
+        try:
+            session = await registry.acquire(config_path, server_name)
+
+            # Yield the actual session for immediate use
+            with self._track_session(session, server_name):
+                yield session
+
+        except Exception as e:
+            discard = isinstance(e, (ConnectionError, TimeoutError, OSError, EOFError)) or (
+                session is not None and not getattr(session, "is_connected", True)
+            )
+            logger.error(f"Session context error for {server_name}: {e}")
+            raise MCPSessionError(
+                f"Session context failed: {e}",
+                server_name=server_name
+            )
+        finally:
+            if session is not None:
+                await registry.release(config_path, server_name, session, discard=discard)
+            if self.force_gc:
+                gc.collect()
+
+    @asynccontextmanager
+    async def _fresh_session_context(self, server_name: str):
+        """Connect-per-use session lifecycle (exact DirectMCPClient pattern)."""
         client = None
         session = None
 
@@ -181,14 +429,55 @@ class MCPSessionManager:
                 except Exception as cleanup_error:
                     logger.warning(f"Client cleanup warning for {server_name}: {cleanup_error}")
 
-            # Force garbage collection (exact pattern from DirectMCPClient)
-            gc.collect()
+            if self.force_gc:
+                gc.collect()
+
+    @contextmanager
+    def _track_session(self, session: Any, server_name: str):
+        """Record which server a session belongs to while a session_context is open."""
+        key = id(session)
+        _, count = self._session_servers.get(key, (server_name, 0))
+        self._session_servers[key] = (server_name, count + 1)
+        try:
+            yield
+        finally:
+            _, count = self._session_servers.get(key, (server_name, 1))
+            if count <= 1:
+                self._session_servers.pop(key, None)
+            else:
+                self._session_servers[key] = (server_name, count - 1)
+
+    def _session_server(self, session: Any, server_name: str | None = None) -> str | None:
+        """Return server_name, or the server of a session yielded by session_context()."""
+        if server_name is not None:
+            return server_name
+        entry = self._session_servers.get(id(session))
+        return entry[0] if entry else None
+
+    async def _get_tool_names(self, session: Any, server_name: str | None,
+                              force_refresh: bool = False) -> list[str]:
+        """
+        Return tool names for a session, using the capability cache when the
+        server name is known (passed, or recorded by session_context()).
+        """
+        server_name = self._session_server(session, server_name)
+        if server_name is None:
+            tools = await session.connector.list_tools()
+            return [t.name for t in tools]
+
+        capabilities = await capability_cache.get_tools(
+            capability_key(self.config_manager.config_path, server_name),
+            session.connector.list_tools,
+            force_refresh=force_refresh
+        )
+        return capabilities.tool_names
 
     async def call_tool(
         self,
         session: Any,  # The actual mcp_use session object
         tool_name: str,
-        params: dict
+        params: dict,
+        server_name: str | None = None
     ) -> Any:
         """
         Call MCP tool with session using proven patterns.
@@ -199,19 +488,24 @@ class MCPSessionManager:
             session: The actual mcp_use session object
             tool_name: Name of tool to call
             params: Tool parameters
+            server_name: Server the session belongs to, for sessions not
+                obtained from session_context(); enables validating the tool
+                name against the cached tool list instead of listing tools
+                before every call
             
         Returns:
             Tool result (guaranteed serializable)
         """
-        # Get available tools
-        tools = await session.connector.list_tools()
-
-        # Validate tool exists
-        tool_names = [t.name for t in tools]
+        server_name = self._session_server(session, server_name)
+        # Validate tool exists (a cached list missing the tool is refreshed once)
+        tool_names = await self._get_tool_names(session, server_name)
+        if tool_name not in tool_names and server_name is not None:
+            tool_names = await self._get_tool_names(session, server_name, force_refresh=True)
         if tool_name not in tool_names:
             raise MCPToolError(
                 f"Tool '{tool_name}' not found. Available tools: {tool_names}",
-                tool_name=tool_name
+                tool_name=tool_name,
+                server_name=server_name
             )
 
         # Call tool
@@ -223,18 +517,19 @@ class MCPSessionManager:
 
         return result
 
-    async def list_tools(self, session: Any) -> list[str]:
+    async def list_tools(self, session: Any, server_name: str | None = None) -> list[str]:
         """
         List available tools for a session.
         
         Args:
             session: The actual mcp_use session object
+            server_name: Server the session belongs to, for sessions not
+                obtained from session_context(); enables the capability cache
             
         Returns:
             List of tool names
         """
-        tools = await session.connector.list_tools()
-        tool_names = [t.name for t in tools]
+        tool_names = await self._get_tool_names(session, server_name)
 
         # Ensure serializable
         ensure_serializable(tool_names)
@@ -262,8 +557,9 @@ class MCPSessionManager:
         for server in servers_to_check:
             try:
                 async with self.session_context(server) as session:
-                    # Try to list tools as a health check
-                    await session.connector.list_tools()
+                    # Try to list tools as a health check; the fresh list also
+                    # refreshes the capability cache used for tool validation
+                    await self._get_tool_names(session, server, force_refresh=True)
                     health_status[server] = True
                     logger.debug(f"Health check passed for {server}")
             except Exception as e:
@@ -315,7 +611,7 @@ async def execute_github_analysis(
 
             async with session_manager.session_context('ovr_github') as session:
                 # Get available tools
-                tools = await session.connector.list_tools()
+                tools = await session_manager._get_tool_names(session, 'ovr_github')
 
                 if not tools:
                     raise RuntimeError("No GitHub tools available from MCP servers")
@@ -402,7 +698,7 @@ async def execute_context7_search(
             logger.debug(f"Context7 search attempt {attempt + 1}/{max_retries}")
 
             async with session_manager.session_context('ovr_context7') as session:
-                tools = await session.connector.list_tools()
+                tools = await session_manager._get_tool_names(session, 'ovr_context7')
 
                 if not tools:
                     logger.warning("No Context7 tools available, returning placeholder")
@@ -412,7 +708,7 @@ async def execute_context7_search(
                 results = []
 
                 # Exact logic from DirectMCPClient.call_context7_tools()
-                if library_id and "get-library-docs" in [t.name for t in tools]:
+                if library_id and "get-library-docs" in tools:
                     logger.debug(f"Calling get-library-docs for library_id: {library_id}, topic: {topic}")
                     try:
                         params = {"context7CompatibleLibraryID": library_id}
@@ -1,7 +1,11 @@
 """
 GraphMCP Workflows Package
 """
-from .builder import WorkflowBuilder, Workflow, WorkflowStep, WorkflowResult, WorkflowConfig, StepType
+from .builder import WorkflowBuilder, Workflow, WorkflowStep, WorkflowResult, WorkflowConfig, StepType, StepAttempt
+from .checkpoint import CheckpointStore, StepCheckpoint
+from .plan import ExecutionPlan, plan_parameter
+from .streams import StepStream, StreamClosedError
+from .timings import StepTimings, step_timings
 
 __all__ = [
     "WorkflowBuilder",
@@ -10,4 +14,13 @@ __all__ = [
     "WorkflowResult",
     "WorkflowConfig",
     "StepType",
-] 
\ No newline at end of file
+    "StepAttempt",
+    "CheckpointStore",
+    "StepCheckpoint",
+    "ExecutionPlan",
+    "plan_parameter",
+    "StepStream",
+    "StreamClosedError",
+    "StepTimings",
+    "step_timings",
+]
@@ -6,16 +6,35 @@ that leverage multiple MCP servers.
 """
 
 from __future__ import annotations
+import asyncio
+import heapq
 import logging
 import time
+from contextlib import nullcontext
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field, replace
 
-from utils import ensure_serializable
+from contextvars import ContextVar
+
+from clients.registry import MCPClientRegistry, get_client_registry
+from clients.timeouts import deadline_scope, remaining_time
+from utils import MCPRetryError, RetryEngine, RetryPolicy, ensure_serializable
+from utils.process_pool import run_in_process
+from utils.profiling import DEFAULT_PROFILE_DIR, Profiler, get_profiler, profile_span, profiling
+from utils.serialization import CHECK_MODES, check_serializable
+from .checkpoint import DEFAULT_CHECKPOINT_DIR, CheckpointStore, StepCheckpoint, fingerprint, step_checkpoint_key
+from .streams import StepStream, StreamClosedError
+from .timings import StepTimings, step_timings
+
+if TYPE_CHECKING:
+    from .plan import ExecutionPlan
 
 logger = logging.getLogger(__name__)
 
+# Id of the step whose task is running, used to attribute shared-context writes
+_current_step_id: ContextVar[Optional[str]] = ContextVar("graphmcp_current_step_id", default=None)
+
 class StepType(Enum):
     CUSTOM = auto()
     GITHUB = auto()
@@ -25,6 +44,8 @@ class StepType(Enum):
     REPOMIX = auto()
     SLACK = auto()
     GPT = auto()
+    STREAM = auto()  # custom function is an async generator; see workflows.streams
+    CPU = auto()     # custom function runs in the shared process pool; see utils.process_pool
 
 @dataclass
 class WorkflowStep:
@@ -34,11 +55,17 @@ class WorkflowStep:
     description: str = ""
     parameters: Dict[str, Any] = field(default_factory=dict)
     depends_on: List[str] = field(default_factory=list)
-    timeout_seconds: int = 120
-    retry_count: int = 3
+    # None: the workflow's default_timeout / default_retry_count, resolved when
+    # the builder builds or compiles the workflow
+    timeout_seconds: Optional[int] = 120
+    retry_count: Optional[int] = 3
     server_name: Optional[str] = None
     tool_name: Optional[str] = None
     custom_function: Optional[Callable] = None
+    # Items buffered per consumer before a STREAM step waits for it
+    stream_buffer_size: int = 8
+    # CPU steps: keyword argument -> shared value key passed to the function
+    inputs: Dict[str, str] = field(default_factory=dict)
     
     # Add serialization helper for functions
     function: Optional[Callable] = field(default=None, repr=False)
@@ -50,6 +77,15 @@ class WorkflowStep:
         elif self.function and not self.custom_function:
             self.custom_function = self.function
 
+@dataclass
+class StepAttempt:
+    """Timing of one execution attempt of a workflow step."""
+    attempt: int
+    started_at: float
+    duration_seconds: float = 0.0
+    status: str = "running"  # succeeded, failed, timed_out or cancelled
+    error: Optional[str] = None
+
 @dataclass
 class WorkflowResult:
     status: str
@@ -58,10 +94,17 @@ class WorkflowResult:
     step_results: Dict[str, Any]
     steps_completed: int
     steps_failed: int
+    step_attempts: Dict[str, List[StepAttempt]] = field(default_factory=dict)
+    resumed_steps: List[str] = field(default_factory=list)
+    profile: Optional[Profiler] = field(default=None, repr=False)
+    profile_files: Dict[str, str] = field(default_factory=dict)
 
     def get_step_result(self, step_id: str, default: Any = None) -> Any:
         return self.step_results.get(step_id, default)
 
+    def get_step_attempts(self, step_id: str) -> List[StepAttempt]:
+        return self.step_attempts.get(step_id, [])
+
 @dataclass
 class WorkflowConfig:
     name: str
@@ -71,17 +114,71 @@ class WorkflowConfig:
     default_timeout: int = 120
     stop_on_error: bool = False
     default_retry_count: int = 2
+    retry_backoff_seconds: float = 1.0
+    checkpoint_dir: Optional[str] = None
+    # Prune checkpoints older than this before each run; None keeps them
+    checkpoint_max_age_seconds: Optional[float] = None
+    # Delete the run's checkpoints once every step has succeeded
+    clear_checkpoints_on_success: bool = False
+    # Step parameters left out of checkpoint keys; see with_run_identity_parameters()
+    checkpoint_ignored_parameters: Tuple[str, ...] = ()
+    # ensure_serializable() mode for step results; None uses the process-wide default
+    serialization_check: Optional[str] = None
+    # Record step and MCP call spans, writing trace files to this directory
+    profile_dir: Optional[str] = None
 
 class WorkflowContext:
     """Workflow execution context for sharing data between steps."""
-    def __init__(self, config: WorkflowConfig):
+    def __init__(self, config: WorkflowConfig, client_registry: Optional[MCPClientRegistry] = None):
         self.config = config
         self._shared_context = {}
+        # Clients used by this run, by server name; owned by the registry
         self._clients = {}
+        self._client_registry = client_registry if client_registry is not None else MCPClientRegistry()
+        self._step_attempts: Dict[str, List[StepAttempt]] = {}
+        # Shared values written by each step, persisted with its checkpoint
+        self._shared_writes: Dict[str, Dict[str, Any]] = {}
+        self._result_hashes: Dict[str, str] = {}
+        # Checkpoint keys of this run's steps, cleared on success if configured
+        self._checkpoint_keys: Set[str] = set()
+        self._streams: Dict[str, StepStream] = {}
+
+    @property
+    def client_registry(self) -> MCPClientRegistry:
+        return self._client_registry
+
+    async def get_client(self, server_name: str, client_class: Optional[type] = None):
+        """
+        Return the registry's client for server_name, creating it on first use.
+
+        Tool steps and custom steps share this client, as do later workflows
+        run with the same registry.
+        """
+        client = await self._client_registry.acquire(server_name, self.config.config_path, client_class)
+        self._clients[server_name] = client
+        return client
     
     def set_shared_value(self, key: str, value: Any):
         """Set a shared value accessible to all workflow steps."""
-        self._shared_context[key] = ensure_serializable(value)
+        self._store_shared_value(key, ensure_serializable(value, self.config.serialization_check))
+
+    def _store_shared_value(self, key: str, value: Any):
+        self._shared_context[key] = value
+        step_id = _current_step_id.get()
+        if step_id is not None:
+            self._shared_writes.setdefault(step_id, {})[key] = value
+
+    def _publish_result(self, step_id: str, value: Any) -> Any:
+        """
+        Validate a step result once and share it under the step id.
+
+        The workflow results and the shared context hold the same object, so
+        downstream steps receive a reference rather than a copy and must
+        treat it as read-only.
+        """
+        value = ensure_serializable(value, self.config.serialization_check)
+        self._store_shared_value(step_id, value)
+        return value
     
     def get_shared_value(self, key: str, default: Any = None) -> Any:
         """Get a shared value from the workflow context."""
@@ -91,22 +188,142 @@ class WorkflowContext:
         """Get a step result from the shared context (alias for get_shared_value)."""
         return self.get_shared_value(step_id, default)
 
+    def stream(self, step_id: str) -> AsyncIterator[Any]:
+        """
+        Iterate the items yielded by STREAM step step_id as they are produced.
+
+        Only steps that list step_id in depends_on can consume its stream.
+
+        Raises:
+            ValueError: step_id is not a running or finished STREAM step, or
+                the calling step does not depend on it
+            StreamClosedError: (while iterating) the producing step failed
+        """
+        stream = self._streams.get(step_id)
+        if stream is None:
+            raise ValueError(f"Step '{step_id}' is not a streaming step of this workflow")
+        consumer = _current_step_id.get()
+        if consumer is None:
+            raise ValueError("context.stream() must be called from a workflow step")
+        return stream.iterate(consumer)
+
+def validate_step_dependencies(steps: List[WorkflowStep]) -> None:
+    """
+    Check that steps form a DAG.
+
+    Raises:
+        ValueError: On duplicate step ids, unknown dependencies or a cycle
+    """
+    steps_by_id: Dict[str, WorkflowStep] = {}
+    for step in steps:
+        if step.id in steps_by_id:
+            raise ValueError(f"Duplicate step id '{step.id}'")
+        steps_by_id[step.id] = step
+
+    for step in steps:
+        for dep in step.depends_on:
+            if dep not in steps_by_id:
+                raise ValueError(f"Step '{step.id}' depends on unknown step '{dep}'")
+
+    # Iterative DFS; a back edge to a step on the current path is a cycle
+    visiting, visited = set(), set()
+    for root in steps:
+        if root.id in visited:
+            continue
+        path = [root.id]
+        stack = [(root.id, iter(steps_by_id[root.id].depends_on))]
+        visiting.add(root.id)
+        while stack:
+            step_id, deps = stack[-1]
+            dep = next(deps, None)
+            if dep is None:
+                stack.pop()
+                path.pop()
+                visiting.discard(step_id)
+                visited.add(step_id)
+            elif dep in visiting:
+                cycle = path[path.index(dep):] + [dep]
+                raise ValueError(f"Dependency cycle between steps: {' -> '.join(cycle)}")
+            elif dep not in visited:
+                visiting.add(dep)
+                path.append(dep)
+                stack.append((dep, iter(steps_by_id[dep].depends_on)))
+
+def dependency_tables(steps: List[WorkflowStep]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """
+    Scheduling tables for steps: the ids of the steps depending on each
+    step, and how many known steps each step waits for.
+    """
+    known = {step.id for step in steps}
+    dependents: Dict[str, List[str]] = {step.id: [] for step in steps}
+    dependency_counts: Dict[str, int] = {}
+    for step in steps:
+        deps = {dep for dep in step.depends_on if dep in known}
+        dependency_counts[step.id] = len(deps)
+        for dep in deps:
+            dependents[dep].append(step.id)
+    return dependents, dependency_counts
+
+
 class Workflow:
     """Represents a compiled, executable workflow."""
-    def __init__(self, config: WorkflowConfig, steps: List[WorkflowStep]):
+    def __init__(self, config: WorkflowConfig, steps: List[WorkflowStep],
+                 client_registry: Optional[MCPClientRegistry] = None, plan: Optional[ExecutionPlan] = None):
         self.config = config
         self.steps = steps
+        # Compiled plan the steps came from (see workflows.plan)
+        self.plan = plan
+        # Shared MCP clients; falls back to the process-wide registry, then
+        # to one private to each run that is closed when the run ends
+        self.client_registry = client_registry
+
+    async def execute(self, enhanced_logger=None, resume: bool = False, profile: bool = False) -> WorkflowResult:
+        """
+        Execute the workflow with proper context management and optional enhanced logging.
+
+        Args:
+            enhanced_logger: Optional logger receiving step progress events
+            resume: Reuse checkpointed results of steps whose inputs are unchanged.
+                Implies checkpointing, in config.checkpoint_dir or the default
+                directory when none is configured.
+            profile: Record a profile of the run (see utils.profiling). Implied
+                by config.profile_dir, which also writes the trace files.
+                Runs inside an active profiling() block record into it.
+        """
+        outer = get_profiler()
+        profiler = outer
+        if profiler is None and (profile or self.config.profile_dir):
+            profiler = Profiler(self.config.name)
+        if profiler is None:
+            return await self._execute(enhanced_logger, resume)
 
-    async def execute(self, enhanced_logger=None) -> WorkflowResult:
-        """Execute the workflow with proper context management and optional enhanced logging."""
+        with profiling(profiler) if outer is None else nullcontext():
+            with profile_span(self.config.name, "workflow", steps=len(self.steps)):
+                result = await self._execute(enhanced_logger, resume)
+        result.profile = profiler
+        if self.config.profile_dir:
+            try:
+                files = profiler.write(self.config.profile_dir)
+                result.profile_files = {kind: str(path) for kind, path in files.items()}
+                logger.info(f"Wrote workflow profile to {files['chrome_trace']}")
+            except OSError as e:
+                logger.warning(f"Failed to write workflow profile: {e}")
+        return result
+
+    async def _execute(self, enhanced_logger=None, resume: bool = False) -> WorkflowResult:
         logger.info(f"Executing workflow: {self.config.name}")
         start_time = time.time()
         results = {}
-        completed_count = 0
-        failed_count = 0
         
+        registry = self.client_registry
+        if registry is None:
+            registry = get_client_registry()
+        owned_registry = None
+        if registry is None or registry.closed:
+            registry = owned_registry = MCPClientRegistry()
+
         # Create workflow context
-        context = WorkflowContext(self.config)
+        context = WorkflowContext(self.config, registry)
         
         # Initialize enhanced logging if provided
         if enhanced_logger and hasattr(enhanced_logger, 'initialize_progress_tracking'):
@@ -117,130 +334,32 @@ class Workflow:
                 logger.warning(f"Failed to initialize enhanced logging: {e}")
                 enhanced_logger = None
 
-        # Simplified sequential execution for demonstration
-        for step_index, step in enumerate(self.steps):
-            logger.info(f"Executing step: {step.id} ({step.name})")
-            
-            # Enhanced logging: Start step tracking
-            if enhanced_logger and hasattr(enhanced_logger, 'log_step_start_async'):
+        checkpoints = None
+        if self.config.checkpoint_dir or resume:
+            checkpoints = CheckpointStore(self.config.checkpoint_dir or DEFAULT_CHECKPOINT_DIR)
+            if self.config.checkpoint_max_age_seconds is not None:
                 try:
-                    await enhanced_logger.log_step_start_async(step.id, step.description or step.name, step.parameters)
-                except Exception as e:
-                    logger.warning(f"Enhanced logging step start failed: {e}")
-            
-            try:
-                if step.custom_function:
-                    # Enhanced logging: Initial progress
-                    if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
-                        try:
-                            await enhanced_logger.log_step_progress_async(step.id, 0.1, "Starting custom function execution")
-                        except Exception:
-                            pass
-                    
-                    # Pass parameters correctly to the function
-                    step_result = await step.custom_function(context, step, **step.parameters)
-                    results[step.id] = ensure_serializable(step_result)
-                    context.set_shared_value(step.id, step_result) # Make result available in shared context
-                    completed_count += 1
-                    
-                    # Enhanced logging: Step completion
-                    if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
-                        try:
-                            await enhanced_logger.log_step_end_async(step.id, {"result": "Custom function completed"}, True)
-                        except Exception:
-                            pass
-                else:
-                    # Execute MCP tool steps
-                    if step.server_name and step.tool_name:
-                        try:
-                            # Enhanced logging: Client initialization progress
-                            if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
-                                try:
-                                    await enhanced_logger.log_step_progress_async(step.id, 0.2, "Initializing MCP client")
-                                except Exception:
-                                    pass
-                            
-                            # Dynamically import the client based on server_name
-                            if step.server_name == "ovr_github":
-                                from clients import GitHubMCPClient as ClientClass
-                            elif step.server_name == "ovr_repomix":
-                                from clients import RepomixMCPClient as ClientClass
-                            elif step.server_name == "ovr_slack": # Temporarily re-add Slack for completeness, will skip it in db_decommission.py
-                                from clients import SlackMCPClient as ClientClass
-                            else:
-                                raise ValueError(f"Unsupported server name: {step.server_name}")
-
-                            client = context._clients.get(step.server_name) or ClientClass(context.config.config_path)
-                            context._clients[step.server_name] = client
-                            
-                            # Enhanced logging: Tool execution progress
-                            if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
-                                try:
-                                    await enhanced_logger.log_step_progress_async(step.id, 0.5, f"Executing {step.tool_name}")
-                                except Exception:
-                                    pass
-                            
-                            logger.info(f"Calling MCP tool '{step.tool_name}' on server '{step.server_name}' for step '{step.id}'")
-                            tool_result = await client.call_tool_with_retry(
-                                step.tool_name, 
-                                step.parameters,
-                                retry_count=step.retry_count
-                            )
-                            results[step.id] = ensure_serializable(tool_result)
-                            context.set_shared_value(step.id, tool_result)
-                            completed_count += 1
-                            
-                            # Enhanced logging: Tool completion
-                            if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
-                                try:
-                                    await enhanced_logger.log_step_end_async(step.id, {"tool_result": "MCP tool completed"}, True)
-                                except Exception:
-                                    pass
-                        except Exception as client_e:
-                            logger.error(f"MCP client call failed for step {step.id} ({step.name}): {client_e}")
-                            results[step.id] = {"error": str(client_e)}
-                            failed_count += 1
-                            
-                            # Enhanced logging: Step failure
-                            if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
-                                try:
-                                    await enhanced_logger.log_step_end_async(step.id, {"error": str(client_e)}, False)
-                                except Exception:
-                                    pass
-                            
-                            if self.config.stop_on_error:
-                                break
-                    else:
-                        # Fallback for unhandled step types (should not happen if all are covered)
-                        logger.warning(f"Unhandled step type: {step.step_type.name} for step {step.id}. Mocking execution.")
-                        results[step.id] = {"status": "mocked_unhandled", "step_type": step.step_type.name}
-                        completed_count += 1
-                        
-                        # Enhanced logging: Mocked step completion
-                        if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
-                            try:
-                                await enhanced_logger.log_step_end_async(step.id, {"status": "mocked_unhandled"}, True)
-                            except Exception:
-                                pass
-            except Exception as e:
-                logger.error(f"Step {step.id} failed: {e}")
-                results[step.id] = {"error": str(e)}
-                failed_count += 1
-                
-                # Enhanced logging: General step failure
-                if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
-                    try:
-                        await enhanced_logger.log_step_end_async(step.id, {"error": str(e)}, False)
-                    except Exception:
-                        pass
-                
-                if self.config.stop_on_error:
-                    break
-        
+                    pruned = await asyncio.to_thread(checkpoints.prune, self.config.checkpoint_max_age_seconds)
+                    if pruned:
+                        logger.info(f"Pruned {pruned} expired checkpoints from {checkpoints.directory}")
+                except OSError as e:
+                    logger.warning(f"Failed to prune checkpoints: {e}")
+        resumed: List[str] = []
+
+        completed_count, failed_count = await self._run_scheduled_steps(
+            context, results, enhanced_logger, checkpoints, resume, resumed)
+
         duration = time.time() - start_time
         success_rate = (completed_count / len(self.steps)) * 100 if self.steps else 100
+        step_timings.record_attempts(self.config.name, context._step_attempts, skip=resumed)
 
         status = "completed" if failed_count == 0 else ("partial_success" if completed_count > 0 else "failed")
+        if checkpoints is not None and status == "completed" and self.config.clear_checkpoints_on_success:
+            # Only this run's checkpoints: other runs of the workflow may share the directory
+            try:
+                await asyncio.to_thread(checkpoints.discard, self.config.name, context._checkpoint_keys)
+            except OSError as e:
+                logger.warning(f"Failed to clear checkpoints: {e}")
 
         # Enhanced logging: Workflow completion
         if enhanced_logger and hasattr(enhanced_logger, 'log_workflow_end'):
@@ -249,13 +368,10 @@ class Workflow:
             except Exception as e:
                 logger.warning(f"Enhanced logging workflow end failed: {e}")
 
-        # Cleanup: Close all cached MCP clients to prevent memory leaks
-        for client_name, client in context._clients.items():
-            try:
-                await client.close()
-                logger.debug(f"Closed MCP client: {client_name}")
-            except Exception as e:
-                logger.warning(f"Error closing MCP client {client_name}: {e}")
+        # Cleanup: Close the run's MCP clients to prevent memory leaks.
+        # Clients of a shared registry stay connected for later workflows.
+        if owned_registry is not None:
+            await owned_registry.close()
 
         return WorkflowResult(
             status=status,
@@ -264,21 +380,479 @@ class Workflow:
             step_results=results,
             steps_completed=completed_count,
             steps_failed=failed_count,
+            step_attempts=context._step_attempts,
+            resumed_steps=resumed,
         )
 
+    async def _run_scheduled_steps(self, context: WorkflowContext, results: Dict[str, Any],
+                                   enhanced_logger=None, checkpoints: Optional[CheckpointStore] = None,
+                                   resume: bool = False, resumed: Optional[List[str]] = None) -> Tuple[int, int]:
+        """
+        Run steps as a DAG: a step starts once all of its depends_on steps have
+        finished, with at most config.max_parallel_steps running at a time.
+        Ready steps start in declaration order.
+
+        STREAM steps release their dependents as soon as they start, so the
+        dependents can consume items while they are produced. Such a
+        consumer starts even when max_parallel_steps are already running,
+        since the producer may be waiting on it to drain its buffer.
+
+        When a step fails under stop_on_error no further steps are started;
+        steps that never ran are recorded as skipped.
+
+        Returns:
+            (completed_count, failed_count)
+        """
+        order = {step.id: index for index, step in enumerate(self.steps)}
+        steps_by_id = {step.id: step for step in self.steps}
+        if self.plan is not None:
+            dependents, dependency_counts = self.plan.dependents, self.plan.dependency_counts
+        else:
+            dependents, dependency_counts = dependency_tables(self.steps)
+        waiting_on = dict(dependency_counts)
+
+        ready = [(order[step_id], step_id) for step_id, count in waiting_on.items() if count == 0]
+        heapq.heapify(ready)
+        limit = max(1, self.config.max_parallel_steps or 1)
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+        failed_steps: List[str] = []
+        finished = set()
+        completed_count = failed_count = 0
+
+        def release_dependents(step_id: str):
+            for dependent in dependents[step_id]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    heapq.heappush(ready, (order[dependent], dependent))
+
+        def consumes_running_stream(step_id: str) -> bool:
+            return any(stream_id in context._streams and not context._streams[stream_id].closed
+                       for stream_id in steps_by_id[step_id].depends_on)
+
+        try:
+            while ready or running:
+                while ready and not failed_steps:
+                    if len(running) < limit:
+                        _, step_id = heapq.heappop(ready)
+                    else:
+                        exempt = [entry for entry in ready if consumes_running_stream(entry[1])]
+                        if not exempt:
+                            break
+                        entry = min(exempt)
+                        ready.remove(entry)
+                        heapq.heapify(ready)
+                        step_id = entry[1]
+                    step = steps_by_id[step_id]
+                    if step.step_type == StepType.STREAM:
+                        context._streams[step.id] = StepStream(step.id, dependents[step.id], step.stream_buffer_size)
+                    task = asyncio.create_task(self._run_step(
+                        step, context, results, enhanced_logger, checkpoints, resume, resumed))
+                    running[task] = step
+                    if step.step_type == StepType.STREAM:
+                        release_dependents(step.id)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: order[running[t].id]):
+                    step = running.pop(task)
+                    finished.add(step.id)
+                    if task.result():
+                        completed_count += 1
+                    else:
+                        failed_count += 1
+                        if self.config.stop_on_error:
+                            failed_steps.append(step.id)
+                    if step.step_type != StepType.STREAM:
+                        release_dependents(step.id)
+        finally:
+            for task in running:
+                task.cancel()
+
+        for step in self.steps:
+            if step.id in results:
+                continue
+            blocked = [dep for dep in step.depends_on if dep not in finished or dep in failed_steps]
+            if blocked and failed_steps:
+                reason = f"dependency '{blocked[0]}' did not complete"
+            elif failed_steps:
+                reason = f"workflow stopped after step '{failed_steps[0]}' failed"
+            else:
+                reason = "unresolved dependencies"
+            logger.info(f"Skipping step {step.id}: {reason}")
+            results[step.id] = {"status": "skipped", "reason": reason}
+        return completed_count, failed_count
+
+    async def _run_step(self, step: WorkflowStep, context: WorkflowContext, results: Dict[str, Any],
+                        enhanced_logger=None, checkpoints: Optional[CheckpointStore] = None,
+                        resume: bool = False, resumed: Optional[List[str]] = None) -> bool:
+        """
+        Execute a step, or restore it from a checkpoint when resuming.
+
+        Successful results are checkpointed under a key derived from the step
+        definition and the result hashes of its dependencies.
+        """
+        # Streamed items are not checkpointed, so neither side of a stream can be restored
+        streams = [context._streams[dep] for dep in step.depends_on if dep in context._streams]
+        if step.step_type == StepType.STREAM or streams:
+            checkpoints = None
+
+        succeeded = False
+        try:
+            with profile_span(step.id, "step", step_type=step.step_type.name) as span:
+                succeeded = await self._run_step_checkpointed(
+                    step, context, results, enhanced_logger, checkpoints, resume, resumed)
+                if span is not None:
+                    span.args["status"] = "succeeded" if succeeded else "failed"
+                    span.args["attempts"] = len(context._step_attempts.get(step.id, []))
+                    span.args["resumed"] = resumed is not None and step.id in resumed
+            return succeeded
+        finally:
+            for stream in streams:
+                await stream.detach(step.id)
+            stream = context._streams.get(step.id)
+            if stream is not None:
+                error = None
+                if not succeeded:
+                    outcome = results.get(step.id)
+                    reason = outcome.get("error") if isinstance(outcome, dict) else None
+                    error = StreamClosedError(reason or "step did not complete")
+                await stream.close(error)
+
+    async def _run_step_checkpointed(self, step: WorkflowStep, context: WorkflowContext, results: Dict[str, Any],
+                                     enhanced_logger=None, checkpoints: Optional[CheckpointStore] = None,
+                                     resume: bool = False, resumed: Optional[List[str]] = None) -> bool:
+        if checkpoints is not None:
+            upstream = {dep: context._result_hashes.get(dep) for dep in step.depends_on}
+            key = step_checkpoint_key(step, upstream, self.config.checkpoint_ignored_parameters)
+            context._checkpoint_keys.add(key)
+            if resume:
+                checkpoint = await checkpoints.load_async(self.config.name, key)
+                if checkpoint is not None:
+                    logger.info(f"Resuming step {step.id} from checkpoint {key[:12]}")
+                    context._shared_context.update(checkpoint.shared_values)
+                    context._shared_writes[step.id] = dict(checkpoint.shared_values)
+                    context._result_hashes[step.id] = checkpoint.result_hash
+                    results[step.id] = checkpoint.result
+                    if resumed is not None:
+                        resumed.append(step.id)
+                    return True
+
+        token = _current_step_id.set(step.id)
+        try:
+            succeeded = await self._execute_step(step, context, results, enhanced_logger)
+        finally:
+            _current_step_id.reset(token)
+
+        if checkpoints is None:
+            return succeeded
+
+        shared_values = context._shared_writes.get(step.id, {})
+        result_hash = fingerprint({"result": results.get(step.id), "shared": shared_values})
+        context._result_hashes[step.id] = result_hash
+        if succeeded:
+            try:
+                await checkpoints.save_async(self.config.name, StepCheckpoint(
+                    step_id=step.id, key=key, result=results[step.id],
+                    result_hash=result_hash, shared_values=shared_values,
+                ))
+            except Exception as e:
+                logger.warning(f"Failed to checkpoint step {step.id}: {e}")
+        return succeeded
+
+    async def _execute_step(self, step: WorkflowStep, context: WorkflowContext,
+                            results: Dict[str, Any], enhanced_logger=None) -> bool:
+        """Execute one step, storing its result (or error) in results. Returns True on success."""
+        succeeded = False
+        logger.info(f"Executing step: {step.id} ({step.name})")
+
+        # Enhanced logging: Start step tracking
+        if enhanced_logger and hasattr(enhanced_logger, 'log_step_start_async'):
+            try:
+                await enhanced_logger.log_step_start_async(step.id, step.description or step.name, step.parameters)
+            except Exception as e:
+                logger.warning(f"Enhanced logging step start failed: {e}")
+
+        # Every MCP call made by the step (and its retries) shares the step's budget
+        with deadline_scope(step.timeout_seconds):
+            timeout_scope = asyncio.timeout(step.timeout_seconds or None)
+            try:
+                async with timeout_scope:
+                    if step.step_type == StepType.STREAM:
+                        # Streamed items can not be taken back, so the step is not retried
+                        step_result = await self._timed_attempt(
+                            context._step_attempts.setdefault(step.id, []),
+                            self._publish_stream(step, context),
+                        )
+                        results[step.id] = context._publish_result(step.id, step_result)
+                        succeeded = True
+
+                        if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                            try:
+                                await enhanced_logger.log_step_end_async(step.id, {"result": "Stream completed"}, True)
+                            except Exception:
+                                pass
+                    elif step.step_type == StepType.CPU:
+                        step_result = await self._run_custom_function(step, context)
+                        results[step.id] = context._publish_result(step.id, step_result)
+                        succeeded = True
+
+                        if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                            try:
+                                await enhanced_logger.log_step_end_async(step.id, {"result": "CPU step completed"}, True)
+                            except Exception:
+                                pass
+                    elif step.custom_function:
+                        # Enhanced logging: Initial progress
+                        if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
+                            try:
+                                await enhanced_logger.log_step_progress_async(step.id, 0.1, "Starting custom function execution")
+                            except Exception:
+                                pass
+
+                        # Pass parameters correctly to the function; transient failures are retried
+                        step_result = await self._run_custom_function(step, context)
+                        results[step.id] = context._publish_result(step.id, step_result) # Make result available in shared context
+                        succeeded = True
+
+                        # Enhanced logging: Step completion
+                        if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                            try:
+                                await enhanced_logger.log_step_end_async(step.id, {"result": "Custom function completed"}, True)
+                            except Exception:
+                                pass
+                    else:
+                        # Execute MCP tool steps
+                        if step.server_name and step.tool_name:
+                            try:
+                                # Enhanced logging: Client initialization progress
+                                if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
+                                    try:
+                                        await enhanced_logger.log_step_progress_async(step.id, 0.2, "Initializing MCP client")
+                                    except Exception:
+                                        pass
+
+                                # Concurrent steps for the same server share one client
+                                client_class = self.plan.client_classes.get(step.server_name) if self.plan else None
+                                client = await context.get_client(step.server_name, client_class)
+
+                                # Enhanced logging: Tool execution progress
+                                if enhanced_logger and hasattr(enhanced_logger, 'log_step_progress_async'):
+                                    try:
+                                        await enhanced_logger.log_step_progress_async(step.id, 0.5, f"Executing {step.tool_name}")
+                                    except Exception:
+                                        pass
+
+                                logger.info(f"Calling MCP tool '{step.tool_name}' on server '{step.server_name}' for step '{step.id}'")
+                                # The client retries internally, so this is recorded as one attempt
+                                tool_result = await self._timed_attempt(
+                                    context._step_attempts.setdefault(step.id, []),
+                                    client.call_tool_with_retry(
+                                        step.tool_name, 
+                                        step.parameters,
+                                        retry_count=step.retry_count
+                                    ),
+                                )
+                                results[step.id] = context._publish_result(step.id, tool_result)
+                                succeeded = True
+
+                                # Enhanced logging: Tool completion
+                                if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                                    try:
+                                        await enhanced_logger.log_step_end_async(step.id, {"tool_result": "MCP tool completed"}, True)
+                                    except Exception:
+                                        pass
+                            except Exception as client_e:
+                                logger.error(f"MCP client call failed for step {step.id} ({step.name}): {client_e}")
+                                results[step.id] = {"error": str(client_e)}
+                                succeeded = False
+
+                                # Enhanced logging: Step failure
+                                if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                                    try:
+                                        await enhanced_logger.log_step_end_async(step.id, {"error": str(client_e)}, False)
+                                    except Exception:
+                                        pass
+                        else:
+                            # Fallback for unhandled step types (should not happen if all are covered)
+                            logger.warning(f"Unhandled step type: {step.step_type.name} for step {step.id}. Mocking execution.")
+                            results[step.id] = {"status": "mocked_unhandled", "step_type": step.step_type.name}
+                            succeeded = True
+
+                            # Enhanced logging: Mocked step completion
+                            if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                                try:
+                                    await enhanced_logger.log_step_end_async(step.id, {"status": "mocked_unhandled"}, True)
+                                except Exception:
+                                    pass
+            except Exception as e:
+                if isinstance(e, TimeoutError) and timeout_scope.expired():
+                    e = TimeoutError(f"Step timed out after {step.timeout_seconds}s")
+                    for attempt in context._step_attempts.get(step.id, [])[-1:]:
+                        if attempt.status == "cancelled":
+                            attempt.status = "timed_out"
+                logger.error(f"Step {step.id} failed: {e}")
+                results[step.id] = {"error": str(e)}
+                succeeded = False
+
+                # Enhanced logging: General step failure
+                if enhanced_logger and hasattr(enhanced_logger, 'log_step_end_async'):
+                    try:
+                        await enhanced_logger.log_step_end_async(step.id, {"error": str(e)}, False)
+                    except Exception:
+                        pass
+
+        return succeeded
+
+    async def _run_custom_function(self, step: WorkflowStep, context: WorkflowContext) -> Any:
+        """
+        Run a custom step function, retrying transient failures up to
+        step.retry_count times with jittered backoff.
+
+        Retries stop early when the backoff would outlive the step's timeout.
+        Terminal errors (see utils.retry.is_retryable_error) are not retried.
+        """
+        attempts = context._step_attempts.setdefault(step.id, [])
+        engine = RetryEngine(RetryPolicy(
+            max_attempts=max(0, step.retry_count or 0) + 1,
+            base_delay=self.config.retry_backoff_seconds,
+            max_delay=max(self.config.retry_backoff_seconds, 30.0),
+        ))
+
+        def log_retry(attempt: int, delay: float, error: Exception):
+            logger.warning(f"Step {step.id} attempt {attempt} failed, retrying in {delay:.1f}s: {error}")
+
+        if step.step_type == StepType.CPU:
+            call = lambda: self._run_cpu_function(step, context)
+        else:
+            call = lambda: step.custom_function(context, step, **step.parameters)
+
+        try:
+            return await engine.run(
+                lambda: self._timed_attempt(attempts, call()),
+                remaining_time=remaining_time,
+                on_retry=log_retry,
+            )
+        except MCPRetryError as e:
+            if e.last_error is not None:
+                raise e.last_error
+            raise
+
+    @staticmethod
+    async def _run_cpu_function(step: WorkflowStep, context: WorkflowContext) -> Any:
+        """Call a CPU step's function in the shared process pool with its parameters and inputs."""
+        kwargs = dict(step.parameters)
+        for argument, key in step.inputs.items():
+            kwargs[argument] = context.get_shared_value(key)
+        with profile_span(getattr(step.custom_function, "__qualname__", step.id), "cpu", process_pool=True):
+            return await run_in_process(step.custom_function, **kwargs)
+
+    @staticmethod
+    async def _publish_stream(step: WorkflowStep, context: WorkflowContext) -> Dict[str, Any]:
+        """Run a STREAM step's async generator, publishing each item to its consumers."""
+        stream = context._streams[step.id]
+        items = step.custom_function(context, step, **step.parameters)
+        if not hasattr(items, "__aiter__"):
+            if asyncio.iscoroutine(items):
+                items.close()
+            raise TypeError(f"Streaming step '{step.id}' function must be an async generator")
+        try:
+            async for item in items:
+                await stream.publish(item)
+        finally:
+            await items.aclose()
+        return {"status": "streamed", "items": stream.items_published}
+
+    @staticmethod
+    async def _timed_attempt(attempts: List[StepAttempt], awaitable: Awaitable[Any]) -> Any:
+        """Await one attempt of a step, appending its timing to attempts."""
+        record = StepAttempt(attempt=len(attempts) + 1, started_at=time.time())
+        attempts.append(record)
+        start = time.perf_counter()
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            record.status = "cancelled"
+            raise
+        except Exception as e:
+            record.status = "failed"
+            record.error = str(e)
+            raise
+        finally:
+            record.duration_seconds = time.perf_counter() - start
+        record.status = "succeeded"
+        return result
+
 class WorkflowBuilder:
     """A fluent builder for constructing GraphMCP workflows."""
     
     def __init__(self, name: str, config_path: str, description: str = ""):
         self._config = WorkflowConfig(name=name, config_path=config_path, description=description)
         self._steps: List[WorkflowStep] = []
+        self._client_registry: Optional[MCPClientRegistry] = None
 
-    def with_config(self, max_parallel_steps: int = 3, default_timeout: int = 120, stop_on_error: bool = False, default_retry_count: int = 2) -> WorkflowBuilder:
+    def with_config(self, max_parallel_steps: int = 3, default_timeout: int = 120, stop_on_error: bool = False, default_retry_count: int = 2,
+                    retry_backoff_seconds: float = 1.0) -> WorkflowBuilder:
         """Configure workflow execution parameters."""
         self._config.max_parallel_steps = max_parallel_steps
         self._config.default_timeout = default_timeout
         self._config.stop_on_error = stop_on_error
         self._config.default_retry_count = default_retry_count
+        self._config.retry_backoff_seconds = retry_backoff_seconds
+        return self
+
+    def with_checkpoints(self, directory: str = DEFAULT_CHECKPOINT_DIR, max_age_seconds: Optional[float] = None,
+                         clear_on_success: bool = False) -> WorkflowBuilder:
+        """
+        Checkpoint successful step results to directory so runs can be resumed.
+
+        Args:
+            directory: Checkpoint directory, shared by all workflows
+            max_age_seconds: Before each run, delete checkpoints older than this
+            clear_on_success: Delete a run's checkpoints once all its steps succeed
+        """
+        self._config.checkpoint_dir = str(directory)
+        self._config.checkpoint_max_age_seconds = max_age_seconds
+        self._config.clear_checkpoints_on_success = clear_on_success
+        return self
+
+    def with_run_identity_parameters(self, *names: str) -> WorkflowBuilder:
+        """
+        Leave these step parameters (e.g. a workflow id that differs per run)
+        out of checkpoint keys, so a resumed run finds the checkpoints of the
+        run it resumes.
+        """
+        self._config.checkpoint_ignored_parameters = tuple(names)
+        return self
+
+    def with_profiling(self, directory: str = DEFAULT_PROFILE_DIR) -> WorkflowBuilder:
+        """
+        Profile every run, writing a Chrome trace (.trace.json) and collapsed
+        stacks for flamegraphs (.folded) to directory.
+        """
+        self._config.profile_dir = str(directory)
+        return self
+
+    def with_serialization_check(self, mode: str) -> WorkflowBuilder:
+        """
+        Choose how step results are checked for serializability.
+
+        "structural" (default) walks the value's types, "pickle" runs a full
+        pickle.dumps() and "off" skips the check, leaving errors to surface
+        when results are checkpointed.
+        """
+        if mode not in CHECK_MODES:
+            raise ValueError(f"Unknown serialization check mode '{mode}'; expected one of {CHECK_MODES}")
+        self._config.serialization_check = mode
+        return self
+
+    def with_client_registry(self, registry: MCPClientRegistry) -> WorkflowBuilder:
+        """
+        Share MCP clients through registry, so they outlive this workflow's
+        run and are reused by other workflows given the same registry.
+        The caller closes the registry.
+        """
+        self._client_registry = registry
         return self
 
     def custom_step(self, step_id: str, name: str, func: Callable, 
@@ -294,8 +868,75 @@ class WorkflowBuilder:
             custom_function=func,
             parameters=parameters or {},
             depends_on=depends_on or [],
-            timeout_seconds=timeout_seconds or self._config.default_timeout,
-            retry_count=retry_count or self._config.default_retry_count
+            timeout_seconds=timeout_seconds,
+            retry_count=retry_count
+        )
+        self._steps.append(step)
+        return self
+
+    def cpu_step(self, step_id: str, name: str, func: Callable,
+                 description: str = "", parameters: Dict = None,
+                 inputs: Dict[str, str] = None, depends_on: List[str] = None,
+                 timeout_seconds: int = None, retry_count: int = 0, **kwargs) -> WorkflowBuilder:
+        """
+        Add a CPU-bound step that runs in the shared process pool.
+
+        func is a plain, module-level function called as
+        func(**parameters, **{arg: context.get_shared_value(key)}) for each
+        arg -> key in inputs; its return value becomes the step result. It
+        does not receive the workflow context.
+
+        Raises:
+            ValueError: func is a coroutine function, or func or parameters
+                can not be pickled to a worker process
+        """
+        parameters = parameters or {}
+        if asyncio.iscoroutinefunction(func):
+            raise ValueError(f"CPU step '{step_id}' needs a plain function, not a coroutine function")
+        problem = check_serializable({"function": func, "parameters": parameters})
+        if problem is not None:
+            raise ValueError(f"CPU step '{step_id}' can not be sent to a worker process: {problem}")
+
+        step = WorkflowStep(
+            id=step_id,
+            name=name,
+            description=description,
+            step_type=StepType.CPU,
+            custom_function=func,
+            parameters=parameters,
+            depends_on=depends_on or [],
+            timeout_seconds=timeout_seconds,
+            retry_count=retry_count,
+            inputs=dict(inputs or {}),
+        )
+        self._steps.append(step)
+        return self
+
+    def stream_step(self, step_id: str, name: str, func: Callable,
+                    description: str = "", parameters: Dict = None,
+                    depends_on: List[str] = None, timeout_seconds: int = None,
+                    buffer_size: int = 8, **kwargs) -> WorkflowBuilder:
+        """
+        Add a streaming step whose function is an async generator.
+
+        Steps that depend on it start as soon as it does and read its items
+        with context.stream(step_id); at most buffer_size items are held for
+        each of them. The step result is {"status": "streamed", "items": n}.
+        Streaming steps are not retried or checkpointed. A full buffer pauses
+        the step until its consumer runs, so consumers should not also wait
+        on steps that can only start after this one frees its slot.
+        """
+        step = WorkflowStep(
+            id=step_id,
+            name=name,
+            description=description,
+            step_type=StepType.STREAM,
+            custom_function=func,
+            parameters=parameters or {},
+            depends_on=depends_on or [],
+            timeout_seconds=timeout_seconds,
+            retry_count=0,
+            stream_buffer_size=buffer_size,
         )
         self._steps.append(step)
         return self
@@ -323,8 +964,8 @@ class WorkflowBuilder:
             tool_name="pack_remote_repository", # Set tool_name
             parameters=step_params,
             depends_on=kwargs.get('depends_on', []),
-            timeout_seconds=kwargs.get('timeout_seconds', self._config.default_timeout),
-            retry_count=kwargs.get('retry_count', self._config.default_retry_count)
+            timeout_seconds=kwargs.get('timeout_seconds'),
+            retry_count=kwargs.get('retry_count')
         )
         self._steps.append(step)
         return self
@@ -346,8 +987,8 @@ class WorkflowBuilder:
             tool_name="analyze_repo_structure", # Set tool_name
             parameters=step_params,
             depends_on=kwargs.get('depends_on', []),
-            timeout_seconds=kwargs.get('timeout_seconds', self._config.default_timeout),
-            retry_count=kwargs.get('retry_count', self._config.default_retry_count)
+            timeout_seconds=kwargs.get('timeout_seconds'),
+            retry_count=kwargs.get('retry_count')
         )
         self._steps.append(step)
         return self
@@ -374,8 +1015,8 @@ class WorkflowBuilder:
             tool_name="create_pull_request", # Set tool_name
             parameters=step_params,
             depends_on=kwargs.get('depends_on', []),
-            timeout_seconds=kwargs.get('timeout_seconds', self._config.default_timeout),
-            retry_count=kwargs.get('retry_count', self._config.default_retry_count)
+            timeout_seconds=kwargs.get('timeout_seconds'),
+            retry_count=kwargs.get('retry_count')
         )
         self._steps.append(step)
         return self
@@ -397,8 +1038,8 @@ class WorkflowBuilder:
             tool_name="slack_post_message", # Corrected tool name
             parameters=step_params,
             depends_on=kwargs.get('depends_on', []),
-            timeout_seconds=kwargs.get('timeout_seconds', self._config.default_timeout),
-            retry_count=kwargs.get('retry_count', self._config.default_retry_count)
+            timeout_seconds=kwargs.get('timeout_seconds'),
+            retry_count=kwargs.get('retry_count')
         )
         self._steps.append(step)
         return self
@@ -425,13 +1066,50 @@ class WorkflowBuilder:
             custom_function=step_func,
             parameters=step_params,
             depends_on=kwargs.get('depends_on', []),
-            timeout_seconds=kwargs.get('timeout_seconds', self._config.default_timeout),
-            retry_count=kwargs.get('retry_count', self._config.default_retry_count)
+            timeout_seconds=kwargs.get('timeout_seconds'),
+            retry_count=kwargs.get('retry_count')
         )
         self._steps.append(step)
         return self
 
     def build(self) -> Workflow:
-        """Build and return the configured workflow."""
+        """
+        Build and return the configured workflow.
+
+        Raises:
+            ValueError: If step ids are duplicated, a step depends on an unknown
+                step, the dependencies contain a cycle, or a tool step's
+                server or tool is unknown
+        """
         logger.info(f"Building workflow '{self._config.name}' with {len(self._steps)} steps.")
-        return Workflow(self._config, self._steps) 
\ No newline at end of file
+        return Workflow(self._config, self._resolved_steps(), self._client_registry, self.compile())
+
+    def compile(self, timings: Optional[StepTimings] = None) -> ExecutionPlan:
+        """
+        Compile the workflow into a reusable ExecutionPlan.
+
+        Bind the plan once per run (ExecutionPlan.bind) to execute the same
+        definition with different ${name} parameter values, without
+        validating and resolving it again.
+
+        Raises:
+            ValueError: See ExecutionPlan.compile
+        """
+        from .plan import ExecutionPlan
+        return ExecutionPlan.compile(self._config, self._resolved_steps(), timings)
+
+    def _resolved_steps(self) -> List[WorkflowStep]:
+        """
+        The steps, with the configured defaults filled in for steps added
+        without a timeout or retry count, so with_config() applies no matter
+        whether it is called before or after the steps are added.
+        """
+        return [
+            replace(
+                step,
+                timeout_seconds=self._config.default_timeout if step.timeout_seconds is None else step.timeout_seconds,
+                retry_count=self._config.default_retry_count if step.retry_count is None else step.retry_count,
+            )
+            if step.timeout_seconds is None or step.retry_count is None else step
+            for step in self._steps
+        ]
@@ -0,0 +1,181 @@
+"""
+Workflow Step Checkpoints
+
+Persists each successful step's result under a content address derived from
+the step's definition (id, function, parameters) and the result hashes of
+the steps it depends on. A resumed run recomputes the address and reuses the
+stored result when nothing upstream changed, so a failure late in a workflow
+does not force earlier, expensive steps (e.g. Repomix packs) to run again.
+
+Checkpoints are pickled, matching the pickle-safety check that
+WorkflowContext.set_shared_value() applies; with that check turned off
+(WorkflowBuilder.with_serialization_check("off")) this is where a
+non-serializable result first surfaces.
+"""
+
+import asyncio
+import dataclasses
+import enum
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = "cache/checkpoints"
+# Checkpoints older than this are pruned by workflows that set an age limit
+DEFAULT_CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Bump when the key derivation or the stored record changes shape
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def _canonical(obj: Any) -> Any:
+    """json.dumps default hook producing stable representations."""
+    if callable(obj) and hasattr(obj, "__code__"):
+        code = obj.__code__
+        body = hashlib.sha256(code.co_code + repr(code.co_consts).encode()).hexdigest()[:16]
+        return f"<function {obj.__module__}.{obj.__qualname__}:{body}>"
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, (bytes, bytearray)):
+        return {"__bytes__": hashlib.sha256(obj).hexdigest()}
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return f"{type(obj).__qualname__}.{obj.name}"
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"__dataclass__": type(obj).__qualname__, **dataclasses.asdict(obj)}
+    # Falls back to repr(); reprs containing memory addresses simply never match
+    return f"<{type(obj).__qualname__} {obj!r}>"
+
+
+def fingerprint(value: Any) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-like value."""
+    encoded = json.dumps(value, sort_keys=True, default=_canonical, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+def step_checkpoint_key(step: Any, upstream_hashes: Dict[str, Optional[str]],
+                        ignored_parameters: Collection[str] = ()) -> str:
+    """
+    Content address of a step execution.
+
+    Args:
+        step: WorkflowStep being executed
+        upstream_hashes: Result hash of each step it depends on
+        ignored_parameters: Step parameters identifying the run rather than
+            its inputs (e.g. a per-run workflow id), left out of the key
+
+    Returns:
+        Hex digest that changes whenever the step or its inputs change
+    """
+    return fingerprint({
+        "version": CHECKPOINT_FORMAT_VERSION,
+        "step": step.id,
+        "type": step.step_type.name,
+        "server": step.server_name,
+        "tool": step.tool_name,
+        "function": step.custom_function,
+        "parameters": {name: value for name, value in step.parameters.items() if name not in ignored_parameters},
+        "upstream": upstream_hashes,
+    })
+
+
+@dataclass
+class StepCheckpoint:
+    """A persisted step result plus the shared context values it wrote."""
+    step_id: str
+    key: str
+    result: Any
+    result_hash: str
+    shared_values: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+
+class CheckpointStore:
+    """Directory of pickled StepCheckpoints, one subdirectory per workflow."""
+
+    def __init__(self, directory: str | Path = DEFAULT_CHECKPOINT_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, workflow_name: str, key: str) -> Path:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", workflow_name) or "workflow"
+        return self.directory / safe_name / f"{key}.pkl"
+
+    def load(self, workflow_name: str, key: str) -> Optional[StepCheckpoint]:
+        """Return the checkpoint stored under key, or None if absent or unreadable."""
+        path = self._path(workflow_name, key)
+        try:
+            with open(path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        if not isinstance(checkpoint, StepCheckpoint) or checkpoint.key != key:
+            logger.warning(f"Ignoring mismatched checkpoint {path}")
+            return None
+        return checkpoint
+
+    def save(self, workflow_name: str, checkpoint: StepCheckpoint) -> Path:
+        """Atomically write a checkpoint and return its path."""
+        path = self._path(workflow_name, checkpoint.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Saved checkpoint for step '{checkpoint.step_id}' to {path}")
+        return path
+
+    async def load_async(self, workflow_name: str, key: str) -> Optional[StepCheckpoint]:
+        return await asyncio.to_thread(self.load, workflow_name, key)
+
+    async def save_async(self, workflow_name: str, checkpoint: StepCheckpoint) -> Path:
+        return await asyncio.to_thread(self.save, workflow_name, checkpoint)
+
+    def clear(self, workflow_name: Optional[str] = None) -> int:
+        """Delete stored checkpoints (for one workflow or all); returns the count removed."""
+        root = self._path(workflow_name, "x").parent if workflow_name else self.directory
+        removed = 0
+        for path in root.rglob("*.pkl") if root.exists() else []:
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def discard(self, workflow_name: str, keys: Iterable[str]) -> int:
+        """Delete the given checkpoints of a workflow; returns the count removed."""
+        removed = 0
+        for key in keys:
+            path = self._path(workflow_name, key)
+            if path.exists():
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete checkpoints (of every workflow) older than max_age_seconds; returns the count removed."""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.directory.rglob("*.pkl") if self.directory.exists() else []:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
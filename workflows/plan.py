@@ -0,0 +1,259 @@
+"""
+Compiled Workflow Plans
+
+WorkflowBuilder.compile() does the per-definition work of a workflow once:
+it validates the dependency graph, precomputes the scheduling tables,
+resolves each MCP server's client class, checks tool names against cached
+server capabilities, records where step parameters hold ${name}
+placeholders and estimates the run's duration from historical step
+timings. The resulting ExecutionPlan is then bound to concrete values as
+many times as needed, without repeating any of that:
+
+    plan = (WorkflowBuilder("decommission", "mcp_config.json")
+            .custom_step("scan", "Scan", scan_step,
+                         parameters={"database_name": plan_parameter("database_name")})
+            .compile())
+    for database in databases:
+        await plan.bind({"database_name": database}).execute()
+
+A parameter that is exactly one placeholder is replaced by the bound value
+as is (e.g. a list of repositories); placeholders inside a longer string
+are formatted into it. Binding copies only the containers on the path to a
+placeholder.
+
+Plans pickle (see save() and load()), so a plan compiled once can be reused
+by other processes. Step functions and client classes are pickled by
+reference and must be importable module-level objects.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import pickle
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from clients.base import BaseMCPClient
+from clients.pool import find_client_class
+from clients.registry import MCPClientRegistry
+from utils.capabilities import capability_cache, capability_key
+from .builder import Workflow, WorkflowConfig, WorkflowStep, dependency_tables, validate_step_dependencies
+from .timings import StepTimings, step_timings
+
+logger = logging.getLogger(__name__)
+
+_NAME = r"[A-Za-z_][A-Za-z0-9_]*"
+PLACEHOLDER = re.compile(r"\$\{(" + _NAME + r")\}")
+
+ParameterPath = Tuple[Union[str, int], ...]
+
+
+def plan_parameter(name: str) -> str:
+    """Return the placeholder for a value supplied when a plan is bound."""
+    if not re.fullmatch(_NAME, name):
+        raise ValueError(f"Invalid plan parameter name '{name}'")
+    return "${" + name + "}"
+
+
+def _find_slots(value: Any, path: ParameterPath = ()) -> List[Tuple[ParameterPath, str]]:
+    """Paths of the strings containing placeholders within a parameter value."""
+    if isinstance(value, str):
+        return [(path, value)] if PLACEHOLDER.search(value) else []
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = enumerate(value)
+    else:
+        return []
+    slots = []
+    for key, item in items:
+        slots.extend(_find_slots(item, path + (key,)))
+    return slots
+
+
+def _substitute(template: str, values: Dict[str, Any]) -> Any:
+    match = PLACEHOLDER.fullmatch(template)
+    if match:
+        return values[match.group(1)]
+    return PLACEHOLDER.sub(lambda m: str(values[m.group(1)]), template)
+
+
+def _replace_at(value: Any, path: ParameterPath, replacement: Any) -> Any:
+    """Copy of value with the item at path replaced; only containers on the path are copied."""
+    if not path:
+        return replacement
+    key, rest = path[0], path[1:]
+    copy = dict(value) if isinstance(value, dict) else list(value)
+    copy[key] = _replace_at(value[key], rest, replacement)
+    return tuple(copy) if isinstance(value, tuple) else copy
+
+
+def _critical_path(steps: List[WorkflowStep], dependents: Dict[str, List[str]],
+                   dependency_counts: Dict[str, int], estimates: Dict[str, Optional[float]]) -> float:
+    """Longest chain of estimated step durations; steps without history count as zero."""
+    finish: Dict[str, float] = {}
+    waiting_on = dict(dependency_counts)
+    ready = [step.id for step in steps if waiting_on[step.id] == 0]
+    starts = {step.id: 0.0 for step in steps}
+    while ready:
+        step_id = ready.pop()
+        finish[step_id] = starts[step_id] + (estimates.get(step_id) or 0.0)
+        for dependent in dependents[step_id]:
+            starts[dependent] = max(starts[dependent], finish[step_id])
+            waiting_on[dependent] -= 1
+            if waiting_on[dependent] == 0:
+                ready.append(dependent)
+    return max(finish.values(), default=0.0)
+
+
+@dataclass
+class ExecutionPlan:
+    """A validated workflow definition, ready to be bound and executed."""
+    config: WorkflowConfig
+    steps: List[WorkflowStep]
+    # Scheduling tables used by Workflow.execute()
+    dependents: Dict[str, List[str]]
+    dependency_counts: Dict[str, int]
+    # MCP server name -> client class used by its tool steps
+    client_classes: Dict[str, Type[BaseMCPClient]]
+    # Step id -> (path into its parameters, template) of each placeholder
+    parameter_slots: Dict[str, List[Tuple[ParameterPath, str]]]
+    description_template: Optional[str] = None
+    variables: List[str] = field(default_factory=list)
+    # Mean historical duration per step; None where no run was recorded
+    estimates: Dict[str, Optional[float]] = field(default_factory=dict)
+    estimated_duration_seconds: float = 0.0
+
+    @property
+    def unestimated_steps(self) -> List[str]:
+        return [step_id for step_id, seconds in self.estimates.items() if seconds is None]
+
+    @classmethod
+    def compile(cls, config: WorkflowConfig, steps: List[WorkflowStep],
+                timings: Optional[StepTimings] = None) -> ExecutionPlan:
+        """
+        Compile a workflow definition.
+
+        Args:
+            config: Workflow configuration; copied into the plan
+            steps: Step definitions; copied into the plan
+            timings: Step duration history (defaults to the process-wide one)
+
+        Raises:
+            ValueError: If the dependencies are invalid (see
+                validate_step_dependencies), no client class is known for a
+                step's server, or a server's cached capabilities lack a
+                step's tool
+        """
+        validate_step_dependencies(steps)
+        config = dataclasses.replace(config)
+        steps = [dataclasses.replace(step) for step in steps]
+        dependents, dependency_counts = dependency_tables(steps)
+
+        client_classes: Dict[str, Type[BaseMCPClient]] = {}
+        for step in steps:
+            if not step.server_name or not step.tool_name:
+                continue
+            if step.server_name not in client_classes:
+                client_class = find_client_class(step.server_name)
+                if client_class is None:
+                    raise ValueError(f"Step '{step.id}' uses unsupported server '{step.server_name}'")
+                client_classes[step.server_name] = client_class
+            capabilities = capability_cache.get(capability_key(config.config_path, step.server_name))
+            if capabilities is not None and not capabilities.has_tool(step.tool_name):
+                raise ValueError(f"Step '{step.id}' calls tool '{step.tool_name}', "
+                                 f"which server '{step.server_name}' does not provide")
+
+        parameter_slots = {}
+        variables = set(PLACEHOLDER.findall(config.description))
+        for step in steps:
+            slots = _find_slots(step.parameters)
+            if slots:
+                parameter_slots[step.id] = slots
+                for _, template in slots:
+                    variables.update(PLACEHOLDER.findall(template))
+
+        timings = timings if timings is not None else step_timings
+        estimates = {step.id: timings.estimate(config.name, step.id) for step in steps}
+
+        return cls(
+            config=config,
+            steps=steps,
+            dependents=dependents,
+            dependency_counts=dependency_counts,
+            client_classes=client_classes,
+            parameter_slots=parameter_slots,
+            description_template=config.description if PLACEHOLDER.search(config.description) else None,
+            variables=sorted(variables),
+            estimates=estimates,
+            estimated_duration_seconds=_critical_path(steps, dependents, dependency_counts, estimates),
+        )
+
+    def bind(self, values: Optional[Dict[str, Any]] = None,
+             client_registry: Optional[MCPClientRegistry] = None) -> Workflow:
+        """
+        Create a workflow from the plan with its placeholders filled in.
+
+        Args:
+            values: Value of each of the plan's variables
+            client_registry: Registry the workflow takes MCP clients from
+
+        Raises:
+            ValueError: If a variable has no value, or a value is given for
+                a name that is not a variable of the plan
+        """
+        values = values or {}
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise ValueError(f"No value for plan parameters: {', '.join(missing)}")
+        unknown = sorted(set(values) - set(self.variables))
+        if unknown:
+            raise ValueError(f"Unknown plan parameters: {', '.join(unknown)}")
+
+        config = dataclasses.replace(self.config)
+        if self.description_template is not None:
+            config.description = str(_substitute(self.description_template, values))
+        steps = []
+        for step in self.steps:
+            parameters = step.parameters
+            for path, template in self.parameter_slots.get(step.id, ()):
+                parameters = _replace_at(parameters, path, _substitute(template, values))
+            steps.append(dataclasses.replace(step, parameters=parameters))
+        return Workflow(config, steps, client_registry, plan=self)
+
+    def save(self, path: str | Path) -> Path:
+        """
+        Atomically pickle the plan to path.
+
+        Raises:
+            ValueError: A step function or parameter cannot be pickled
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise ValueError(f"Plan for workflow '{self.config.name}' cannot be saved: {e}") from e
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Saved execution plan for '{self.config.name}' to {path}")
+        return path
+
+    @staticmethod
+    def load(path: str | Path) -> ExecutionPlan:
+        """Load a plan written by save()."""
+        with open(path, "rb") as f:
+            plan = pickle.load(f)
+        if not isinstance(plan, ExecutionPlan):
+            raise ValueError(f"{path} does not contain an execution plan")
+        return plan
@@ -0,0 +1,98 @@
+"""
+Streaming Step Outputs
+
+A streaming step's function is an async generator. Instead of returning one
+complete value, it yields items that steps depending on it consume while it
+is still running:
+
+    async def discover(context, step, repos):
+        for repo in repos:
+            yield await scan(repo)
+
+    async def refactor(context, step):
+        async for scan_result in context.stream("discover"):
+            ...
+
+Every consumer gets its own bounded buffer. The producer waits whenever any
+consumer's buffer is full, so a slow consumer applies backpressure and at
+most buffer_size items per consumer are held in memory at a time.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional
+
+
+class StreamClosedError(RuntimeError):
+    """The producing step failed or was cancelled before finishing its stream."""
+
+
+class StepStream:
+    """Bounded broadcast of one streaming step's items to its consumers."""
+
+    def __init__(self, step_id: str, consumers: Iterable[str], buffer_size: int = 8):
+        self.step_id = step_id
+        self.buffer_size = max(1, buffer_size)
+        self.items_published = 0
+        self._buffers: Dict[str, Deque[Any]] = {consumer: deque() for consumer in consumers}
+        self._condition = asyncio.Condition()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def publish(self, item: Any) -> None:
+        """Hand item to every attached consumer, waiting while any buffer is full."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: all(len(buffer) < self.buffer_size for buffer in self._buffers.values()))
+            for buffer in self._buffers.values():
+                buffer.append(item)
+            self.items_published += 1
+            self._condition.notify_all()
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        End the stream. Consumers drain what is buffered, then stop, or
+        raise error when one is given.
+        """
+        async with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._error = error
+            self._condition.notify_all()
+
+    async def detach(self, consumer: str) -> None:
+        """Stop buffering items for consumer, e.g. once its step has finished."""
+        async with self._condition:
+            if self._buffers.pop(consumer, None) is not None:
+                self._condition.notify_all()
+
+    def iterate(self, consumer: str) -> AsyncIterator[Any]:
+        """
+        Return an iterator over the items published for consumer, ending
+        when the stream closes.
+
+        Raises:
+            ValueError: consumer is not (or no longer) attached
+        """
+        buffer = self._buffers.get(consumer)
+        if buffer is None:
+            raise ValueError(f"Step '{consumer}' does not consume the stream of step '{self.step_id}'")
+        return self._drain(buffer)
+
+    async def _drain(self, buffer: Deque[Any]) -> AsyncIterator[Any]:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: buffer or self._closed)
+                if buffer:
+                    item = buffer.popleft()
+                    self._condition.notify_all()
+                elif self._error is not None:
+                    raise StreamClosedError(f"Stream of step '{self.step_id}' failed: {self._error}") from self._error
+                else:
+                    return
+            yield item
@@ -0,0 +1,102 @@
+"""
+Historical Step Timings
+
+Records how long each step of a workflow took on successful runs, keyed by
+(workflow name, step id), so compiled execution plans can estimate a run's
+cost before it starts. The most recent samples are kept per step; retries
+count towards a step's duration since they are part of what it costs.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .builder import StepAttempt
+
+logger = logging.getLogger(__name__)
+
+TimingKey = Tuple[str, str]
+
+
+class StepTimings:
+    """Recent successful durations of workflow steps."""
+
+    def __init__(self, max_samples: int = 20):
+        self.max_samples = max(1, max_samples)
+        self._samples: Dict[TimingKey, Deque[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, workflow_name: str, step_id: str, seconds: float) -> None:
+        samples = self._samples.get((workflow_name, step_id))
+        if samples is None:
+            samples = self._samples[(workflow_name, step_id)] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+    def record_attempts(self, workflow_name: str, step_attempts: Dict[str, List["StepAttempt"]],
+                        skip: Iterable[str] = ()) -> None:
+        """
+        Record the steps of a finished run whose last attempt succeeded.
+
+        Args:
+            workflow_name: Name of the workflow that ran
+            step_attempts: WorkflowResult.step_attempts of the run
+            skip: Step ids to leave out, e.g. steps restored from checkpoints
+        """
+        skip = set(skip)
+        for step_id, attempts in step_attempts.items():
+            if step_id in skip or not attempts or attempts[-1].status != "succeeded":
+                continue
+            self.record(workflow_name, step_id, sum(attempt.duration_seconds for attempt in attempts))
+
+    def estimate(self, workflow_name: str, step_id: str) -> Optional[float]:
+        """Mean recorded duration of a step in seconds, or None without history."""
+        samples = self._samples.get((workflow_name, step_id))
+        if not samples:
+            return None
+        return sum(samples) / len(samples)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+    def save(self, path: str | Path) -> Path:
+        """Atomically write the samples as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {workflow: {} for workflow, _ in self._samples}
+        for (workflow, step_id), samples in self._samples.items():
+            data[workflow][step_id] = list(samples)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    def load(self, path: str | Path) -> None:
+        """Add the samples saved at path; a missing or unreadable file is ignored."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable step timings {path}: {e}")
+            return
+        for workflow, steps in data.items():
+            for step_id, samples in steps.items():
+                for seconds in samples:
+                    self.record(workflow, step_id, float(seconds))
+
+
+# Process-wide history, fed by every workflow run
+step_timings = StepTimings()